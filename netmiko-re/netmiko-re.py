@@ -21,8 +21,14 @@ for router in routers:
     print(f"\n--- {name} ---")
     try:
         conn = ConnectHandler(**info)
-        brief  = conn.send_command("show ip interface brief")
-        detail = conn.send_command("show interfaces")
+        if hasattr(conn, "send_commands"):
+            # Both commands in one round trip (netmikolab's netmiko)
+            outputs = conn.send_commands(["show ip interface brief", "show interfaces"])
+            brief  = outputs["show ip interface brief"]
+            detail = outputs["show interfaces"]
+        else:
+            brief  = conn.send_command("show ip interface brief")
+            detail = conn.send_command("show interfaces")
         conn.disconnect()
     except Exception as e:
         print(f"Failed {name}: {e}")
@@ -0,0 +1,380 @@
+"""Local SSH server behaving like a Cisco IOS device, used by run_benchmarks.py.
+
+Any username and password are accepted. Besides a few canned show commands, the device
+answers 'show bench <size>' with <size> bytes of output. Every line received is answered
+after rtt seconds, and output is sent in chunk_size pieces (chunk_delay seconds apart).
+
+Can also be run on its own to try netmiko against it:
+
+    python fake_ios.py --port 2222 --rtt 0.05
+"""
+import argparse
+import socket
+import threading
+import time
+
+import paramiko
+
+HOSTNAME = "R1"
+
+SHOW_VERSION = """\
+Cisco IOS Software, IOSv Software (VIOS-ADVENTERPRISEK9-M), Version 15.9(3)M6, RELEASE SOFTWARE (fc1)
+Technical Support: http://www.cisco.com/techsupport
+Copyright (c) 1986-2022 by Cisco Systems, Inc.
+Compiled Wed 02-Nov-22 12:40 by prod_rel_team
+
+
+ROM: Bootstrap program is IOSv
+
+{hostname} uptime is 1 week, 2 days, 3 hours, 4 minutes
+System returned to ROM by reload
+System image file is "flash0:/vios-adventerprisek9-m"
+Last reload reason: Unknown reason
+
+Cisco IOSv (revision 1.0) with  with 460137K/62464K bytes of memory.
+Processor board ID 9YJXS2VD3Q7LZSB8LLZ1Y
+4 Gigabit Ethernet interfaces
+DRAM configuration is 72 bits wide with parity disabled.
+256K bytes of non-volatile configuration memory.
+2097152K bytes of ATA System CompactFlash 0 (Read/Write)
+
+Configuration register is 0x0
+"""
+
+CONFIG_BANNER = "Enter configuration commands, one per line.  End with CNTL/Z.\r\n"
+INVALID_INPUT = "% Invalid input detected at '^' marker.\r\n"
+
+
+def ip_interface_brief(count):
+    """'show ip interface brief' output for count interfaces."""
+    header = "Interface              IP-Address      OK? Method Status                "
+    lines = [header + "Protocol"]
+    row = "GigabitEthernet0/{:<6} {:<15} YES NVRAM  up                    up"
+    for i in range(count):
+        lines.append(row.format(i, "10.{}.{}.1".format(i // 256 % 256, i % 256)))
+    return "\n".join(lines) + "\n"
+
+
+def show_interfaces(count):
+    """'show interfaces' output for count interfaces."""
+    blocks = []
+    for i in range(count):
+        blocks.append(
+            """\
+GigabitEthernet0/{i} is up, line protocol is up
+  Hardware is iGbE, address is 5254.00{a:02x}.{b:02x}01 (bia 5254.00{a:02x}.{b:02x}01)
+  Description: Link {i}
+  Internet address is 10.{a}.{b}.1/24
+  MTU 1500 bytes, BW 1000000 Kbit/sec, DLY 10 usec,
+     reliability 255/255, txload 1/255, rxload 1/255
+  Encapsulation ARPA, loopback not set
+  Keepalive set (10 sec)
+  Auto Duplex, Auto Speed, link type is auto, media type is RJ45
+  output flow-control is unsupported, input flow-control is unsupported
+  ARP type: ARPA, ARP Timeout 04:00:00
+  Last input 00:00:01, output 00:00:02, output hang never
+  Last clearing of "show interface" counters never
+  Input queue: 0/75/0/0 (size/max/drops/flushes); Total output drops: 0
+  Queueing strategy: fifo
+  Output queue: 0/40 (size/max)
+  5 minute input rate 1000 bits/sec, 1 packets/sec
+  5 minute output rate 2000 bits/sec, 2 packets/sec
+     123456 packets input, 12345678 bytes, 0 no buffer
+     Received 1234 broadcasts (0 IP multicasts)
+     0 runts, 0 giants, 0 throttles
+     0 input errors, 0 CRC, 0 frame, 0 overrun, 0 ignored
+     0 watchdog, 0 multicast, 0 pause input
+     654321 packets output, 87654321 bytes, 0 underruns
+     0 output errors, 0 collisions, 1 interface resets
+     0 unknown protocol drops
+     0 babbles, 0 late collision, 0 deferred
+     0 lost carrier, 0 no carrier, 0 pause output
+     0 output buffer failures, 0 output buffers swapped out
+""".format(
+                i=i, a=i // 256 % 256, b=i % 256
+            )
+        )
+    return "".join(blocks)
+
+
+def bench_output(size):
+    """size bytes of output made of 80 character lines (at least one line)."""
+    line = "{:06d} " + "x" * 72 + "\n"
+    lines = [line.format(i % 1000000) for i in range(size // 80 + 1)]
+    return "".join(lines)[: max(size - 1, 1)] + "\n"
+
+
+class _ServerInterface(paramiko.ServerInterface):
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_pty_request(
+        self, channel, term, width, height, pixelwidth, pixelheight, modes
+    ):
+        return True
+
+    def check_channel_shell_request(self, channel):
+        return True
+
+    def check_channel_window_change_request(
+        self, channel, width, height, pixelwidth, pixelheight
+    ):
+        return True
+
+
+class FakeIOSServer(object):
+    """
+    SSH server of one fake IOS device, listening on host:port (port 0 picks a free
+    port).
+
+    :param rtt: Seconds before each line received is answered.
+
+    :param chunk_size: Output is sent in pieces of this many bytes.
+
+    :param chunk_delay: Seconds between two pieces of output.
+
+    :param host_key: paramiko PKey of the server (default: a new 2048 bit RSA key).
+
+    :param compression: Whether to offer zlib compression to clients.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        rtt=0.0,
+        chunk_size=4096,
+        chunk_delay=0.0,
+        hostname=HOSTNAME,
+        host_key=None,
+        compression=False,
+    ):
+        self.rtt = rtt
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.hostname = hostname
+        self.host_key = host_key or paramiko.RSAKey.generate(2048)
+        self.compression = compression
+        self.outputs = {
+            "show version": SHOW_VERSION.format(hostname=hostname),
+            "show ip interface brief": ip_interface_brief(48),
+            "show interfaces": show_interfaces(48),
+            "show running-config": self._running_config(),
+        }
+        self.outputs["show run"] = self.outputs["show running-config"]
+        self._bench_outputs = {}
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(100)
+        self.host, self.port = self._sock.getsockname()
+        self._stopped = threading.Event()
+        self._thread = None
+        # Number of SSH connections accepted so far
+        self.connections = 0
+
+    def _running_config(self):
+        lines = ["Building configuration...", "", "Current configuration : 4096 bytes"]
+        lines.append("!")
+        lines.append("hostname {}".format(self.hostname))
+        for i in range(48):
+            lines += [
+                "!",
+                "interface GigabitEthernet0/{}".format(i),
+                " description Link {}".format(i),
+                " ip address 10.0.{}.1 255.255.255.0".format(i),
+            ]
+        lines += ["!", "end"]
+        return "\n".join(lines) + "\n"
+
+    def start(self):
+        """Accept connections in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._sock.close()
+
+    def serve_forever(self):
+        while not self._stopped.is_set():
+            try:
+                client, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(
+                target=self._handle_client, args=(client,), daemon=True
+            ).start()
+
+    def _handle_client(self, client):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(self.host_key)
+        transport.use_compression(self.compression)
+        try:
+            transport.start_server(server=_ServerInterface())
+            # Every channel gets a CLI session of its own; as on IOS, logging out of one
+            # of them closes the whole connection.
+            while transport.is_active():
+                channel = transport.accept(timeout=1)
+                if channel is not None:
+                    threading.Thread(
+                        target=self._run_session, args=(transport, channel), daemon=True
+                    ).start()
+        except (EOFError, OSError, paramiko.SSHException):
+            pass
+        finally:
+            transport.close()
+
+    def _run_session(self, transport, channel):
+        try:
+            if _Session(self, channel).run():
+                transport.close()
+        except (EOFError, OSError, paramiko.SSHException):
+            pass
+
+    def bench_output(self, size):
+        """bench_output(size) encoded as sent (CRLF line endings)."""
+        output = self._bench_outputs.get(size)
+        if output is None:
+            output = bench_output(size).replace("\n", "\r\n").encode()
+            self._bench_outputs[size] = output
+        return output
+
+
+class _Session(object):
+    """The CLI of one SSH session."""
+
+    def __init__(self, server, channel):
+        self.server = server
+        self.channel = channel
+        self.mode = ""
+
+    @property
+    def prompt(self):
+        return "{}{}#".format(self.server.hostname, self.mode)
+
+    def send(self, data):
+        if isinstance(data, str):
+            data = data.replace("\r\n", "\n").replace("\n", "\r\n").encode()
+        size = self.server.chunk_size
+        for i in range(0, len(data), size):
+            if i and self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+            self.channel.sendall(data[i : i + size])
+
+    def run(self):
+        """Serve the session until the channel closes; True if it ended by logging out."""
+        self.send("\n" + self.prompt)
+        pending = ""
+        # Characters of pending already echoed
+        echoed = 0
+        while True:
+            data = self.channel.recv(65536)
+            if not data:
+                return False
+            if self.server.rtt:
+                time.sleep(self.server.rtt)
+            pending += data.decode(errors="replace")
+            while True:
+                # Lines end with \n or \r (optionally followed by \n)
+                ends = [i for i in (pending.find("\n"), pending.find("\r")) if i >= 0]
+                if not ends:
+                    break
+                end = min(ends)
+                line = pending[:end]
+                skip = 2 if pending[end : end + 2] == "\r\n" else 1
+                pending = pending[end + skip :]
+                if not self.handle_line(line, echoed):
+                    self.channel.close()
+                    return True
+                echoed = 0
+            if len(pending) > echoed:
+                # Echo the start of a line not terminated yet
+                self.send(pending[echoed:])
+                echoed = len(pending)
+
+    def handle_line(self, line, echoed=0):
+        """Echo line, send its output and the next prompt. False closes the session."""
+        command = line.strip()
+        output = self.command_output(command)
+        if output is None:
+            return False
+        if isinstance(output, bytes):
+            self.send(line[echoed:] + "\n")
+            self.send(output)
+            self.send(self.prompt)
+        else:
+            self.send(line[echoed:] + "\n" + output + self.prompt)
+        return True
+
+    def command_output(self, command):
+        if not command:
+            return ""
+        if self.mode:
+            return self.config_command(command)
+        if command.startswith("show bench "):
+            try:
+                return self.server.bench_output(int(command.split()[2]))
+            except ValueError:
+                return INVALID_INPUT
+        if command in self.server.outputs:
+            return self.server.outputs[command]
+        if command in ("configure terminal", "conf t", "config term"):
+            self.mode = "(config)"
+            return CONFIG_BANNER
+        if command in ("exit", "logout", "quit"):
+            return None
+        if command.startswith(("terminal ", "enable", "write", "copy ")):
+            return ""
+        return INVALID_INPUT
+
+    def config_command(self, command):
+        if command == "end":
+            self.mode = ""
+        elif command == "exit":
+            self.mode = "(config)" if self.mode != "(config)" else ""
+        elif command.startswith("interface "):
+            self.mode = "(config-if)"
+        elif command.startswith(("router ", "line ")):
+            self.mode = "(config-{})".format(command.split()[0])
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Cisco IOS SSH server")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", default=2222, type=int, help="Port to listen on")
+    parser.add_argument("--rtt", default=0.0, type=float, help="Seconds per round trip")
+    parser.add_argument(
+        "--chunk-size", default=4096, type=int, help="Output piece size in bytes"
+    )
+    parser.add_argument(
+        "--chunk-delay", default=0.0, type=float, help="Seconds between output pieces"
+    )
+    args = parser.parse_args()
+    server = FakeIOSServer(
+        host=args.host,
+        port=args.port,
+        rtt=args.rtt,
+        chunk_size=args.chunk_size,
+        chunk_delay=args.chunk_delay,
+    )
+    print("Fake IOS device listening on {}:{}".format(server.host, server.port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+"""Benchmarks of the netmiko hot paths against a local fake IOS device (fake_ios.py).
+
+Measures the netmiko import time, connect/prepare, send_command, send_command_timing,
+send_config_set (with and without cmd_verify), read_until_pattern on outputs of 1 KB to
+50 MB, TextFSM parsing of common ntc-templates and of 25k to 100k rows with a Fillup
+value. The results are written to JSON, and a previous results file can be given to
+--compare to spot regressions.
+
+Run with the python of the netmiko virtualenv:
+
+    ../netmiko/bin/python run_benchmarks.py --output baseline.json
+    ../netmiko/bin/python run_benchmarks.py --output new.json --compare baseline.json
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from fake_ios import FakeIOSServer, ip_interface_brief, show_interfaces, SHOW_VERSION
+
+SIZE_UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3}
+DEFAULT_SIZES = "1K,10K,100K,1M,10M,50M"
+FILLUP_ROWS = (25000, 50000, 100000)
+FILLUP_TEMPLATE = """\
+Value Fillup GROUP (\\S+)
+Value NAME (\\S+)
+
+Start
+  ^name ${NAME} -> Record
+  ^group ${GROUP}
+"""
+IMPORT_CODE = (
+    "import time; start = time.perf_counter(); "
+    "from netmiko import ConnectHandler; print(time.perf_counter() - start)"
+)
+
+
+def parse_size(size):
+    """'10K' -> 10240."""
+    size = size.strip().upper()
+    if size[-1:] in SIZE_UNITS:
+        return int(float(size[:-1]) * SIZE_UNITS[size[-1]])
+    return int(size)
+
+
+def format_size(size):
+    for unit in ("G", "M", "K"):
+        if size >= SIZE_UNITS[unit] and size % SIZE_UNITS[unit] == 0:
+            return "{}{}B".format(size // SIZE_UNITS[unit], unit)
+    return "{}B".format(size)
+
+
+def _serve(conn, server_args):
+    server = FakeIOSServer(**server_args)
+    conn.send(server.port)
+    server.serve_forever()
+
+
+def start_server(server_args):
+    """Run the fake device in its own process, so it does not compete for the GIL."""
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe()
+    process = ctx.Process(target=_serve, args=(child_conn, server_args), daemon=True)
+    process.start()
+    port = parent_conn.recv()
+    return process, port
+
+
+def summarize(runs, size=None):
+    result = {
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.mean(runs),
+        "max": max(runs),
+        "stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+    }
+    if size:
+        result["size"] = size
+        result["mb_per_s"] = size / 1024**2 / result["median"]
+    return result
+
+
+def timed(func, repeat, warmup=1):
+    """Run func warmup + repeat times, return the durations of the last repeat runs."""
+    runs = []
+    for i in range(warmup + repeat):
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+        if i >= warmup:
+            runs.append(duration)
+    return runs
+
+
+class Benchmarks(object):
+    def __init__(self, args, port):
+        self.args = args
+        self.device = {
+            "device_type": "cisco_ios",
+            "host": "127.0.0.1",
+            "port": port,
+            "username": "bench",
+            "password": "bench",
+            "ssh_strict": False,
+            "system_host_keys": False,
+            "alt_host_keys": False,
+            "allow_agent": False,
+            "use_keys": False,
+        }
+        self.sizes = [parse_size(size) for size in args.sizes.split(",")]
+        self.results = {}
+
+    def log(self, name, result):
+        self.results[name] = result
+        line = "{:<45} median {:9.4f}s  min {:9.4f}s".format(
+            name, result["median"], result["min"]
+        )
+        if "mb_per_s" in result:
+            line += "  {:8.2f} MB/s".format(result["mb_per_s"])
+        print(line)
+        sys.stdout.flush()
+
+    def selected(self, name):
+        return not self.args.only or any(part in name for part in self.args.only)
+
+    def connect(self, **kwargs):
+        from netmiko import ConnectHandler
+
+        params = dict(self.device, **kwargs)
+        return ConnectHandler(**params)
+
+    def run(self):
+        for bench in (
+            self.bench_import,
+            self.bench_connect,
+            self.bench_send_command,
+            self.bench_send_command_timing,
+            self.bench_send_config_set,
+            self.bench_read_until_pattern,
+            self.bench_textfsm,
+            self.bench_textfsm_fillup,
+        ):
+            bench()
+        return self.results
+
+    def bench_import(self):
+        if not self.selected("import"):
+            return
+        runs = []
+        for _ in range(self.args.repeat):
+            output = subprocess.check_output([sys.executable, "-c", IMPORT_CODE])
+            runs.append(float(output))
+        self.log("import_netmiko", summarize(runs))
+
+    def bench_connect(self):
+        from netmiko.instrumentation import Instrumentation
+
+        for fast_prepare in (False, True):
+            name = "connect[fast_prepare={}]".format(fast_prepare)
+            if not self.selected(name):
+                continue
+            spans = {}
+
+            class Collector(object):
+                def export(self, span):
+                    spans.setdefault(span.name, []).append(span.duration)
+
+            instrumentation = Instrumentation(exporters=[Collector()])
+
+            def connect():
+                self.connect(
+                    fast_prepare=fast_prepare, instrumentation=instrumentation
+                ).disconnect()
+
+            self.log(name, summarize(timed(connect, self.args.repeat, warmup=0)))
+            # Time split of the connection, from the instrumentation spans
+            for span_name in ("connect", "auth", "session_preparation", "disconnect"):
+                if spans.get(span_name):
+                    self.log(
+                        "{}.{}".format(name, span_name), summarize(spans[span_name])
+                    )
+
+    def bench_send_command(self):
+        conn = None
+        for size in self.sizes:
+            name = "send_command[{}]".format(format_size(size))
+            if not self.selected(name):
+                continue
+            conn = conn or self.connect()
+            command = "show bench {}".format(size)
+            runs = timed(
+                lambda: conn.send_command(command, read_timeout=self.args.read_timeout),
+                self.args.repeat,
+            )
+            self.log(name, summarize(runs, size))
+        if conn is not None:
+            conn.disconnect()
+
+    def bench_send_command_timing(self):
+        conn = None
+        # Delay based: the duration is mostly last_read, large outputs add little
+        for size in [size for size in self.sizes if size <= 1024**2]:
+            name = "send_command_timing[{}]".format(format_size(size))
+            if not self.selected(name):
+                continue
+            conn = conn or self.connect()
+            command = "show bench {}".format(size)
+            runs = timed(
+                lambda: conn.send_command_timing(
+                    command, read_timeout=self.args.read_timeout
+                ),
+                self.args.repeat,
+            )
+            self.log(name, summarize(runs, size))
+        if conn is not None:
+            conn.disconnect()
+
+    def bench_send_config_set(self):
+        conn = None
+        for count in (10, 100):
+            commands = []
+            for i in range(count // 2):
+                commands += [
+                    "interface GigabitEthernet0/{}".format(i),
+                    " description bench {}".format(i),
+                ]
+            for cmd_verify in (True, False):
+                name = "send_config_set[{}_commands,cmd_verify={}]".format(
+                    count, cmd_verify
+                )
+                if not self.selected(name):
+                    continue
+                conn = conn or self.connect()
+                runs = timed(
+                    lambda: conn.send_config_set(commands, cmd_verify=cmd_verify),
+                    self.args.repeat,
+                )
+                self.log(name, summarize(runs))
+        if conn is not None:
+            conn.disconnect()
+
+    def bench_read_until_pattern(self):
+        conn = None
+        for size in self.sizes:
+            name = "read_until_pattern[{}]".format(format_size(size))
+            if not self.selected(name):
+                continue
+            if conn is None:
+                conn = self.connect()
+                prompt = re.escape(conn.find_prompt())
+
+            def read():
+                conn.write_channel("show bench {}{}".format(size, conn.RETURN))
+                conn.read_until_pattern(
+                    pattern=prompt, read_timeout=self.args.read_timeout
+                )
+
+            self.log(name, summarize(timed(read, self.args.repeat), size))
+        if conn is not None:
+            conn.disconnect()
+
+    def bench_textfsm(self):
+        from netmiko.utilities import get_structured_data_textfsm
+
+        samples = (
+            ("show version", SHOW_VERSION.format(hostname="R1")),
+            ("show ip interface brief", ip_interface_brief(1000)),
+            ("show interfaces", show_interfaces(200)),
+        )
+        for command, raw_output in samples:
+            name = "textfsm[{}]".format(command)
+            if not self.selected(name):
+                continue
+            runs = timed(
+                lambda: get_structured_data_textfsm(
+                    raw_output, platform="cisco_ios", command=command
+                ),
+                self.args.repeat,
+            )
+            self.log(name, summarize(runs, len(raw_output)))
+
+    def bench_textfsm_fillup(self):
+        import textfsm
+
+        per_row = {}
+        for rows in FILLUP_ROWS:
+            name = "textfsm_fillup[{}_rows]".format(rows)
+            if not self.selected(name):
+                continue
+            # Ten records per group, each group line fills up the ten rows above it
+            lines = []
+            for i in range(rows):
+                lines.append("name n{}".format(i))
+                if i % 10 == 9:
+                    lines.append("group g{}".format(i // 10))
+            raw_output = "\n".join(lines) + "\n"
+
+            def parse():
+                textfsm.TextFSM(io.StringIO(FILLUP_TEMPLATE)).ParseText(raw_output)
+
+            result = summarize(timed(parse, self.args.repeat), len(raw_output))
+            self.log(name, result)
+            per_row[rows] = result["min"] / rows
+        if len(per_row) > 1:
+            # Linear scaling keeps the time per row flat as the rows grow
+            smallest, largest = min(per_row), max(per_row)
+            print(
+                "textfsm_fillup time per row, {} vs {} rows: x{:.2f}".format(
+                    largest, smallest, per_row[largest] / per_row[smallest]
+                )
+            )
+
+
+def compare(results, baseline, threshold):
+    """Print the change of each median against baseline, return the regressed names."""
+    regressions = []
+    print(
+        "\n{:<45} {:>10} {:>10} {:>8}".format("benchmark", "baseline", "now", "change")
+    )
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["median"]
+        after = result["median"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(
+            "{:<45} {:>9.4f}s {:>9.4f}s {:>+7.1%}{}".format(
+                name, before, after, change, flag
+            )
+        )
+    return regressions
+
+
+def parse_arguments(args):
+    parser = argparse.ArgumentParser(description="Benchmark netmiko hot paths")
+    parser.add_argument(
+        "--output", help="Write the results to this JSON file", default=None
+    )
+    parser.add_argument(
+        "--compare", help="Compare with the results of a previous run", default=None
+    )
+    parser.add_argument(
+        "--threshold",
+        help="Median slowdown reported as a regression (default: 0.1 for 10%%)",
+        default=0.1,
+        type=float,
+    )
+    parser.add_argument(
+        "--repeat", help="Runs of each benchmark (default: 5)", default=5, type=int
+    )
+    parser.add_argument(
+        "--sizes",
+        help="Output sizes (default: {})".format(DEFAULT_SIZES),
+        default=DEFAULT_SIZES,
+    )
+    parser.add_argument(
+        "--rtt", help="Round trip time of the fake device", default=0.0, type=float
+    )
+    parser.add_argument(
+        "--chunk-size",
+        help="Size of the output pieces sent by the fake device (default: 4096)",
+        default=4096,
+        type=int,
+    )
+    parser.add_argument(
+        "--chunk-delay",
+        help="Seconds between output pieces (default: 0)",
+        default=0.0,
+        type=float,
+    )
+    parser.add_argument(
+        "--read-timeout",
+        help="read_timeout of the commands (default: 600)",
+        default=600.0,
+        type=float,
+    )
+    parser.add_argument(
+        "--only",
+        help="Only run the benchmarks whose name contains this (can be repeated)",
+        action="append",
+        default=[],
+    )
+    return parser.parse_args(args)
+
+
+def main(args):
+    cli_args = parse_arguments(args)
+    server_args = {
+        "rtt": cli_args.rtt,
+        "chunk_size": cli_args.chunk_size,
+        "chunk_delay": cli_args.chunk_delay,
+    }
+    process, port = start_server(server_args)
+    try:
+        results = Benchmarks(cli_args, port).run()
+    finally:
+        process.terminate()
+
+    import netmiko
+
+    report = {
+        "metadata": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "netmiko": netmiko.__version__,
+            "repeat": cli_args.repeat,
+            "server": server_args,
+        },
+        "results": results,
+    }
+    if cli_args.output:
+        with open(cli_args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if cli_args.compare:
+        with open(cli_args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, cli_args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
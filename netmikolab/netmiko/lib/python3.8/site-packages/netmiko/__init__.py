@@ -1,4 +1,5 @@
 import sys
+from typing import Any
 
 __version__ = "4.4.0"
 PY_MAJ_VER = 3
@@ -46,7 +47,6 @@ from netmiko.ssh_dispatcher import redispatch  # noqa
 from netmiko.ssh_dispatcher import platforms  # noqa
 from netmiko.ssh_dispatcher import FileTransfer  # noqa
 from netmiko.scp_handler import SCPConn  # noqa
-from netmiko.cisco.cisco_ios import InLineTransfer  # noqa
 from netmiko.exceptions import (  # noqa
     NetmikoTimeoutException,
     NetMikoTimeoutException,
@@ -58,13 +58,24 @@ from netmiko.exceptions import (  # noqa
 from netmiko.exceptions import ConfigInvalidException  # noqa
 from netmiko.exceptions import ReadException, ReadTimeout  # noqa
 from netmiko.exceptions import NetmikoBaseException, ConnectionException  # noqa
-from netmiko.ssh_autodetect import SSHDetect  # noqa
+from netmiko.ssh_autodetect import SSHDetect, AutodetectCache, autodetect_many  # noqa
 from netmiko.base_connection import BaseConnection  # noqa
 from netmiko.scp_functions import file_transfer, progress_bar  # noqa
+from netmiko.file_distribution import distribute_file  # noqa
 
 # Alternate naming
 Netmiko = ConnectHandler
 
+
+def __getattr__(name: str) -> Any:
+    """Import InLineTransfer (and with it the Cisco drivers) only when it is used."""
+    if name == "InLineTransfer":
+        from netmiko.cisco.cisco_ios import InLineTransfer
+
+        return InLineTransfer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = (
     "ConnectHandler",
     "AgnosticHandler",
@@ -86,10 +97,13 @@ __all__ = (
     "InLineTransfer",
     "redispatch",
     "SSHDetect",
+    "AutodetectCache",
+    "autodetect_many",
     "BaseConnection",
     "Netmiko",
     "file_transfer",
     "progress_bar",
+    "distribute_file",
 )
 
 # Cisco cntl-shift-six sequence
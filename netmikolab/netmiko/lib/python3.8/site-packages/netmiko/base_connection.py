@@ -18,6 +18,7 @@ from typing import (
     Type,
     Sequence,
     Iterator,
+    ContextManager,
     TextIO,
     Union,
     Tuple,
@@ -25,11 +26,13 @@ from typing import (
 )
 from typing import TYPE_CHECKING
 from types import TracebackType
+from contextlib import nullcontext
 import io
 import re
 import socket
 import time
 from collections import deque
+import os
 from os import path
 from pathlib import Path
 from threading import Lock
@@ -38,7 +41,6 @@ import logging
 import itertools
 
 import paramiko
-import serial
 import warnings
 
 from netmiko import log
@@ -51,8 +53,17 @@ from netmiko.exceptions import (
     ReadTimeout,
 )
 from netmiko._telnetlib import telnetlib
+from netmiko.broker import BrokerChannel, broker_params, open_brokered_channel
 from netmiko.channel import Channel, SSHChannel, TelnetChannel, SerialChannel
 from netmiko.session_log import SessionLog
+from netmiko.structured_data_cache import StructuredDataCache
+from netmiko.transport_profile import TransportProfile, TransportStats
+from netmiko.instrumentation import (
+    Instrumentation,
+    InstrumentedSSHClient,
+    ReadTimer,
+    SpanTracker,
+)
 from netmiko.utilities import (
     write_bytes,
     check_serial_port,
@@ -60,12 +71,14 @@ from netmiko.utilities import (
     run_ttp_template,
     select_cmd_verify,
     calc_old_timeout,
+    iter_structured_data_textfsm,
 )
 from netmiko.utilities import m_exec_time  # noqa
 from netmiko import telnet_proxy
 
 if TYPE_CHECKING:
     from os import PathLike
+    import serial
 
 # For decorators
 F = TypeVar("F", bound=Callable[..., Any])
@@ -77,6 +90,28 @@ max_loops in this context. You should remove any use of delay_factor=x
 from this method call.\n"""
 
 
+# Parsed SSH config files, keyed by absolute path. Re-parsed only when the file's
+# (mtime, size) changes, so opening many connections doesn't re-read the file each time.
+_ssh_config_cache: Dict[str, Tuple[Tuple[int, int], paramiko.SSHConfig]] = {}
+_ssh_config_cache_lock = Lock()
+
+
+def _load_ssh_config(full_path: str) -> paramiko.SSHConfig:
+    """Return a parsed (and cached) SSHConfig for full_path."""
+    stat = os.stat(full_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _ssh_config_cache_lock:
+        cached = _ssh_config_cache.get(full_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    ssh_config_instance = paramiko.SSHConfig()
+    with io.open(full_path, "rt", encoding="utf-8") as f:
+        ssh_config_instance.parse(f)
+    with _ssh_config_cache_lock:
+        _ssh_config_cache[full_path] = (stamp, ssh_config_instance)
+    return ssh_config_instance
+
+
 # Logging filter for #2597
 class SecretsFilter(logging.Filter):
     def __init__(self, no_log: Optional[Dict[Any, str]] = None) -> None:
@@ -118,6 +153,23 @@ def flush_session_log(func: F) -> F:
     return cast(F, wrapper_decorator)
 
 
+def record_span(name: str) -> Callable[[F], F]:
+    """Record the calls of the decorated method as name spans (see instrumentation)."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper_decorator(self: "BaseConnection", *args: Any, **kwargs: Any) -> Any:
+            tracker = getattr(self, "_span_tracker", None)
+            if tracker is None:
+                return func(self, *args, **kwargs)
+            with tracker.span(name):
+                return func(self, *args, **kwargs)
+
+        return cast(F, wrapper_decorator)
+
+    return decorator
+
+
 def log_writes(func: F) -> F:
     """Handle both session_log and log of writes."""
 
@@ -148,6 +200,9 @@ class BaseConnection:
     Otherwise method left as a stub method.
     """
 
+    # Commands sent by fast_session_preparation() (None if the driver does not support it)
+    fast_prepare_commands: Optional[Tuple[str, ...]] = None
+
     def __init__(
         self,
         ip: str = "",
@@ -201,6 +256,12 @@ class BaseConnection:
         auto_connect: bool = True,
         delay_factor_compat: bool = False,
         disable_lf_normalization: bool = False,
+        structured_data_cache: Optional[StructuredDataCache] = None,
+        broker_socket: Optional[str] = None,
+        transport_profile: Optional[TransportProfile] = None,
+        fast_prepare: bool = False,
+        prompt_cache: Optional[Dict[str, str]] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ) -> None:
         """
         Initialize attributes for establishing connection to target device.
@@ -319,10 +380,35 @@ class BaseConnection:
 
         :param disable_lf_normalization: Disable Netmiko's linefeed normalization behavior
                 (default: False)
+
+        :param structured_data_cache: StructuredDataCache object used to memoize TextFSM, TTP
+                and Genie parsing of command output. Can be shared between connections
+                (default: None, always parse).
+
+        :param broker_socket: Unix socket of a Netmiko connection broker. The SSH session is
+                opened on a connection the broker keeps logged in, instead of connecting to
+                the device directly. See netmiko/broker.py (default: None).
+
+        :param transport_profile: TransportProfile object deciding when to use SSH compression.
+                Byte counts and timing of the session are then available from
+                transport_stats.summary(). Can be shared between connections
+                (default: None, no compression).
+
+        :param fast_prepare: Prepare the session with fast_session_preparation() when the
+                driver supports it: the terminal setup commands and a prompt probe are sent
+                back-to-back and parsed from one read, without fixed sleeps (default: False).
+
+        :param prompt_cache: Dictionary of 'host:port' to prompt used by fast_prepare, the
+                prompt of the device is stored in it and a known prompt saves the probe.
+                Can be shared between connections (default: None).
+
+        :param instrumentation: Instrumentation object receiving latency spans for connect,
+                auth, session_preparation, send_command, send_config_set, read_until_pattern
+                and disconnect. Can be shared between connections (default: None).
         """
 
         self.remote_conn: Union[
-            None, telnetlib.Telnet, paramiko.Channel, serial.Serial
+            None, telnetlib.Telnet, paramiko.Channel, BrokerChannel, "serial.Serial"
         ] = None
         # Does the platform support a configuration mode
         self._config_mode = True
@@ -377,6 +463,17 @@ class BaseConnection:
         self._legacy_mode = _legacy_mode
         self.global_delay_factor = global_delay_factor
         self.global_cmd_verify = global_cmd_verify
+        self.structured_data_cache = structured_data_cache
+        self.broker_socket = broker_socket
+        self.transport_profile = transport_profile
+        self.transport_stats: Optional[TransportStats] = None
+        self.fast_prepare = fast_prepare
+        self.prompt_cache = prompt_cache
+        self._prompt_override: Optional[str] = None
+        self.instrumentation = instrumentation
+        self._span_tracker: Optional[SpanTracker] = None
+        if instrumentation is not None:
+            self._span_tracker = SpanTracker(instrumentation, self.host, device_type)
         if self.fast_cli and self.global_delay_factor == 1:
             self.global_delay_factor = 0.1
         self.session_log = None
@@ -420,13 +517,14 @@ class BaseConnection:
                     "SessionLog object, or a BufferedIOBase subclass."
                 )
 
-        # Default values
+        # Default values (serial.EIGHTBITS, serial.PARITY_NONE, serial.STOPBITS_ONE; pyserial
+        # is only imported when a serial connection is opened)
         self.serial_settings = {
             "port": "COM1",
             "baudrate": 9600,
-            "bytesize": serial.EIGHTBITS,
-            "parity": serial.PARITY_NONE,
-            "stopbits": serial.STOPBITS_ONE,
+            "bytesize": 8,
+            "parity": "N",
+            "stopbits": 1,
         }
         if serial_settings is None:
             serial_settings = {}
@@ -492,8 +590,27 @@ class BaseConnection:
     def _open(self) -> None:
         """Decouple connection creation from __init__ for mocking."""
         self._modify_connection_params()
-        self.establish_connection()
-        self._try_session_preparation()
+        with self._span("connect"):
+            self.establish_connection()
+        with self._span("session_preparation"):
+            self._try_session_preparation()
+
+    def _span(self, name: str) -> ContextManager[Any]:
+        """Context manager recording a name span (does nothing without instrumentation)."""
+        if self._span_tracker is None:
+            return nullcontext()
+        return self._span_tracker.span(name)
+
+    def _read_timer(self) -> ReadTimer:
+        """Timer accounting a channel read loop as read_time of the open spans."""
+        return ReadTimer(self._span_tracker)
+
+    def _sleep(self, seconds: float) -> None:
+        """time.sleep() in a polling loop, accounted as sleeping time of the open spans."""
+        time.sleep(seconds)
+        if self._span_tracker is not None:
+            self._span_tracker.add_sleep(seconds)
+            self._span_tracker.add_loop()
 
     def __enter__(self) -> "BaseConnection":
         """Establish a session using a Context Manager."""
@@ -613,6 +730,8 @@ key_file: {self.key_file}
                 # Try sending ASCII null byte to maintain the connection alive
                 log.debug("Sending the NULL byte")
                 self.write_channel(null)
+                if isinstance(self.remote_conn, BrokerChannel):
+                    return self.remote_conn.is_active()
                 assert isinstance(self.remote_conn, paramiko.Channel)
                 assert self.remote_conn.transport is not None
                 result = self.remote_conn.transport.is_active()
@@ -644,6 +763,8 @@ key_file: {self.key_file}
 
         if self.ansi_escape_codes:
             new_data = self.strip_ansi_escape_codes(new_data)
+        if self._span_tracker is not None:
+            self._span_tracker.add_read(len(new_data))
         log.debug(f"read_channel: {new_data}")
         if self.session_log:
             self.session_log.write(new_data)
@@ -657,6 +778,7 @@ key_file: {self.key_file}
             output = new_data
         return output
 
+    @record_span("read_until_pattern")
     def read_until_pattern(
         self,
         pattern: str = "",
@@ -693,6 +815,8 @@ where x is the total number of seconds to wait before timing out.\n"""
         output = ""
         loop_delay = 0.01
         start_time = time.time()
+        reading = self._read_timer()
+        reading.start()
         # if read_timeout == 0 or 0.0 keep reading indefinitely
         while (time.time() - start_time < read_timeout) or (not read_timeout):
             output += self.read_channel()
@@ -734,8 +858,10 @@ results={results}
                 if buffer:
                     self._read_buffer += buffer
                 log.debug(f"Pattern found: {pattern} {output}")
+                reading.stop()
                 return output
-            time.sleep(loop_delay)
+            self._sleep(loop_delay)
+        reading.stop()
 
         msg = f"""\n\nPattern not detected: {repr(pattern)} in output.
 
@@ -791,9 +917,11 @@ You can also look at the Netmiko session_log or debug log for more information.\
         channel_data = ""
         start_time = time.time()
 
+        reading = self._read_timer()
+        reading.start()
         # Set read_timeout to 0 to never timeout
         while (time.time() - start_time < read_timeout) or (not read_timeout):
-            time.sleep(loop_delay)
+            self._sleep(loop_delay)
             new_data = self.read_channel()
             # gather new output
             if new_data:
@@ -801,7 +929,7 @@ You can also look at the Netmiko session_log or debug log for more information.\
             # if we have some output, but nothing new, then do the last read
             elif channel_data != "":
                 # Make sure really done (i.e. no new data)
-                time.sleep(last_read)
+                self._sleep(last_read)
                 new_data = self.read_channel()
                 if not new_data:
                     break
@@ -823,6 +951,7 @@ You can look at the Netmiko session_log or debug log for more information.
 
 """
             raise ReadTimeout(msg)
+        reading.stop()
         return channel_data
 
     def read_until_prompt(
@@ -983,6 +1112,9 @@ You can look at the Netmiko session_log or debug log for more information.
         to threads used in Paramiko.
         """
         try:
+            if self.fast_prepare and self.fast_prepare_commands is not None:
+                self.fast_session_preparation()
+                return
             # Netmiko needs there to be data for session_preparation to work.
             if force_data:
                 self.write_channel(self.RETURN)
@@ -1010,6 +1142,76 @@ You can look at the Netmiko session_log or debug log for more information.
         self.set_terminal_width()
         self.disable_paging()
 
+    def fast_session_preparation(self, read_timeout: float = 20.0) -> None:
+        """
+        Prepare the session in about one round trip.
+
+        The fast_prepare_commands and a RETURN (the prompt probe) are written back-to-back.
+        The prompt is the line repeated twice at the end of the output, after the echo of the
+        last command. A prompt from prompt_cache replaces the probe, it is only sent if the
+        device shows a different prompt. There are no fixed sleeps.
+
+        :param read_timeout: maximum time to wait for the prompt. Will raise ReadTimeout.
+        """
+        assert self.fast_prepare_commands is not None
+        commands = [self.normalize_cmd(cmd) for cmd in self.fast_prepare_commands]
+        cache_key = f"{self.host}:{self.port}"
+        cached_prompt = None
+        if self.prompt_cache is not None:
+            cached_prompt = self.prompt_cache.get(cache_key)
+
+        self.write_channel("".join(commands))
+        if cached_prompt is None:
+            self.write_channel(self.RETURN)
+
+        last_cmd = commands[-1].strip() if commands else ""
+        single_prompt = re.compile(r"[\r\n](?P<prompt>[^\r\n]*[#>])[ \t]*$")
+        double_prompt = re.compile(
+            r"[\r\n](?P<prompt>[^\r\n]*[#>])[ \t]*[\r\n]+(?P=prompt)[ \t]*$"
+        )
+        output = ""
+        prompt = None
+        start_time = time.time()
+        reading = self._read_timer()
+        reading.start()
+        while time.time() - start_time < read_timeout:
+            output += self.read_channel()
+            echo = output.rfind(last_cmd) if last_cmd else 0
+            if echo != -1:
+                tail = "\n" + output[echo + len(last_cmd) :]
+                if cached_prompt is not None:
+                    match = single_prompt.search(tail)
+                    if match and match.group("prompt").strip() == cached_prompt:
+                        prompt = cached_prompt
+                        break
+                    if match:
+                        log.debug(f"Cached prompt {cached_prompt!r} not found, probing")
+                        cached_prompt = None
+                        self.write_channel(self.RETURN)
+                else:
+                    match = double_prompt.search(tail)
+                    if match:
+                        prompt = match.group("prompt").strip()
+                        break
+            self._sleep(0.01)
+        reading.stop()
+
+        if prompt is None:
+            msg = f"""\n\nPrompt not detected during fast session preparation.
+
+output={repr(output)}
+"""
+            raise ReadTimeout(msg)
+
+        log.debug(f"[fast_session_preparation()]: prompt is {prompt}")
+        self._prompt_override = prompt
+        try:
+            self.set_base_prompt()
+        finally:
+            self._prompt_override = None
+        if self.prompt_cache is not None:
+            self.prompt_cache[cache_key] = prompt
+
     def _use_ssh_config(self, dict_arg: Dict[str, Any]) -> Dict[str, Any]:
         """Update SSH connection parameters based on contents of SSH config file.
 
@@ -1022,10 +1224,7 @@ You can look at the Netmiko session_log or debug log for more information.
         full_path = path.abspath(path.expanduser(self.ssh_config_file))
         source: Union[paramiko.config.SSHConfigDict, Dict[str, Any]]
         if path.exists(full_path):
-            ssh_config_instance = paramiko.SSHConfig()
-            with io.open(full_path, "rt", encoding="utf-8") as f:
-                ssh_config_instance.parse(f)
-                source = ssh_config_instance.lookup(self.host)
+            source = _load_ssh_config(full_path).lookup(self.host)
         else:
             source = {}
 
@@ -1077,6 +1276,10 @@ You can look at the Netmiko session_log or debug log for more information.
             "banner_timeout": self.banner_timeout,
             "sock": self.sock,
         }
+        if self.transport_profile is not None:
+            conn_dict["compress"] = self.transport_profile.compress_on_connect(
+                self.device_type
+            )
 
         # Check if using SSH 'config' file mainly for SSH proxy support
         if self.ssh_config_file:
@@ -1110,6 +1313,7 @@ You can look at the Netmiko session_log or debug log for more information.
         :type height: int
         """
         self.channel: Channel
+        self.remote_conn_pre: Optional[paramiko.SSHClient]
         if self.protocol == "telnet":
             if self.sock_telnet:
                 self.remote_conn = telnet_proxy.Telnet(
@@ -1124,14 +1328,31 @@ You can look at the Netmiko session_log or debug log for more information.
                 )
             # Migrating communication to channel class
             self.channel = TelnetChannel(conn=self.remote_conn, encoding=self.encoding)
-            self.telnet_login()
+            with self._span("auth"):
+                self.telnet_login()
         elif self.protocol == "serial":
+            import serial
+
             self.remote_conn = serial.Serial(**self.serial_settings)
             self.channel = SerialChannel(conn=self.remote_conn, encoding=self.encoding)
-            self.serial_login()
+            with self._span("auth"):
+                self.serial_login()
+        elif self.protocol == "ssh" and self.broker_socket:
+            self.remote_conn_pre = None
+            self.remote_conn = open_brokered_channel(
+                self.broker_socket,
+                broker_params(self),
+                width=width,
+                height=height,
+                timeout=self.timeout,
+            )
+            self.remote_conn.settimeout(self.blocking_timeout)
+            self.channel = SSHChannel(conn=self.remote_conn, encoding=self.encoding)
+            self.special_login_handler()
+            if self.verbose:
+                print(f"Brokered SSH session established to {self.host}:{self.port}")
         elif self.protocol == "ssh":
             ssh_connect_params = self._connect_params_dict()
-            self.remote_conn_pre: Optional[paramiko.SSHClient]
             self.remote_conn_pre = self._build_ssh_client()
 
             # initiate SSH connection
@@ -1203,6 +1424,14 @@ A paramiko SSHException occurred during connection creation:
             if self.keepalive:
                 assert isinstance(self.remote_conn.transport, paramiko.Transport)
                 self.remote_conn.transport.set_keepalive(self.keepalive)
+            if self.transport_profile is not None:
+                assert isinstance(self.remote_conn.transport, paramiko.Transport)
+                self.transport_stats = TransportStats(
+                    self.remote_conn.transport,
+                    self.transport_profile,
+                    device_type=self.device_type,
+                    host=self.host,
+                )
 
             # Migrating communication to channel class
             self.channel = SSHChannel(conn=self.remote_conn, encoding=self.encoding)
@@ -1254,7 +1483,12 @@ A paramiko SSHException occurred during connection creation:
     def _build_ssh_client(self) -> paramiko.SSHClient:
         """Prepare for Paramiko SSH connection."""
         # Create instance of SSHClient object
-        remote_conn_pre = paramiko.SSHClient()
+        remote_conn_pre: paramiko.SSHClient
+        if self._span_tracker is not None:
+            # Records the SSH authentication as an 'auth' span
+            remote_conn_pre = InstrumentedSSHClient(self._span_tracker)
+        else:
+            remote_conn_pre = paramiko.SSHClient()
 
         # Load host_keys for better SSH security
         if self.system_host_keys:
@@ -1420,6 +1654,9 @@ A paramiko SSHException occurred during connection creation:
 
         :param pattern: Regular expression pattern to determine whether prompt is valid
         """
+        if self._prompt_override is not None:
+            # Prompt already read by fast_session_preparation()
+            return self._prompt_override
         delay_factor = self.select_delay_factor(delay_factor)
         sleep_time = delay_factor * 0.25
         self.clear_buffer()
@@ -1498,6 +1735,7 @@ A paramiko SSHException occurred during connection creation:
             pass
         return new_data
 
+    @record_span("send_command_timing")
     @flush_session_log
     @select_cmd_verify
     def send_command_timing(
@@ -1561,6 +1799,7 @@ A paramiko SSHException occurred during connection creation:
         new_data = ""
         if normalize:
             command_string = self.normalize_cmd(command_string)
+        stats_start = self._command_stats_start(command_string)
         self.write_channel(command_string)
 
         cmd = command_string.strip()
@@ -1570,6 +1809,7 @@ A paramiko SSHException occurred during connection creation:
         output += self.read_channel_timing(
             last_read=last_read, read_timeout=read_timeout
         )
+        self._command_stats_end(command_string, stats_start)
 
         output = self._sanitize_output(
             output,
@@ -1586,9 +1826,25 @@ A paramiko SSHException occurred during connection creation:
             use_genie=use_genie,
             textfsm_template=textfsm_template,
             ttp_template=ttp_template,
+            cache=self.structured_data_cache,
         )
         return return_data
 
+    def _command_stats_start(
+        self, command_string: str
+    ) -> Optional[Tuple[float, Dict[str, int]]]:
+        """Apply the transport_profile before sending a command (may turn on compression)."""
+        if self.transport_stats is None:
+            return None
+        return self.transport_stats.command_start(command_string)
+
+    def _command_stats_end(
+        self, command_string: str, start: Optional[Tuple[float, Dict[str, int]]]
+    ) -> None:
+        """Record the bytes and time used by a command in transport_stats."""
+        if self.transport_stats is not None and start is not None:
+            self.transport_stats.command_end(command_string, start)
+
     def _send_command_timing_str(self, *args: Any, **kwargs: Any) -> str:
         """Wrapper for `send_command_timing` method that always returns a
         string"""
@@ -1647,6 +1903,7 @@ A paramiko SSHException occurred during connection creation:
             prompt = self.base_prompt
         return re.escape(prompt.strip())
 
+    @record_span("send_command")
     @flush_session_log
     @select_cmd_verify
     def send_command(
@@ -1766,6 +2023,7 @@ before timing out.\n"""
         if normalize:
             command_string = self.normalize_cmd(command_string)
 
+        stats_start = self._command_stats_start(command_string)
         # Start the clock
         start_time = time.time()
         self.write_channel(command_string)
@@ -1783,6 +2041,8 @@ before timing out.\n"""
         past_n_reads: Deque[str] = deque(maxlen=DEQUE_SIZE)
         first_line_processed = False
 
+        reading = self._read_timer()
+        reading.start()
         # Keep reading data until search_pattern is found or until read_timeout
         while time.time() - start_time < read_timeout:
             if new_data:
@@ -1809,7 +2069,7 @@ before timing out.\n"""
                         if re.search(search_pattern, "".join(past_n_reads)):
                             break
 
-            time.sleep(loop_delay)
+            self._sleep(loop_delay)
             new_data = self.read_channel()
 
         else:  # nobreak
@@ -1824,6 +2084,8 @@ You can also look at the Netmiko session_log or debug log for more information.
 
 """
             raise ReadTimeout(msg)
+        reading.stop()
+        self._command_stats_end(command_string, stats_start)
 
         output = self._sanitize_output(
             output,
@@ -1840,6 +2102,7 @@ You can also look at the Netmiko session_log or debug log for more information.
             use_genie=use_genie,
             textfsm_template=textfsm_template,
             ttp_template=ttp_template,
+            cache=self.structured_data_cache,
         )
         return return_val
 
@@ -1855,6 +2118,228 @@ You can also look at the Netmiko session_log or debug log for more information.
         """Support previous name of send_command method."""
         return self.send_command(*args, **kwargs)
 
+    @select_cmd_verify
+    def stream_command(
+        self,
+        command_string: str,
+        expect_string: Optional[str] = None,
+        read_timeout: float = 10.0,
+        auto_find_prompt: bool = True,
+        strip_prompt: bool = True,
+        strip_command: bool = True,
+        normalize: bool = True,
+        lines: bool = False,
+        use_textfsm: bool = False,
+        textfsm_template: Optional[str] = None,
+        cmd_verify: bool = True,
+    ) -> Iterator[Union[str, Dict[str, str]]]:
+        """Execute command_string like send_command(), yielding the output as it arrives.
+
+        Joined, the chunks yielded are the output send_command() would return: normalized
+        like every read_channel(), without the command echo and the trailing prompt. The
+        prompt is searched in the unyielded tail of the output only, so memory stays bounded
+        however large the output is (eg 'show tech-support' or a full BGP table).
+
+        The command is sent when the iteration starts. Consume the whole iterator before
+        using the connection again, the rest of the output would be left in the channel.
+
+        :param command_string: The command to be executed on the remote device.
+
+        :param expect_string: Regular expression pattern to use for determining end of output.
+            If left blank will default to being based on router prompt.
+
+        :param read_timeout: Maximum time to wait looking for pattern. Will raise ReadTimeout
+            if timeout is exceeded.
+
+        :param auto_find_prompt: Use find_prompt() to override base prompt
+
+        :param strip_prompt: Remove the trailing router prompt from the output (default: True).
+
+        :param strip_command: Remove the echo of the command from the output (default: True).
+
+        :param normalize: Ensure the proper enter is sent at end of command (default: True).
+
+        :param lines: Yield the output line by line, without line endings (default: False).
+
+        :param use_textfsm: Yield the TextFSM records (dicts) parsed from the output as they
+            are complete (default: False).
+
+        :param textfsm_template: Name of template to parse output with; can be fully qualified
+            path, relative path, or name of file in current directory. (default: None).
+
+        :param cmd_verify: Verify command echo before proceeding (default: True).
+        """
+        if self.read_timeout_override:
+            read_timeout = self.read_timeout_override
+        if normalize:
+            command_string = self.normalize_cmd(command_string)
+        chunks = self._stream_command_chunks(
+            command_string,
+            expect_string=expect_string,
+            read_timeout=read_timeout,
+            auto_find_prompt=auto_find_prompt,
+            strip_prompt=strip_prompt,
+            strip_command=strip_command,
+            cmd_verify=cmd_verify,
+        )
+        if use_textfsm:
+            return iter_structured_data_textfsm(
+                chunks,
+                platform=self.device_type,
+                command=command_string.strip(),
+                template=textfsm_template,
+            )
+        if lines:
+            return self._stream_lines(chunks)
+        return chunks
+
+    def _stream_command_chunks(
+        self,
+        command_string: str,
+        expect_string: Optional[str],
+        read_timeout: float,
+        auto_find_prompt: bool,
+        strip_prompt: bool,
+        strip_command: bool,
+        cmd_verify: bool,
+    ) -> Iterator[str]:
+        # Longest unyielded tail kept while a line is not complete
+        MAX_TAIL = 65536
+        # Chars kept of a line longer than MAX_TAIL, in case the pattern spans two reads
+        LONG_LINE_TAIL = 4096
+
+        tracker = self._span_tracker
+        span = tracker.start("stream_command") if tracker else None
+        # The span leaves the stack while a chunk is yielded (the caller's spans are not
+        # nested in it), the finally ends it if the generator is abandoned there
+        reading = self._read_timer()
+        try:
+            if expect_string is not None:
+                search_pattern = expect_string
+            else:
+                search_pattern = self._prompt_handler(auto_find_prompt)
+
+            stats_start = self._command_stats_start(command_string)
+            start_time = time.time()
+            self.write_channel(command_string)
+            new_data = ""
+            cmd = command_string.strip()
+            if cmd and cmd_verify:
+                new_data = self.command_echo_read(cmd=cmd, read_timeout=10)
+
+            # Output not yielded yet, from the last line ending on
+            pending = ""
+            first_line_processed = False
+            echo_processed = False
+            reading.start()
+            while time.time() - start_time < read_timeout:
+                if new_data:
+                    pending += new_data
+                    if not first_line_processed:
+                        pending, first_line_processed = self._first_line_handler(
+                            pending, search_pattern
+                        )
+                    if re.search(search_pattern, pending):
+                        break
+
+                    if not echo_processed:
+                        if self.RESPONSE_RETURN not in pending:
+                            if len(pending) <= MAX_TAIL:
+                                self._sleep(0.025)
+                                new_data = self.read_channel()
+                                continue
+                        elif strip_command:
+                            pending = self.strip_command(command_string, pending)
+                        echo_processed = True
+
+                    end = pending.rfind(self.RESPONSE_RETURN)
+                    if len(pending) - max(end, 0) > MAX_TAIL:
+                        end = len(pending) - LONG_LINE_TAIL
+                    if end > 0:
+                        chunk, pending = pending[:end], pending[end:]
+                        if strip_command:
+                            chunk = self.strip_backspaces(chunk)
+                        reading.stop()
+                        if tracker and span:
+                            tracker.suspend(span)
+                        yield chunk
+                        if tracker and span:
+                            tracker.resume(span)
+                        reading.start()
+
+                self._sleep(0.025)
+                new_data = self.read_channel()
+
+            else:  # nobreak
+                msg = f"""
+Pattern not detected: {repr(search_pattern)} in output.
+
+Things you might try to fix this:
+1. Explicitly set your pattern using the expect_string argument.
+2. Increase the read_timeout to a larger value.
+
+You can also look at the Netmiko session_log or debug log for more information.
+
+"""
+                raise ReadTimeout(msg)
+            reading.stop()
+            self._command_stats_end(command_string, stats_start)
+
+            if strip_command and not echo_processed:
+                pending = self.strip_command(command_string, pending)
+            if strip_prompt:
+                pending = self.strip_prompt(pending)
+            if strip_command:
+                pending = self.strip_backspaces(pending)
+            if pending:
+                if tracker and span:
+                    tracker.suspend(span)
+                yield pending
+        except BaseException as e:
+            if span:
+                span.error = type(e).__name__
+            raise
+        finally:
+            reading.stop()
+            if self.session_log:
+                self.session_log.flush()
+            if tracker and span:
+                tracker.end(span)
+
+    def _stream_lines(self, chunks: Iterator[str]) -> Iterator[str]:
+        """Regroup the chunks of stream_command() into lines."""
+        partial_line = ""
+        for chunk in chunks:
+            lines = (partial_line + chunk).split(self.RESPONSE_RETURN)
+            partial_line = lines.pop()
+            yield from lines
+        if partial_line:
+            yield partial_line
+
+    def send_command_to_file(
+        self,
+        command_string: str,
+        output_file: Union[str, "PathLike[str]"],
+        **kwargs: Any,
+    ) -> int:
+        """
+        Execute command_string with stream_command(), writing the output to output_file as
+        it arrives. Returns the number of characters written.
+
+        :param command_string: The command to be executed on the remote device.
+
+        :param output_file: File the output is written to (replacing its content).
+
+        :param kwargs: Other stream_command() arguments.
+        """
+        written = 0
+        with open(output_file, "w") as f:
+            for chunk in self.stream_command(command_string, **kwargs):
+                assert isinstance(chunk, str)
+                f.write(chunk)
+                written += len(chunk)
+        return written
+
     def _multiline_kwargs(self, **kwargs: Any) -> Dict[str, Any]:
         strip_prompt = kwargs.get("strip_prompt", False)
         kwargs["strip_prompt"] = strip_prompt
@@ -1921,6 +2406,178 @@ You can also look at the Netmiko session_log or debug log for more information.
             output += self._send_command_timing_str(cmd, **kwargs)
         return output
 
+    @record_span("send_commands")
+    @flush_session_log
+    @select_cmd_verify
+    def send_commands(
+        self,
+        commands: Sequence[str],
+        read_timeout: float = 60.0,
+        auto_find_prompt: bool = True,
+        strip_prompt: bool = True,
+        strip_command: bool = True,
+        normalize: bool = True,
+        use_textfsm: bool = False,
+        textfsm_template: Optional[str] = None,
+        use_ttp: bool = False,
+        ttp_template: Optional[str] = None,
+        use_genie: bool = False,
+        cmd_verify: bool = True,
+    ) -> Dict[str, Union[str, List[Any], Dict[str, Any]]]:
+        """Execute several show commands in one round trip, return a dict of command to output.
+
+        The commands are written in one burst and the combined output is read once. It is
+        split back into the output of each command at the prompt boundaries: the prompt
+        followed by the echo of the next command. The device must echo type-ahead commands
+        when it gets to them (after the prompt), as IOS and most CLIs do; otherwise use
+        send_command(). A command repeated in commands keeps its last output.
+
+        The outputs cannot be split without the echoes: with cmd_verify=False (or
+        global_cmd_verify=False) the commands are sent one at a time with send_command(),
+        each with read_timeout.
+
+        :param commands: The commands to be executed on the remote device.
+
+        :param read_timeout: Maximum time to wait for all the outputs. Will raise ReadTimeout
+            if timeout is exceeded.
+
+        :param auto_find_prompt: Use find_prompt() to override base prompt
+
+        :param strip_prompt: Remove the trailing router prompt from the outputs (default: True).
+
+        :param strip_command: Remove the echo of the command from the outputs (default: True).
+
+        :param normalize: Ensure the proper enter is sent at end of each command
+            (default: True).
+
+        :param use_textfsm: Process each output through TextFSM template (default: False).
+
+        :param textfsm_template: Name of template to parse output with; can be fully qualified
+            path, relative path, or name of file in current directory. (default: None).
+
+        :param use_ttp: Process each output through TTP template (default: False).
+
+        :param ttp_template: Name of template to parse output with; can be fully qualified
+            path, relative path, or name of file in current directory. (default: None).
+
+        :param use_genie: Process each output through PyATS/Genie parser (default: False).
+
+        :param cmd_verify: Split the outputs at the command echoes, else send the commands
+            one at a time (default: True).
+        """
+        if self.read_timeout_override:
+            read_timeout = self.read_timeout_override
+        commands = [cmd for cmd in commands if cmd.strip()]
+        if not cmd_verify:
+            return {
+                cmd.strip(): self.send_command(
+                    cmd,
+                    read_timeout=read_timeout,
+                    auto_find_prompt=auto_find_prompt,
+                    strip_prompt=strip_prompt,
+                    strip_command=strip_command,
+                    normalize=normalize,
+                    use_textfsm=use_textfsm,
+                    textfsm_template=textfsm_template,
+                    use_ttp=use_ttp,
+                    ttp_template=ttp_template,
+                    use_genie=use_genie,
+                    cmd_verify=False,
+                )
+                for cmd in commands
+            }
+        if normalize:
+            commands = [self.normalize_cmd(cmd) for cmd in commands]
+        if not commands:
+            return {}
+        prompt_pattern = self._prompt_handler(auto_find_prompt)
+        if not auto_find_prompt:
+            # base_prompt lacks the end of the prompt (mode and terminator, eg '(config)#')
+            prompt_pattern += r"\S*?"
+        cmds = [cmd.strip() for cmd in commands]
+
+        # End of each output: the prompt followed by the next echo, or the last prompt
+        boundaries = [
+            re.compile(rf"(?P<prompt>{prompt_pattern})[ \t]*(?P<echo>{re.escape(cmd)})")
+            for cmd in cmds[1:]
+        ]
+        boundaries.append(re.compile(rf"(?P<prompt>{prompt_pattern})[ \t]*$"))
+        first_echo = re.compile(re.escape(cmds[0]))
+        # Characters to search again before new data, as a boundary can span two reads
+        overlap = max(len(cmd) for cmd in cmds) + len(prompt_pattern) + 80
+
+        # The transport_profile is applied for each command (may turn on compression), the
+        # burst is recorded in transport_stats as one command
+        for command_string in commands:
+            stats_start = self._command_stats_start(command_string)
+        start_time = time.time()
+        self.write_channel("".join(commands))
+
+        output = ""
+        segments: List[str] = []
+        seg_start: Optional[int] = None
+        search_pos = 0
+        reading = self._read_timer()
+        reading.start()
+        while time.time() - start_time < read_timeout:
+            new_data = self.read_channel()
+            if not new_data:
+                self._sleep(0.025)
+                continue
+            search_pos = max(search_pos, len(output) - overlap)
+            output += new_data
+            if seg_start is None:
+                match = first_echo.search(output, search_pos)
+                if not match:
+                    continue
+                seg_start = search_pos = match.start()
+            while len(segments) < len(cmds):
+                match = boundaries[len(segments)].search(output, search_pos)
+                if not match:
+                    break
+                segments.append(output[seg_start : match.end("prompt")])
+                if len(segments) < len(cmds):
+                    seg_start = search_pos = match.start("echo")
+            if len(segments) == len(cmds):
+                break
+
+        else:  # nobreak
+            msg = f"""
+Output of {cmds[len(segments)]!r} not delimited by the prompt {prompt_pattern!r}
+({len(segments)} of {len(cmds)} outputs found).
+
+Things you might try to fix this:
+1. Increase the read_timeout to a larger value.
+2. Use send_command() if the device echoes type-ahead commands right away.
+
+You can also look at the Netmiko session_log or debug log for more information.
+
+"""
+            raise ReadTimeout(msg)
+        reading.stop()
+        self._command_stats_end("".join(commands), stats_start)
+
+        results: Dict[str, Union[str, List[Any], Dict[str, Any]]] = {}
+        for command_string, cmd, segment in zip(commands, cmds, segments):
+            segment = self._sanitize_output(
+                segment,
+                strip_command=strip_command,
+                command_string=command_string,
+                strip_prompt=strip_prompt,
+            )
+            results[cmd] = structured_data_converter(
+                command=command_string,
+                raw_data=segment,
+                platform=self.device_type,
+                use_textfsm=use_textfsm,
+                use_ttp=use_ttp,
+                use_genie=use_genie,
+                textfsm_template=textfsm_template,
+                ttp_template=ttp_template,
+                cache=self.structured_data_cache,
+            )
+        return results
+
     @staticmethod
     def strip_backspaces(output: str) -> str:
         """Strip any backspace characters out of the output.
@@ -2171,6 +2828,7 @@ You can also look at the Netmiko session_log or debug log for more information.
             commands = cfg_file.readlines()
         return self.send_config_set(commands, **kwargs)
 
+    @record_span("send_config_set")
     @flush_session_log
     def send_config_set(
         self,
@@ -2298,7 +2956,7 @@ You can also look at the Netmiko session_log or debug log for more information.
         elif not cmd_verify:
             for cmd in config_commands:
                 self.write_channel(self.normalize_cmd(cmd))
-                time.sleep(delay_factor * 0.05)
+                self._sleep(delay_factor * 0.05)
 
                 # Gather the output incrementally due to error_pattern requirements
                 if error_pattern:
@@ -2453,14 +3111,21 @@ You can also look at the Netmiko session_log or debug log for more information.
 
     def paramiko_cleanup(self) -> None:
         """Cleanup Paramiko to try to gracefully handle SSH session ending."""
+        if isinstance(self.remote_conn, BrokerChannel):
+            # Closes only this session, the broker keeps the SSH connection
+            self.remote_conn.close()
         if self.remote_conn_pre is not None:
             self.remote_conn_pre.close()
         del self.remote_conn_pre
 
+    @record_span("disconnect")
     def disconnect(self) -> None:
         """Try to gracefully close the session."""
         try:
-            self.cleanup()
+            # Logging out of a brokered session (eg 'exit') would make the device drop the
+            # SSH connection the broker keeps for later sessions; closing the channel is enough.
+            if not isinstance(self.remote_conn, BrokerChannel):
+                self.cleanup()
         except Exception:
             # Keep going on cleanup process even if exceptions
             pass
@@ -2472,7 +3137,7 @@ You can also look at the Netmiko session_log or debug log for more information.
                 assert isinstance(self.remote_conn, telnetlib.Telnet)
                 self.remote_conn.close()  # type: ignore
             elif self.protocol == "serial":
-                assert isinstance(self.remote_conn, serial.Serial)
+                assert self.remote_conn is not None
                 self.remote_conn.close()
         except Exception:
             # There have been race conditions observed on disconnect.
@@ -0,0 +1,523 @@
+"""
+Connection broker, keeps authenticated SSH transports to devices warm for short-lived scripts.
+
+Every new Netmiko connection normally pays for the TCP connection, the SSH key exchange and
+authentication before the first command can be sent. The broker is a local daemon that logs
+into each device once and keeps the SSH transport open; scripts reach it over a Unix socket
+and every brokered connection gets its own interactive channel on the warm transport.
+
+Start the broker (runs in the foreground):
+
+    netmiko-broker
+
+Then add broker_socket to the usual ConnectHandler arguments:
+
+    net_connect = ConnectHandler(**device, broker_socket="~/.netmiko/broker.sock")
+
+The broker only accepts connections from its own user (the socket is created with mode 0600
+in a 0700 directory). Connections are only shared between requests using the exact same
+connection arguments (credentials included). Transports without open channels are closed
+after idle_timeout seconds, and at most max_sessions channels are open per device at a time.
+"""
+
+import hashlib
+import json
+import os
+import selectors
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from typing import TYPE_CHECKING
+
+import paramiko
+
+from netmiko import log
+from netmiko.exceptions import (
+    NetmikoAuthenticationException,
+    NetmikoTimeoutException,
+)
+from netmiko.netmiko_globals import MAX_BUFFER
+
+if TYPE_CHECKING:
+    from netmiko.base_connection import BaseConnection
+
+BROKER_SOCKET = "~/.netmiko/broker.sock"
+PROTOCOL_VERSION = 1
+# Upper bound on the size of a request/reply line
+MAX_LINE = 1024 * 1024
+
+# BaseConnection attributes sent to the broker, which logs in with them on the client's behalf
+BROKER_PARAMS = (
+    "device_type",
+    "host",
+    "port",
+    "username",
+    "password",
+    "use_keys",
+    "key_file",
+    "passphrase",
+    "allow_agent",
+    "system_host_keys",
+    "alt_host_keys",
+    "alt_key_file",
+    "ssh_config_file",
+    "disabled_algorithms",
+    "conn_timeout",
+    "auth_timeout",
+    "banner_timeout",
+    "keepalive",
+)
+
+
+def _read_line(sock: socket.socket) -> bytes:
+    """Read one newline terminated line, without consuming anything after it."""
+    line = bytearray()
+    while not line.endswith(b"\n"):
+        data = sock.recv(1)
+        if not data:
+            raise EOFError("Connection closed while reading from the broker socket")
+        line += data
+        if len(line) > MAX_LINE:
+            raise ValueError("Broker message too long")
+    return bytes(line)
+
+
+def _send_json(sock: socket.socket, data: Dict[str, Any]) -> None:
+    sock.sendall(json.dumps(data).encode("utf-8") + b"\n")
+
+
+def broker_params(conn: "BaseConnection") -> Dict[str, Any]:
+    """Return the (JSON serializable) connection arguments the broker needs for conn."""
+    if conn.pkey is not None or conn.sock is not None:
+        raise ValueError(
+            "The 'pkey' and 'sock' arguments cannot be used with 'broker_socket' "
+            "(they cannot be sent to the broker), use 'key_file' instead of 'pkey'."
+        )
+    params = {name: getattr(conn, name) for name in BROKER_PARAMS}
+    params["ssh_strict"] = isinstance(conn.key_policy, paramiko.RejectPolicy)
+    return params
+
+
+class BrokerChannel:
+    """
+    Client end of a brokered session.
+
+    Provides the part of the paramiko.Channel interface that Netmiko uses, on top of the Unix
+    socket to the broker (which relays everything to and from the device's channel).
+    """
+
+    def __init__(self, sock: socket.socket, remote_version: str = "") -> None:
+        self.sock = sock
+        self.remote_version = remote_version
+        self.closed = False
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(sock, selectors.EVENT_READ)
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        self.sock.settimeout(timeout)
+
+    def recv_ready(self) -> bool:
+        if self.closed:
+            return False
+        return bool(self._selector.select(0))
+
+    def recv(self, nbytes: int) -> bytes:
+        return self.sock.recv(nbytes)
+
+    def sendall(self, data: bytes) -> None:
+        self.sock.sendall(data)
+
+    def is_active(self) -> bool:
+        """Return True unless the channel (or the broker's transport) has been closed."""
+        if self.closed:
+            return False
+        try:
+            # Readable with nothing to read means the broker closed its end
+            if self.recv_ready():
+                return self.sock.recv(1, socket.MSG_PEEK) != b""
+        except OSError:
+            return False
+        return True
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._selector.close()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def open_brokered_channel(
+    socket_path: str,
+    params: Dict[str, Any],
+    width: int = 511,
+    height: int = 1000,
+    timeout: float = 100,
+) -> BrokerChannel:
+    """
+    Ask the broker at socket_path for a new interactive channel to the device in params.
+
+    :param socket_path: Path of the broker's Unix socket.
+
+    :param params: Connection arguments, see broker_params().
+
+    :param width: Width of the VT100 terminal window.
+
+    :param height: Height of the VT100 terminal window.
+
+    :param timeout: How long to wait for the broker (which may have to log in first).
+    """
+    full_path = os.path.abspath(os.path.expanduser(socket_path))
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(full_path)
+        request = {
+            "version": PROTOCOL_VERSION,
+            "params": params,
+            "width": width,
+            "height": height,
+        }
+        _send_json(sock, request)
+        reply = json.loads(_read_line(sock))
+    except (OSError, EOFError, ValueError) as e:
+        sock.close()
+        msg = f"""Unable to use the Netmiko connection broker at {full_path}: {e}
+
+Start it with 'netmiko-broker'.
+"""
+        raise NetmikoTimeoutException(msg)
+
+    if reply.get("status") != "ok":
+        sock.close()
+        message = reply.get("message", "unknown error")
+        error = reply.get("error")
+        if error == "auth":
+            raise NetmikoAuthenticationException(message)
+        elif error == "value":
+            raise ValueError(message)
+        raise NetmikoTimeoutException(message)
+    return BrokerChannel(sock, remote_version=reply.get("remote_version", ""))
+
+
+class _PooledClient:
+    """An authenticated SSHClient held by the broker."""
+
+    def __init__(self, device: Tuple[str, int]) -> None:
+        self.device = device
+        self.client: Optional[paramiko.SSHClient] = None
+        self.lock = threading.Lock()
+        self.channels = 0
+        self.last_used = time.monotonic()
+
+    def is_active(self) -> bool:
+        if self.client is None:
+            return False
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+
+class _BrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ConnectionBroker:
+    def __init__(
+        self,
+        socket_path: str = BROKER_SOCKET,
+        idle_timeout: float = 300.0,
+        max_sessions: int = 4,
+        queue_timeout: float = 60.0,
+    ) -> None:
+        """
+        Broker that keeps authenticated SSH transports open and hands out channels on them.
+
+        :param socket_path: Path of the Unix socket to listen on.
+
+        :param idle_timeout: Close a device's transport once it had no open channels for this
+            many seconds (default: 300).
+
+        :param max_sessions: Maximum number of channels open to one device (host and port) at a
+            time, further requests wait for a free slot (default: 4).
+
+        :param queue_timeout: How long a request waits for a free slot before failing
+            (default: 60).
+        """
+        self.socket_path = os.path.abspath(os.path.expanduser(socket_path))
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.queue_timeout = queue_timeout
+        self._clients: Dict[str, _PooledClient] = {}
+        self._sessions: Dict[Tuple[str, int], int] = {}
+        self._cond = threading.Condition()
+        self._server: Optional[_BrokerServer] = None
+        self._closed = threading.Event()
+
+    def serve_forever(self) -> None:
+        """Listen on socket_path and serve requests until shutdown() is called."""
+        socket_dir = os.path.dirname(self.socket_path)
+        os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                # Left behind by a broker that did not exit cleanly
+                os.remove(self.socket_path)
+            else:
+                raise ValueError(f"A broker is already listening on {self.socket_path}")
+            finally:
+                probe.close()
+
+        broker = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                broker._handle(self.request)
+
+        old_umask = os.umask(0o077)
+        try:
+            self._server = _BrokerServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.socket_path, 0o600)
+
+        reaper = threading.Thread(target=self._reap, name="netmiko-broker-reaper")
+        reaper.daemon = True
+        reaper.start()
+        log.info(f"Netmiko connection broker listening on {self.socket_path}")
+        try:
+            self._server.serve_forever(poll_interval=0.5)
+        finally:
+            self._closed.set()
+            self._server.server_close()
+            self._close_clients()
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+
+    def shutdown(self) -> None:
+        """Stop serve_forever() and close all transports."""
+        self._closed.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of open transports and channels."""
+        with self._cond:
+            return {
+                "transports": sum(c.is_active() for c in self._clients.values()),
+                "channels": sum(self._sessions.values()),
+            }
+
+    def _handle(self, sock: socket.socket) -> None:
+        """Serve one client: open a channel on a (warm) transport and relay until either side closes."""
+        sock.settimeout(self.queue_timeout)
+        try:
+            request = json.loads(_read_line(sock))
+            if request.get("version") != PROTOCOL_VERSION:
+                raise ValueError(
+                    f"Unsupported broker protocol version: {request.get('version')}"
+                )
+            params = request["params"]
+            device = (str(params["host"]), int(params["port"]))
+        except (OSError, EOFError, ValueError, KeyError, TypeError) as e:
+            self._reply_error(sock, "value", f"Invalid broker request: {e}")
+            return
+
+        try:
+            self._acquire(device)
+        except NetmikoTimeoutException as e:
+            self._reply_error(sock, "timeout", str(e))
+            return
+        pooled = None
+        channel = None
+        try:
+            try:
+                pooled, channel = self._open_channel(
+                    params,
+                    device,
+                    request.get("width", 511),
+                    request.get("height", 1000),
+                )
+            except paramiko.ssh_exception.AuthenticationException as e:
+                self._reply_error(sock, "auth", f"Authentication to device failed: {e}")
+                return
+            except ValueError as e:
+                self._reply_error(sock, "value", str(e))
+                return
+            except (OSError, EOFError, paramiko.ssh_exception.SSHException) as e:
+                msg = f"Connection to {device[0]}:{device[1]} failed: {e}"
+                self._reply_error(sock, "timeout", msg)
+                return
+            transport = channel.get_transport()
+            _send_json(
+                sock, {"status": "ok", "remote_version": transport.remote_version}
+            )
+            sock.settimeout(None)
+            self._relay(sock, channel)
+        except (OSError, EOFError, paramiko.ssh_exception.SSHException) as e:
+            log.debug(f"Netmiko broker: session to {device[0]}:{device[1]} ended: {e}")
+        finally:
+            if channel is not None:
+                channel.close()
+            self._release(device, pooled)
+
+    def _reply_error(self, sock: socket.socket, error: str, message: str) -> None:
+        log.debug(f"Netmiko broker: {message}")
+        try:
+            _send_json(sock, {"status": "error", "error": error, "message": message})
+        except OSError:
+            pass
+
+    def _acquire(self, device: Tuple[str, int]) -> None:
+        """Wait for one of the device's max_sessions slots."""
+        with self._cond:
+            ok = self._cond.wait_for(
+                lambda: self._sessions.get(device, 0) < self.max_sessions,
+                timeout=self.queue_timeout,
+            )
+            if not ok:
+                raise NetmikoTimeoutException(
+                    f"Timed out waiting for one of the broker's {self.max_sessions} "
+                    f"sessions to {device[0]}:{device[1]}"
+                )
+            self._sessions[device] = self._sessions.get(device, 0) + 1
+
+    def _release(
+        self, device: Tuple[str, int], pooled: Optional[_PooledClient]
+    ) -> None:
+        with self._cond:
+            self._sessions[device] -= 1
+            if not self._sessions[device]:
+                del self._sessions[device]
+            if pooled is not None:
+                pooled.channels -= 1
+                pooled.last_used = time.monotonic()
+            self._cond.notify_all()
+
+    def _open_channel(
+        self, params: Dict[str, Any], device: Tuple[str, int], width: int, height: int
+    ) -> Tuple[_PooledClient, paramiko.Channel]:
+        key = hashlib.sha256(
+            json.dumps(params, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        with self._cond:
+            pooled = self._clients.get(key)
+            if pooled is None:
+                pooled = self._clients[key] = _PooledClient(device)
+            pooled.channels += 1
+        try:
+            with pooled.lock:
+                # A transport that died while idle is replaced (once), as is one that fails
+                # to open a channel (eg closed by the device in the meantime).
+                for attempt in range(2):
+                    if not pooled.is_active():
+                        pooled.close()
+                        pooled.client = self._login(params)
+                    assert pooled.client is not None
+                    try:
+                        channel = pooled.client.invoke_shell(
+                            term="vt100", width=width, height=height
+                        )
+                        break
+                    except (paramiko.ssh_exception.SSHException, EOFError, OSError):
+                        pooled.close()
+                        if attempt:
+                            raise
+        except BaseException:
+            with self._cond:
+                pooled.channels -= 1
+            raise
+        return pooled, channel
+
+    def _login(self, params: Dict[str, Any]) -> paramiko.SSHClient:
+        """Connect and authenticate the same way BaseConnection.establish_connection() does."""
+        from netmiko.ssh_dispatcher import ConnectHandler
+
+        conn = ConnectHandler(**params, auto_connect=False)
+        try:
+            conn._modify_connection_params()
+            client = conn._build_ssh_client()
+            try:
+                client.connect(**conn._connect_params_dict())
+            except BaseException:
+                client.close()
+                raise
+            if conn.keepalive:
+                transport = client.get_transport()
+                assert transport is not None
+                transport.set_keepalive(conn.keepalive)
+        finally:
+            log.removeFilter(conn._secrets_filter)
+        log.debug(f"Netmiko broker: connected to {conn.host}:{conn.port}")
+        return client
+
+    def _relay(self, sock: socket.socket, channel: paramiko.Channel) -> None:
+        """Copy data both ways between the client socket and the device channel."""
+        selector = selectors.DefaultSelector()
+        selector.register(sock, selectors.EVENT_READ)
+        selector.register(channel, selectors.EVENT_READ)
+        try:
+            while not self._closed.is_set():
+                for key, _ in selector.select(timeout=1):
+                    if key.fileobj is sock:
+                        data = sock.recv(MAX_BUFFER)
+                        if not data:
+                            return
+                        channel.sendall(data)
+                    elif channel.recv_ready():
+                        sock.sendall(channel.recv(MAX_BUFFER))
+                    elif channel.recv_stderr_ready():
+                        sock.sendall(channel.recv_stderr(MAX_BUFFER))
+                    elif channel.closed or channel.eof_received:
+                        return
+        finally:
+            selector.close()
+
+    def _reap(self) -> None:
+        """Close transports that are dead or have been idle for longer than idle_timeout."""
+        interval = min(max(self.idle_timeout / 4, 0.1), 5)
+        while not self._closed.wait(interval):
+            now = time.monotonic()
+            with self._cond:
+                idle = [
+                    (key, pooled)
+                    for key, pooled in self._clients.items()
+                    if not pooled.channels
+                    and (
+                        now - pooled.last_used > self.idle_timeout
+                        or not pooled.is_active()
+                    )
+                ]
+                for key, _ in idle:
+                    del self._clients[key]
+            for _, pooled in idle:
+                log.debug(
+                    f"Netmiko broker: closing idle connection to "
+                    f"{pooled.device[0]}:{pooled.device[1]}"
+                )
+                with pooled.lock:
+                    pooled.close()
+
+    def _close_clients(self) -> None:
+        with self._cond:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for pooled in clients:
+            pooled.close()
@@ -1,13 +1,17 @@
-from typing import Any, Optional
+from typing import Any, Optional, Union
+from typing import TYPE_CHECKING
 from abc import ABC, abstractmethod
 import paramiko
-import serial
 
 from netmiko._telnetlib import telnetlib
+from netmiko.broker import BrokerChannel
 from netmiko.utilities import write_bytes
 from netmiko.netmiko_globals import MAX_BUFFER
 from netmiko.exceptions import ReadException, WriteException
 
+if TYPE_CHECKING:
+    import serial
+
 
 class Channel(ABC):
     @abstractmethod
@@ -57,7 +61,9 @@ class Channel(ABC):
 
 
 class SSHChannel(Channel):
-    def __init__(self, conn: Optional[paramiko.Channel], encoding: str) -> None:
+    def __init__(
+        self, conn: Union[None, paramiko.Channel, BrokerChannel], encoding: str
+    ) -> None:
         """
         Placeholder __init__ method so that reading and writing can be moved to the
         channel class.
@@ -127,7 +133,7 @@ class TelnetChannel(Channel):
 
 
 class SerialChannel(Channel):
-    def __init__(self, conn: Optional[serial.Serial], encoding: str) -> None:
+    def __init__(self, conn: Optional["serial.Serial"], encoding: str) -> None:
         """
         Placeholder __init__ method so that reading and writing can be moved to the
         channel class.
@@ -13,6 +13,8 @@ from netmiko.base_connection import BaseConnection
 class CiscoIosBase(CiscoBaseConnection):
     """Common Methods for IOS (both SSH and telnet)."""
 
+    fast_prepare_commands = ("terminal width 511", "terminal length 0")
+
     def session_preparation(self) -> None:
         """Prepare the session after the connection has been established."""
         cmd = "terminal width 511"
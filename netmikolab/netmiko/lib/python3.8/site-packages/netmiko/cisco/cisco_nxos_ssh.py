@@ -80,6 +80,9 @@ class CiscoNxosFileTransfer(CiscoFileTransfer):
         progress: Optional[Callable[..., Any]] = None,
         progress4: Optional[Callable[..., Any]] = None,
         hash_supported: bool = True,
+        buff_size: int = 1048576,
+        use_sftp: bool = False,
+        max_in_flight: int = 64,
     ) -> None:
         self.ssh_ctl_chan = ssh_conn
         self.source_file = source_file
@@ -106,6 +109,9 @@ class CiscoNxosFileTransfer(CiscoFileTransfer):
         self.socket_timeout = socket_timeout
         self.progress = progress
         self.progress4 = progress4
+        self.buff_size = buff_size
+        self.use_sftp = use_sftp
+        self.max_in_flight = max_in_flight
 
     def check_file_exists(self, remote_cmd: str = "") -> bool:
         """Check if the dest_file already exists on the file system (return boolean)."""
@@ -0,0 +1,120 @@
+"""Helpers shared by the netmiko-show, netmiko-grep and netmiko-cfg tools."""
+import queue
+import re
+import sys
+import threading
+import time
+
+ERROR_PATTERN = "%%%failed%%%"
+MAX_WORKERS = 50
+DEVICE_TIMEOUT = 120.0
+
+# Same colors as 'grep --color=auto'
+COLOR_FILENAME = "\x1b[35m\x1b[K"
+COLOR_SEPARATOR = "\x1b[36m\x1b[K"
+COLOR_MATCH = "\x1b[01;31m\x1b[K"
+COLOR_RESET = "\x1b[m\x1b[K"
+
+
+def run_devices(device_group, task, max_workers=MAX_WORKERS, timeout=DEVICE_TIMEOUT):
+    """
+    Run task(device_name, a_device) for every device of device_group, using at most
+    max_workers threads.
+
+    The devices start running right away. Returns an iterator yielding
+    (device_name, output) as each device completes. A device still running timeout
+    seconds after it started yields ERROR_PATTERN. A thread blocked on a device cannot be
+    interrupted, so it is abandoned and another thread takes over the remaining devices.
+    The threads are daemon threads: an abandoned one does not keep the tool from exiting.
+    Devices that have not started when the iterator is closed are skipped.
+    """
+    devices = queue.Queue()
+    for device_name, a_device in device_group.items():
+        devices.put((device_name, a_device))
+    results = queue.Queue()
+    started = {}
+    abandoned = set()
+    stop = threading.Event()
+
+    def worker():
+        while not stop.is_set():
+            try:
+                device_name, a_device = devices.get_nowait()
+            except queue.Empty:
+                return
+            started[device_name] = time.monotonic()
+            try:
+                output = task(device_name, a_device)
+            except Exception:
+                output = ERROR_PATTERN
+            results.put((device_name, output))
+            if device_name in abandoned:
+                # Another thread took over
+                return
+
+    def start_worker():
+        threading.Thread(target=worker, daemon=True).start()
+
+    for _ in range(min(max_workers, len(device_group))):
+        start_worker()
+    return _completed(
+        results, len(device_group), started, abandoned, timeout, stop, start_worker
+    )
+
+
+def _completed(results, count, started, abandoned, timeout, stop, start_worker):
+    finished = set()
+    try:
+        while len(finished) < count:
+            try:
+                device_name, output = results.get(timeout=1.0)
+            except queue.Empty:
+                pass
+            else:
+                # A device that timed out may still complete later
+                if device_name not in finished:
+                    finished.add(device_name)
+                    yield device_name, output
+            if not timeout:
+                continue
+            now = time.monotonic()
+            for device_name, start in list(started.items()):
+                if device_name not in finished and now - start > timeout:
+                    finished.add(device_name)
+                    abandoned.add(device_name)
+                    start_worker()
+                    yield device_name, ERROR_PATTERN
+    finally:
+        stop.set()
+
+
+def compile_pattern(pattern):
+    """Compile a grep pattern, exit with an error message if it is invalid."""
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        sys.exit("Invalid pattern {!r}: {}".format(pattern, e))
+
+
+def grep_lines(file_name, output, regex, with_filename=True, use_colors=False):
+    """Return the lines of output matching regex, formatted like grep output."""
+    return [
+        format_line(file_name, line, regex, with_filename, use_colors)
+        for line in output.splitlines()
+        if regex.search(line)
+    ]
+
+
+def format_line(file_name, line, regex, with_filename=True, use_colors=False):
+    """Format a line matching regex like grep output."""
+    if not use_colors:
+        return "{}:{}".format(file_name, line) if with_filename else line
+    line = regex.sub(
+        lambda m: COLOR_MATCH + m.group(0) + COLOR_RESET if m.group(0) else "",
+        line,
+    )
+    if not with_filename:
+        return line
+    return "{}{}{}{}:{}{}".format(
+        COLOR_FILENAME, file_name, COLOR_RESET, COLOR_SEPARATOR, COLOR_RESET, line
+    )
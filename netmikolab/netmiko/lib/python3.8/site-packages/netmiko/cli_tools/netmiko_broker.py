@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Run the Netmiko connection broker (keeps SSH connections to devices warm)."""
+import argparse
+import logging
+import signal
+import sys
+
+from netmiko.broker import BROKER_SOCKET, ConnectionBroker
+
+__version__ = "0.1.0"
+
+
+def parse_arguments(args):
+    """Parse command-line arguments."""
+    description = (
+        "Keep authenticated SSH connections open for short-lived Netmiko scripts "
+        "(use ConnectHandler(..., broker_socket=SOCKET))"
+    )
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--socket",
+        help=f"Unix socket to listen on (default: {BROKER_SOCKET})",
+        action="store",
+        default=BROKER_SOCKET,
+        type=str,
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        help="Close connections with no open sessions after this many seconds "
+        "(default: 300)",
+        action="store",
+        default=300.0,
+        type=float,
+    )
+    parser.add_argument(
+        "--max-sessions",
+        help="Maximum number of concurrent sessions per device (default: 4)",
+        action="store",
+        default=4,
+        type=int,
+    )
+    parser.add_argument(
+        "--queue-timeout",
+        help="Seconds a request waits for a free session before failing (default: 60)",
+        action="store",
+        default=60.0,
+        type=float,
+    )
+    parser.add_argument("--debug", help="Enable debug logging", action="store_true")
+    parser.add_argument("--version", help="Display version", action="store_true")
+    cli_args = parser.parse_args(args)
+    return cli_args
+
+
+def main_ep():
+    sys.exit(main(sys.argv[1:]))
+
+
+def main(args):
+    cli_args = parse_arguments(args)
+    if cli_args.version:
+        print("netmiko-broker v{}".format(__version__))
+        return 0
+
+    logging.basicConfig(level=logging.DEBUG if cli_args.debug else logging.INFO)
+    broker = ConnectionBroker(
+        socket_path=cli_args.socket,
+        idle_timeout=cli_args.idle_timeout,
+        max_sessions=cli_args.max_sessions,
+        queue_timeout=cli_args.queue_timeout,
+    )
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
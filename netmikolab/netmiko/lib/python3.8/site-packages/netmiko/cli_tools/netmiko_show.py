@@ -6,13 +6,6 @@ from __future__ import unicode_literals
 import argparse
 import sys
 import os
-import subprocess
-import threading
-
-try:
-    from Queue import Queue
-except ImportError:
-    from queue import Queue
 from datetime import datetime
 from getpass import getpass
 
@@ -22,44 +15,23 @@ from netmiko.utilities import obtain_all_devices
 from netmiko.utilities import obtain_netmiko_filename, write_tmp_file, ensure_dir_exists
 from netmiko.utilities import find_netmiko_dir
 from netmiko.utilities import SHOW_RUN_MAPPER
+from netmiko.cli_tools.helpers import ERROR_PATTERN, MAX_WORKERS, DEVICE_TIMEOUT
+from netmiko.cli_tools.helpers import compile_pattern, grep_lines, run_devices
+from netmiko.cli_tools.output_store import OutputStore
 
-GREP = "/bin/grep"
-if not os.path.exists(GREP):
-    GREP = "/usr/bin/grep"
 NETMIKO_BASE_DIR = "~/.netmiko"
-ERROR_PATTERN = "%%%failed%%%"
 __version__ = "0.1.0"
 
 
-def grepx(files, pattern, grep_options, use_colors=True):
-    """Call system grep"""
-    if not isinstance(files, (list, tuple)):
-        files = [files]
-    if use_colors:
-        grep_options += ["--color=auto"]
-
-    # Make grep output look nicer by 'cd netmiko_full_dir'
-    _, netmiko_full_dir = find_netmiko_dir()
-    os.chdir(netmiko_full_dir)
-    # Convert files to strip off the directory
-    retrieve_file = lambda x: x.split("/")[-1]  # noqa
-    files = [retrieve_file(a_file) for a_file in files]
-    files.sort()
-    grep_list = [GREP] + grep_options + [pattern] + files
-    proc = subprocess.Popen(grep_list, shell=False)
-    proc.communicate()
-    return ""
-
-
-def ssh_conn(device_name, a_device, cli_command, output_q):
+def ssh_conn(a_device, cli_command, read_timeout=DEVICE_TIMEOUT):
     try:
-        net_connect = ConnectHandler(**a_device)
-        net_connect.enable()
-        output = net_connect.send_command_expect(cli_command)
-        net_connect.disconnect()
+        with ConnectHandler(**a_device) as net_connect:
+            net_connect.enable()
+            return net_connect.send_command_expect(
+                cli_command, read_timeout=read_timeout
+            )
     except Exception:
-        output = ERROR_PATTERN
-    output_q.put({device_name: output})
+        return ERROR_PATTERN
 
 
 def parse_arguments(args):
@@ -95,6 +67,24 @@ def parse_arguments(args):
     parser.add_argument(
         "--hide-failed", help="Hide failed devices", action="store_true"
     )
+    parser.add_argument(
+        "--workers",
+        help="Maximum number of devices to connect to at once (default: {})".format(
+            MAX_WORKERS
+        ),
+        action="store",
+        default=MAX_WORKERS,
+        type=int,
+    )
+    parser.add_argument(
+        "--timeout",
+        help="Seconds before a device is reported as failed (default: {:g})".format(
+            DEVICE_TIMEOUT
+        ),
+        action="store",
+        default=DEVICE_TIMEOUT,
+        type=float,
+    )
     parser.add_argument("--version", help="Display version", action="store_true")
     cli_args = parser.parse_args(args)
     if not cli_args.list_devices and not cli_args.version:
@@ -134,7 +124,6 @@ def main(args):
     use_cached_files = cli_args.use_cache
     hide_failed = cli_args.hide_failed
 
-    output_q = Queue()
     my_devices = load_devices()
     if device_or_group == "all":
         device_group = obtain_all_devices(my_devices)
@@ -153,55 +142,70 @@ def main(args):
                 " Device or group not found: {0}".format(device_or_group)
             )
 
-    # Retrieve output from devices
-    my_files = []
+    regex = compile_pattern(pattern)
+    use_colors = sys.stdout.isatty()
+    # Like grep, only prefix the lines with the file name when there are several files
+    with_filename = len(device_group) > 1
+
+    def print_matches(device_name, output):
+        file_name = os.path.basename(obtain_netmiko_filename(device_name))
+        for line in grep_lines(file_name, output, regex, with_filename, use_colors):
+            print(line)
+        sys.stdout.flush()
+
+    # Retrieve output from devices, printing it as each device completes
     failed_devices = []
     if not use_cached_files:
-        for device_name, a_device in device_group.items():
+        netmiko_base_dir, netmiko_full_dir = find_netmiko_dir()
+        ensure_dir_exists(netmiko_base_dir)
+        ensure_dir_exists(netmiko_full_dir)
+        for a_device in device_group.values():
             if cli_username:
                 a_device["username"] = cli_username
             if cli_password:
                 a_device["password"] = cli_password
             if cli_secret:
                 a_device["secret"] = cli_secret
+
+        commands = {}
+        for device_name, a_device in device_group.items():
+            commands[device_name] = cli_command
             if not cmd_arg:
-                cli_command = SHOW_RUN_MAPPER.get(a_device["device_type"], "show run")
-            my_thread = threading.Thread(
-                target=ssh_conn, args=(device_name, a_device, cli_command, output_q)
+                commands[device_name] = SHOW_RUN_MAPPER.get(
+                    a_device["device_type"], "show run"
+                )
+
+        def retrieve_output(device_name, a_device):
+            return ssh_conn(
+                a_device, commands[device_name], read_timeout=cli_args.timeout
             )
-            my_thread.start()
-        # Make sure all threads have finished
-        main_thread = threading.current_thread()
-        for some_thread in threading.enumerate():
-            if some_thread != main_thread:
-                some_thread.join()
-        # Write files
-        while not output_q.empty():
-            my_dict = output_q.get()
-            netmiko_base_dir, netmiko_full_dir = find_netmiko_dir()
-            ensure_dir_exists(netmiko_base_dir)
-            ensure_dir_exists(netmiko_full_dir)
-            for device_name, output in my_dict.items():
-                file_name = write_tmp_file(device_name, output)
+
+        with OutputStore() as store:
+            for device_name, output in run_devices(
+                device_group, retrieve_output, cli_args.workers, cli_args.timeout
+            ):
+                # Saved for --use-cache
+                write_tmp_file(device_name, output)
                 if ERROR_PATTERN not in output:
-                    my_files.append(file_name)
+                    store.save(device_name, commands[device_name], output)
+                    print_matches(device_name, output)
                 else:
                     failed_devices.append(device_name)
     else:
-        for device_name in device_group:
+        outputs = {}
+        for device_name in sorted(device_group):
             file_name = obtain_netmiko_filename(device_name)
             try:
                 with open(file_name) as f:
-                    output = f.read()
+                    outputs[device_name] = f.read()
             except IOError:
                 return "Some cache files are missing: unable to use --use-cache option."
+        for device_name, output in outputs.items():
             if ERROR_PATTERN not in output:
-                my_files.append(file_name)
+                print_matches(device_name, output)
             else:
                 failed_devices.append(device_name)
 
-    grep_options = []
-    grepx(my_files, pattern, grep_options)
     if cli_args.display_runtime:
         print("Total time: {0}".format(datetime.now() - start_time))
 
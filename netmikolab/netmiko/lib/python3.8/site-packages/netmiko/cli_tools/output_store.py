@@ -0,0 +1,261 @@
+"""Persistent store of device outputs with a line-oriented inverted index.
+
+Every output saved by the cli_tools is kept per (device, command) with the time it was
+retrieved. Its lines are indexed by the words they contain, so netmiko-grep can answer a
+pattern across thousands of stored outputs by only reading the lines that can match.
+"""
+import os
+import re
+import sqlite3
+import time
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+from netmiko.utilities import ensure_dir_exists, find_netmiko_dir
+
+STORE_FILE = "output_store.sqlite"
+WORD_PATTERN = re.compile(r"\w+")
+# Shorter pattern fragments match too many words to narrow the search
+MIN_FRAGMENT = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    device TEXT NOT NULL,
+    command TEXT NOT NULL,
+    updated REAL NOT NULL,
+    output TEXT NOT NULL,
+    PRIMARY KEY (device, command)
+);
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    device TEXT NOT NULL,
+    command TEXT NOT NULL,
+    line_no INTEGER NOT NULL,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lines_output ON lines (device, command, line_no);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS postings (
+    word_id INTEGER NOT NULL,
+    line_id INTEGER NOT NULL,
+    PRIMARY KEY (word_id, line_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_line ON postings (line_id);
+"""
+
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def pattern_fragments(pattern):
+    """
+    Return the word fragments every match of pattern must contain, as LIKE expressions
+    on the indexed (lowercase) words.
+
+    Only the literal characters at the top level of the pattern are used. A fragment
+    that touches the edge of a literal run may only be part of a word (eg 'face' in
+    'interface'), unless the pattern anchors it there with ^, $ or \\b.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, TypeError, ValueError):
+        return []
+    items = list(parsed)
+    closed_before = (sre_parse.AT_BEGINNING, sre_parse.AT_BEGINNING_STRING)
+    closed_after = (sre_parse.AT_END, sre_parse.AT_END_STRING)
+
+    def is_anchor(index, anchors):
+        if not 0 <= index < len(items):
+            return False
+        op, av = items[index]
+        return op == sre_parse.AT and (av in anchors or av == sre_parse.AT_BOUNDARY)
+
+    fragments = []
+    index = 0
+    while index < len(items):
+        if items[index][0] != sre_parse.LITERAL:
+            index += 1
+            continue
+        start = index
+        while index < len(items) and items[index][0] == sre_parse.LITERAL:
+            index += 1
+        run = "".join(chr(av) for _, av in items[start:index]).lower()
+        left_closed = is_anchor(start - 1, closed_before)
+        right_closed = is_anchor(index, closed_after)
+        for match in WORD_PATTERN.finditer(run):
+            word = _like_escape(match.group(0))
+            open_left = match.start() == 0 and not left_closed
+            open_right = match.end() == len(run) and not right_closed
+            if not open_left and not open_right:
+                fragments.append(word)
+            elif len(match.group(0)) >= MIN_FRAGMENT:
+                prefix = "%" if open_left else ""
+                suffix = "%" if open_right else ""
+                fragments.append(prefix + word + suffix)
+    return fragments
+
+
+class OutputStore(object):
+    """Device outputs stored in a SQLite database in the Netmiko directory."""
+
+    def __init__(self, store_file=None):
+        if store_file is None:
+            netmiko_base_dir, _ = find_netmiko_dir()
+            ensure_dir_exists(netmiko_base_dir)
+            store_file = os.path.join(netmiko_base_dir, STORE_FILE)
+        self.store_file = store_file
+        self.conn = sqlite3.connect(store_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def save(self, device, command, output):
+        """Store the output of command on device, replacing the previous one."""
+        lines = output.splitlines()
+        with self.conn:
+            self._delete(device, command)
+            self.conn.execute(
+                "INSERT INTO outputs (device, command, updated, output) "
+                "VALUES (?, ?, ?, ?)",
+                (device, command, time.time(), output),
+            )
+            line_words = []
+            for line_no, line in enumerate(lines, 1):
+                line_id = self.conn.execute(
+                    "INSERT INTO lines (device, command, line_no, line) "
+                    "VALUES (?, ?, ?, ?)",
+                    (device, command, line_no, line),
+                ).lastrowid
+                line_words.append((line_id, set(WORD_PATTERN.findall(line.lower()))))
+            all_words = set().union(*(words for _, words in line_words))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO words (word) VALUES (?)",
+                [(word,) for word in all_words],
+            )
+            word_ids = self._word_ids(all_words)
+            self.conn.executemany(
+                "INSERT INTO postings (word_id, line_id) VALUES (?, ?)",
+                [
+                    (word_ids[word], line_id)
+                    for line_id, words in line_words
+                    for word in words
+                ],
+            )
+
+    def _word_ids(self, words):
+        words = list(words)
+        word_ids = {}
+        # Stay below SQLite's limit on the number of query parameters
+        for i in range(0, len(words), 500):
+            chunk = words[i : i + 500]
+            word_ids.update(
+                self.conn.execute(
+                    "SELECT word, id FROM words WHERE word IN ({})".format(
+                        ", ".join("?" * len(chunk))
+                    ),
+                    chunk,
+                )
+            )
+        return word_ids
+
+    def _delete(self, device, command):
+        self.conn.execute(
+            "DELETE FROM postings WHERE line_id IN "
+            "(SELECT id FROM lines WHERE device = ? AND command = ?)",
+            (device, command),
+        )
+        self.conn.execute(
+            "DELETE FROM lines WHERE device = ? AND command = ?", (device, command)
+        )
+        self.conn.execute(
+            "DELETE FROM outputs WHERE device = ? AND command = ?", (device, command)
+        )
+
+    def get(self, device, command, max_age=None):
+        """Return the stored output of command on device, None if missing or stale."""
+        row = self.conn.execute(
+            "SELECT updated, output FROM outputs WHERE device = ? AND command = ?",
+            (device, command),
+        ).fetchone()
+        if row is None or not self._is_fresh(row[0], max_age):
+            return None
+        return row[1]
+
+    def fresh(self, outputs, max_age=None):
+        """Return the (device, command) pairs of outputs saved less than max_age ago."""
+        self._select(outputs)
+        rows = self.conn.execute(
+            "SELECT device, command, updated FROM outputs JOIN selected "
+            "USING (device, command)"
+        )
+        return {
+            (device, command)
+            for device, command, updated in rows
+            if self._is_fresh(updated, max_age)
+        }
+
+    def _select(self, outputs):
+        """Fill the selected temp table with the (device, command) pairs of outputs."""
+        self.conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS selected ("
+            "device TEXT NOT NULL, command TEXT NOT NULL, PRIMARY KEY (device, command))"
+        )
+        with self.conn:
+            self.conn.execute("DELETE FROM selected")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO selected (device, command) VALUES (?, ?)",
+                outputs,
+            )
+
+    @staticmethod
+    def _is_fresh(updated, max_age):
+        return max_age is None or time.time() - updated <= max_age
+
+    def grep(self, regex, outputs):
+        """
+        Search the stored outputs for the lines matching regex (a compiled pattern).
+
+        outputs is an iterable of (device, command) pairs. Returns {device: [line, ...]}
+        with the matching lines in order, for the devices having at least one.
+        """
+        outputs = set(outputs)
+        if not outputs:
+            return {}
+        self._select(outputs)
+        query = (
+            "SELECT device, command, line FROM lines JOIN selected "
+            "USING (device, command)"
+        )
+        fragments = pattern_fragments(regex.pattern)
+        if fragments:
+            word_query = (
+                "SELECT line_id FROM postings WHERE word_id IN "
+                "(SELECT id FROM words WHERE word LIKE ? ESCAPE '\\')"
+            )
+            query += " WHERE lines.id IN ({})".format(
+                " INTERSECT ".join([word_query] * len(fragments))
+            )
+        rows = self.conn.execute(
+            query + " ORDER BY device, command, line_no", fragments
+        )
+        matches = {}
+        for device, command, line in rows:
+            if regex.search(line):
+                matches.setdefault(device, []).append(line)
+        return matches
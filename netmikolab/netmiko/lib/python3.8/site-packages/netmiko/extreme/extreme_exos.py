@@ -94,6 +94,9 @@ class ExtremeExosFileTransfer(BaseFileTransfer):
         progress: Optional[Callable[..., Any]] = None,
         progress4: Optional[Callable[..., Any]] = None,
         hash_supported: bool = False,
+        buff_size: int = 1048576,
+        use_sftp: bool = False,
+        max_in_flight: int = 64,
     ) -> None:
         super().__init__(
             ssh_conn=ssh_conn,
@@ -105,6 +108,9 @@ class ExtremeExosFileTransfer(BaseFileTransfer):
             progress=progress,
             progress4=progress4,
             hash_supported=hash_supported,
+            buff_size=buff_size,
+            use_sftp=use_sftp,
+            max_in_flight=max_in_flight,
         )
 
     def remote_space_available(self, search_pattern: str = r"(\d+)\s+\d+%$") -> int:
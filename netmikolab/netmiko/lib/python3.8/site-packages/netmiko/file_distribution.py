@@ -0,0 +1,229 @@
+"""Distribution of one file (eg an OS image) to many devices, with per-site fan-out."""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from netmiko import log
+from netmiko.scp_handler import BaseFileTransfer, cached_file_md5
+from netmiko.ssh_dispatcher import ConnectHandler, FileTransfer
+
+# Called as peer_copy(transfer, seed_device) on a device of a site that did not receive the
+# file from the local system. It must make the device copy transfer.dest_file (on
+# transfer.file_system) from the seed device, eg with 'copy scp://...' and the seed's address.
+PeerCopy = Callable[[BaseFileTransfer, Dict[str, Any]], None]
+
+
+class _Target:
+    """One device of the distribution and its result."""
+
+    def __init__(self, device: Dict[str, Any], site_key: str) -> None:
+        self.params = dict(device)
+        host = self.params.get("host") or self.params.get("ip")
+        site = self.params.pop(site_key, None)
+        # Devices without a site share no uplink with any other device
+        self.site = site if site is not None else f"host:{host}"
+        self.result: Dict[str, Any] = {
+            "host": host,
+            "site": site,
+            "file_exists": False,
+            "file_transferred": False,
+            "file_verified": False,
+            "source": None,
+            "error": None,
+        }
+        self.needs_transfer = False
+
+    def fail(self, action: str, error: Exception) -> None:
+        log.error(f"{self.result['host']}: {action} failed: {error}")
+        self.result["error"] = f"{action}: {error}"
+
+
+def distribute_file(
+    devices: Sequence[Dict[str, Any]],
+    source_file: str,
+    dest_file: str,
+    file_system: Optional[str] = None,
+    overwrite_file: bool = False,
+    max_workers: int = 20,
+    per_site: int = 2,
+    site_key: str = "site",
+    peer_copy: Optional[PeerCopy] = None,
+    socket_timeout: float = 10.0,
+    use_sftp: bool = False,
+    max_in_flight: int = 64,
+) -> List[Dict[str, Any]]:
+    """Copy source_file to dest_file on many devices.
+
+    All devices are first checked concurrently: devices that already have the file with the
+    right MD5 are skipped, the others must have enough free space. The file is then uploaded
+    with at most per_site transfers running in each site (and max_workers overall), so
+    devices sharing an uplink do not compete for it.
+
+    With peer_copy, only one device per site (the seed) receives the file from the local
+    system, none if a device of the site already had it. The other devices of the site then
+    copy it from the seed using peer_copy. A device whose peer copy fails is uploaded to
+    directly.
+
+    devices are Netmiko connection dictionaries, with the site of the device under site_key
+    (devices without it are their own site).
+
+    Returns one dictionary per device, in the order of devices:
+
+    {
+        'host': str,
+        'site': site or None,
+        'file_exists': boolean,
+        'file_transferred': boolean,
+        'file_verified': boolean,
+        'source': None (local system) or the host of the seed it was copied from,
+        'error': None or str,
+    }
+    """
+    # Hash once up front, every device then reuses the cached MD5
+    cached_file_md5(source_file)
+    transfer_args: Dict[str, Any] = {
+        "source_file": source_file,
+        "dest_file": dest_file,
+        "direction": "put",
+        "socket_timeout": socket_timeout,
+    }
+    if file_system is not None:
+        transfer_args["file_system"] = file_system
+    if use_sftp:
+        transfer_args["use_sftp"] = True
+        transfer_args["max_in_flight"] = max_in_flight
+
+    targets = [_Target(device, site_key) for device in devices]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(
+            executor.map(
+                lambda target: _precheck(target, transfer_args, overwrite_file), targets
+            )
+        )
+
+    sites: Dict[Any, List[_Target]] = {}
+    seeds: Dict[Any, _Target] = {}
+    for target in targets:
+        if target.needs_transfer:
+            sites.setdefault(target.site, []).append(target)
+        elif target.result["file_verified"]:
+            seeds.setdefault(target.site, target)
+
+    if sites:
+        slots = BoundedSemaphore(max_workers)
+        # Sites beyond max_workers wait for a free thread; the threads left over are shared
+        # out between the sites that run at the same time
+        site_workers = min(len(sites), max_workers)
+        site_per_site = max(1, min(per_site, max_workers // site_workers))
+        with ThreadPoolExecutor(max_workers=site_workers) as executor:
+            list(
+                executor.map(
+                    lambda site: _distribute_site(
+                        sites[site],
+                        seeds.get(site),
+                        transfer_args,
+                        site_per_site,
+                        slots,
+                        peer_copy,
+                    ),
+                    sites,
+                )
+            )
+
+    return [target.result for target in targets]
+
+
+def _precheck(
+    target: _Target, transfer_args: Dict[str, Any], overwrite_file: bool
+) -> None:
+    """Find out whether target needs the file, and can store it."""
+    try:
+        with ConnectHandler(**target.params) as net_connect:
+            transfer = FileTransfer(net_connect, **transfer_args)
+            if transfer.check_file_exists():
+                target.result["file_exists"] = True
+                if transfer.verify_file():
+                    target.result["file_verified"] = True
+                    return
+                if not overwrite_file:
+                    raise ValueError(
+                        "File already exists and overwrite_file is disabled"
+                    )
+            if not transfer.verify_space_available():
+                raise ValueError("Insufficient space available on remote device")
+    except Exception as e:
+        target.fail("check", e)
+        return
+    target.needs_transfer = True
+
+
+def _distribute_site(
+    targets: List[_Target],
+    seed: Optional[_Target],
+    transfer_args: Dict[str, Any],
+    per_site: int,
+    slots: BoundedSemaphore,
+    peer_copy: Optional[PeerCopy],
+) -> None:
+    """Transfer the file to the devices of one site (seed already has it, if not None)."""
+    if peer_copy is not None and seed is None and len(targets) > 1:
+        seed = targets[0]
+        targets = targets[1:]
+        with slots:
+            _upload(seed, transfer_args)
+        if not seed.result["file_verified"]:
+            seed = None
+
+    def transfer(target: _Target) -> None:
+        with slots:
+            if seed is not None and peer_copy is not None:
+                if _peer_copy(target, seed, transfer_args, peer_copy):
+                    return
+            _upload(target, transfer_args)
+
+    with ThreadPoolExecutor(max_workers=per_site) as executor:
+        list(executor.map(transfer, targets))
+
+
+def _upload(target: _Target, transfer_args: Dict[str, Any]) -> None:
+    """Upload the file to target from the local system."""
+    target.result["error"] = None
+    try:
+        with ConnectHandler(**target.params) as net_connect:
+            with FileTransfer(net_connect, **transfer_args) as scp_transfer:
+                scp_transfer.transfer_file()
+                target.result["file_exists"] = True
+                target.result["file_transferred"] = True
+                target.result["source"] = None
+                target.result["file_verified"] = scp_transfer.verify_file()
+    except Exception as e:
+        target.fail("upload", e)
+        return
+    if not target.result["file_verified"]:
+        target.result["error"] = "MD5 failure between source and destination files"
+
+
+def _peer_copy(
+    target: _Target,
+    seed: _Target,
+    transfer_args: Dict[str, Any],
+    peer_copy: PeerCopy,
+) -> bool:
+    """Have target copy the file from seed, return True if it was verified."""
+    try:
+        with ConnectHandler(**target.params) as net_connect:
+            scp_transfer = FileTransfer(net_connect, **transfer_args)
+            peer_copy(scp_transfer, seed.params)
+            target.result["file_exists"] = True
+            target.result["file_transferred"] = True
+            target.result["source"] = seed.result["host"]
+            target.result["file_verified"] = scp_transfer.verify_file()
+    except Exception as e:
+        target.fail(f"copy from {seed.result['host']}", e)
+        return False
+    if not target.result["file_verified"]:
+        log.error(f"{target.result['host']}: MD5 mismatch after copy from seed")
+        return False
+    return True
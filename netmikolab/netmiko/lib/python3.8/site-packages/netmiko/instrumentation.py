@@ -0,0 +1,418 @@
+"""Per-operation latency spans for connections, and exporters aggregating them.
+
+>>> metrics = PrometheusExporter()
+>>> instrumentation = Instrumentation(exporters=[metrics])
+>>> net_connect = ConnectHandler(**device, instrumentation=instrumentation)
+>>> net_connect.send_command("show version")
+>>> print(metrics.render())
+
+Connections record spans for connect, auth, session_preparation, send_command,
+send_command_timing, send_commands, stream_command, send_config_set, read_until_pattern and
+disconnect. Spans nest (eg the read_until_pattern calls of a send_command), and each span
+accounts for everything that happened while it was open, including in the spans nested in
+it.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import paramiko
+
+from netmiko import log
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+
+class Span:
+    """One timed operation of a connection."""
+
+    __slots__ = (
+        "name",
+        "host",
+        "device_type",
+        "parent",
+        "start",
+        "end",
+        "bytes_read",
+        "loop_iterations",
+        "sleep_time",
+        "read_time",
+        "error",
+        "_reading",
+    )
+
+    def __init__(
+        self, name: str, host: str, device_type: str, parent: Optional["Span"] = None
+    ) -> None:
+        self.name = name
+        self.host = host
+        self.device_type = device_type
+        self.parent = parent
+        self.start = time.monotonic()
+        self.end: Optional[float] = None
+        # Characters returned by read_channel() (bytes for ASCII output)
+        self.bytes_read = 0
+        # Iterations of the polling loops waiting for output
+        self.loop_iterations = 0
+        # Seconds spent in time.sleep() by the polling loops
+        self.sleep_time = 0.0
+        # Seconds spent in the channel read loops, waiting on and receiving data (includes
+        # the sleep_time of those loops)
+        self.read_time = 0.0
+        # Name of the exception that ended the span, if any
+        self.error: Optional[str] = None
+        # The ReadTimer accounting read_time to the span, if any
+        self._reading: Optional["ReadTimer"] = None
+
+    @property
+    def duration(self) -> float:
+        end = self.end if self.end is not None else time.monotonic()
+        return end - self.start
+
+    @property
+    def other_time(self) -> float:
+        """Seconds outside the channel read loops (processing, writes, etc)."""
+        return max(self.duration - self.read_time, 0.0)
+
+    def __repr__(self) -> str:
+        return (
+            f"Span({self.name!r}, host={self.host!r}, duration={self.duration:.3f}, "
+            f"bytes_read={self.bytes_read}, loop_iterations={self.loop_iterations}, "
+            f"sleep_time={self.sleep_time:.3f}, read_time={self.read_time:.3f}, "
+            f"error={self.error!r})"
+        )
+
+
+class Instrumentation:
+    """
+    Receive the spans of connections and hand them to the exporters.
+
+    An exporter is any object with an export(span) method, called once the span ended.
+    One Instrumentation can be shared by many connections (and threads).
+    """
+
+    def __init__(self, exporters: Iterable[Any] = ()) -> None:
+        self.exporters: List[Any] = list(exporters)
+
+    def add_exporter(self, exporter: Any) -> None:
+        self.exporters.append(exporter)
+
+    def span_ended(self, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                log.error(f"Span exporter {exporter!r} failed: {e}")
+
+
+class SpanTracker:
+    """The open spans of one connection, and the accounting of the current operation."""
+
+    def __init__(
+        self, instrumentation: Instrumentation, host: str, device_type: str
+    ) -> None:
+        self.instrumentation = instrumentation
+        self.host = host
+        self.device_type = device_type
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        try:
+            return self._local.stack  # type: ignore
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack  # type: ignore
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        span = self.start(name)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            self.end(span)
+
+    def start(self, name: str) -> Span:
+        """Open a name span, nested in the current one. It must be passed to end()."""
+        stack = self._stack()
+        span = Span(
+            name, self.host, self.device_type, parent=stack[-1] if stack else None
+        )
+        stack.append(span)
+        return span
+
+    def end(self, span: Span) -> None:
+        if span._reading is not None:
+            # A read loop left by an exception
+            span._reading.stop()
+        span.end = time.monotonic()
+        self.suspend(span)
+        self.instrumentation.span_ended(span)
+
+    def suspend(self, span: Span) -> None:
+        """Stop accounting to span, eg while a generator has yielded to its caller."""
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)
+
+    def resume(self, span: Span) -> None:
+        stack = self._stack()
+        if span not in stack:
+            span.parent = stack[-1] if stack else None
+            stack.append(span)
+
+    def add_read(self, nbytes: int) -> None:
+        for span in self._stack():
+            span.bytes_read += nbytes
+
+    def add_sleep(self, seconds: float) -> None:
+        for span in self._stack():
+            span.sleep_time += seconds
+
+    def add_loop(self) -> None:
+        for span in self._stack():
+            span.loop_iterations += 1
+
+
+class ReadTimer:
+    """
+    Account the time spent in a channel read loop as read_time of the open spans (does
+    nothing without a tracker).
+
+    A read loop running inside another one only adds to the spans opened within the outer
+    loop, the time is not counted twice. start() is called before the loop and stop() after
+    it; when the loop is left by an exception, the timer is stopped by the end of its spans.
+    """
+
+    def __init__(self, tracker: Optional[SpanTracker]) -> None:
+        self.tracker = tracker
+        self._spans: List[Span] = []
+        self._start = 0.0
+
+    def start(self) -> None:
+        if self.tracker is None:
+            return
+        self._spans = [span for span in self.tracker._stack() if span._reading is None]
+        for span in self._spans:
+            span._reading = self
+        self._start = time.monotonic()
+
+    def stop(self) -> None:
+        if not self._spans:
+            return
+        seconds = time.monotonic() - self._start
+        for span in self._spans:
+            span.read_time += seconds
+            span._reading = None
+        self._spans = []
+
+
+class InstrumentedSSHClient(paramiko.SSHClient):
+    """SSHClient recording the SSH authentication as an 'auth' span."""
+
+    def __init__(self, tracker: SpanTracker) -> None:
+        super().__init__()
+        self._span_tracker = tracker
+
+    def _auth(self, *args: Any, **kwargs: Any) -> None:
+        with self._span_tracker.span("auth"):
+            super()._auth(*args, **kwargs)
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.bytes_read = 0
+        self.loop_iterations = 0
+        self.sleep_time = 0.0
+        self.read_time = 0.0
+        self.errors = 0
+
+
+class HistogramExporter:
+    """
+    Aggregate span durations in memory, per span name and device_type (and host if
+    per_host is set).
+
+    Each histogram also sums the bytes read, loop iterations, sleeping and reading times
+    and errors of its spans.
+    """
+
+    def __init__(
+        self, buckets: Iterable[float] = DEFAULT_BUCKETS, per_host: bool = False
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.per_host = per_host
+        self._histograms: Dict[Tuple[str, ...], _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, span: Span) -> Tuple[str, ...]:
+        if self.per_host:
+            return (span.name, span.device_type, span.host)
+        return (span.name, span.device_type)
+
+    def export(self, span: Span) -> None:
+        duration = span.duration
+        with self._lock:
+            key = self._key(span)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    histogram.bucket_counts[i] += 1
+            histogram.count += 1
+            histogram.sum += duration
+            histogram.bytes_read += span.bytes_read
+            histogram.loop_iterations += span.loop_iterations
+            histogram.sleep_time += span.sleep_time
+            histogram.read_time += span.read_time
+            if span.error is not None:
+                histogram.errors += 1
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+        """
+        Return the histograms, keyed by (name, device_type) or (name, device_type, host).
+
+        'buckets' is a list of (upper bound, cumulative count).
+        """
+        with self._lock:
+            return {
+                key: {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "buckets": list(zip(self.buckets, histogram.bucket_counts)),
+                    "bytes_read": histogram.bytes_read,
+                    "loop_iterations": histogram.loop_iterations,
+                    "sleep_time": histogram.sleep_time,
+                    "read_time": histogram.read_time,
+                    "errors": histogram.errors,
+                }
+                for key, histogram in self._histograms.items()
+            }
+
+    def quantile(self, q: float, name: str, device_type: Optional[str] = None) -> float:
+        """
+        Estimate the q quantile (0 to 1) of the duration of the name spans (of device_type,
+        or of all device types), interpolating within the histogram buckets.
+        """
+        counts = [0] * len(self.buckets)
+        total = 0
+        for key, data in self.snapshot().items():
+            if key[0] != name or (device_type is not None and key[1] != device_type):
+                continue
+            total += data["count"]
+            for i, (_, count) in enumerate(data["buckets"]):
+                counts[i] += count
+        if not total:
+            return 0.0
+        rank = q * total
+        lower_bound, lower_count = 0.0, 0
+        for bound, count in zip(self.buckets, counts):
+            if count >= rank:
+                if count == lower_count:
+                    return bound
+                return lower_bound + (bound - lower_bound) * (rank - lower_count) / (
+                    count - lower_count
+                )
+            lower_bound, lower_count = bound, count
+        # Above the largest bucket
+        return self.buckets[-1]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {}
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class PrometheusExporter(HistogramExporter):
+    """HistogramExporter rendering its histograms in the Prometheus text format."""
+
+    def __init__(
+        self,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+        per_host: bool = False,
+        prefix: str = "netmiko",
+    ) -> None:
+        super().__init__(buckets=buckets, per_host=per_host)
+        self.prefix = prefix
+
+    def _labels(self, key: Tuple[str, ...]) -> str:
+        names = ("operation", "device_type", "host")
+        return ",".join(
+            f'{label}="{_escape_label(value)}"' for label, value in zip(names, key)
+        )
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        snapshot = sorted(self.snapshot().items())
+        metric = f"{self.prefix}_operation_duration_seconds"
+        lines = [
+            f"# HELP {metric} Duration of Netmiko operations.",
+            f"# TYPE {metric} histogram",
+        ]
+        for key, data in snapshot:
+            labels = self._labels(key)
+            for bound, count in data["buckets"]:
+                lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {count}')
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {data["count"]}')
+            lines.append(f"{metric}_sum{{{labels}}} {data['sum']:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {data['count']}")
+
+        counters = (
+            ("sleep_seconds_total", "sleep_time", "Seconds sleeping in polling loops."),
+            ("read_seconds_total", "read_time", "Seconds in channel read loops."),
+            ("bytes_read_total", "bytes_read", "Characters read from the channel."),
+            ("loop_iterations_total", "loop_iterations", "Polling loop iterations."),
+            ("errors_total", "errors", "Operations that raised an exception."),
+        )
+        for suffix, field, help_text in counters:
+            metric = f"{self.prefix}_operation_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for key, data in snapshot:
+                value = data[field]
+                value = f"{value:.6f}" if isinstance(value, float) else str(value)
+                lines.append(f"{metric}{{{self._labels(key)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, file_name: str) -> None:
+        """Write the metrics to file_name (eg for the node_exporter textfile collector)."""
+        # A temp file of its own, write() may run in several threads at once
+        fd, tmp_file = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(file_name)), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render())
+            os.chmod(tmp_file, 0o644)
+            os.replace(tmp_file, file_name)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
@@ -149,6 +149,9 @@ class MikrotikRouterOsFileTransfer(BaseFileTransfer):
         progress: Optional[Callable[..., Any]] = None,
         progress4: Optional[Callable[..., Any]] = None,
         hash_supported: bool = False,
+        buff_size: int = 1048576,
+        use_sftp: bool = False,
+        max_in_flight: int = 64,
     ) -> None:
         super().__init__(
             ssh_conn=ssh_conn,
@@ -160,6 +163,9 @@ class MikrotikRouterOsFileTransfer(BaseFileTransfer):
             progress=progress,
             progress4=progress4,
             hash_supported=hash_supported,
+            buff_size=buff_size,
+            use_sftp=use_sftp,
+            max_in_flight=max_in_flight,
         )
 
     def check_file_exists(self, remote_cmd: str = "") -> bool:
@@ -287,6 +287,9 @@ class NokiaSrosFileTransfer(BaseFileTransfer):
         progress: Optional[Callable[..., Any]] = None,
         progress4: Optional[Callable[..., Any]] = None,
         hash_supported: bool = False,
+        buff_size: int = 1048576,
+        use_sftp: bool = False,
+        max_in_flight: int = 64,
     ) -> None:
         super().__init__(
             ssh_conn=ssh_conn,
@@ -298,6 +301,9 @@ class NokiaSrosFileTransfer(BaseFileTransfer):
             progress=progress,
             progress4=progress4,
             hash_supported=hash_supported,
+            buff_size=buff_size,
+            use_sftp=use_sftp,
+            max_in_flight=max_in_flight,
         )
 
     def _file_cmd_prefix(self) -> str:
@@ -10,7 +10,6 @@ from typing import AnyStr, Optional, Callable, Any, Dict
 from typing import TYPE_CHECKING
 from netmiko.scp_handler import BaseFileTransfer
 from netmiko.ssh_dispatcher import FileTransfer
-from netmiko.cisco.cisco_ios import InLineTransfer
 
 if TYPE_CHECKING:
     from netmiko.base_connection import BaseConnection
@@ -64,11 +63,15 @@ def file_transfer(
     progress: Optional[Callable[..., Any]] = None,
     progress4: Optional[Callable[..., Any]] = None,
     verify_file: Optional[bool] = None,
+    use_sftp: bool = False,
+    max_in_flight: int = 64,
 ) -> Dict[str, bool]:
     """Use Secure Copy or Inline (IOS-only) to transfer files to/from network devices.
 
     inline_transfer ONLY SUPPORTS TEXT FILES and will not support binary file transfers.
 
+    use_sftp copies the file with SFTP, keeping max_in_flight requests outstanding.
+
     return {
         'file_exists': boolean,
         'file_transferred': boolean,
@@ -97,6 +100,8 @@ def file_transfer(
         cisco_ios = False
     if not cisco_ios and inline_transfer:
         raise ValueError("Inline Transfer only supported for Cisco IOS/Cisco IOS-XE")
+    if use_sftp and inline_transfer:
+        raise ValueError("use_sftp cannot be combined with inline_transfer")
 
     # Replace disable_md5 argument with verify_file argument across time
     if verify_file is None:
@@ -113,9 +118,14 @@ def file_transfer(
     }
     if file_system is not None:
         scp_args["file_system"] = file_system
+    if use_sftp:
+        scp_args["use_sftp"] = True
+        scp_args["max_in_flight"] = max_in_flight
 
     TransferClass: Callable[..., BaseFileTransfer]
     if inline_transfer:
+        from netmiko.cisco.cisco_ios import InLineTransfer
+
         TransferClass = InLineTransfer
     else:
         TransferClass = FileTransfer
@@ -6,25 +6,101 @@ Supports file get and file put operations.
 SCP requires a separate SSH connection for a control channel.
 """
 
-from typing import Callable, Optional, Any, Type
+from typing import Callable, Optional, Any, Type, Dict, Tuple
 from typing import TYPE_CHECKING
 from types import TracebackType
+from threading import Lock
 import re
 import os
 import hashlib
+import time
 
+import paramiko
 import scp
 import sys
 
+from netmiko import log
+
 if TYPE_CHECKING:
     from netmiko.base_connection import BaseConnection
 
+MD5_READ_SIZE = 1048576
+MD5_CACHE_SIZE = 256
+
+# MD5 of local files keyed by (path, size, mtime), shared by all transfers in the process
+_md5_cache: Dict[Tuple[str, int, int], str] = {}
+_md5_cache_lock = Lock()
+
+
+def _md5_cache_key(file_name: str) -> Tuple[str, int, int]:
+    stat = os.stat(file_name)
+    return (os.path.realpath(file_name), stat.st_size, stat.st_mtime_ns)
+
+
+def _md5_cache_get(file_name: str) -> Optional[str]:
+    with _md5_cache_lock:
+        return _md5_cache.get(_md5_cache_key(file_name))
+
+
+def _md5_cache_put(key: Tuple[str, int, int], md5: str) -> None:
+    with _md5_cache_lock:
+        if len(_md5_cache) >= MD5_CACHE_SIZE:
+            del _md5_cache[next(iter(_md5_cache))]
+        _md5_cache[key] = md5
+
+
+def cached_file_md5(file_name: str) -> str:
+    """Return the MD5 of a local file, hashing it only if it changed since the last call."""
+    key = _md5_cache_key(file_name)
+    with _md5_cache_lock:
+        cached = _md5_cache.get(key)
+    if cached is not None:
+        return cached
+    file_hash = hashlib.md5()
+    buf = memoryview(bytearray(MD5_READ_SIZE))
+    with open(file_name, "rb", buffering=0) as f:
+        while True:
+            size = f.readinto(buf)
+            if not size:
+                break
+            file_hash.update(buf[:size])
+    md5 = file_hash.hexdigest()
+    _md5_cache_put(key, md5)
+    return md5
+
+
+class _HashingReader(object):
+    """File wrapper that feeds everything read from it into an MD5 hash."""
+
+    def __init__(self, fl: Any) -> None:
+        self.fl = fl
+        self.md5 = hashlib.md5()
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fl.read(size)
+        self.md5.update(data)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buf: Any) -> int:
+        size = self.fl.readinto(buf)
+        self.md5.update(memoryview(buf)[:size])
+        self.bytes_read += size
+        return size
+
+    def tell(self) -> int:
+        return self.fl.tell()
+
 
 class SCPConn(object):
     """
     Establish a secure copy channel to the remote network device.
 
     Must close the SCP connection to get the file to write to the remote filesystem
+
+    With use_sftp the file is copied with SFTP instead, keeping up to max_in_flight read or
+    write requests outstanding.
     """
 
     def __init__(
@@ -33,11 +109,17 @@ class SCPConn(object):
         socket_timeout: float = 10.0,
         progress: Optional[Callable[..., Any]] = None,
         progress4: Optional[Callable[..., Any]] = None,
+        buff_size: int = 1048576,
+        use_sftp: bool = False,
+        max_in_flight: int = 64,
     ) -> None:
         self.ssh_ctl_chan = ssh_conn
         self.socket_timeout = socket_timeout
         self.progress = progress
         self.progress4 = progress4
+        self.buff_size = buff_size
+        self.use_sftp = use_sftp
+        self.max_in_flight = max_in_flight
         self.establish_scp_conn()
 
     def establish_scp_conn(self) -> None:
@@ -45,33 +127,105 @@ class SCPConn(object):
         ssh_connect_params = self.ssh_ctl_chan._connect_params_dict()
         self.scp_conn = self.ssh_ctl_chan._build_ssh_client()
         self.scp_conn.connect(**ssh_connect_params)
-        self.scp_client = scp.SCPClient(
-            self.scp_conn.get_transport(),
-            socket_timeout=self.socket_timeout,
-            progress=self.progress,
-            progress4=self.progress4,
-        )
+        transport = self.scp_conn.get_transport()
+        if self.use_sftp:
+            assert transport is not None
+            self.sftp_client = paramiko.SFTPClient.from_transport(transport)
+            assert self.sftp_client is not None
+            self.sftp_client.get_channel().settimeout(self.socket_timeout)
+        else:
+            self.scp_client = scp.SCPClient(
+                transport,
+                buff_size=self.buff_size,
+                socket_timeout=self.socket_timeout,
+                progress=self.progress,
+                progress4=self.progress4,
+            )
+
+    def _sftp_callback(self, file_name: str) -> Optional[Callable[[int, int], None]]:
+        """Adapt the SCP progress callbacks to the SFTP (sent, size) callback."""
+        peername = self.scp_conn.get_transport().getpeername()  # type: ignore
+        if self.progress4 is not None:
+            progress4 = self.progress4
+            return lambda sent, size: progress4(file_name, size, sent, peername)
+        if self.progress is not None:
+            progress = self.progress
+            return lambda sent, size: progress(file_name, size, sent)
+        return None
 
     def scp_transfer_file(self, source_file: str, dest_file: str) -> None:
         """Put file using SCP (for backwards compatibility)."""
-        self.scp_client.put(source_file, dest_file)
+        self.scp_put_file(source_file, dest_file)
 
     def scp_get_file(self, source_file: str, dest_file: str) -> None:
         """Get file using SCP."""
-        self.scp_client.get(source_file, dest_file)
+        if self.use_sftp:
+            self.sftp_client.get(
+                source_file,
+                dest_file,
+                callback=self._sftp_callback(source_file),
+                max_concurrent_prefetch_requests=self.max_in_flight,
+            )
+        else:
+            self.scp_client.get(source_file, dest_file)
 
     def scp_put_file(self, source_file: str, dest_file: str) -> None:
         """Put file using SCP."""
-        self.scp_client.put(source_file, dest_file)
+        if self.use_sftp:
+            self.sftp_client.put(
+                source_file,
+                dest_file,
+                callback=self._sftp_callback(os.path.basename(source_file)),
+                confirm=False,
+                max_concurrent_requests=self.max_in_flight,
+            )
+        else:
+            self.scp_client.put(source_file, dest_file)
+
+    def scp_put_file_md5(self, source_file: str, dest_file: str) -> Optional[str]:
+        """Put file using SCP, return the MD5 of the data sent (None if not all was sent).
+
+        The file is hashed from the same buffers that are sent, instead of being read twice.
+        """
+        stat = os.stat(source_file)
+        with open(source_file, "rb") as fl:
+            reader = _HashingReader(fl)
+            if self.use_sftp:
+                self.sftp_client.putfo(
+                    reader,
+                    dest_file,
+                    file_size=stat.st_size,
+                    callback=self._sftp_callback(os.path.basename(source_file)),
+                    confirm=False,
+                    max_concurrent_requests=self.max_in_flight,
+                )
+            else:
+                self.scp_client.putfo(
+                    reader, dest_file, mode=oct(stat.st_mode)[-4:], size=stat.st_size
+                )
+        if reader.bytes_read != stat.st_size:
+            return None
+        return reader.md5.hexdigest()
 
     def close(self) -> None:
         """Close the SCP connection."""
+        if self.use_sftp:
+            self.sftp_client.close()
         self.scp_conn.close()
 
 
 class BaseFileTransfer(object):
     """Class to manage SCP file transfer and associated SSH control channel."""
 
+    # Defaults for subclasses that do not call BaseFileTransfer.__init__
+    buff_size = 1048576
+    use_sftp = False
+    max_in_flight = 64
+    transfer_rate: Optional[float] = None
+    # put direction: the local MD5 is computed on first use, or while put_file sends the file
+    _source_md5: Optional[str] = None
+    _source_md5_pending = False
+
     def __init__(
         self,
         ssh_conn: "BaseConnection",
@@ -83,6 +237,9 @@ class BaseFileTransfer(object):
         progress: Optional[Callable[..., Any]] = None,
         progress4: Optional[Callable[..., Any]] = None,
         hash_supported: bool = True,
+        buff_size: int = 1048576,
+        use_sftp: bool = False,
+        max_in_flight: int = 64,
     ) -> None:
         self.ssh_ctl_chan = ssh_conn
         self.source_file = source_file
@@ -91,6 +248,9 @@ class BaseFileTransfer(object):
         self.socket_timeout = socket_timeout
         self.progress = progress
         self.progress4 = progress4
+        self.buff_size = buff_size
+        self.use_sftp = use_sftp
+        self.max_in_flight = max_in_flight
 
         auto_flag = (
             "cisco_ios" in ssh_conn.device_type
@@ -106,7 +266,8 @@ class BaseFileTransfer(object):
             self.file_system = file_system
 
         if direction == "put":
-            self.source_md5 = self.file_md5(source_file) if hash_supported else None
+            self.source_md5 = None
+            self._source_md5_pending = hash_supported
             self.file_size = os.stat(source_file).st_size
         elif direction == "get":
             self.source_md5 = (
@@ -116,6 +277,19 @@ class BaseFileTransfer(object):
         else:
             raise ValueError("Invalid direction specified")
 
+    @property
+    def source_md5(self) -> Optional[str]:
+        """MD5 of the source file."""
+        if self._source_md5_pending:
+            self._source_md5 = self.file_md5(self.source_file)
+            self._source_md5_pending = False
+        return self._source_md5
+
+    @source_md5.setter
+    def source_md5(self, value: Optional[str]) -> None:
+        self._source_md5 = value
+        self._source_md5_pending = False
+
     def __enter__(self) -> "BaseFileTransfer":
         """Context manager setup"""
         self.establish_scp_conn()
@@ -137,6 +311,9 @@ class BaseFileTransfer(object):
             socket_timeout=self.socket_timeout,
             progress=self.progress,
             progress4=self.progress4,
+            buff_size=self.buff_size,
+            use_sftp=self.use_sftp,
+            max_in_flight=self.max_in_flight,
         )
 
     def close_scp_chan(self) -> None:
@@ -334,16 +511,7 @@ class BaseFileTransfer(object):
           add_newline: add newline to end of file contents or not
 
         """
-        file_hash = hashlib.md5()
-        with open(file_name, "rb") as f:
-            while True:
-                file_contents = f.read(512)
-                if not file_contents:
-                    if add_newline:
-                        file_contents + b"\n"
-                    break
-                file_hash.update(file_contents)
-        return file_hash.hexdigest()
+        return cached_file_md5(file_name)
 
     @staticmethod
     def process_md5(md5_output: str, pattern: str = r"=\s+(\S+)") -> str:
@@ -400,15 +568,40 @@ class BaseFileTransfer(object):
     def get_file(self) -> None:
         """SCP copy the file from the remote device to local system."""
         source_file = f"{self.file_system}/{self.source_file}"
+        start = time.monotonic()
         self.scp_conn.scp_get_file(source_file, self.dest_file)
         self.scp_conn.close()
+        self._record_transfer_rate(start)
 
     def put_file(self) -> None:
         """SCP copy the file from the local system to the remote device."""
         destination = f"{self.file_system}/{self.dest_file}"
-        self.scp_conn.scp_transfer_file(self.source_file, destination)
+        start = time.monotonic()
+        if (
+            self._source_md5_pending
+            and type(self).file_md5 is BaseFileTransfer.file_md5
+            and _md5_cache_get(self.source_file) is None
+        ):
+            # Hash the file while it is being sent
+            key = _md5_cache_key(self.source_file)
+            md5 = self.scp_conn.scp_put_file_md5(self.source_file, destination)
+            if md5 is not None and key == _md5_cache_key(self.source_file):
+                _md5_cache_put(key, md5)
+                self.source_md5 = md5
+        else:
+            self.scp_conn.scp_transfer_file(self.source_file, destination)
         # Must close the SCP connection to get the file written (flush)
         self.scp_conn.close()
+        self._record_transfer_rate(start)
+
+    def _record_transfer_rate(self, start: float) -> None:
+        """Set transfer_rate to the MB/s of the transfer that began at start."""
+        elapsed = max(time.monotonic() - start, 1e-6)
+        self.transfer_rate = self.file_size / elapsed / 1e6
+        log.info(
+            f"Transferred {self.file_size} bytes in {elapsed:.2f}s "
+            f"({self.transfer_rate:.2f} MB/s)"
+        )
 
     def verify_file(self) -> bool:
         """Verify the file has been transferred correctly."""
@@ -1,6 +1,13 @@
+import gzip
 import io
+import os
+import queue
+import re
+import shutil
+import threading
+from netmiko import log
 from netmiko.utilities import write_bytes
-from typing import Dict, Any, Union, Optional, TextIO
+from typing import Dict, Any, List, Union, Optional, Pattern, TextIO, Tuple
 
 
 class SessionLog:
@@ -23,6 +30,8 @@ class SessionLog:
         self.file_encoding = file_encoding
         self.record_writes = record_writes
         self._session_log_close = False
+        self._no_log_secrets: Tuple[str, ...] = ()
+        self._no_log_pattern: Optional[Pattern[str]] = None
 
         # Actual file/file-handle/buffered-IO that will be written to.
         self.session_log: Union[io.BufferedIOBase, TextIO, None]
@@ -62,11 +71,27 @@ class SessionLog:
             self.session_log.close()
             self.session_log = None
 
+    def _compile_no_log(self) -> Optional[Pattern[str]]:
+        """Return one pattern matching all the no_log values (rebuilt on change)."""
+        # Longest first, so a secret containing another one is hidden entirely
+        secrets = tuple(
+            sorted({v for v in self.no_log.values() if v}, key=len, reverse=True)
+        )
+        if secrets != self._no_log_secrets:
+            self._no_log_secrets = secrets
+            self._no_log_pattern = (
+                re.compile("|".join(re.escape(secret) for secret in secrets))
+                if secrets
+                else None
+            )
+        return self._no_log_pattern
+
     def no_log_filter(self, data: str) -> str:
         """Filter content from the session_log."""
-        for hidden_data in self.no_log.values():
-            data = data.replace(hidden_data, "********")
-        return data
+        pattern = self._compile_no_log()
+        if pattern is None:
+            return data
+        return pattern.sub("********", data)
 
     def _read_buffer(self) -> str:
         self.slog_buffer.seek(0)
@@ -97,3 +122,202 @@ class SessionLog:
     def write(self, data: str) -> None:
         if len(data) > 0:
             self.slog_buffer.write(data)
+
+
+# Markers queued by AsyncSessionLog.flush() and AsyncSessionLog.close()
+_FLUSH = object()
+_CLOSE = object()
+
+
+class AsyncSessionLog(SessionLog):
+    """
+    SessionLog doing the filtering and the writing in a background thread.
+
+    write() only queues the data (it blocks if queue_size chunks are already waiting).
+    The writer thread hides the no_log data, writes the queued chunks in batches and, if
+    max_bytes is set, rotates the file once it exceeds max_bytes. backup_count rotated
+    files are kept, gzip-compressed if compress is set (file_name.1.gz is the newest).
+
+    Unlike SessionLog, the data is not held in memory until flush(): only the end of
+    the data that could be the beginning of a no_log value is held back.
+    """
+
+    def __init__(
+        self,
+        file_name: Optional[str] = None,
+        buffered_io: Optional[io.BufferedIOBase] = None,
+        file_mode: str = "write",
+        file_encoding: str = "utf-8",
+        no_log: Optional[Dict[str, Any]] = None,
+        record_writes: bool = False,
+        max_bytes: int = 0,
+        backup_count: int = 5,
+        compress: bool = True,
+        queue_size: int = 1000,
+        batch_size: int = 65536,
+    ) -> None:
+        """
+        :param max_bytes: Rotate the session log file once it is larger than this (0
+            never rotates; rotation only applies to file_name).
+
+        :param backup_count: Number of rotated files to keep.
+
+        :param compress: gzip the rotated files.
+
+        :param queue_size: Number of written chunks that can wait for the writer thread.
+
+        :param batch_size: Number of characters written to the file at once at most.
+        """
+        super().__init__(
+            file_name=file_name,
+            buffered_io=buffered_io,
+            file_mode=file_mode,
+            file_encoding=file_encoding,
+            no_log=no_log,
+            record_writes=record_writes,
+        )
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._bytes_written = 0
+
+    def open(self) -> None:
+        """Open the session_log file and start the writer thread."""
+        if self.file_name is not None and self.session_log is None:
+            super().open()
+            if self.file_mode == "append" and self.file_name is not None:
+                self._bytes_written = os.path.getsize(self.file_name)
+        self._start()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._run, name="netmiko-session-log", daemon=True
+                )
+                self._writer.start()
+
+    def write(self, data: str) -> None:
+        if len(data) > 0:
+            if self._writer is None:
+                self._start()
+            self._queue.put(data)
+
+    def flush(self) -> None:
+        """Have the writer thread write out everything queued so far (does not wait)."""
+        if self._writer is not None:
+            self._queue.put(_FLUSH)
+
+    def close(self) -> None:
+        """Write out everything queued, stop the writer thread and close the file."""
+        if self._writer is not None:
+            self._queue.put(_CLOSE)
+            self._writer.join()
+            self._writer = None
+        if self.session_log and self._session_log_close:
+            self.session_log.close()
+            self.session_log = None
+
+    def _run(self) -> None:
+        tail = ""
+        while True:
+            item = self._queue.get()
+            chunks: List[str] = []
+            size = 0
+            # Batch everything already queued into a single write
+            while item is not _FLUSH and item is not _CLOSE:
+                chunks.append(item)
+                size += len(item)
+                if size >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            data = tail + "".join(chunks)
+            if item is _FLUSH or item is _CLOSE:
+                tail = ""
+            else:
+                data, tail = self._split_tail(data)
+            try:
+                self._write_out(self.no_log_filter(data))
+            except Exception as e:
+                log.error(f"Session log write failed: {e}")
+            if item is _CLOSE:
+                return
+
+    def _split_tail(self, data: str) -> Tuple[str, str]:
+        """
+        Split data before the point where the beginning of a no_log value could still
+        be completed by the next chunk.
+        """
+        pattern = self._compile_no_log()
+        if pattern is None:
+            return data, ""
+        cut = max(len(data) - len(self._no_log_secrets[0]) + 1, 0)
+        for match in pattern.finditer(data):
+            if match.start() < cut < match.end():
+                cut = match.start()
+                break
+        return data[:cut], data[cut:]
+
+    def _write_out(self, data: str) -> None:
+        if self.session_log is None or not data:
+            return
+        rotating = bool(
+            self.max_bytes and self.file_name is not None and self._session_log_close
+        )
+        while data:
+            part = data
+            if rotating:
+                # Split the batch where the file reaches max_bytes
+                part = self._fit(data, self.max_bytes - self._bytes_written)
+                if not part and self._bytes_written == 0:
+                    # A single character larger than max_bytes
+                    part = data[:1]
+            if part:
+                self._write_part(part)
+                data = data[len(part) :]
+            if rotating and (data or self._bytes_written >= self.max_bytes):
+                self._rotate()
+        self.session_log.flush()
+
+    def _fit(self, data: str, max_size: int) -> str:
+        """Return the longest start of data that encodes to at most max_size bytes."""
+        out_data = data.encode(self.file_encoding)
+        if len(out_data) <= max_size:
+            return data
+        return out_data[: max(max_size, 0)].decode(self.file_encoding, errors="ignore")
+
+    def _write_part(self, data: str) -> None:
+        assert self.session_log is not None
+        if isinstance(self.session_log, io.BufferedIOBase):
+            out_data = write_bytes(data, encoding=self.file_encoding)
+            self.session_log.write(out_data)
+            self._bytes_written += len(out_data)
+        else:
+            self.session_log.write(data)
+            self._bytes_written += len(data.encode(self.file_encoding))
+
+    def _rotate(self) -> None:
+        assert self.file_name is not None and self.session_log is not None
+        self.session_log.close()
+        suffix = ".gz" if self.compress else ""
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                older = f"{self.file_name}.{i}{suffix}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.file_name}.{i + 1}{suffix}")
+            if self.compress:
+                with open(self.file_name, "rb") as f_in:
+                    with gzip.open(f"{self.file_name}.1.gz", "wb") as f_out:
+                        shutil.copyfileobj(f_in, f_out)
+                os.remove(self.file_name)
+            else:
+                os.replace(self.file_name, f"{self.file_name}.1")
+        self.session_log = open(self.file_name, mode="w", encoding=self.file_encoding)
+        self._bytes_written = 0
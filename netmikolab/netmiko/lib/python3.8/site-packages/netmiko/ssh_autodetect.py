@@ -37,14 +37,24 @@ Examples
 # Netmiko connection creation section
 >>> remote_device['device_type'] = best_match
 >>> connection = ConnectHandler(**remote_device)
+
+# Many devices at once, remembering the results between runs
+>>> cache = AutodetectCache("~/.netmiko/autodetect.json")
+>>> device_types = autodetect_many(devices, max_workers=50, detect_cache=cache)
 """
 
-from typing import Any, List, Optional, Union, Dict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, List, Optional, Sequence, Tuple, Union, Dict
+import json
+import os
 import re
+import tempfile
 import time
 
 import paramiko
 
+from netmiko import log
 from netmiko.ssh_dispatcher import ConnectHandler
 from netmiko.base_connection import BaseConnection
 
@@ -332,6 +342,90 @@ SSH_MAPPER_BASE = sorted(
 )
 SSH_MAPPER_BASE.reverse()
 
+# SSH_MAPPER_BASE grouped by (dispatch, cmd), in order of first appearance: each command is
+# sent once and the output is matched against every device_type that uses it
+SSH_MAPPER_GROUPS: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any]]]] = {}
+for k, v in SSH_MAPPER_BASE:
+    group_key = (str(v["dispatch"]), str(v["cmd"]))
+    SSH_MAPPER_GROUPS.setdefault(group_key, []).append((k, v))
+
+
+class AutodetectCache(object):
+    """
+    Results of SSHDetect.autodetect() keyed by host, port, SSH server version string and host
+    key fingerprint, so a device is only probed again if one of them changes.
+
+    Optionally persisted as JSON in cache_file. One cache can be shared by many threads.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None, autosave: bool = True) -> None:
+        """
+        :param cache_file: JSON file holding the cache (default: None, memory only).
+
+        :param autosave: Write cache_file every time a result is added (default: True).
+        """
+        self.cache_file = os.path.expanduser(cache_file) if cache_file else None
+        self.autosave = autosave
+        self._entries: Dict[str, str] = {}
+        self._lock = Lock()
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                log.warning(
+                    f"Ignoring unreadable autodetect cache {self.cache_file}: {e}"
+                )
+
+    @staticmethod
+    def make_key(connection: BaseConnection) -> Optional[str]:
+        """Return the cache key of an SSH connection, None if it is not a paramiko session."""
+        remote_conn = connection.remote_conn
+        if (
+            not isinstance(remote_conn, paramiko.Channel)
+            or remote_conn.transport is None
+        ):
+            return None
+        transport = remote_conn.transport
+        host_key = transport.get_remote_server_key()
+        fingerprint = host_key.get_fingerprint().hex()
+        return (
+            f"{connection.host}:{connection.port}|{transport.remote_version}|"
+            f"{host_key.get_name()}:{fingerprint}"
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, device_type: str, autosave: Optional[bool] = None) -> None:
+        """Add a result, saving cache_file if autosave (default: self.autosave)."""
+        with self._lock:
+            self._entries[key] = device_type
+        if autosave is None:
+            autosave = self.autosave
+        if autosave:
+            self.save()
+
+    def save(self) -> None:
+        """Write the cache to cache_file."""
+        if not self.cache_file:
+            return
+        # Under the lock, so an older snapshot never replaces a newer one; the temp file is
+        # unique so other processes sharing cache_file do not clash either
+        with self._lock:
+            data = json.dumps(self._entries, indent=0, sort_keys=True)
+            fd, tmp_file = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.cache_file)), suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp_file, self.cache_file)
+            except BaseException:
+                os.unlink(tmp_file)
+                raise
+
 
 class SSHDetect(object):
     """
@@ -360,15 +454,35 @@ class SSHDetect(object):
         Try to determine the device type.
     """
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        *args: Any,
+        detect_cache: Optional[AutodetectCache] = None,
+        **kwargs: Any,
+    ) -> None:
         """
         Constructor of the SSHDetect class
+
+        detect_cache is an optional AutodetectCache: a device found in it is not probed.
         """
         if kwargs["device_type"] != "autodetect":
             raise ValueError("The connection device_type must be 'autodetect'")
         # Always set cmd_verify to False for autodetect
         kwargs["global_cmd_verify"] = False
         self.connection = ConnectHandler(*args, **kwargs)
+        self.potential_matches: Dict[str, int] = {}
+        self._results_cache: Dict[str, str] = {}
+        self.initial_buffer = ""
+
+        self.detect_cache = detect_cache
+        self._detect_cache_key: Optional[str] = None
+        self.cached_match: Optional[str] = None
+        if detect_cache is not None:
+            self._detect_cache_key = detect_cache.make_key(self.connection)
+            if self._detect_cache_key is not None:
+                self.cached_match = detect_cache.get(self._detect_cache_key)
+        if self.cached_match is not None:
+            return
 
         # Add additional sleep to let the login complete.
         time.sleep(3)
@@ -376,48 +490,59 @@ class SSHDetect(object):
         # Call the _test_channel_read() in base to clear initial data
         output = BaseConnection._test_channel_read(self.connection)
         self.initial_buffer = output
-        self.potential_matches: Dict[str, int] = {}
-        self._results_cache: Dict[str, str] = {}
 
-    def autodetect(self) -> Union[str, None]:
+    def autodetect(self, autosave: Optional[bool] = None) -> Union[str, None]:
         """
         Try to guess the best 'device_type' based on patterns defined in SSH_MAPPER_BASE
 
+        Parameters
+        ----------
+        autosave : bool or None
+            Whether the detect_cache file is written when the result is added to it (default:
+            the autosave setting of the cache).
+
         Returns
         -------
         best_match : str or None
             The device type that is currently the best to use to interact with the device
         """
-        for device_type, autodetect_dict in SSH_MAPPER_BASE:
-            tmp_dict = autodetect_dict.copy()
-            call_method = tmp_dict.pop("dispatch")
-            assert isinstance(call_method, str)
-            autodetect_method = getattr(self, call_method)
-            accuracy = autodetect_method(**tmp_dict)
-            if accuracy:
-                self.potential_matches[device_type] = accuracy
-                if accuracy >= 99:  # Stop the loop as we are sure of our match
-                    best_match = sorted(
-                        self.potential_matches.items(), key=lambda t: t[1], reverse=True
-                    )
-                    # WLC needs two different auto-dectect solutions
-                    if "cisco_wlc_85" in best_match[0]:
-                        best_match[0] = ("cisco_wlc", 99)
-                    # IOS XR needs two different auto-dectect solutions
-                    if "cisco_xr_2" in best_match[0]:
-                        best_match[0] = ("cisco_xr", 99)
-                    self.connection.disconnect()
-                    return best_match[0][0]
+        if self.cached_match is not None:
+            self.connection.disconnect()
+            return self.cached_match
+
+        for group in SSH_MAPPER_GROUPS.values():
+            # Every device_type of the group is checked against the same (cached) output
+            for device_type, autodetect_dict in group:
+                tmp_dict = autodetect_dict.copy()
+                call_method = tmp_dict.pop("dispatch")
+                assert isinstance(call_method, str)
+                autodetect_method = getattr(self, call_method)
+                accuracy = autodetect_method(**tmp_dict)
+                if accuracy:
+                    self.potential_matches[device_type] = accuracy
+            if any(accuracy >= 99 for accuracy in self.potential_matches.values()):
+                # Stop probing as we are sure of our match
+                break
 
+        self.connection.disconnect()
         if not self.potential_matches:
-            self.connection.disconnect()
             return None
 
         best_match = sorted(
             self.potential_matches.items(), key=lambda t: t[1], reverse=True
         )
-        self.connection.disconnect()
-        return best_match[0][0]
+        # WLC needs two different auto-dectect solutions
+        if "cisco_wlc_85" in best_match[0]:
+            best_match[0] = ("cisco_wlc", 99)
+        # IOS XR needs two different auto-dectect solutions
+        if "cisco_xr_2" in best_match[0]:
+            best_match[0] = ("cisco_xr", 99)
+        device_type = best_match[0][0]
+        if self.detect_cache is not None and self._detect_cache_key is not None:
+            self.detect_cache.set(
+                self._detect_cache_key, device_type, autosave=autosave
+            )
+        return device_type
 
     def _send_command(self, cmd: str = "") -> str:
         """
@@ -467,7 +592,7 @@ class SSHDetect(object):
         search_patterns: Optional[List[str]] = None,
         re_flags: int = re.IGNORECASE,
         priority: int = 99,
-        **kwargs: Any
+        **kwargs: Any,
     ) -> int:
         """
         Method to try auto-detect the device type, by matching a regular expression on the reported
@@ -555,3 +680,38 @@ class SSHDetect(object):
         except Exception:
             return 0
         return 0
+
+
+def autodetect_many(
+    devices: Sequence[Dict[str, Any]],
+    max_workers: int = 20,
+    detect_cache: Optional[AutodetectCache] = None,
+) -> List[Optional[str]]:
+    """
+    Run SSHDetect.autodetect() on many devices concurrently.
+
+    devices are Netmiko connection dictionaries (device_type is set to 'autodetect'). Returns
+    the detected device_type of each device, in the order of devices (None if it could not be
+    detected or the connection failed).
+
+    With an autosave detect_cache, its cache_file is written once after all devices.
+    """
+
+    def detect(device: Dict[str, Any]) -> Optional[str]:
+        params = dict(device, device_type="autodetect")
+        try:
+            # The cache is saved once at the end instead of after every device
+            return SSHDetect(detect_cache=detect_cache, **params).autodetect(
+                autosave=False
+            )
+        except Exception as e:
+            host = params.get("host") or params.get("ip")
+            log.error(f"Autodetect failed for {host}: {e}")
+            return None
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(detect, devices))
+    finally:
+        if detect_cache is not None and detect_cache.autosave:
+            detect_cache.save()
@@ -1,372 +1,468 @@
 """Controls selection of proper class based on the device type."""
 
-from typing import Any, Type, Optional
+from typing import Any, Dict, Iterator, MutableMapping, Type, Optional
 from typing import TYPE_CHECKING
+import importlib
 import re
 from netmiko.exceptions import ConnectionException
 from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationException
-from netmiko.a10 import A10SSH
-from netmiko.accedian import AccedianSSH
-from netmiko.adtran import AdtranOSSSH, AdtranOSTelnet
-from netmiko.adva import AdvaAosFsp150F3SSH, AdvaAosFsp150F2SSH
-from netmiko.alcatel import AlcatelAosSSH
-from netmiko.allied_telesis import AlliedTelesisAwplusSSH
-from netmiko.arista import AristaSSH, AristaTelnet
-from netmiko.arista import AristaFileTransfer
-from netmiko.arris import ArrisCERSSH
-from netmiko.apresia import ApresiaAeosSSH, ApresiaAeosTelnet
-from netmiko.aruba import ArubaOsSSH, ArubaCxSSH
-from netmiko.audiocode import (
-    Audiocode72SSH,
-    Audiocode66SSH,
-    AudiocodeShellSSH,
-    Audiocode72Telnet,
-    Audiocode66Telnet,
-    AudiocodeShellTelnet,
-)
-from netmiko.brocade import BrocadeFOSSSH
-from netmiko.broadcom import BroadcomIcosSSH
-from netmiko.calix import CalixB6SSH, CalixB6Telnet
-from netmiko.casa import CasaCMTSSSH
-from netmiko.cdot import CdotCrosSSH
-from netmiko.centec import CentecOSSSH, CentecOSTelnet
-from netmiko.checkpoint import CheckPointGaiaSSH
-from netmiko.ciena import CienaSaosSSH, CienaSaosTelnet, CienaSaosFileTransfer
-from netmiko.cisco import CiscoAsaSSH, CiscoAsaFileTransfer
-from netmiko.cisco import CiscoFtdSSH
-from netmiko.cisco import (
-    CiscoIosSSH,
-    CiscoIosFileTransfer,
-    CiscoIosTelnet,
-    CiscoIosSerial,
-)
-from netmiko.cisco import CiscoNxosSSH, CiscoNxosFileTransfer
-from netmiko.cisco import CiscoS200SSH, CiscoS200Telnet
-from netmiko.cisco import CiscoS300SSH, CiscoS300Telnet
-from netmiko.cisco import CiscoTpTcCeSSH
-from netmiko.cisco import CiscoViptelaSSH
-from netmiko.cisco import CiscoWlcSSH
-from netmiko.cisco import CiscoXrSSH, CiscoXrTelnet, CiscoXrFileTransfer
-from netmiko.citrix import NetscalerSSH
-from netmiko.cloudgenix import CloudGenixIonSSH
-from netmiko.coriant import CoriantSSH
-from netmiko.dell import DellDNOS6SSH
-from netmiko.dell import DellDNOS6Telnet
-from netmiko.dell import DellForce10SSH
-from netmiko.dell import DellOS10SSH, DellOS10FileTransfer
-from netmiko.dell import DellSonicSSH
-from netmiko.dell import DellPowerConnectSSH
-from netmiko.dell import DellPowerConnectTelnet
-from netmiko.dell import DellIsilonSSH
-from netmiko.digi import DigiTransportSSH
-from netmiko.dlink import DlinkDSTelnet, DlinkDSSSH
-from netmiko.eltex import EltexSSH, EltexEsrSSH
-from netmiko.endace import EndaceSSH
-from netmiko.enterasys import EnterasysSSH
-from netmiko.ericsson import (
-    EricssonIposSSH,
-    EricssonMinilink63SSH,
-    EricssonMinilink66SSH,
-)
-from netmiko.extreme import ExtremeErsSSH
-from netmiko.extreme import ExtremeExosSSH, ExtremeExosFileTransfer
-from netmiko.extreme import ExtremeExosTelnet
-from netmiko.extreme import ExtremeNetironSSH
-from netmiko.extreme import ExtremeNetironTelnet
-from netmiko.extreme import ExtremeNosSSH
-from netmiko.extreme import ExtremeSlxSSH
-from netmiko.extreme import ExtremeTierraSSH
-from netmiko.extreme import ExtremeVspSSH
-from netmiko.extreme import ExtremeWingSSH
-from netmiko.f5 import F5TmshSSH
-from netmiko.f5 import F5LinuxSSH
-from netmiko.fiberstore import FiberstoreFsosSSH
-from netmiko.flexvnf import FlexvnfSSH
-from netmiko.fortinet import FortinetSSH
-from netmiko.hillstone import HillstoneStoneosSSH
-from netmiko.hp import HPProcurveSSH, HPProcurveTelnet, HPComwareSSH, HPComwareTelnet
-from netmiko.huawei import HuaweiSSH, HuaweiVrpv8SSH, HuaweiTelnet
-from netmiko.huawei import HuaweiSmartAXSSH
-from netmiko.ipinfusion import IpInfusionOcNOSSSH, IpInfusionOcNOSTelnet
-from netmiko.juniper import JuniperSSH, JuniperTelnet, JuniperScreenOsSSH
-from netmiko.juniper import JuniperFileTransfer
-from netmiko.keymile import KeymileSSH, KeymileNOSSSH
-from netmiko.linux import LinuxSSH, LinuxFileTransfer
-from netmiko.maipu import MaipuSSH
-from netmiko.maipu import MaipuTelnet
-from netmiko.mikrotik import MikrotikRouterOsSSH, MikrotikRouterOsFileTransfer
-from netmiko.mikrotik import MikrotikSwitchOsSSH
-from netmiko.mellanox import MellanoxMlnxosSSH
-from netmiko.mrv import MrvLxSSH
-from netmiko.mrv import MrvOptiswitchSSH
-from netmiko.netapp import NetAppcDotSSH
-from netmiko.nokia import (
-    NokiaSrosSSH,
-    NokiaSrosFileTransfer,
-    NokiaSrosTelnet,
-    NokiaSrlSSH,
-)
-from netmiko.netgear import NetgearProSafeSSH
-from netmiko.oneaccess import OneaccessOneOSTelnet, OneaccessOneOSSSH
-from netmiko.ovs import OvsLinuxSSH
-from netmiko.paloalto import PaloAltoPanosSSH
-from netmiko.paloalto import PaloAltoPanosTelnet
-from netmiko.pluribus import PluribusSSH
-from netmiko.quanta import QuantaMeshSSH
-from netmiko.rad import RadETXSSH
-from netmiko.rad import RadETXTelnet
-from netmiko.raisecom import RaisecomRoapSSH
-from netmiko.raisecom import RaisecomRoapTelnet
-from netmiko.ruckus import RuckusFastironSSH
-from netmiko.ruckus import RuckusFastironTelnet
-from netmiko.ruijie import RuijieOSSSH, RuijieOSTelnet
-from netmiko.sixwind import SixwindOSSSH
-from netmiko.sophos import SophosSfosSSH
-from netmiko.teldat import TeldatCITSSH, TeldatCITTelnet
-from netmiko.terminal_server import TerminalServerSSH
-from netmiko.terminal_server import TerminalServerTelnet
-from netmiko.tplink import TPLinkJetStreamSSH, TPLinkJetStreamTelnet
-from netmiko.ubiquiti import UbiquitiEdgeRouterSSH, UbiquitiEdgeRouterFileTransfer
-from netmiko.ubiquiti import UbiquitiEdgeSSH
-from netmiko.ubiquiti import UbiquitiUnifiSwitchSSH
-from netmiko.vyos import VyOSSSH
-from netmiko.watchguard import WatchguardFirewareSSH
-from netmiko.yamaha import YamahaSSH
-from netmiko.yamaha import YamahaTelnet
-from netmiko.zte import ZteZxrosSSH
-from netmiko.zte import ZteZxrosTelnet
-from netmiko.supermicro import SmciSwitchSmisSSH
-from netmiko.supermicro import SmciSwitchSmisTelnet
-from netmiko.zyxel import ZyxelSSH
+
+# Package of each platform class. Vendor packages are only imported when one of their
+# device_types is used, so 'import netmiko' does not load every driver.
+_CLASS_MODULES = {
+    "A10SSH": "netmiko.a10",
+    "AccedianSSH": "netmiko.accedian",
+    "AdtranOSSSH": "netmiko.adtran",
+    "AdtranOSTelnet": "netmiko.adtran",
+    "AdvaAosFsp150F2SSH": "netmiko.adva",
+    "AdvaAosFsp150F3SSH": "netmiko.adva",
+    "AlcatelAosSSH": "netmiko.alcatel",
+    "AlliedTelesisAwplusSSH": "netmiko.allied_telesis",
+    "ApresiaAeosSSH": "netmiko.apresia",
+    "ApresiaAeosTelnet": "netmiko.apresia",
+    "AristaFileTransfer": "netmiko.arista",
+    "AristaSSH": "netmiko.arista",
+    "AristaTelnet": "netmiko.arista",
+    "ArrisCERSSH": "netmiko.arris",
+    "ArubaCxSSH": "netmiko.aruba",
+    "ArubaOsSSH": "netmiko.aruba",
+    "Audiocode66SSH": "netmiko.audiocode",
+    "Audiocode66Telnet": "netmiko.audiocode",
+    "Audiocode72SSH": "netmiko.audiocode",
+    "Audiocode72Telnet": "netmiko.audiocode",
+    "AudiocodeShellSSH": "netmiko.audiocode",
+    "AudiocodeShellTelnet": "netmiko.audiocode",
+    "BroadcomIcosSSH": "netmiko.broadcom",
+    "BrocadeFOSSSH": "netmiko.brocade",
+    "CalixB6SSH": "netmiko.calix",
+    "CalixB6Telnet": "netmiko.calix",
+    "CasaCMTSSSH": "netmiko.casa",
+    "CdotCrosSSH": "netmiko.cdot",
+    "CentecOSSSH": "netmiko.centec",
+    "CentecOSTelnet": "netmiko.centec",
+    "CheckPointGaiaSSH": "netmiko.checkpoint",
+    "CienaSaosFileTransfer": "netmiko.ciena",
+    "CienaSaosSSH": "netmiko.ciena",
+    "CienaSaosTelnet": "netmiko.ciena",
+    "CiscoAsaFileTransfer": "netmiko.cisco",
+    "CiscoAsaSSH": "netmiko.cisco",
+    "CiscoFtdSSH": "netmiko.cisco",
+    "CiscoIosFileTransfer": "netmiko.cisco",
+    "CiscoIosSSH": "netmiko.cisco",
+    "CiscoIosSerial": "netmiko.cisco",
+    "CiscoIosTelnet": "netmiko.cisco",
+    "CiscoNxosFileTransfer": "netmiko.cisco",
+    "CiscoNxosSSH": "netmiko.cisco",
+    "CiscoS200SSH": "netmiko.cisco",
+    "CiscoS200Telnet": "netmiko.cisco",
+    "CiscoS300SSH": "netmiko.cisco",
+    "CiscoS300Telnet": "netmiko.cisco",
+    "CiscoTpTcCeSSH": "netmiko.cisco",
+    "CiscoViptelaSSH": "netmiko.cisco",
+    "CiscoWlcSSH": "netmiko.cisco",
+    "CiscoXrFileTransfer": "netmiko.cisco",
+    "CiscoXrSSH": "netmiko.cisco",
+    "CiscoXrTelnet": "netmiko.cisco",
+    "CloudGenixIonSSH": "netmiko.cloudgenix",
+    "CoriantSSH": "netmiko.coriant",
+    "DellDNOS6SSH": "netmiko.dell",
+    "DellDNOS6Telnet": "netmiko.dell",
+    "DellForce10SSH": "netmiko.dell",
+    "DellIsilonSSH": "netmiko.dell",
+    "DellOS10FileTransfer": "netmiko.dell",
+    "DellOS10SSH": "netmiko.dell",
+    "DellPowerConnectSSH": "netmiko.dell",
+    "DellPowerConnectTelnet": "netmiko.dell",
+    "DellSonicSSH": "netmiko.dell",
+    "DigiTransportSSH": "netmiko.digi",
+    "DlinkDSSSH": "netmiko.dlink",
+    "DlinkDSTelnet": "netmiko.dlink",
+    "EltexEsrSSH": "netmiko.eltex",
+    "EltexSSH": "netmiko.eltex",
+    "EndaceSSH": "netmiko.endace",
+    "EnterasysSSH": "netmiko.enterasys",
+    "EricssonIposSSH": "netmiko.ericsson",
+    "EricssonMinilink63SSH": "netmiko.ericsson",
+    "EricssonMinilink66SSH": "netmiko.ericsson",
+    "ExtremeErsSSH": "netmiko.extreme",
+    "ExtremeExosFileTransfer": "netmiko.extreme",
+    "ExtremeExosSSH": "netmiko.extreme",
+    "ExtremeExosTelnet": "netmiko.extreme",
+    "ExtremeNetironSSH": "netmiko.extreme",
+    "ExtremeNetironTelnet": "netmiko.extreme",
+    "ExtremeNosSSH": "netmiko.extreme",
+    "ExtremeSlxSSH": "netmiko.extreme",
+    "ExtremeTierraSSH": "netmiko.extreme",
+    "ExtremeVspSSH": "netmiko.extreme",
+    "ExtremeWingSSH": "netmiko.extreme",
+    "F5LinuxSSH": "netmiko.f5",
+    "F5TmshSSH": "netmiko.f5",
+    "FiberstoreFsosSSH": "netmiko.fiberstore",
+    "FlexvnfSSH": "netmiko.flexvnf",
+    "FortinetSSH": "netmiko.fortinet",
+    "HPComwareSSH": "netmiko.hp",
+    "HPComwareTelnet": "netmiko.hp",
+    "HPProcurveSSH": "netmiko.hp",
+    "HPProcurveTelnet": "netmiko.hp",
+    "HillstoneStoneosSSH": "netmiko.hillstone",
+    "HuaweiSSH": "netmiko.huawei",
+    "HuaweiSmartAXSSH": "netmiko.huawei",
+    "HuaweiTelnet": "netmiko.huawei",
+    "HuaweiVrpv8SSH": "netmiko.huawei",
+    "IpInfusionOcNOSSSH": "netmiko.ipinfusion",
+    "IpInfusionOcNOSTelnet": "netmiko.ipinfusion",
+    "JuniperFileTransfer": "netmiko.juniper",
+    "JuniperSSH": "netmiko.juniper",
+    "JuniperScreenOsSSH": "netmiko.juniper",
+    "JuniperTelnet": "netmiko.juniper",
+    "KeymileNOSSSH": "netmiko.keymile",
+    "KeymileSSH": "netmiko.keymile",
+    "LinuxFileTransfer": "netmiko.linux",
+    "LinuxSSH": "netmiko.linux",
+    "MaipuSSH": "netmiko.maipu",
+    "MaipuTelnet": "netmiko.maipu",
+    "MellanoxMlnxosSSH": "netmiko.mellanox",
+    "MikrotikRouterOsFileTransfer": "netmiko.mikrotik",
+    "MikrotikRouterOsSSH": "netmiko.mikrotik",
+    "MikrotikSwitchOsSSH": "netmiko.mikrotik",
+    "MrvLxSSH": "netmiko.mrv",
+    "MrvOptiswitchSSH": "netmiko.mrv",
+    "NetAppcDotSSH": "netmiko.netapp",
+    "NetgearProSafeSSH": "netmiko.netgear",
+    "NetscalerSSH": "netmiko.citrix",
+    "NokiaSrlSSH": "netmiko.nokia",
+    "NokiaSrosFileTransfer": "netmiko.nokia",
+    "NokiaSrosSSH": "netmiko.nokia",
+    "NokiaSrosTelnet": "netmiko.nokia",
+    "OneaccessOneOSSSH": "netmiko.oneaccess",
+    "OneaccessOneOSTelnet": "netmiko.oneaccess",
+    "OvsLinuxSSH": "netmiko.ovs",
+    "PaloAltoPanosSSH": "netmiko.paloalto",
+    "PaloAltoPanosTelnet": "netmiko.paloalto",
+    "PluribusSSH": "netmiko.pluribus",
+    "QuantaMeshSSH": "netmiko.quanta",
+    "RadETXSSH": "netmiko.rad",
+    "RadETXTelnet": "netmiko.rad",
+    "RaisecomRoapSSH": "netmiko.raisecom",
+    "RaisecomRoapTelnet": "netmiko.raisecom",
+    "RuckusFastironSSH": "netmiko.ruckus",
+    "RuckusFastironTelnet": "netmiko.ruckus",
+    "RuijieOSSSH": "netmiko.ruijie",
+    "RuijieOSTelnet": "netmiko.ruijie",
+    "SixwindOSSSH": "netmiko.sixwind",
+    "SmciSwitchSmisSSH": "netmiko.supermicro",
+    "SmciSwitchSmisTelnet": "netmiko.supermicro",
+    "SophosSfosSSH": "netmiko.sophos",
+    "TPLinkJetStreamSSH": "netmiko.tplink",
+    "TPLinkJetStreamTelnet": "netmiko.tplink",
+    "TeldatCITSSH": "netmiko.teldat",
+    "TeldatCITTelnet": "netmiko.teldat",
+    "TerminalServerSSH": "netmiko.terminal_server",
+    "TerminalServerTelnet": "netmiko.terminal_server",
+    "UbiquitiEdgeRouterFileTransfer": "netmiko.ubiquiti",
+    "UbiquitiEdgeRouterSSH": "netmiko.ubiquiti",
+    "UbiquitiEdgeSSH": "netmiko.ubiquiti",
+    "UbiquitiUnifiSwitchSSH": "netmiko.ubiquiti",
+    "VyOSSSH": "netmiko.vyos",
+    "WatchguardFirewareSSH": "netmiko.watchguard",
+    "YamahaSSH": "netmiko.yamaha",
+    "YamahaTelnet": "netmiko.yamaha",
+    "ZteZxrosSSH": "netmiko.zte",
+    "ZteZxrosTelnet": "netmiko.zte",
+    "ZyxelSSH": "netmiko.zyxel",
+}
+_CLASS_ALIASES = {
+    "GenericSSH": "TerminalServerSSH",
+    "GenericTelnet": "TerminalServerTelnet",
+}
 
 
 if TYPE_CHECKING:
     from netmiko.base_connection import BaseConnection
     from netmiko.scp_handler import BaseFileTransfer
 
-GenericSSH = TerminalServerSSH
-GenericTelnet = TerminalServerTelnet
+
+def _load_class(name: str) -> Type[Any]:
+    """Import the package of a platform class and return the class."""
+    name = _CLASS_ALIASES.get(name, name)
+    module = importlib.import_module(_CLASS_MODULES[name])
+    platform_class: Type[Any] = getattr(module, name)
+    return platform_class
+
+
+def __getattr__(name: str) -> Any:
+    """Platform classes (eg ssh_dispatcher.CiscoIosSSH) are imported on first access."""
+    if name in _CLASS_MODULES or name in _CLASS_ALIASES:
+        return _load_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazyClassMapper(MutableMapping[str, Type[Any]]):
+    """
+    Mapping of device_type to platform class that only holds class names, the class is
+    imported the first time its device_type is looked up.
+
+    Classes (or class names from _CLASS_MODULES) can be assigned like in a dictionary.
+    """
+
+    def __init__(self, class_names: Dict[str, str]) -> None:
+        self._names = dict(class_names)
+        self._classes: Dict[str, Type[Any]] = {}
+
+    def __getitem__(self, device_type: str) -> Type[Any]:
+        platform_class = self._classes.get(device_type)
+        if platform_class is None:
+            platform_class = _load_class(self._names[device_type])
+            self._classes[device_type] = platform_class
+        return platform_class
+
+    def __setitem__(self, device_type: str, value: Any) -> None:
+        if isinstance(value, str):
+            self._names[device_type] = value
+            self._classes.pop(device_type, None)
+        else:
+            self._names[device_type] = value.__name__
+            self._classes[device_type] = value
+
+    def __delitem__(self, device_type: str) -> None:
+        del self._names[device_type]
+        self._classes.pop(device_type, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def class_names(self) -> Dict[str, str]:
+        """Return device_type to class name, without importing anything."""
+        return dict(self._names)
+
 
 # The keys of this dictionary are the supported device_types
-CLASS_MAPPER_BASE = {
-    "a10": A10SSH,
-    "accedian": AccedianSSH,
-    "adtran_os": AdtranOSSSH,
-    "adva_fsp150f2": AdvaAosFsp150F2SSH,
-    "adva_fsp150f3": AdvaAosFsp150F3SSH,
-    "alcatel_aos": AlcatelAosSSH,
-    "alcatel_sros": NokiaSrosSSH,
-    "allied_telesis_awplus": AlliedTelesisAwplusSSH,
-    "apresia_aeos": ApresiaAeosSSH,
-    "arista_eos": AristaSSH,
-    "arris_cer": ArrisCERSSH,
-    "aruba_os": ArubaOsSSH,
-    "aruba_aoscx": ArubaCxSSH,
-    "aruba_osswitch": HPProcurveSSH,
-    "aruba_procurve": HPProcurveSSH,
-    "audiocode_72": Audiocode72SSH,
-    "audiocode_66": Audiocode66SSH,
-    "audiocode_shell": AudiocodeShellSSH,
-    "avaya_ers": ExtremeErsSSH,
-    "avaya_vsp": ExtremeVspSSH,
-    "broadcom_icos": BroadcomIcosSSH,
-    "brocade_fos": BrocadeFOSSSH,
-    "brocade_fastiron": RuckusFastironSSH,
-    "brocade_netiron": ExtremeNetironSSH,
-    "brocade_nos": ExtremeNosSSH,
-    "brocade_vdx": ExtremeNosSSH,
-    "brocade_vyos": VyOSSSH,
-    "checkpoint_gaia": CheckPointGaiaSSH,
-    "calix_b6": CalixB6SSH,
-    "casa_cmts": CasaCMTSSSH,
-    "cdot_cros": CdotCrosSSH,
-    "centec_os": CentecOSSSH,
-    "ciena_saos": CienaSaosSSH,
-    "cisco_asa": CiscoAsaSSH,
-    "cisco_ftd": CiscoFtdSSH,
-    "cisco_ios": CiscoIosSSH,
-    "cisco_nxos": CiscoNxosSSH,
-    "cisco_s200": CiscoS200SSH,
-    "cisco_s300": CiscoS300SSH,
-    "cisco_tp": CiscoTpTcCeSSH,
-    "cisco_viptela": CiscoViptelaSSH,
-    "cisco_wlc": CiscoWlcSSH,
-    "cisco_xe": CiscoIosSSH,
-    "cisco_xr": CiscoXrSSH,
-    "cloudgenix_ion": CloudGenixIonSSH,
-    "coriant": CoriantSSH,
-    "dell_dnos9": DellForce10SSH,
-    "dell_force10": DellForce10SSH,
-    "dell_os6": DellDNOS6SSH,
-    "dell_os9": DellForce10SSH,
-    "dell_os10": DellOS10SSH,
-    "dell_sonic": DellSonicSSH,
-    "dell_powerconnect": DellPowerConnectSSH,
-    "dell_isilon": DellIsilonSSH,
-    "dlink_ds": DlinkDSSSH,
-    "digi_transport": DigiTransportSSH,
-    "endace": EndaceSSH,
-    "eltex": EltexSSH,
-    "eltex_esr": EltexEsrSSH,
-    "enterasys": EnterasysSSH,
-    "ericsson_ipos": EricssonIposSSH,
-    "ericsson_mltn63": EricssonMinilink63SSH,
-    "ericsson_mltn66": EricssonMinilink66SSH,
-    "extreme": ExtremeExosSSH,
-    "extreme_ers": ExtremeErsSSH,
-    "extreme_exos": ExtremeExosSSH,
-    "extreme_netiron": ExtremeNetironSSH,
-    "extreme_nos": ExtremeNosSSH,
-    "extreme_slx": ExtremeSlxSSH,
-    "extreme_tierra": ExtremeTierraSSH,
-    "extreme_vdx": ExtremeNosSSH,
-    "extreme_vsp": ExtremeVspSSH,
-    "extreme_wing": ExtremeWingSSH,
-    "f5_ltm": F5TmshSSH,
-    "f5_tmsh": F5TmshSSH,
-    "f5_linux": F5LinuxSSH,
-    "fiberstore_fsos": FiberstoreFsosSSH,
-    "flexvnf": FlexvnfSSH,
-    "fortinet": FortinetSSH,
-    "generic": GenericSSH,
-    "generic_termserver": TerminalServerSSH,
-    "hillstone_stoneos": HillstoneStoneosSSH,
-    "hp_comware": HPComwareSSH,
-    "hp_procurve": HPProcurveSSH,
-    "huawei": HuaweiSSH,
-    "huawei_smartax": HuaweiSmartAXSSH,
-    "huawei_olt": HuaweiSmartAXSSH,
-    "huawei_vrp": HuaweiSSH,
-    "huawei_vrpv8": HuaweiVrpv8SSH,
-    "ipinfusion_ocnos": IpInfusionOcNOSSSH,
-    "juniper": JuniperSSH,
-    "juniper_junos": JuniperSSH,
-    "juniper_screenos": JuniperScreenOsSSH,
-    "keymile": KeymileSSH,
-    "keymile_nos": KeymileNOSSSH,
-    "linux": LinuxSSH,
-    "mikrotik_routeros": MikrotikRouterOsSSH,
-    "mikrotik_switchos": MikrotikSwitchOsSSH,
-    "mellanox": MellanoxMlnxosSSH,
-    "mellanox_mlnxos": MellanoxMlnxosSSH,
-    "mrv_lx": MrvLxSSH,
-    "mrv_optiswitch": MrvOptiswitchSSH,
-    "netapp_cdot": NetAppcDotSSH,
-    "netgear_prosafe": NetgearProSafeSSH,
-    "netscaler": NetscalerSSH,
-    "nokia_sros": NokiaSrosSSH,
-    "nokia_srl": NokiaSrlSSH,
-    "oneaccess_oneos": OneaccessOneOSSSH,
-    "ovs_linux": OvsLinuxSSH,
-    "paloalto_panos": PaloAltoPanosSSH,
-    "pluribus": PluribusSSH,
-    "quanta_mesh": QuantaMeshSSH,
-    "rad_etx": RadETXSSH,
-    "raisecom_roap": RaisecomRoapSSH,
-    "ruckus_fastiron": RuckusFastironSSH,
-    "ruijie_os": RuijieOSSSH,
-    "sixwind_os": SixwindOSSSH,
-    "sophos_sfos": SophosSfosSSH,
-    "supermicro_smis": SmciSwitchSmisSSH,
-    "teldat_cit": TeldatCITSSH,
-    "tplink_jetstream": TPLinkJetStreamSSH,
-    # ubiquiti_airos - Placeholder agreed to with NTC (if this driver is created in future)
-    "ubiquiti_edge": UbiquitiEdgeSSH,
-    "ubiquiti_edgerouter": UbiquitiEdgeRouterSSH,
-    "ubiquiti_edgeswitch": UbiquitiEdgeSSH,
-    "ubiquiti_unifiswitch": UbiquitiUnifiSwitchSSH,
-    "vyatta_vyos": VyOSSSH,
-    "vyos": VyOSSSH,
-    "watchguard_fireware": WatchguardFirewareSSH,
-    "zte_zxros": ZteZxrosSSH,
-    "yamaha": YamahaSSH,
-    "zyxel_os": ZyxelSSH,
-    "maipu": MaipuSSH,
-}
+CLASS_MAPPER_BASE = LazyClassMapper(
+    {
+        "a10": "A10SSH",
+        "accedian": "AccedianSSH",
+        "adtran_os": "AdtranOSSSH",
+        "adva_fsp150f2": "AdvaAosFsp150F2SSH",
+        "adva_fsp150f3": "AdvaAosFsp150F3SSH",
+        "alcatel_aos": "AlcatelAosSSH",
+        "alcatel_sros": "NokiaSrosSSH",
+        "allied_telesis_awplus": "AlliedTelesisAwplusSSH",
+        "apresia_aeos": "ApresiaAeosSSH",
+        "arista_eos": "AristaSSH",
+        "arris_cer": "ArrisCERSSH",
+        "aruba_os": "ArubaOsSSH",
+        "aruba_aoscx": "ArubaCxSSH",
+        "aruba_osswitch": "HPProcurveSSH",
+        "aruba_procurve": "HPProcurveSSH",
+        "audiocode_72": "Audiocode72SSH",
+        "audiocode_66": "Audiocode66SSH",
+        "audiocode_shell": "AudiocodeShellSSH",
+        "avaya_ers": "ExtremeErsSSH",
+        "avaya_vsp": "ExtremeVspSSH",
+        "broadcom_icos": "BroadcomIcosSSH",
+        "brocade_fos": "BrocadeFOSSSH",
+        "brocade_fastiron": "RuckusFastironSSH",
+        "brocade_netiron": "ExtremeNetironSSH",
+        "brocade_nos": "ExtremeNosSSH",
+        "brocade_vdx": "ExtremeNosSSH",
+        "brocade_vyos": "VyOSSSH",
+        "checkpoint_gaia": "CheckPointGaiaSSH",
+        "calix_b6": "CalixB6SSH",
+        "casa_cmts": "CasaCMTSSSH",
+        "cdot_cros": "CdotCrosSSH",
+        "centec_os": "CentecOSSSH",
+        "ciena_saos": "CienaSaosSSH",
+        "cisco_asa": "CiscoAsaSSH",
+        "cisco_ftd": "CiscoFtdSSH",
+        "cisco_ios": "CiscoIosSSH",
+        "cisco_nxos": "CiscoNxosSSH",
+        "cisco_s200": "CiscoS200SSH",
+        "cisco_s300": "CiscoS300SSH",
+        "cisco_tp": "CiscoTpTcCeSSH",
+        "cisco_viptela": "CiscoViptelaSSH",
+        "cisco_wlc": "CiscoWlcSSH",
+        "cisco_xe": "CiscoIosSSH",
+        "cisco_xr": "CiscoXrSSH",
+        "cloudgenix_ion": "CloudGenixIonSSH",
+        "coriant": "CoriantSSH",
+        "dell_dnos9": "DellForce10SSH",
+        "dell_force10": "DellForce10SSH",
+        "dell_os6": "DellDNOS6SSH",
+        "dell_os9": "DellForce10SSH",
+        "dell_os10": "DellOS10SSH",
+        "dell_sonic": "DellSonicSSH",
+        "dell_powerconnect": "DellPowerConnectSSH",
+        "dell_isilon": "DellIsilonSSH",
+        "dlink_ds": "DlinkDSSSH",
+        "digi_transport": "DigiTransportSSH",
+        "endace": "EndaceSSH",
+        "eltex": "EltexSSH",
+        "eltex_esr": "EltexEsrSSH",
+        "enterasys": "EnterasysSSH",
+        "ericsson_ipos": "EricssonIposSSH",
+        "ericsson_mltn63": "EricssonMinilink63SSH",
+        "ericsson_mltn66": "EricssonMinilink66SSH",
+        "extreme": "ExtremeExosSSH",
+        "extreme_ers": "ExtremeErsSSH",
+        "extreme_exos": "ExtremeExosSSH",
+        "extreme_netiron": "ExtremeNetironSSH",
+        "extreme_nos": "ExtremeNosSSH",
+        "extreme_slx": "ExtremeSlxSSH",
+        "extreme_tierra": "ExtremeTierraSSH",
+        "extreme_vdx": "ExtremeNosSSH",
+        "extreme_vsp": "ExtremeVspSSH",
+        "extreme_wing": "ExtremeWingSSH",
+        "f5_ltm": "F5TmshSSH",
+        "f5_tmsh": "F5TmshSSH",
+        "f5_linux": "F5LinuxSSH",
+        "fiberstore_fsos": "FiberstoreFsosSSH",
+        "flexvnf": "FlexvnfSSH",
+        "fortinet": "FortinetSSH",
+        "generic": "GenericSSH",
+        "generic_termserver": "TerminalServerSSH",
+        "hillstone_stoneos": "HillstoneStoneosSSH",
+        "hp_comware": "HPComwareSSH",
+        "hp_procurve": "HPProcurveSSH",
+        "huawei": "HuaweiSSH",
+        "huawei_smartax": "HuaweiSmartAXSSH",
+        "huawei_olt": "HuaweiSmartAXSSH",
+        "huawei_vrp": "HuaweiSSH",
+        "huawei_vrpv8": "HuaweiVrpv8SSH",
+        "ipinfusion_ocnos": "IpInfusionOcNOSSSH",
+        "juniper": "JuniperSSH",
+        "juniper_junos": "JuniperSSH",
+        "juniper_screenos": "JuniperScreenOsSSH",
+        "keymile": "KeymileSSH",
+        "keymile_nos": "KeymileNOSSSH",
+        "linux": "LinuxSSH",
+        "mikrotik_routeros": "MikrotikRouterOsSSH",
+        "mikrotik_switchos": "MikrotikSwitchOsSSH",
+        "mellanox": "MellanoxMlnxosSSH",
+        "mellanox_mlnxos": "MellanoxMlnxosSSH",
+        "mrv_lx": "MrvLxSSH",
+        "mrv_optiswitch": "MrvOptiswitchSSH",
+        "netapp_cdot": "NetAppcDotSSH",
+        "netgear_prosafe": "NetgearProSafeSSH",
+        "netscaler": "NetscalerSSH",
+        "nokia_sros": "NokiaSrosSSH",
+        "nokia_srl": "NokiaSrlSSH",
+        "oneaccess_oneos": "OneaccessOneOSSSH",
+        "ovs_linux": "OvsLinuxSSH",
+        "paloalto_panos": "PaloAltoPanosSSH",
+        "pluribus": "PluribusSSH",
+        "quanta_mesh": "QuantaMeshSSH",
+        "rad_etx": "RadETXSSH",
+        "raisecom_roap": "RaisecomRoapSSH",
+        "ruckus_fastiron": "RuckusFastironSSH",
+        "ruijie_os": "RuijieOSSSH",
+        "sixwind_os": "SixwindOSSSH",
+        "sophos_sfos": "SophosSfosSSH",
+        "supermicro_smis": "SmciSwitchSmisSSH",
+        "teldat_cit": "TeldatCITSSH",
+        "tplink_jetstream": "TPLinkJetStreamSSH",
+        # ubiquiti_airos - Placeholder agreed to with NTC (if this driver is created in future)
+        "ubiquiti_edge": "UbiquitiEdgeSSH",
+        "ubiquiti_edgerouter": "UbiquitiEdgeRouterSSH",
+        "ubiquiti_edgeswitch": "UbiquitiEdgeSSH",
+        "ubiquiti_unifiswitch": "UbiquitiUnifiSwitchSSH",
+        "vyatta_vyos": "VyOSSSH",
+        "vyos": "VyOSSSH",
+        "watchguard_fireware": "WatchguardFirewareSSH",
+        "zte_zxros": "ZteZxrosSSH",
+        "yamaha": "YamahaSSH",
+        "zyxel_os": "ZyxelSSH",
+        "maipu": "MaipuSSH",
+    }
+)
 
-FILE_TRANSFER_MAP = {
-    "arista_eos": AristaFileTransfer,
-    "ciena_saos": CienaSaosFileTransfer,
-    "cisco_asa": CiscoAsaFileTransfer,
-    "cisco_ios": CiscoIosFileTransfer,
-    "cisco_nxos": CiscoNxosFileTransfer,
-    "cisco_xe": CiscoIosFileTransfer,
-    "cisco_xr": CiscoXrFileTransfer,
-    "dell_os10": DellOS10FileTransfer,
-    "extreme_exos": ExtremeExosFileTransfer,
-    "juniper_junos": JuniperFileTransfer,
-    "linux": LinuxFileTransfer,
-    "nokia_sros": NokiaSrosFileTransfer,
-    "mikrotik_routeros": MikrotikRouterOsFileTransfer,
-    "ubiquiti_edgerouter": UbiquitiEdgeRouterFileTransfer,
-}
+FILE_TRANSFER_MAP = LazyClassMapper(
+    {
+        "arista_eos": "AristaFileTransfer",
+        "ciena_saos": "CienaSaosFileTransfer",
+        "cisco_asa": "CiscoAsaFileTransfer",
+        "cisco_ios": "CiscoIosFileTransfer",
+        "cisco_nxos": "CiscoNxosFileTransfer",
+        "cisco_xe": "CiscoIosFileTransfer",
+        "cisco_xr": "CiscoXrFileTransfer",
+        "dell_os10": "DellOS10FileTransfer",
+        "extreme_exos": "ExtremeExosFileTransfer",
+        "juniper_junos": "JuniperFileTransfer",
+        "linux": "LinuxFileTransfer",
+        "nokia_sros": "NokiaSrosFileTransfer",
+        "mikrotik_routeros": "MikrotikRouterOsFileTransfer",
+        "ubiquiti_edgerouter": "UbiquitiEdgeRouterFileTransfer",
+    }
+)
 
 # Also support keys that end in _ssh
 new_mapper = {}
-for k, v in CLASS_MAPPER_BASE.items():
+for k, v in CLASS_MAPPER_BASE.class_names().items():
     new_mapper[k] = v
     alt_key = k + "_ssh"
     new_mapper[alt_key] = v
-CLASS_MAPPER = new_mapper
+CLASS_MAPPER = LazyClassMapper(new_mapper)
 
 new_mapper = {}
-for k, v in FILE_TRANSFER_MAP.items():
+for k, v in FILE_TRANSFER_MAP.class_names().items():
     new_mapper[k] = v
     alt_key = k + "_ssh"
     new_mapper[alt_key] = v
-FILE_TRANSFER_MAP = new_mapper
+FILE_TRANSFER_MAP = LazyClassMapper(new_mapper)
 
 # Add telnet drivers
-CLASS_MAPPER["adtran_os_telnet"] = AdtranOSTelnet
-CLASS_MAPPER["apresia_aeos_telnet"] = ApresiaAeosTelnet
-CLASS_MAPPER["arista_eos_telnet"] = AristaTelnet
-CLASS_MAPPER["aruba_procurve_telnet"] = HPProcurveTelnet
-CLASS_MAPPER["audiocode_72_telnet"] = Audiocode72Telnet
-CLASS_MAPPER["audiocode_66_telnet"] = Audiocode66Telnet
-CLASS_MAPPER["audiocode_shell_telnet"] = AudiocodeShellTelnet
-CLASS_MAPPER["brocade_fastiron_telnet"] = RuckusFastironTelnet
-CLASS_MAPPER["brocade_netiron_telnet"] = ExtremeNetironTelnet
-CLASS_MAPPER["calix_b6_telnet"] = CalixB6Telnet
-CLASS_MAPPER["centec_os_telnet"] = CentecOSTelnet
-CLASS_MAPPER["ciena_saos_telnet"] = CienaSaosTelnet
-CLASS_MAPPER["cisco_ios_telnet"] = CiscoIosTelnet
-CLASS_MAPPER["cisco_xr_telnet"] = CiscoXrTelnet
-CLASS_MAPPER["cisco_s200_telnet"] = CiscoS200Telnet
-CLASS_MAPPER["cisco_s300_telnet"] = CiscoS300Telnet
-CLASS_MAPPER["dell_dnos6_telnet"] = DellDNOS6Telnet
-CLASS_MAPPER["dell_powerconnect_telnet"] = DellPowerConnectTelnet
-CLASS_MAPPER["dlink_ds_telnet"] = DlinkDSTelnet
-CLASS_MAPPER["extreme_telnet"] = ExtremeExosTelnet
-CLASS_MAPPER["extreme_exos_telnet"] = ExtremeExosTelnet
-CLASS_MAPPER["extreme_netiron_telnet"] = ExtremeNetironTelnet
-CLASS_MAPPER["generic_telnet"] = GenericTelnet
-CLASS_MAPPER["generic_termserver_telnet"] = TerminalServerTelnet
-CLASS_MAPPER["hp_procurve_telnet"] = HPProcurveTelnet
-CLASS_MAPPER["hp_comware_telnet"] = HPComwareTelnet
-CLASS_MAPPER["huawei_telnet"] = HuaweiTelnet
-CLASS_MAPPER["huawei_olt_telnet"] = HuaweiSmartAXSSH
-CLASS_MAPPER["ipinfusion_ocnos_telnet"] = IpInfusionOcNOSTelnet
-CLASS_MAPPER["juniper_junos_telnet"] = JuniperTelnet
-CLASS_MAPPER["nokia_sros_telnet"] = NokiaSrosTelnet
-CLASS_MAPPER["oneaccess_oneos_telnet"] = OneaccessOneOSTelnet
-CLASS_MAPPER["paloalto_panos_telnet"] = PaloAltoPanosTelnet
-CLASS_MAPPER["rad_etx_telnet"] = RadETXTelnet
-CLASS_MAPPER["raisecom_telnet"] = RaisecomRoapTelnet
-CLASS_MAPPER["ruckus_fastiron_telnet"] = RuckusFastironTelnet
-CLASS_MAPPER["ruijie_os_telnet"] = RuijieOSTelnet
-CLASS_MAPPER["supermicro_smis_telnet"] = SmciSwitchSmisTelnet
-CLASS_MAPPER["teldat_cit_telnet"] = TeldatCITTelnet
-CLASS_MAPPER["tplink_jetstream_telnet"] = TPLinkJetStreamTelnet
-CLASS_MAPPER["yamaha_telnet"] = YamahaTelnet
-CLASS_MAPPER["zte_zxros_telnet"] = ZteZxrosTelnet
-CLASS_MAPPER["maipu_telnet"] = MaipuTelnet
+CLASS_MAPPER["adtran_os_telnet"] = "AdtranOSTelnet"
+CLASS_MAPPER["apresia_aeos_telnet"] = "ApresiaAeosTelnet"
+CLASS_MAPPER["arista_eos_telnet"] = "AristaTelnet"
+CLASS_MAPPER["aruba_procurve_telnet"] = "HPProcurveTelnet"
+CLASS_MAPPER["audiocode_72_telnet"] = "Audiocode72Telnet"
+CLASS_MAPPER["audiocode_66_telnet"] = "Audiocode66Telnet"
+CLASS_MAPPER["audiocode_shell_telnet"] = "AudiocodeShellTelnet"
+CLASS_MAPPER["brocade_fastiron_telnet"] = "RuckusFastironTelnet"
+CLASS_MAPPER["brocade_netiron_telnet"] = "ExtremeNetironTelnet"
+CLASS_MAPPER["calix_b6_telnet"] = "CalixB6Telnet"
+CLASS_MAPPER["centec_os_telnet"] = "CentecOSTelnet"
+CLASS_MAPPER["ciena_saos_telnet"] = "CienaSaosTelnet"
+CLASS_MAPPER["cisco_ios_telnet"] = "CiscoIosTelnet"
+CLASS_MAPPER["cisco_xr_telnet"] = "CiscoXrTelnet"
+CLASS_MAPPER["cisco_s200_telnet"] = "CiscoS200Telnet"
+CLASS_MAPPER["cisco_s300_telnet"] = "CiscoS300Telnet"
+CLASS_MAPPER["dell_dnos6_telnet"] = "DellDNOS6Telnet"
+CLASS_MAPPER["dell_powerconnect_telnet"] = "DellPowerConnectTelnet"
+CLASS_MAPPER["dlink_ds_telnet"] = "DlinkDSTelnet"
+CLASS_MAPPER["extreme_telnet"] = "ExtremeExosTelnet"
+CLASS_MAPPER["extreme_exos_telnet"] = "ExtremeExosTelnet"
+CLASS_MAPPER["extreme_netiron_telnet"] = "ExtremeNetironTelnet"
+CLASS_MAPPER["generic_telnet"] = "GenericTelnet"
+CLASS_MAPPER["generic_termserver_telnet"] = "TerminalServerTelnet"
+CLASS_MAPPER["hp_procurve_telnet"] = "HPProcurveTelnet"
+CLASS_MAPPER["hp_comware_telnet"] = "HPComwareTelnet"
+CLASS_MAPPER["huawei_telnet"] = "HuaweiTelnet"
+CLASS_MAPPER["huawei_olt_telnet"] = "HuaweiSmartAXSSH"
+CLASS_MAPPER["ipinfusion_ocnos_telnet"] = "IpInfusionOcNOSTelnet"
+CLASS_MAPPER["juniper_junos_telnet"] = "JuniperTelnet"
+CLASS_MAPPER["nokia_sros_telnet"] = "NokiaSrosTelnet"
+CLASS_MAPPER["oneaccess_oneos_telnet"] = "OneaccessOneOSTelnet"
+CLASS_MAPPER["paloalto_panos_telnet"] = "PaloAltoPanosTelnet"
+CLASS_MAPPER["rad_etx_telnet"] = "RadETXTelnet"
+CLASS_MAPPER["raisecom_telnet"] = "RaisecomRoapTelnet"
+CLASS_MAPPER["ruckus_fastiron_telnet"] = "RuckusFastironTelnet"
+CLASS_MAPPER["ruijie_os_telnet"] = "RuijieOSTelnet"
+CLASS_MAPPER["supermicro_smis_telnet"] = "SmciSwitchSmisTelnet"
+CLASS_MAPPER["teldat_cit_telnet"] = "TeldatCITTelnet"
+CLASS_MAPPER["tplink_jetstream_telnet"] = "TPLinkJetStreamTelnet"
+CLASS_MAPPER["yamaha_telnet"] = "YamahaTelnet"
+CLASS_MAPPER["zte_zxros_telnet"] = "ZteZxrosTelnet"
+CLASS_MAPPER["maipu_telnet"] = "MaipuTelnet"
 
 # Add serial drivers
-CLASS_MAPPER["cisco_ios_serial"] = CiscoIosSerial
+CLASS_MAPPER["cisco_ios_serial"] = "CiscoIosSerial"
 
 # Add general terminal_server driver and autodetect
-CLASS_MAPPER["terminal_server"] = TerminalServerSSH
-CLASS_MAPPER["autodetect"] = TerminalServerSSH
+CLASS_MAPPER["terminal_server"] = "TerminalServerSSH"
+CLASS_MAPPER["autodetect"] = "TerminalServerSSH"
 
 platforms = list(CLASS_MAPPER.keys())
 platforms.sort()
@@ -0,0 +1,278 @@
+"""Memoization of structured data parsed from command output."""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from netmiko import log
+
+
+def _file_stamp(file_name: str) -> Optional[Tuple[int, int]]:
+    """Return (mtime, size) of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(os.path.expanduser(file_name))
+    except (OSError, ValueError):
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _package_version(package: str) -> Optional[str]:
+    try:
+        from importlib import metadata
+
+        return metadata.version(package)
+    except Exception:
+        return None
+
+
+class StructuredDataCache:
+    """
+    Bounded LRU cache (optionally backed by a directory on disk) of parsed command output.
+
+    Entries are keyed by platform, command, parser settings, template version and a hash of
+    the raw output, so an unchanged 'show version' polled every minute is only parsed once.
+    Values are stored pickled, every lookup returns a fresh copy (of the same types as the
+    parser returned) that callers may modify.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        cache_dir: Optional[str] = None,
+        max_disk_entries: int = 65536,
+    ) -> None:
+        """
+        :param max_entries: Maximum number of entries held in memory.
+
+        :param cache_dir: Directory used as a persistent second-level cache (default: None,
+            memory only). Created if it does not exist. Entries are unpickled when read, so
+            only use a directory that is not writable by untrusted users.
+
+        :param max_disk_entries: Maximum number of entries kept in cache_dir, the least
+            recently used are removed when it is exceeded.
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self._disk_entries = 0
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._disk_entries = len(self._disk_files())
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        # (platform, command, index stamp) => template files the index resolves to
+        self._textfsm_templates: "OrderedDict[Tuple[Any, ...], List[str]]" = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def make_key(
+        self,
+        raw_data: str,
+        command: str,
+        platform: str,
+        use_textfsm: bool = False,
+        use_ttp: bool = False,
+        use_genie: bool = False,
+        textfsm_template: Optional[str] = None,
+        ttp_template: Optional[str] = None,
+    ) -> str:
+        """Build the cache key for one structured_data_converter() call."""
+        template_version: Dict[str, Any] = {}
+        if use_textfsm:
+            if textfsm_template is not None:
+                template_version["textfsm"] = _file_stamp(textfsm_template)
+            else:
+                # Changes whenever the template set is upgraded, the index is edited or
+                # one of the templates the index selects is edited
+                from netmiko.utilities import get_template_dir
+
+                try:
+                    index = os.path.join(get_template_dir(), "index")
+                except ValueError:
+                    index = ""
+                index_stamp = _file_stamp(index)
+                template_version["textfsm"] = [
+                    index,
+                    index_stamp,
+                    [
+                        [template_file, _file_stamp(template_file)]
+                        for template_file in self._index_templates(
+                            platform, command, index_stamp
+                        )
+                    ],
+                ]
+        if use_ttp and ttp_template is not None:
+            template_version["ttp"] = _file_stamp(ttp_template)
+        if use_genie:
+            template_version["genie"] = _package_version("genie")
+
+        raw_hash = hashlib.sha256(raw_data.encode("utf-8", "replace")).hexdigest()
+        key_data = [
+            platform,
+            command,
+            [use_textfsm, use_ttp, use_genie],
+            [textfsm_template, ttp_template],
+            template_version,
+            raw_hash,
+        ]
+        key_json = json.dumps(key_data, sort_keys=True)
+        return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+    def _index_templates(
+        self, platform: str, command: str, index_stamp: Optional[Tuple[int, int]]
+    ) -> List[str]:
+        """Return the template files the TextFSM index maps platform/command to."""
+        from netmiko.utilities import textfsm_index_templates
+
+        lookup = (platform, command, index_stamp)
+        with self._lock:
+            template_files = self._textfsm_templates.get(lookup)
+            if template_files is not None:
+                self._textfsm_templates.move_to_end(lookup)
+                return template_files
+        try:
+            template_files = textfsm_index_templates(platform, command)
+        except Exception:
+            # Parsing fails the same way, the index stamp still versions the entry
+            template_files = []
+        with self._lock:
+            self._textfsm_templates[lookup] = template_files
+            while len(self._textfsm_templates) > self.max_entries:
+                self._textfsm_templates.popitem(last=False)
+        return template_files
+
+    def _disk_path(self, key: str) -> str:
+        assert self.cache_dir is not None
+        return os.path.join(self.cache_dir, f"{key}.pickle")
+
+    def _disk_files(self) -> List[str]:
+        assert self.cache_dir is not None
+        return [
+            os.path.join(self.cache_dir, file_name)
+            for file_name in os.listdir(self.cache_dir)
+            if file_name.endswith(".pickle")
+        ]
+
+    def _evict_disk(self) -> None:
+        """Remove the least recently used files once cache_dir exceeds max_disk_entries."""
+        with self._lock:
+            if self._disk_entries <= self.max_disk_entries:
+                return
+        stamps = []
+        for file_name in self._disk_files():
+            try:
+                stamps.append((os.stat(file_name).st_mtime_ns, file_name))
+            except OSError:
+                pass
+        stamps.sort()
+        # Trim to 90% so the directory is not rescanned on every write
+        excess = len(stamps) - int(self.max_disk_entries * 0.9)
+        removed = 0
+        for _, file_name in stamps[: max(excess, 0)]:
+            try:
+                os.remove(file_name)
+                removed += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_entries = len(stamps) - removed
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for key, raise KeyError if not cached."""
+        with self._lock:
+            value_pickle = self._entries.get(key)
+            if value_pickle is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(value_pickle)
+
+        if self.cache_dir:
+            file_name = self._disk_path(key)
+            try:
+                with open(file_name, "rb") as f:
+                    value_pickle = f.read()
+                value = pickle.loads(value_pickle)
+                # Marks the entry as recently used for _evict_disk()
+                os.utime(file_name)
+            except Exception:
+                pass
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._store(key, value_pickle)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        raise KeyError(key)
+
+    def set(self, key: str, value: Any) -> None:
+        """Cache value (must be picklable, otherwise it is not cached)."""
+        try:
+            value_pickle = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            log.debug("StructuredDataCache: value is not picklable, not cached")
+            return
+
+        with self._lock:
+            self._store(key, value_pickle)
+
+        if self.cache_dir:
+            file_name = self._disk_path(key)
+            tmp_file = f"{file_name}.{os.getpid()}.tmp"
+            try:
+                new_entry = not os.path.exists(file_name)
+                with open(tmp_file, "wb") as f:
+                    f.write(value_pickle)
+                os.replace(tmp_file, file_name)
+            except OSError as e:
+                log.debug(f"StructuredDataCache: unable to write {file_name}: {e}")
+                return
+            if new_entry:
+                with self._lock:
+                    self._disk_entries += 1
+                self._evict_disk()
+
+    def _store(self, key: str, value_pickle: bytes) -> None:
+        """Insert into the in-memory LRU (caller must hold the lock)."""
+        self._entries[key] = value_pickle
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries (in memory and on disk) and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._textfsm_templates.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if self.cache_dir:
+            for file_name in self._disk_files():
+                try:
+                    os.remove(file_name)
+                except OSError:
+                    pass
+            with self._lock:
+                self._disk_entries = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of in-memory entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,166 @@
+"""SSH compression policy (zlib@openssh.com) and per-connection byte and timing accounting."""
+
+import fnmatch
+import re
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, Iterable, Optional, Set, Tuple
+
+import paramiko
+
+from netmiko import log
+
+# Commands whose output is large enough that compression pays off on slow links
+DEFAULT_VERBOSE_COMMANDS = (
+    r"^show run(ning-config)? all",
+    r"^show tech(-support)?",
+    r"^show logging",
+    r"^display current-configuration",
+)
+
+
+class TransportProfile:
+    """
+    Decide when a connection should use SSH compression.
+
+    Compression is turned on when connecting to a device whose device_type matches one of
+    device_types, or right before running a command that matches one of commands or that
+    produced at least min_output_size bytes the last time it ran on the same device_type (the
+    SSH keys are renegotiated to switch it on). Devices that do not offer compression are
+    remembered and not asked again.
+
+    One profile can be shared by many connections.
+    """
+
+    def __init__(
+        self,
+        device_types: Iterable[str] = (),
+        commands: Iterable[str] = DEFAULT_VERBOSE_COMMANDS,
+        min_output_size: Optional[int] = 1_000_000,
+        history: int = 100,
+    ) -> None:
+        """
+        :param device_types: device_type patterns (fnmatch style, eg 'cisco_*') that always use
+            compression (default: none).
+
+        :param commands: Regular expressions matching commands that turn on compression
+            (default: DEFAULT_VERBOSE_COMMANDS).
+
+        :param min_output_size: Turn on compression for commands that previously returned at
+            least this many bytes, None to disable (default: 1,000,000).
+
+        :param history: Number of per-command records each connection keeps (default: 100).
+        """
+        self.device_types = tuple(device_types)
+        self.commands = [re.compile(pattern) for pattern in commands]
+        self.min_output_size = min_output_size
+        self.history = history
+        self._output_sizes: Dict[Tuple[str, str], int] = {}
+        self._unsupported: Set[str] = set()
+        self._lock = Lock()
+
+    def compress_on_connect(self, device_type: str) -> bool:
+        """Return True if connections to this device_type should negotiate compression."""
+        return any(fnmatch.fnmatch(device_type, pattern) for pattern in self.device_types)
+
+    def compress_for_command(self, device_type: str, host: str, command: str) -> bool:
+        """Return True if compression should be turned on before running command."""
+        command = command.strip()
+        with self._lock:
+            if host in self._unsupported:
+                return False
+            size = self._output_sizes.get((device_type, command), 0)
+        if self.min_output_size is not None and size >= self.min_output_size:
+            return True
+        return any(pattern.search(command) for pattern in self.commands)
+
+    def record_output(self, device_type: str, command: str, size: int) -> None:
+        """Remember how much output command produced."""
+        with self._lock:
+            self._output_sizes[(device_type, command.strip())] = size
+
+    def mark_unsupported(self, host: str) -> None:
+        """Remember that host does not support compression."""
+        with self._lock:
+            self._unsupported.add(host)
+
+
+class TransportStats:
+    """
+    Byte counts (before and after compression) and timing of one connection's SSH transport,
+    in total and per command.
+    """
+
+    def __init__(
+        self,
+        transport: paramiko.Transport,
+        profile: TransportProfile,
+        device_type: str,
+        host: str,
+    ) -> None:
+        self.transport = transport
+        self.profile = profile
+        self.device_type = device_type
+        self.host = host
+        self.commands: Deque[Dict[str, Any]] = deque(maxlen=profile.history)
+        self._start_time = time.monotonic()
+        self._start = transport.get_compression_stats()
+
+    def command_start(self, command: str) -> Tuple[float, Dict[str, int]]:
+        """Apply the profile before running command, return the start point of its stats."""
+        if not self.transport.is_compressing() and self.profile.compress_for_command(
+            self.device_type, self.host, command
+        ):
+            self.enable_compression()
+        return (time.monotonic(), self.transport.get_compression_stats())
+
+    def command_end(self, command: str, start: Tuple[float, Dict[str, int]]) -> None:
+        """Record the bytes received and time taken by command."""
+        start_time, before = start
+        after = self.transport.get_compression_stats()
+        raw = after["raw_in"] - before["raw_in"]
+        compressed = after["compressed_in"] - before["compressed_in"]
+        self.commands.append(
+            {
+                "command": command.strip(),
+                "raw_bytes": raw,
+                "compressed_bytes": compressed,
+                "saved_bytes": raw - compressed,
+                "seconds": time.monotonic() - start_time,
+                "compression": self.transport.is_compressing(),
+            }
+        )
+        self.profile.record_output(self.device_type, command, raw)
+
+    def enable_compression(self) -> bool:
+        """Renegotiate the SSH keys with compression turned on, return True if it is on."""
+        log.debug(f"Renegotiating SSH keys to turn on compression for {self.host}")
+        self.transport.use_compression(True)
+        try:
+            self.transport.renegotiate_keys()
+        except paramiko.SSHException as e:
+            log.debug(f"Unable to turn on compression for {self.host}: {e}")
+            return False
+        if not self.transport.is_compressing():
+            log.debug(f"{self.host} does not support compression")
+            self.profile.mark_unsupported(self.host)
+            return False
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the totals since the connection was established, and the per-command records."""
+        now = self.transport.get_compression_stats()
+        totals = {key: now[key] - self._start[key] for key in now}
+        raw = totals["raw_in"] + totals["raw_out"]
+        compressed = totals["compressed_in"] + totals["compressed_out"]
+        return {
+            "compression": self.transport.is_compressing(),
+            "seconds": time.monotonic() - self._start_time,
+            "raw_bytes_in": totals["raw_in"],
+            "compressed_bytes_in": totals["compressed_in"],
+            "raw_bytes_out": totals["raw_out"],
+            "compressed_bytes_out": totals["compressed_out"],
+            "saved_bytes": raw - compressed,
+            "commands": list(self.commands),
+        }
@@ -11,6 +11,8 @@ from typing import (
     List,
     Dict,
     Tuple,
+    Iterable,
+    Iterator,
 )
 from typing import TYPE_CHECKING
 import re
@@ -20,10 +22,10 @@ import io
 import os
 from pathlib import Path
 import functools
+import multiprocessing
 from datetime import datetime
+import importlib
 import importlib.resources as pkg_resources
-from textfsm import clitable
-from textfsm.clitable import CliTableError
 from netmiko import log
 
 # For decorators
@@ -32,31 +34,40 @@ F = TypeVar("F", bound=Callable[..., Any])
 
 if TYPE_CHECKING:
     from netmiko.base_connection import BaseConnection
+    from netmiko.structured_data_cache import StructuredDataCache
     from os import PathLike
+    from textfsm import clitable
+
+# textfsm, ttp, genie and pyserial are only imported when they are used, which keeps
+# 'import netmiko' fast. TTP_INSTALLED, GENIE_INSTALLED and PYSERIAL_INSTALLED are
+# module attributes that try the import on first access.
+_OPTIONAL_MODULES = {
+    "TTP_INSTALLED": ("ttp",),
+    "GENIE_INSTALLED": (
+        "genie.conf.base",
+        "genie.libs.parser.utils",
+        "pyats.datastructures",
+    ),
+    "PYSERIAL_INSTALLED": ("serial.tools.list_ports",),
+}
 
-try:
-    from ttp import ttp
-
-    TTP_INSTALLED = True
-
-except ImportError:
-    TTP_INSTALLED = False
 
-try:
-    from genie.conf.base import Device
-    from genie.libs.parser.utils import get_parser
-    from pyats.datastructures import AttrDict
+@functools.lru_cache(maxsize=None)
+def _installed(name: str) -> bool:
+    """Whether the modules behind name (eg GENIE_INSTALLED) import without error."""
+    try:
+        for module in _OPTIONAL_MODULES[name]:
+            importlib.import_module(module)
+    except ImportError:
+        return False
+    return True
 
-    GENIE_INSTALLED = True
-except ImportError:
-    GENIE_INSTALLED = False
 
-try:
-    import serial.tools.list_ports
+def __getattr__(name: str) -> Any:
+    if name in _OPTIONAL_MODULES:
+        return _installed(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    PYSERIAL_INSTALLED = True
-except ImportError:
-    PYSERIAL_INSTALLED = False
 
 # Dictionary mapping 'show run' for vendors with different command
 SHOW_RUN_MAPPER = {
@@ -101,6 +112,9 @@ SHOW_RUN_MAPPER = new_dict
 # Default location of netmiko temp directory for netmiko tools
 NETMIKO_BASE_DIR = "~/.netmiko"
 
+# CliTable owned by each bulk TextFSM worker process (see _bulk_textfsm_init)
+_BULK_TEXTFSM_OBJ: Optional["clitable.CliTable"] = None
+
 
 def load_yaml_file(yaml_file: Union[str, bytes, "PathLike[Any]"]) -> Any:
     """Read YAML file."""
@@ -237,13 +251,15 @@ def write_bytes(out_data: AnyStr, encoding: str = "utf-8") -> bytes:
 def check_serial_port(name: str) -> str:
     """returns valid COM Port."""
 
-    if not PYSERIAL_INSTALLED:
+    if not _installed("PYSERIAL_INSTALLED"):
         msg = (
             "\npyserial is not installed. Please PIP install pyserial:\n\n"
             "pip install pyserial\n\n"
         )
         raise ValueError(msg)
 
+    import serial.tools.list_ports
+
     try:
         cdc = next(serial.tools.list_ports.grep(name))
         serial_port = cdc[0]
@@ -317,33 +333,29 @@ Alternatively, `pip install ntc-templates` (if using ntc-templates).
     return os.path.abspath(template_dir)
 
 
-def clitable_to_dict(cli_table: clitable.CliTable) -> List[Dict[str, str]]:
+def clitable_to_dict(cli_table: "clitable.CliTable") -> List[Dict[str, str]]:
     """Converts TextFSM cli_table object to list of dictionaries."""
-    return_list = []
-    for row in cli_table:
-        temp_dict = {}
-        for index, element in enumerate(row):
-            temp_dict[cli_table.header[index].lower()] = element
-        return_list.append(temp_dict)
-    return return_list
+    header = [name.lower() for name in cli_table.header]
+    return [dict(zip(header, row)) for row in cli_table]
 
 
 def _textfsm_parse(
-    textfsm_obj: clitable.CliTable,
+    textfsm_obj: "clitable.CliTable",
     raw_output: str,
     attrs: Dict[str, str],
     template_file: Optional[str] = None,
 ) -> Union[str, List[Dict[str, str]]]:
     """Perform the actual TextFSM parsing using the CliTable object."""
-    tfsm_parse: Callable[..., Any] = textfsm_obj.ParseCmd
+    from textfsm.clitable import CliTableError
+
+    tfsm_parse: Callable[..., List[Dict[str, str]]] = textfsm_obj.ParseCmdRecords
     try:
-        # Parse output through template
+        # Parse output through template (directly to dicts, bypassing the TextTable)
         if template_file is not None:
-            tfsm_parse(raw_output, templates=template_file)
+            structured_data = tfsm_parse(raw_output, templates=template_file)
         else:
-            tfsm_parse(raw_output, attrs)
+            structured_data = tfsm_parse(raw_output, attrs)
 
-        structured_data = clitable_to_dict(textfsm_obj)
         if structured_data == []:
             return raw_output
         else:
@@ -352,6 +364,56 @@ def _textfsm_parse(
         return raw_output
 
 
+def _textfsm_parse_index(
+    textfsm_obj: "clitable.CliTable", raw_output: str, platform: str, command: str
+) -> Union[str, List[Dict[str, str]]]:
+    """Parse using the CliTable index, retrying 'cisco_xe' as 'cisco_ios'."""
+    attrs = {"Command": command, "Platform": platform}
+    output = _textfsm_parse(textfsm_obj, raw_output, attrs)
+
+    # Retry the output if "cisco_xe" and not structured data
+    if "cisco_xe" in platform:
+        if not isinstance(output, list):
+            attrs["Platform"] = "cisco_ios"
+            output = _textfsm_parse(textfsm_obj, raw_output, attrs)
+    return output
+
+
+def _textfsm_index_entries(platform: str, command: str) -> Tuple[str, List[str]]:
+    """
+    Return the template directory and the Template column of the index entries matching
+    platform and command (for 'cisco_xe', then 'cisco_ios', which parsing falls back to).
+    """
+    from textfsm import clitable
+
+    template_dir = get_template_dir()
+    index_file = os.path.join(template_dir, "index")
+    index = clitable.CliTable(index_file, template_dir).index
+    platforms = [platform]
+    # Same retry as _textfsm_parse_index()
+    if "cisco_xe" in platform:
+        platforms.append("cisco_ios")
+    entries = []
+    for attr_platform in platforms:
+        row_idx = index.GetRowMatch({"Command": command, "Platform": attr_platform})
+        if row_idx:
+            entries.append(index.index[row_idx]["Template"])
+    return (template_dir, entries)
+
+
+def textfsm_index_templates(platform: str, command: str) -> List[str]:
+    """
+    Return the paths of the TextFSM templates the index maps platform and command to
+    (for 'cisco_xe', also those of 'cisco_ios', which parsing falls back to).
+    """
+    template_dir, entries = _textfsm_index_entries(platform, command)
+    return [
+        os.path.join(template_dir, template)
+        for templates in entries
+        for template in templates.split(":")
+    ]
+
+
 def get_structured_data_textfsm(
     raw_output: str,
     platform: Optional[str] = None,
@@ -364,27 +426,22 @@ def get_structured_data_textfsm(
     You can use a straight TextFSM file i.e. specify "template". If no template is specified,
     then you must use an CliTable index file.
     """
+    from textfsm import clitable
+
     if platform is None or command is None:
         attrs = {}
     else:
         attrs = {"Command": command, "Platform": platform}
 
     if template is None:
-        if attrs == {}:
+        if platform is None or command is None:
             raise ValueError(
                 "Either 'platform/command' or 'template' must be specified."
             )
         template_dir = get_template_dir()
         index_file = os.path.join(template_dir, "index")
         textfsm_obj = clitable.CliTable(index_file, template_dir)
-        output = _textfsm_parse(textfsm_obj, raw_output, attrs)
-
-        # Retry the output if "cisco_xe" and not structured data
-        if platform and "cisco_xe" in platform:
-            if not isinstance(output, list):
-                attrs["Platform"] = "cisco_ios"
-                output = _textfsm_parse(textfsm_obj, raw_output, attrs)
-        return output
+        return _textfsm_parse_index(textfsm_obj, raw_output, platform, command)
     else:
         template_path = Path(os.path.expanduser(template))
         template_file = template_path.name
@@ -400,16 +457,166 @@ def get_structured_data_textfsm(
 get_structured_data = get_structured_data_textfsm
 
 
+def _stream_textfsm_template(
+    platform: Optional[str], command: Optional[str], template: Optional[str]
+) -> Tuple[str, str]:
+    """Return the (template_dir, template names) parsing the output of command."""
+    from textfsm import clitable
+
+    if template is not None:
+        template_path = Path(os.path.expanduser(template))
+        return (str(template_path.parents[0]), template_path.name)
+    if platform is None or command is None:
+        raise ValueError("Either 'platform/command' or 'template' must be specified.")
+    template_dir, entries = _textfsm_index_entries(platform, command)
+    if entries:
+        return (template_dir, entries[0])
+    raise clitable.CliTableError(
+        f'No template found for attributes: "{platform}" "{command}"'
+    )
+
+
+def iter_structured_data_textfsm(
+    chunks: Iterable[str],
+    platform: Optional[str] = None,
+    command: Optional[str] = None,
+    template: Optional[str] = None,
+) -> Iterator[Dict[str, str]]:
+    """
+    Parse CLI output arriving in chunks with a TextFSM template, yielding each record (as
+    a dict keyed by the lowercase column names) as soon as it is complete.
+
+    Records are yielded as their lines arrive, the output is not held in memory. An index
+    entry that merges the tables of several templates, or a template with a Fillup value
+    (set in the records before the line it is read from), cannot be parsed as a stream:
+    the chunks are then joined and parsed at the end.
+    """
+    from textfsm import TextFSM, clitable
+
+    template_dir, templates = _stream_textfsm_template(platform, command, template)
+    fsm = None
+    if ":" not in templates:
+        with open(os.path.join(template_dir, templates)) as f:
+            fsm = TextFSM(f)
+    if fsm is None or any("Fillup" in value.OptionNames() for value in fsm.values):
+        textfsm_obj = clitable.CliTable(template_dir=template_dir)
+        yield from textfsm_obj.ParseCmdRecords("".join(chunks), templates=templates)
+        return
+
+    header = [name.lower() for name in fsm.header]
+    # Rows of ParseText() (all the records so far) already yielded
+    yielded = 0
+
+    def records(rows: List[List[Any]]) -> Iterator[Dict[str, str]]:
+        nonlocal yielded
+        for row in rows[yielded:]:
+            # Same string conversion as CliTable.ParseCmdRecords()
+            values = [
+                [str(v) for v in val] if isinstance(val, list) else val for val in row
+            ]
+            yield dict(zip(header, values))
+        yielded = len(rows)
+
+    partial_line = ""
+    for chunk in chunks:
+        if fsm._cur_state_name in ("End", "EOF"):
+            # The template stops parsing here, just consume the rest of the output
+            continue
+        text = partial_line + chunk
+        end = max(text.rfind("\n"), text.rfind("\r"))
+        if end == -1:
+            partial_line = text
+            continue
+        partial_line = text[end + 1 :]
+        yield from records(fsm.ParseText(text[: end + 1], eof=False))
+    if fsm._cur_state_name in ("End", "EOF"):
+        partial_line = ""
+    # The last line, and the implicit record at the end of the output
+    yield from records(fsm.ParseText(partial_line))
+
+
+def _bulk_textfsm_init(template_dir: str) -> None:
+    """Load the index and compile every template once per worker process."""
+    from textfsm import clitable
+
+    global _BULK_TEXTFSM_OBJ
+    index_file = os.path.join(template_dir, "index")
+    _BULK_TEXTFSM_OBJ = clitable.CliTable(index_file, template_dir)
+    _BULK_TEXTFSM_OBJ.PreloadTemplates()
+
+
+def _bulk_textfsm_parse(
+    job: Tuple[int, Tuple[str, str, str]]
+) -> Tuple[int, Union[str, List[Dict[str, str]]]]:
+    position, (platform, command, raw_output) = job
+    assert _BULK_TEXTFSM_OBJ is not None
+    output = _textfsm_parse_index(
+        _BULK_TEXTFSM_OBJ, raw_output, platform, command.strip()
+    )
+    return (position, output)
+
+
+def iter_structured_data_textfsm_bulk(
+    items: Iterable[Tuple[str, str, str]],
+    processes: Optional[int] = None,
+    chunksize: int = 8,
+    ordered: bool = True,
+) -> Iterator[Tuple[int, Union[str, List[Dict[str, str]]]]]:
+    """
+    Convert many raw CLI outputs to structured data using a pool of worker processes.
+
+    Each worker loads the TextFSM index and compiles all templates once at start-up.
+
+    :param items: iterable of (platform, command, raw_output) tuples
+
+    :param processes: number of worker processes (default: os.cpu_count())
+
+    :param chunksize: number of items handed to a worker at a time
+
+    :param ordered: yield results in input order; if False, yield them as they complete
+
+    Yields (position, output) tuples where position is the index of the item in items and
+    output matches what get_structured_data_textfsm() would return for it.
+    """
+    template_dir = get_template_dir()
+    with multiprocessing.Pool(
+        processes, initializer=_bulk_textfsm_init, initargs=(template_dir,)
+    ) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(_bulk_textfsm_parse, enumerate(items), chunksize)
+
+
+def get_structured_data_textfsm_bulk(
+    items: Iterable[Tuple[str, str, str]],
+    processes: Optional[int] = None,
+    chunksize: int = 8,
+) -> List[Union[str, List[Dict[str, str]]]]:
+    """
+    Convert many raw CLI outputs to structured data in parallel.
+
+    items is an iterable of (platform, command, raw_output) tuples. The outputs are returned
+    in input order; see iter_structured_data_textfsm_bulk() for details.
+    """
+    return [
+        output
+        for _, output in iter_structured_data_textfsm_bulk(
+            items, processes=processes, chunksize=chunksize
+        )
+    ]
+
+
 def get_structured_data_ttp(raw_output: str, template: str) -> Union[str, List[Any]]:
     """
     Convert raw CLI output to structured data using TTP template.
 
     You can use a straight TextFSM file i.e. specify "template"
     """
-    if not TTP_INSTALLED:
+    if not _installed("TTP_INSTALLED"):
         msg = "\nTTP is not installed. Please PIP install ttp:\n\npip install ttp\n"
         raise ValueError(msg)
 
+    from ttp import ttp
+
     try:
         ttp_parser = ttp(data=raw_output, template=template)
         ttp_parser.parse(one=True)
@@ -436,10 +643,12 @@ def run_ttp_template(
 
     :param kwargs: ``**kwargs`` for TTP object instantiation
     """
-    if not TTP_INSTALLED:
+    if not _installed("TTP_INSTALLED"):
         msg = "\nTTP is not installed. Please PIP install ttp:\n" "pip install ttp\n"
         raise ValueError(msg)
 
+    from ttp import ttp
+
     parser = ttp(template=template, **kwargs)
 
     # get inputs load for TTP template
@@ -493,7 +702,7 @@ def get_structured_data_genie(
     if not sys.version_info >= (3, 4):
         raise ValueError("Genie requires Python >= 3.4")
 
-    if not GENIE_INSTALLED:
+    if not _installed("GENIE_INSTALLED"):
         msg = (
             "\nGenie and PyATS are not installed. Please PIP install both Genie and PyATS:\n"
             "pip install genie\npip install pyats\n"
@@ -526,6 +735,10 @@ def get_structured_data_genie(
     if os is None:
         return raw_output
 
+    from genie.conf.base import Device
+    from genie.libs.parser.utils import get_parser
+    from pyats.datastructures import AttrDict
+
     # Genie specific construct for doing parsing (based on Genie in Ansible)
     device = Device("new_device", os=os)
     device.custom.setdefault("abstraction", {})
@@ -549,13 +762,71 @@ def structured_data_converter(
     use_genie: bool = False,
     textfsm_template: Optional[str] = None,
     ttp_template: Optional[str] = None,
+    cache: Optional["StructuredDataCache"] = None,
 ) -> Union[str, List[Any], Dict[str, Any]]:
     """
     Try structured data converters in the following order: TextFSM, TTP, Genie.
 
     Return the first structured data found, else return the raw_data as-is.
+
+    If a StructuredDataCache is passed in, identical output (for the same platform, command,
+    parsers and template version) is returned from the cache without being parsed again.
     """
     command = command.strip()
+    if cache is None or not (use_textfsm or use_ttp or use_genie):
+        return _structured_data_convert(
+            raw_data,
+            command=command,
+            platform=platform,
+            use_textfsm=use_textfsm,
+            use_ttp=use_ttp,
+            use_genie=use_genie,
+            textfsm_template=textfsm_template,
+            ttp_template=ttp_template,
+        )
+
+    cache_key = cache.make_key(
+        raw_data,
+        command=command,
+        platform=platform,
+        use_textfsm=use_textfsm,
+        use_ttp=use_ttp,
+        use_genie=use_genie,
+        textfsm_template=textfsm_template,
+        ttp_template=ttp_template,
+    )
+    try:
+        cached_output = cache.get(cache_key)
+    except KeyError:
+        pass
+    else:
+        # None records that no structured data could be found for this output
+        return raw_data if cached_output is None else cached_output
+
+    output = _structured_data_convert(
+        raw_data,
+        command=command,
+        platform=platform,
+        use_textfsm=use_textfsm,
+        use_ttp=use_ttp,
+        use_genie=use_genie,
+        textfsm_template=textfsm_template,
+        ttp_template=ttp_template,
+    )
+    cache.set(cache_key, None if isinstance(output, str) else output)
+    return output
+
+
+def _structured_data_convert(
+    raw_data: str,
+    command: str,
+    platform: str,
+    use_textfsm: bool = False,
+    use_ttp: bool = False,
+    use_genie: bool = False,
+    textfsm_template: Optional[str] = None,
+    ttp_template: Optional[str] = None,
+) -> Union[str, List[Any], Dict[str, Any]]:
     if use_textfsm:
         structured_output_tfsm = get_structured_data_textfsm(
             raw_data, platform=platform, command=command, template=textfsm_template
@@ -1,5 +1,6 @@
 """ntc_templates.parse."""
 
+import multiprocessing
 import os
 
 # Due to TextFSM library issues on Windows, it is better to not fail on import
@@ -16,6 +17,10 @@ class ParsingException(Exception):
     """Error that is raised when TextFSM hits an `Error` state."""
 
 
+# CliTable owned by each bulk parsing worker process, see `_bulk_init`.
+_BULK_CLI_TABLE = None
+
+
 def _get_template_dir():
     template_dir = os.environ.get("NTC_TEMPLATES_DIR")
     if template_dir is None:
@@ -30,14 +35,19 @@ def _get_template_dir():
 
 def _clitable_to_dict(cli_table):
     """Convert TextFSM cli_table object to list of dictionaries."""
-    objs = []
-    for row in cli_table:
-        temp_dict = {}
-        for index, element in enumerate(row):
-            temp_dict[cli_table.header[index].lower()] = element
-        objs.append(temp_dict)
+    header = [name.lower() for name in cli_table.header]
+    return [dict(zip(header, row)) for row in cli_table]
 
-    return objs
+
+def _check_clitable():
+    if not HAS_CLITABLE:
+        msg = (
+            "The TextFSM library is not currently supported on Windows. If you are NOT using Windows "
+            "you should be able to 'pip install textfsm' to fix this issue. If you are using Windows "
+            "then you will need to install the patch referenced here:\n\n"
+            "https://github.com/google/textfsm/pull/82\n\n"
+        )
+        raise ImportError(msg)
 
 
 def parse_output(
@@ -61,24 +71,116 @@ def parse_output(
     Returns:
         list: The TextFSM table entries as dictionaries.
     """
-    if not HAS_CLITABLE:
-        msg = (
-            "The TextFSM library is not currently supported on Windows. If you are NOT using Windows "
-            "you should be able to 'pip install textfsm' to fix this issue. If you are using Windows "
-            "then you will need to install the patch referenced here:\n\n"
-            "https://github.com/google/textfsm/pull/82\n\n"
-        )
-        raise ImportError(msg)
+    _check_clitable()
 
     template_dir = template_dir or _get_template_dir()
     cli_table = clitable.CliTable("index", template_dir)
     attrs = {"Command": command, "Platform": platform}
     try:
-        cli_table.ParseCmd(data, attrs)
-        structured_data = _clitable_to_dict(cli_table)
+        structured_data = cli_table.ParseCmdRecords(data, attrs)
     except clitable.CliTableError as err:
         if try_fallback and template_dir != _get_template_dir():
             return parse_output(platform, command, data)
         raise ParsingException(f'Unable to parse command "{command}" on platform {platform} - {str(err)}') from err
 
     return structured_data
+
+
+def build_template_bundle(template_dir=None):
+    """Write the precompiled template bundle used to speed up process start-up.
+
+    The bundle holds the expanded index and the parsed templates in a single file next to the
+    index. It is ignored, per file, once the index or a template is modified, so it must be
+    rebuilt after updating templates to keep the benefit.
+
+    Args:
+        template_dir: The directory containing the index and TextFSM templates.
+            Defaults to setting of environment variable or default ntc-templates dir.
+
+    Returns:
+        str: The path of the bundle written.
+    """
+    _check_clitable()
+
+    return clitable.WriteBundle(template_dir or _get_template_dir())
+
+
+def _bulk_init(template_dir):
+    """Load the index and compile every template once per worker process."""
+    global _BULK_CLI_TABLE  # pylint: disable=global-statement
+    _BULK_CLI_TABLE = clitable.CliTable("index", template_dir)
+    _BULK_CLI_TABLE.PreloadTemplates()
+
+
+def _bulk_parse(job):
+    """Parse a single `(position, (platform, command, data))` job inside a worker."""
+    position, (platform, command, data) = job
+    attrs = {"Command": command, "Platform": platform}
+    try:
+        return position, _BULK_CLI_TABLE.ParseCmdRecords(data, attrs)
+    except clitable.CliTableError as err:
+        return position, ParsingException(f'Unable to parse command "{command}" on platform {platform} - {str(err)}')
+
+
+def iter_parse_output_bulk(
+    items,
+    template_dir=None,
+    processes=None,
+    chunksize=8,
+    ordered=True,
+):
+    """Parse many device outputs across a pool of worker processes.
+
+    Each worker loads the index and compiles all templates once at start-up, so the per-item
+    cost is only the FSM run itself.
+
+    Args:
+        items: Iterable of `(platform, command, data)` tuples.
+        template_dir: The directory to look for TextFSM templates.
+            Defaults to setting of environment variable or default ntc-templates dir.
+        processes: Number of worker processes. Defaults to `os.cpu_count()`.
+        chunksize: Number of items handed to a worker at a time.
+        ordered: Yield results in input order. When False, results are yielded as soon as
+            any worker finishes them.
+
+    Yields:
+        tuple: `(position, result)` where `position` is the index of the item in `items` and
+            `result` is the list of TextFSM table entries as dictionaries, or the
+            `ParsingException` raised for that item.
+    """
+    _check_clitable()
+
+    template_dir = template_dir or _get_template_dir()
+    with multiprocessing.Pool(processes, initializer=_bulk_init, initargs=(template_dir,)) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(_bulk_parse, enumerate(items), chunksize)
+
+
+def parse_output_bulk(
+    items,
+    template_dir=None,
+    processes=None,
+    chunksize=8,
+    raise_on_error=True,
+):
+    """Return the structured data for many device outputs, parsed in parallel.
+
+    Args:
+        items: Iterable of `(platform, command, data)` tuples.
+        template_dir: The directory to look for TextFSM templates.
+            Defaults to setting of environment variable or default ntc-templates dir.
+        processes: Number of worker processes. Defaults to `os.cpu_count()`.
+        chunksize: Number of items handed to a worker at a time.
+        raise_on_error: Raise the first `ParsingException` encountered. When False, the
+            exception is returned in place of that item's result instead.
+
+    Returns:
+        list: One result per item, in input order, as returned by `parse_output`.
+    """
+    results = []
+    for _, result in iter_parse_output_bulk(items, template_dir, processes, chunksize):
+        if raise_on_error and isinstance(result, ParsingException):
+            raise result
+        results.append(result)
+
+    return results
@@ -78,9 +78,10 @@ from paramiko.sftp_si import SFTPServerInterface
 from paramiko.sftp_file import SFTPFile
 from paramiko.message import Message
 from paramiko.packet import Packetizer
+from paramiko.reactor import TransportReactor
 from paramiko.file import BufferedFile
 from paramiko.agent import Agent, AgentKey
-from paramiko.pkey import PKey, PublicBlob, UnknownKeyType
+from paramiko.pkey import PKey, PKeyCache, PublicBlob, UnknownKeyType
 from paramiko.hostkeys import HostKeys
 from paramiko.config import SSHConfig, SSHConfigDict
 from paramiko.proxy import ProxyCommand
@@ -138,6 +139,7 @@ __all__ = [
     "Message",
     "MissingHostKeyPolicy",
     "PKey",
+    "PKeyCache",
     "PasswordRequiredException",
     "ProxyCommand",
     "ProxyCommandFailure",
@@ -159,6 +161,7 @@ __all__ = [
     "ServerInterface",
     "SubsystemHandler",
     "Transport",
+    "TransportReactor",
     "WarningPolicy",
     "io_sleep",
     "util",
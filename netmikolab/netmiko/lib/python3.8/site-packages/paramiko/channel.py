@@ -40,6 +40,7 @@ from paramiko.common import (
     cMSG_CHANNEL_FAILURE,
     cMSG_CHANNEL_EOF,
     cMSG_CHANNEL_CLOSE,
+    MAX_WINDOW_SIZE,
 )
 from paramiko.message import Message
 from paramiko.ssh_exception import SSHException
@@ -123,6 +124,12 @@ class Channel(ClosingContextManager):
         self.out_max_packet_size = 0
         self.in_window_threshold = 0
         self.in_window_sofar = 0
+        # window auto-tuning (see `.Transport` ``window_autotune``)
+        self.in_window_autotune = False
+        self._autotune_start = None
+        self._autotune_bytes = 0
+        # when we asked the server to open us (for RTT measurement)
+        self._open_started = None
         self.status_event = threading.Event()
         self._name = str(chanid)
         self.logger = util.get_logger("paramiko.transport")
@@ -1007,6 +1014,7 @@ class Channel(ClosingContextManager):
         # a window update
         self.in_window_threshold = window_size // 10
         self.in_window_sofar = 0
+        self.in_window_autotune = self.transport.window_autotune
         self._log(DEBUG, "Max packet in: {} bytes".format(max_packet_size))
 
     def _set_remote_channel(self, chanid, window_size, max_packet_size):
@@ -1279,6 +1287,10 @@ class Channel(ClosingContextManager):
             if self.ultra_debug:
                 self._log(DEBUG, "addwindow {}".format(n))
             self.in_window_sofar += n
+            if self.in_window_autotune:
+                if self._autotune_start is None:
+                    self._autotune_start = time.time()
+                self._autotune_bytes += n
             if self.in_window_sofar <= self.in_window_threshold:
                 return 0
             if self.ultra_debug:
@@ -1287,10 +1299,47 @@ class Channel(ClosingContextManager):
                 )
             out = self.in_window_sofar
             self.in_window_sofar = 0
+            if self.in_window_autotune:
+                out += self._grow_window()
             return out
         finally:
             self.lock.release()
 
+    def _grow_window(self):
+        """
+        Grow the receive window towards twice the bandwidth-delay product
+        (measured read rate * transport RTT), returning how many bytes it
+        grew by. Rates are measured over at least one RTT; while the window
+        is what limits the peer, this doubles it every round trip.
+        """
+        rtt = self.transport._rtt
+        if rtt is None:
+            return 0
+        now = time.time()
+        elapsed = now - self._autotune_start
+        if elapsed < rtt:
+            return 0
+        rate = self._autotune_bytes / elapsed
+        self._autotune_start = now
+        self._autotune_bytes = 0
+        target = min(
+            int(2 * rate * rtt),
+            self.transport.window_autotune_max,
+            MAX_WINDOW_SIZE,
+        )
+        if target <= self.in_window_size:
+            return 0
+        grow = target - self.in_window_size
+        self._log(
+            DEBUG,
+            "window autotune {} -> {} ({:.0f} bytes/s, rtt {:.1f}ms)".format(
+                self.in_window_size, target, rate, rtt * 1000
+            ),
+        )
+        self.in_window_size = target
+        self.in_window_threshold = target // 10
+        return grow
+
     def _wait_for_send_window(self, size):
         """
         (You are already holding the lock.)
@@ -35,6 +35,7 @@ from paramiko.dsskey import DSSKey
 from paramiko.ecdsakey import ECDSAKey
 from paramiko.ed25519key import Ed25519Key
 from paramiko.hostkeys import HostKeys
+from paramiko.pkey import PKeyCache
 from paramiko.rsakey import RSAKey
 from paramiko.ssh_exception import (
     SSHException,
@@ -65,6 +66,12 @@ class SSHClient(ClosingContextManager):
     .. versionadded:: 1.6
     """
 
+    #: Process-wide `.PKeyCache` used when loading ``key_filename`` and
+    #: discovered (``look_for_keys``) private keys, so repeated connections
+    #: don't re-read and re-decrypt them. Set to ``None`` (on the class or an
+    #: instance) to always load keys from disk.
+    key_cache = PKeyCache()
+
     def __init__(self):
         """
         Create a new SSHClient.
@@ -635,7 +642,10 @@ class SSHClient(ClosingContextManager):
             key_path = filename
             cert_path = filename + cert_suffix
         # Blindly try the key path; if no private key, nothing will work.
-        key = klass.from_private_key_file(key_path, password)
+        if self.key_cache is not None:
+            key = self.key_cache.get(key_path, klass, password, cert_path)
+        else:
+            key = klass.from_private_key_file(key_path, password)
         # TODO: change this to 'Loading' instead of 'Trying' sometime; probably
         # when #387 is released, since this is a critical log message users are
         # likely testing/filtering for (bah.)
@@ -643,9 +653,10 @@ class SSHClient(ClosingContextManager):
             hexlify(key.get_fingerprint()), key_path
         )
         self._log(DEBUG, msg)
-        # Attempt to load cert if it exists.
+        # Attempt to load cert if it exists (the cache already did).
         if os.path.isfile(cert_path):
-            key.load_certificate(cert_path)
+            if self.key_cache is None:
+                key.load_certificate(cert_path)
             self._log(DEBUG, "Adding public certificate {}".format(cert_path))
         return key
 
@@ -89,6 +89,10 @@ class SSHConfig:
             config = SSHConfig.from_text("Host foo\\n\\tUser bar")
         """
         self._config = []
+        # Built on first lookup, see _candidates()
+        self._index = None
+        # Memoized lookup() results, by (hostname, local user)
+        self._lookups = {}
 
     @classmethod
     def from_text(cls, text):
@@ -126,6 +130,8 @@ class SSHConfig:
 
         :param file_obj: a file-like object to read the config file from
         """
+        self._index = None
+        self._lookups = {}
         # Start out w/ implicit/anonymous global host-like block to hold
         # anything not contained by an explicit one.
         context = {"host": ["*"], "config": {}}
@@ -210,6 +216,12 @@ class SSHConfig:
             set to the being-looked-up hostname, which is as close as we can
             get to OpenSSH's behavior around that particular option.
 
+        .. note::
+            Results are memoized per hostname (and local user), except when
+            a ``Match exec`` command had to be run or the hostname was
+            canonicalized, as those depend on the outside world. Call `parse`
+            (or make a new object) to pick up config file changes.
+
         :param str hostname: the hostname to lookup
 
         .. versionchanged:: 2.5
@@ -221,6 +233,10 @@ class SSHConfig:
         .. versionchanged:: 3.3
             Added ``Match final`` support.
         """
+        cache_key = (hostname, getpass.getuser())
+        cached = self._lookups.get(cache_key)
+        if cached is not None:
+            return _copy_options(cached)
         # First pass
         options = self._lookup(hostname=hostname)
         # Inject HostName if it was not set (this used to be done incidentally
@@ -244,6 +260,8 @@ class SSHConfig:
             options = self._lookup(
                 hostname, options, canonical=False, final=True
             )
+            if not getattr(options, "_ran_exec", False):
+                self._lookups[cache_key] = _copy_options(options)
         return options
 
     def _lookup(self, hostname, options=None, canonical=False, final=False):
@@ -252,7 +270,7 @@ class SSHConfig:
             options = SSHConfigDict()
         # Iterate all stanzas, applying any that match, in turn (so that things
         # like Match can reference currently understood state)
-        for context in self._config:
+        for context in self._candidates(hostname):
             if not (
                 self._pattern_matches(context.get("host", []), hostname)
                 or self._does_match(
@@ -281,6 +299,37 @@ class SSHConfig:
             options = self._expand_variables(options, hostname)
         return options
 
+    def _candidates(self, hostname):
+        """
+        Return the stanzas which may apply to ``hostname``, in file order.
+
+        ``Host`` stanzas made only of literal (non-wildcard, non-negated)
+        patterns are indexed by pattern, so only those naming ``hostname``
+        are returned; every other stanza (wildcards, negations, ``Match``) is
+        always returned, to be evaluated as usual.
+        """
+        index = self._index
+        if index is None or index[2] != len(self._config):
+            literal, others = {}, []
+            for i, context in enumerate(self._config):
+                patterns = context.get("host")
+                if "matches" in context or patterns is None:
+                    others.append(i)
+                elif any(
+                    p.startswith("!") or any(c in p for c in "*?[")
+                    for p in patterns
+                ):
+                    others.append(i)
+                else:
+                    for p in set(patterns):
+                        literal.setdefault(os.path.normcase(p), []).append(i)
+            index = self._index = (literal, others, len(self._config))
+        literal, others, _ = index
+        hits = literal.get(os.path.normcase(hostname))
+        if not hits:
+            return [self._config[i] for i in others]
+        return [self._config[i] for i in sorted(hits + others)]
+
     def canonicalize(self, hostname, options, domains):
         """
         Return canonicalized version of ``hostname``.
@@ -388,6 +437,9 @@ class SSHConfig:
             elif type_ == "localuser":
                 passed = self._pattern_matches(param, local_username)
             elif type_ == "exec":
+                # Outcome depends on the outside world; keeps lookup() from
+                # memoizing this result.
+                options._ran_exec = True
                 exec_cmd = self._tokenize(
                     options, target_hostname, "match-exec", param
                 )
@@ -556,6 +608,15 @@ class SSHConfig:
         return matches
 
 
+def _copy_options(options):
+    """
+    Copy an `SSHConfigDict`, including its list values (eg identityfile).
+    """
+    return SSHConfigDict(
+        (k, v[:] if isinstance(v, list) else v) for k, v in options.items()
+    )
+
+
 def _addressfamily_host_lookup(hostname, options):
     """
     Try looking up ``hostname`` in an IPv4 or IPv6 specific manner.
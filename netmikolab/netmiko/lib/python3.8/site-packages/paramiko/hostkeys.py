@@ -53,6 +53,8 @@ class HostKeys(MutableMapping):
         """
         # emulate a dict of { hostname: { keytype: PKey } }
         self._entries = []
+        # lookup index over _entries, built on demand; see _matching_entries
+        self._index = None
         if filename is not None:
             self.load(filename)
 
@@ -69,7 +71,7 @@ class HostKeys(MutableMapping):
             if (hostname in e.hostnames) and (e.key.get_name() == keytype):
                 e.key = key
                 return
-        self._entries.append(HostKeyEntry([hostname], key))
+        self._append(HostKeyEntry([hostname], key))
 
     def load(self, filename):
         """
@@ -101,7 +103,7 @@ class HostKeys(MutableMapping):
                         if self.check(h, entry.key):
                             entry.hostnames.remove(h)
                     if len(entry.hostnames):
-                        self._entries.append(entry)
+                        self._append(entry)
 
     def save(self, filename):
         """
@@ -172,7 +174,7 @@ class HostKeys(MutableMapping):
                     # add a new one
                     e = HostKeyEntry([hostname], val)
                     self._entries.append(e)
-                    self._hostkeys._entries.append(e)
+                    self._hostkeys._append(e)
 
             def keys(self):
                 return [
@@ -181,14 +183,76 @@ class HostKeys(MutableMapping):
                     if e.key is not None
                 ]
 
-        entries = []
-        for e in self._entries:
-            if self._hostname_matches(hostname, e):
-                entries.append(e)
+        entries = self._matching_entries(hostname)
         if len(entries) == 0:
             return None
         return SubDict(hostname, entries, self)
 
+    def _append(self, entry):
+        self._entries.append(entry)
+        if self._index is not None:
+            # keep the index current (cheaper than rebuilding it, which
+            # matters when loading big files)
+            self._index_entry(entry, len(self._entries) - 1)
+            self._index["matches"].clear()
+            self._index["state"] = (id(self._entries), len(self._entries))
+
+    def _index_entry(self, entry, position):
+        index = self._index
+        index["positions"][id(entry)] = position
+        for h in entry.hostnames:
+            index["names"].setdefault(h, []).append(entry)
+            if not h.startswith("|1|"):
+                continue
+            fields = h.split("|")
+            try:
+                salt = decodebytes(b(fields[2]))
+                digest = decodebytes(b(fields[3]))
+            except (IndexError, binascii.Error):
+                continue
+            if len(salt) != sha1().digest_size:
+                continue
+            digests = index["hashed"].setdefault(salt, {})
+            digests.setdefault(digest, []).append(entry)
+
+    def _matching_entries(self, hostname):
+        """
+        Return the entries matching ``hostname`` (in file order), the same as
+        testing every entry with `_hostname_matches`.
+
+        Literal hostnames are looked up in a dict. Hashed (``|1|``) ones are
+        grouped by salt, so ``hostname`` is hashed once per distinct salt
+        rather than once per entry, and the result is remembered until the
+        entries change.
+        """
+        index = self._index
+        if index is None or index["state"] != (
+            id(self._entries),
+            len(self._entries),
+        ):
+            index = self._index = {
+                "names": {},
+                "hashed": {},
+                "positions": {},
+                "matches": {},
+                "state": (id(self._entries), len(self._entries)),
+            }
+            for position, entry in enumerate(self._entries):
+                self._index_entry(entry, position)
+        found = index["matches"].get(hostname)
+        if found is None:
+            found = {id(e): e for e in index["names"].get(hostname, ())}
+            if not hostname.startswith("|1|"):
+                raw = b(hostname)
+                for salt, digests in index["hashed"].items():
+                    digest = HMAC(salt, raw, sha1).digest()
+                    for e in digests.get(digest, ()):
+                        found[id(e)] = e
+            positions = index["positions"]
+            found = sorted(found.values(), key=lambda e: positions[id(e)])
+            index["matches"][hostname] = found
+        return list(found)
+
     def _hostname_matches(self, hostname, entry):
         """
         Tests whether ``hostname`` string matches given SubDict ``entry``.
@@ -228,6 +292,7 @@ class HostKeys(MutableMapping):
         Remove all host keys from the dictionary.
         """
         self._entries = []
+        self._index = None
 
     def __iter__(self):
         for k in self.keys():
@@ -251,11 +316,12 @@ class HostKeys(MutableMapping):
         if index is None:
             raise KeyError(key)
         self._entries.pop(index)
+        self._index = None
 
     def __setitem__(self, hostname, entry):
         # don't use this please.
         if len(entry) == 0:
-            self._entries.append(HostKeyEntry([hostname], None))
+            self._append(HostKeyEntry([hostname], None))
             return
         for key_type in entry.keys():
             found = False
@@ -265,7 +331,7 @@ class HostKeys(MutableMapping):
                     e.key = entry[key_type]
                     found = True
             if not found:
-                self._entries.append(HostKeyEntry([hostname], entry[key_type]))
+                self._append(HostKeyEntry([hostname], entry[key_type]))
 
     def keys(self):
         ret = []
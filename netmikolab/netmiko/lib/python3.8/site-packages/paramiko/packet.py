@@ -35,7 +35,6 @@ from paramiko.common import (
     MSG_NAMES,
     DEBUG,
     xffffffff,
-    zero_byte,
     byte_ord,
 )
 from paramiko.util import u
@@ -47,6 +46,13 @@ def compute_hmac(key, message, digest_class):
     return HMAC(key, message, digest_class).digest()
 
 
+def _compute_mac(key, prefix, data, digest_class):
+    # compute_hmac() over prefix + data, without building that concatenation
+    mac = HMAC(key, prefix, digest_class)
+    mac.update(data)
+    return mac.digest()
+
+
 class NeedRekeyException(Exception):
     """
     Exception indicating a rekey is needed.
@@ -78,6 +84,17 @@ class Packetizer:
     # Allow receiving this many bytes after a re-key request before terminating
     REKEY_BYTES_OVERFLOW_MAX = pow(2, 29)
 
+    # Largest inbound packet we're willing to buffer; same limit as OpenSSH's
+    # PACKET_MAX_SIZE.
+    MAX_PACKET_SIZE = pow(2, 18)
+
+    # Cipher contexts need this much room past the end of their input when
+    # decrypting/encrypting into a buffer (largest block size - 1).
+    _CIPHER_SLACK = 15
+
+    # Most bytes `buffer_input` takes from the socket per call.
+    _BUFFER_INPUT_SIZE = 65536
+
     def __init__(self, socket):
         self.__socket = socket
         self.__logger = None
@@ -85,9 +102,22 @@ class Packetizer:
         self.__dump_packets = False
         self.__need_rekey = False
         self.__init_count = 0
-        self.__remainder = bytes()
+        # Input read ahead of the packet being read; the bytes before
+        # __remainder_pos were consumed already (dropped when the buffer is
+        # refilled, so each byte is copied a bounded number of times)
+        self.__remainder = bytearray()
+        self.__remainder_pos = 0
+        # first block of the next inbound packet, if has_buffered_packet()
+        # already had to decrypt it to learn the packet length
+        self.__header_in = None
         self._initial_kex_done = False
 
+        # Real sockets get recv_into() and memoryviews; other socket-like
+        # objects (channels, ProxyCommand) get plain bytes, as always.
+        self.__recv_into = getattr(socket, "recv_into", None)
+        # inbound packets are assembled in here, grown as needed
+        self.__read_buf = bytearray(4096)
+
         # used for noticing when to re-key:
         self.__sent_bytes = 0
         self.__sent_packets = 0
@@ -110,6 +140,11 @@ class Packetizer:
         self.__mac_key_in = bytes()
         self.__compress_engine_out = None
         self.__compress_engine_in = None
+        # payload bytes before/after compression, see get_compression_stats
+        self.__raw_bytes_out = 0
+        self.__compressed_bytes_out = 0
+        self.__raw_bytes_in = 0
+        self.__compressed_bytes_in = 0
         self.__sequence_number_out = 0
         self.__sequence_number_in = 0
         self.__etm_out = False
@@ -223,6 +258,21 @@ class Packetizer:
     def set_inbound_compressor(self, compressor):
         self.__compress_engine_in = compressor
 
+    def get_compression_stats(self):
+        """
+        Return how many payload bytes were sent and received so far, before
+        (``raw``) and after (``compressed``) compression, as a dict with keys
+        ``raw_out``, ``compressed_out``, ``raw_in`` and ``compressed_in``.
+        Both counts are the same for packets sent or received without
+        compression.
+        """
+        return {
+            "raw_out": self.__raw_bytes_out,
+            "compressed_out": self.__compressed_bytes_out,
+            "raw_in": self.__raw_bytes_in,
+            "compressed_in": self.__compressed_bytes_in,
+        }
+
     def close(self):
         self.__closed = True
         self.__socket.close()
@@ -239,6 +289,80 @@ class Packetizer:
     def get_mac_size_out(self):
         return self.__mac_size_out
 
+    def has_pending_input(self):
+        """
+        Returns ``True`` if bytes already read from the socket (eg along with
+        the SSH banner) are waiting to be consumed, in which case the socket
+        itself may never become readable for them.
+        """
+        return self._buffered() > 0 or self.__header_in is not None
+
+    def _buffered(self):
+        return len(self.__remainder) - self.__remainder_pos
+
+    def _take(self, n):
+        """Consume and return (as bytes) the next n buffered bytes."""
+        pos = self.__remainder_pos
+        data = bytes(self.__remainder[pos : pos + n])
+        self.__remainder_pos = pos + len(data)
+        if self.__remainder_pos == len(self.__remainder):
+            self.__remainder = bytearray()
+            self.__remainder_pos = 0
+        return data
+
+    def buffer_input(self):
+        """
+        Append whatever the socket holds to the input buffer, with a single
+        ``recv``; used by `.TransportReactor` once a selector has reported
+        the socket readable, so it never waits for more.
+
+        :raises: ``EOFError`` -- if the socket was closed
+        """
+        try:
+            data = self.__socket.recv(self._BUFFER_INPUT_SIZE)
+        except socket.timeout:
+            return
+        except socket.error as e:
+            if first_arg(e) == errno.EAGAIN:
+                return
+            if self.__closed:
+                raise EOFError()
+            raise
+        if len(data) == 0:
+            raise EOFError()
+        if self.__remainder_pos:
+            del self.__remainder[: self.__remainder_pos]
+            self.__remainder_pos = 0
+        self.__remainder += data
+
+    def has_buffered_packet(self):
+        """
+        Returns ``True`` if a whole inbound packet (and its MAC) is waiting in
+        the input buffer, so `read_message` can return it without touching
+        the socket. Also ``True`` for a packet length `read_message` will
+        reject, so that the error surfaces.
+        """
+        block_size = self.__block_size_in
+        if self.__header_in is None:
+            if self._buffered() < block_size:
+                return False
+            engine = self.__block_engine_in
+            if engine is not None and not (self.__etm_in or self.__aead_in):
+                # The length is encrypted; decrypting can't be undone, so
+                # read_message() takes this block from __header_in instead.
+                self.__header_in = engine.update(self._take(block_size))
+        if self.__header_in is not None:
+            header = self.__header_in[:4]
+            buffered = block_size + self._buffered()
+        else:
+            pos = self.__remainder_pos
+            header = bytes(self.__remainder[pos : pos + 4])
+            buffered = self._buffered()
+        packet_size = struct.unpack(">I", header)[0]
+        if packet_size > self.MAX_PACKET_SIZE:
+            return True
+        return buffered >= 4 + packet_size + self.__mac_size_in
+
     def need_rekey(self):
         """
         Returns ``True`` if a new set of keys needs to be negotiated.  This
@@ -308,22 +432,35 @@ class Packetizer:
             ``EOFError`` -- if the socket was closed before all the bytes could
             be read
         """
-        out = bytes()
+        out = bytearray(n)
+        self._read_into(memoryview(out), check_rekey)
+        return bytes(out)
+
+    def _read_into(self, view, check_rekey=False):
+        """
+        Fill the writable buffer ``view`` from the socket, blocking as long as
+        necessary. See `read_all`.
+        """
+        n = len(view)
+        got = 0
         # handle over-reading from reading the banner line
-        if len(self.__remainder) > 0:
-            out = self.__remainder[:n]
-            self.__remainder = self.__remainder[n:]
-            n -= len(out)
-        while n > 0:
+        if self._buffered() > 0:
+            got = min(n, self._buffered())
+            view[:got] = self._take(got)
+        while got < n:
             got_timeout = False
             if self.handshake_timed_out():
                 raise EOFError()
             try:
-                x = self.__socket.recv(n)
-                if len(x) == 0:
+                if self.__recv_into is not None:
+                    x = self.__recv_into(view[got:])
+                else:
+                    data = self.__socket.recv(n - got)
+                    x = len(data)
+                    view[got : got + x] = data
+                if x == 0:
                     raise EOFError()
-                out += x
-                n -= len(x)
+                got += x
             except socket.timeout:
                 got_timeout = True
             except socket.error as e:
@@ -340,13 +477,17 @@ class Packetizer:
             if got_timeout:
                 if self.__closed:
                     raise EOFError()
-                if check_rekey and (len(out) == 0) and self.__need_rekey:
+                if check_rekey and (got == 0) and self.__need_rekey:
                     raise NeedRekeyException()
                 self._check_keepalive()
-        return out
 
     def write_all(self, out):
         self.__keepalive_last = time.time()
+        if self.__recv_into is not None:
+            # partial sends below then slice without copying
+            out = memoryview(out)
+        elif not isinstance(out, bytes):
+            out = bytes(out)
         iteration_with_zero_as_return_value = 0
         while len(out) > 0:
             retry_write = False
@@ -390,11 +531,11 @@ class Packetizer:
         Read a line from the socket.  We assume no data is pending after the
         line, so it's okay to attempt large reads.
         """
-        buf = self.__remainder
+        buf = self._take(self._buffered())
         while linefeed_byte not in buf:
             buf += self._read_timeout(timeout)
         n = buf.index(linefeed_byte)
-        self.__remainder = buf[n + 1 :]
+        self.__remainder = bytearray(buf[n + 1 :])
         buf = buf[:n]
         if (len(buf) > 0) and (buf[-1] == cr_byte_value):
             buf = buf[:-1]
@@ -427,38 +568,60 @@ class Packetizer:
         try:
             if self.__compress_engine_out is not None:
                 data = self.__compress_engine_out(data)
-            packet = self._build_packet(data)
+            self.__raw_bytes_out += orig_len
+            self.__compressed_bytes_out += len(data)
+            engine = self.__block_engine_out
+            mac_size = self.__mac_size_out
+            # The packet is built, encrypted and MAC'd in one buffer, with
+            # room after it for the MAC (and the cipher's scratch space).
+            if engine is None or self.__aead_out:
+                extra = 0
+            else:
+                extra = mac_size + self._CIPHER_SLACK
+            buf = self._build_packet(data, extra)
+            size = len(buf) - extra
+            packet = memoryview(buf)
             if self.__dump_packets:
                 self._log(
                     DEBUG,
                     "Write packet <{}>, length {}".format(cmd_name, orig_len),
                 )
-                self._log(DEBUG, util.format_binary(packet, "OUT: "))
-            if self.__block_engine_out is not None:
+                self._log(
+                    DEBUG, util.format_binary(bytes(packet[:size]), "OUT: ")
+                )
+            if engine is None:
+                out = buf
+            elif self.__aead_out:
+                # Packet-length field is used as the 'associated data'
+                # under AES-GCM, so like EtM, it's not encrypted. See
+                # https://www.rfc-editor.org/rfc/rfc5647#section-7.3
+                out = bytes(packet[0:4]) + engine.encrypt(
+                    self.__iv_out, packet[4:], packet[0:4]
+                )
+                self.__iv_out = self._inc_iv_counter(self.__iv_out)
+            else:
+                seqno = struct.pack(">I", self.__sequence_number_out)
                 if self.__etm_out:
-                    # packet length is not encrypted in EtM
-                    out = packet[0:4] + self.__block_engine_out.update(
-                        packet[4:]
-                    )
-                elif self.__aead_out:
-                    # Packet-length field is used as the 'associated data'
-                    # under AES-GCM, so like EtM, it's not encrypted. See
-                    # https://www.rfc-editor.org/rfc/rfc5647#section-7.3
-                    out = packet[0:4] + self.__block_engine_out.encrypt(
-                        self.__iv_out, packet[4:], packet[0:4]
+                    # packet length is not encrypted in EtM, and the MAC
+                    # covers the ciphertext
+                    engine.update_into(packet[4:size], packet[4:])
+                    mac = _compute_mac(
+                        self.__mac_key_out,
+                        seqno,
+                        packet[:size],
+                        self.__mac_engine_out,
                     )
-                    self.__iv_out = self._inc_iv_counter(self.__iv_out)
                 else:
-                    out = self.__block_engine_out.update(packet)
-            else:
-                out = packet
-            # Append an MAC when needed (eg, not under AES-GCM)
-            if self.__block_engine_out is not None and not self.__aead_out:
-                packed = struct.pack(">I", self.__sequence_number_out)
-                payload = packed + (out if self.__etm_out else packet)
-                out += compute_hmac(
-                    self.__mac_key_out, payload, self.__mac_engine_out
-                )[: self.__mac_size_out]
+                    # MAC covers the plaintext; encrypt in place afterwards
+                    mac = _compute_mac(
+                        self.__mac_key_out,
+                        seqno,
+                        packet[:size],
+                        self.__mac_engine_out,
+                    )
+                    engine.update_into(packet[:size], packet)
+                packet[size : size + mac_size] = mac[:mac_size]
+                out = packet[: size + mac_size]
             next_seq = (self.__sequence_number_out + 1) & xffffffff
             if next_seq == 0 and not self._initial_kex_done:
                 raise SSHException(
@@ -493,80 +656,64 @@ class Packetizer:
         :raises: `.SSHException` -- if the packet is mangled
         :raises: `.NeedRekeyException` -- if the transport should rekey
         """
-        header = self.read_all(self.__block_size_in, check_rekey=True)
-        if self.__etm_in:
+        block_size = self.__block_size_in
+        mac_size = self.__mac_size_in
+        engine = self.__block_engine_in
+        header = self.__header_in
+        if header is not None:
+            # read & decrypted by has_buffered_packet() already
+            self.__header_in = None
+        else:
+            header = bytearray(block_size)
+            self._read_into(memoryview(header), check_rekey=True)
+            if engine is not None and not (self.__etm_in or self.__aead_in):
+                header = engine.update(header)
+        if self.__etm_in or self.__aead_in:
+            # packet length is sent in the clear
             packet_size = struct.unpack(">I", header[:4])[0]
-            remaining = packet_size - self.__block_size_in + 4
-            packet = header[4:] + self.read_all(remaining, check_rekey=False)
-            mac = self.read_all(self.__mac_size_in, check_rekey=False)
-            mac_payload = (
-                struct.pack(">II", self.__sequence_number_in, packet_size)
-                + packet
-            )
-            my_mac = compute_hmac(
-                self.__mac_key_in, mac_payload, self.__mac_engine_in
-            )[: self.__mac_size_in]
-            if not util.constant_time_bytes_eq(my_mac, mac):
-                raise SSHException("Mismatched MAC")
-            header = packet
+        else:
+            if self.__dump_packets:
+                self._log(DEBUG, util.format_binary(header, "IN: "))
+            packet_size = struct.unpack(">I", header[:4])[0]
+            # the rest of the packet must come in whole blocks
+            if (packet_size + 4) % block_size != 0:
+                raise SSHException("Invalid packet blocking")
+        if packet_size > self.MAX_PACKET_SIZE or packet_size + 4 < block_size:
+            raise SSHException("Invalid packet size {}".format(packet_size))
+
+        # Read the rest of the packet plus its MAC straight in behind the
+        # first block, then decrypt it in place.
+        end = 4 + packet_size
+        need = end + mac_size + self._CIPHER_SLACK
+        if len(self.__read_buf) < need:
+            self.__read_buf = bytearray(need)
+        buf = memoryview(self.__read_buf)
+        buf[:block_size] = header
+        self._read_into(buf[block_size : end + mac_size])
+        mac = bytes(buf[end : end + mac_size])
 
         if self.__aead_in:
-            # Grab unencrypted (considered 'additional data' under GCM) packet
-            # length.
-            packet_size = struct.unpack(">I", header[:4])[0]
-            aad = header[:4]
-            remaining = (
-                packet_size - self.__block_size_in + 4 + self.__mac_size_in
+            # Packet-length field is the 'additional data' under GCM, and the
+            # MAC is GCM's tag
+            packet = memoryview(
+                engine.decrypt(self.__iv_in, buf[4 : end + mac_size], buf[:4])
             )
-            packet = header[4:] + self.read_all(remaining, check_rekey=False)
-            header = self.__block_engine_in.decrypt(self.__iv_in, packet, aad)
-
             self.__iv_in = self._inc_iv_counter(self.__iv_in)
-
-        if self.__block_engine_in is not None and not self.__aead_in:
-            header = self.__block_engine_in.update(header)
-        if self.__dump_packets:
-            self._log(DEBUG, util.format_binary(header, "IN: "))
-
-        # When ETM or AEAD (GCM) are in use, we've already read the packet size
-        # & decrypted everything, so just set the packet back to the header we
-        # obtained.
-        if self.__etm_in or self.__aead_in:
-            packet = header
-        # Otherwise, use the older non-ETM logic
         else:
-            packet_size = struct.unpack(">I", header[:4])[0]
-
-            # leftover contains decrypted bytes from the first block (after the
-            # length field)
-            leftover = header[4:]
-            if (packet_size - len(leftover)) % self.__block_size_in != 0:
-                raise SSHException("Invalid packet blocking")
-            buf = self.read_all(
-                packet_size + self.__mac_size_in - len(leftover)
-            )
-            packet = buf[: packet_size - len(leftover)]
-            post_packet = buf[packet_size - len(leftover) :]
-
-            if self.__block_engine_in is not None:
-                packet = self.__block_engine_in.update(packet)
-            packet = leftover + packet
-
+            if self.__etm_in:
+                # MAC covers the ciphertext (and it all still is)
+                self._check_mac(mac, packet_size, buf[4:end])
+                engine.update_into(buf[4:end], buf[4:])
+            elif engine is not None:
+                # first block was decrypted above, already
+                engine.update_into(buf[block_size:end], buf[block_size:])
+            packet = buf[4:end]
         if self.__dump_packets:
-            self._log(DEBUG, util.format_binary(packet, "IN: "))
+            self._log(DEBUG, util.format_binary(bytes(packet), "IN: "))
 
-        if self.__mac_size_in > 0 and not self.__etm_in and not self.__aead_in:
-            mac = post_packet[: self.__mac_size_in]
-            mac_payload = (
-                struct.pack(">II", self.__sequence_number_in, packet_size)
-                + packet
-            )
-            my_mac = compute_hmac(
-                self.__mac_key_in, mac_payload, self.__mac_engine_in
-            )[: self.__mac_size_in]
-            if not util.constant_time_bytes_eq(my_mac, mac):
-                raise SSHException("Mismatched MAC")
-        padding = byte_ord(packet[0])
+        if mac_size > 0 and not self.__etm_in and not self.__aead_in:
+            self._check_mac(mac, packet_size, packet)
+        padding = packet[0]
         payload = packet[1 : packet_size - padding]
 
         if self.__dump_packets:
@@ -577,8 +724,10 @@ class Packetizer:
                 ),
             )
 
+        self.__compressed_bytes_in += len(payload)
         if self.__compress_engine_in is not None:
             payload = self.__compress_engine_in(payload)
+        self.__raw_bytes_in += len(payload)
 
         msg = Message(payload[1:])
         msg.seqno = self.__sequence_number_in
@@ -634,6 +783,14 @@ class Packetizer:
 
     # ...protected...
 
+    def _check_mac(self, mac, packet_size, packet):
+        prefix = struct.pack(">II", self.__sequence_number_in, packet_size)
+        my_mac = _compute_mac(
+            self.__mac_key_in, prefix, packet, self.__mac_engine_in
+        )[: self.__mac_size_in]
+        if not util.constant_time_bytes_eq(my_mac, mac):
+            raise SSHException("Mismatched MAC")
+
     def _log(self, level, msg):
         if self.__logger is None:
             return
@@ -673,22 +830,24 @@ class Packetizer:
                 raise socket.timeout()
         return x
 
-    def _build_packet(self, payload):
+    def _build_packet(self, payload, extra=0):
         # pad up at least 4 bytes, to nearest block-size (usually 8)
         bsize = self.__block_size_out
         # do not include payload length in computations for padding in EtM mode
         # (payload length won't be encrypted)
         addlen = 4 if self.__etm_out or self.__aead_out else 8
         padding = 3 + bsize - ((len(payload) + addlen) % bsize)
-        packet = struct.pack(">IB", len(payload) + padding + 1, padding)
-        packet += payload
-        if self.__sdctr_out or self.__block_engine_out is None:
-            # cute trick i caught openssh doing: if we're not encrypting or
-            # SDCTR mode (RFC4344),
-            # don't waste random bytes for the padding
-            packet += zero_byte * padding
-        else:
-            packet += os.urandom(padding)
+        # one buffer for the whole packet, plus ``extra`` spare bytes at the
+        # end for the caller
+        size = 5 + len(payload) + padding
+        packet = bytearray(size + extra)
+        struct.pack_into(">IB", packet, 0, len(payload) + padding + 1, padding)
+        packet[5 : 5 + len(payload)] = payload
+        # cute trick i caught openssh doing: if we're not encrypting or
+        # SDCTR mode (RFC4344),
+        # don't waste random bytes for the padding (it stays zeroed)
+        if not (self.__sdctr_out or self.__block_engine_out is None):
+            packet[5 + len(payload) : size] = os.urandom(padding)
         return packet
 
     def _trigger_rekey(self):
@@ -28,6 +28,7 @@ from pathlib import Path
 from hashlib import md5, sha256
 import re
 import struct
+import threading
 
 import bcrypt
 
@@ -955,3 +956,72 @@ class PublicBlob:
 
     def __ne__(self, other):
         return not self == other
+
+
+class PKeyCache:
+    """
+    Process-wide cache of private keys loaded from disk.
+
+    Entries are keyed by key file path, key class and (a digest of) the
+    passphrase, and are only reused while the key file - and its matching
+    ``-cert.pub``, if any - keep the same modification time and size; editing
+    or replacing either file causes a fresh load. Failures to parse a file as
+    a given key class are remembered too, so trying several classes in turn
+    (as `.SSHClient` does) only costs a file read the first time.
+
+    Loaded keys are shared between callers, so they must be treated as
+    read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (path, class, passphrase digest) -> (file stamps, key or exception)
+        self._keys = {}
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, key_path, klass, password=None, cert_path=None):
+        """
+        Return the private key in ``key_path`` as a ``klass`` instance (with
+        the certificate in ``cert_path`` loaded, if that file exists), from
+        cache if possible.
+
+        :raises: anything `.PKey.from_private_key_file` may raise.
+        """
+        key_path = os.path.abspath(key_path)
+        secret = None if password is None else sha256(b(password)).digest()
+        ident = (key_path, klass, secret, cert_path)
+        stamps = (self._stamp(key_path), self._stamp(cert_path or ""))
+        with self._lock:
+            cached = self._keys.get(ident)
+        if cached is None or cached[0] != stamps:
+            cached = (stamps, self._load(key_path, klass, password, cert_path))
+            with self._lock:
+                self._keys[ident] = cached
+        result = cached[1]
+        if isinstance(result, SSHException):
+            # a fresh one each time, so tracebacks don't pile up
+            raise result.__class__(*result.args)
+        return result
+
+    def _load(self, key_path, klass, password, cert_path):
+        try:
+            key = klass.from_private_key_file(key_path, password)
+        except SSHException as e:
+            return e
+        if cert_path is not None and os.path.isfile(cert_path):
+            key.load_certificate(cert_path)
+        return key
+
+    def clear(self):
+        """
+        Forget every cached key.
+        """
+        with self._lock:
+            self._keys.clear()
@@ -0,0 +1,301 @@
+# Copyright (C) 2026  The netmikolab contributors
+#
+# This file is part of paramiko.
+#
+# Paramiko is free software; you can redistribute it and/or modify it under the
+# terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation; either version 2.1 of the License, or (at your option)
+# any later version.
+#
+# Paramiko is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Paramiko; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA.
+
+"""
+Selector-driven event loop shared by many `.Transport` objects.
+"""
+
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+from paramiko import util
+from paramiko.common import ERROR
+from paramiko.ssh_exception import SSHException
+from paramiko.util import ClosingContextManager
+
+
+class TransportReactor(ClosingContextManager):
+    """
+    Drives the inbound side of many `.Transport` objects from a small, fixed
+    pool of threads, instead of one thread per `.Transport`.
+
+    Each loop thread waits on all of its transports' sockets at once (via
+    `selectors`). For whichever of them is readable it buffers what has
+    arrived, without waiting for more, and dispatches only the packets that
+    are complete; a peer which stops halfway through a packet therefore never
+    holds up the other transports. Keepalives, rekeying and handshake
+    timeouts are checked every ``tick`` seconds. Memory and context-switching
+    overhead stay flat no matter how many sessions are open.
+
+    To use it, pass an instance as the ``reactor`` argument of `.Transport`
+    (or, for `.SSHClient.connect`, via ``transport_factory``)::
+
+        reactor = TransportReactor(loops=2)
+        factory = functools.partial(Transport, reactor=reactor)
+        client.connect(host, transport_factory=factory, ...)
+
+    A few things behave differently from thread-per-transport mode:
+
+    - The SSH version exchange happens in the thread calling
+      `.Transport.start_client` / `.Transport.start_server` (which blocks on
+      it for up to ``banner_timeout`` even when given an ``event``); key
+      exchange and everything after it happens on a loop thread.
+    - Message handlers (including `.ServerInterface` callbacks in server mode)
+      run on the loop thread, so one that blocks stalls every other transport
+      sharing that loop.
+    - Socket-like objects without a usable ``fileno()`` (eg `.ProxyCommand`)
+      cannot be selected on; such transports silently fall back to running
+      in their own thread.
+
+    Instances of this class may be used as context managers; closing the
+    reactor closes every transport it still drives.
+    """
+
+    def __init__(self, loops=1, tick=0.5):
+        """
+        :param int loops:
+            number of loop threads to spread transports across. Default: 1.
+        :param float tick:
+            how often (in seconds) each loop checks keepalives, rekeying and
+            handshake timeouts. Default: 0.5.
+        """
+        if loops < 1:
+            raise ValueError("loops must be at least 1")
+        self.tick = tick
+        self.closed = False
+        self._lock = threading.Lock()
+        self._loops = [_ReactorLoop(self, i) for i in range(loops)]
+        # transport -> the loop currently driving it
+        self._assigned = {}
+
+    def __len__(self):
+        return len(self._assigned)
+
+    def supports(self, transport):
+        """
+        Return ``True`` if ``transport``'s socket can be driven by this
+        reactor (ie it has a usable ``fileno()``).
+        """
+        try:
+            return transport.sock.fileno() >= 0
+        except (AttributeError, OSError, ValueError):
+            return False
+
+    def register(self, transport):
+        """
+        Start driving ``transport``, whose version exchange has already
+        happened. Called by `.Transport`; not intended for direct use.
+
+        :raises: `.SSHException` -- if the reactor has been closed
+        """
+        with self._lock:
+            if self.closed:
+                raise SSHException("TransportReactor is closed")
+            loop = min(self._loops, key=lambda x: len(x.transports))
+            if not loop.is_alive():
+                loop.start()
+            self._assigned[transport] = loop
+        loop.post(loop.attach, transport)
+
+    def unregister(self, transport):
+        """
+        Stop driving ``transport``, waiting until its loop has let go of it.
+        A no-op if ``transport`` isn't (or is no longer) registered.
+        """
+        loop = self._assigned.get(transport)
+        if loop is not None:
+            loop.call(loop.finish, transport)
+
+    def close(self):
+        """
+        Close every transport this reactor still drives, and stop its loop
+        threads.
+        """
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        for loop in self._loops:
+            if loop.is_alive():
+                loop.call(loop.shutdown)
+                if loop is not threading.current_thread():
+                    loop.join()
+
+
+class _ReactorLoop(threading.Thread):
+    """
+    One selector loop of a `TransportReactor`.
+
+    The selector and ``transports`` are only touched from this thread; other
+    threads hand work over with `post` / `call`.
+    """
+
+    def __init__(self, reactor, index):
+        threading.Thread.__init__(
+            self, name="paramiko-reactor-{:d}".format(index)
+        )
+        self.daemon = True
+        self.reactor = reactor
+        self.transports = set()
+        self.running = True
+        self.selector = selectors.DefaultSelector()
+        self._requests = deque()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+    def post(self, func, *args):
+        """
+        Run ``func(*args)`` on this loop's thread; returns an ``Event`` set
+        once it has run.
+        """
+        done = threading.Event()
+        self._requests.append((func, args, done))
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            # pipe is full (a wakeup is already pending) or loop is gone
+            pass
+        return done
+
+    def call(self, func, *args):
+        """
+        Like `post`, but wait for ``func`` to have run. Runs it directly when
+        called from this loop's own thread.
+        """
+        if threading.current_thread() is self:
+            func(*args)
+            return
+        done = self.post(func, *args)
+        while not done.wait(0.1):
+            if not self.is_alive():
+                # Nobody left to run it (eg interpreter shutdown)
+                break
+
+    def run(self):
+        next_tick = time.time() + self.reactor.tick
+        while self.running:
+            timeout = max(0, next_tick - time.time())
+            try:
+                events = self.selector.select(timeout)
+            except OSError:
+                # A socket was closed behind our back (only some selector
+                # implementations care); the timer check below reaps it.
+                events = []
+            self._run_requests()
+            for key, mask in events:
+                if key.data is not None:
+                    self._service(key.data, readable=True)
+            if time.time() >= next_tick:
+                self._check_timers()
+                next_tick = time.time() + self.reactor.tick
+        self.selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+    def attach(self, transport):
+        self.transports.add(transport)
+        try:
+            if not transport.active:
+                # closed before we got to it
+                raise EOFError()
+            self.selector.register(
+                transport.sock, selectors.EVENT_READ, transport
+            )
+        except Exception as e:
+            transport._run_failed(e)
+            self.finish(transport)
+            return
+        # Bytes read along with the banner won't make the socket readable.
+        if transport.packetizer.has_pending_input():
+            self._service(transport)
+
+    def finish(self, transport):
+        """
+        Stop servicing ``transport`` and tear it down; the equivalent of its
+        thread exiting in thread-per-transport mode.
+        """
+        if transport not in self.transports:
+            return
+        self.transports.discard(transport)
+        self.reactor._assigned.pop(transport, None)
+        try:
+            self.selector.unregister(transport.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            transport._run_cleanup()
+        except Exception:
+            transport._log(ERROR, util.tb_strings())
+
+    def shutdown(self):
+        for transport in list(self.transports):
+            transport.close()
+        self.running = False
+
+    def _run_requests(self):
+        try:
+            while True:
+                self._wake_r.recv(4096)
+        except (BlockingIOError, OSError):
+            pass
+        while self._requests:
+            func, args, done = self._requests.popleft()
+            try:
+                func(*args)
+            finally:
+                done.set()
+
+    def _service(self, transport, readable=False):
+        if transport not in self.transports:
+            return
+        packetizer = transport.packetizer
+        try:
+            if readable:
+                packetizer.buffer_input()
+            keep = True
+            while (
+                keep and transport.active and packetizer.has_buffered_packet()
+            ):
+                keep = transport._run_one_packet()
+        except Exception as e:
+            transport._run_failed(e)
+            keep = False
+        if not (keep and transport.active):
+            self.finish(transport)
+
+    def _check_timers(self):
+        # What read_all() does on every socket timeout in thread mode.
+        for transport in list(self.transports):
+            packetizer = transport.packetizer
+            try:
+                if not transport.active or packetizer.closed:
+                    raise EOFError()
+                if packetizer.handshake_timed_out():
+                    raise EOFError()
+                if packetizer.need_rekey() and not transport.in_kex:
+                    transport._send_kex_init()
+                if not transport.in_kex:
+                    packetizer._check_keepalive()
+            except Exception as e:
+                transport._run_failed(e)
+                self.finish(transport)
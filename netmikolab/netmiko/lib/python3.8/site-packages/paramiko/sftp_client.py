@@ -684,7 +684,15 @@ class SFTPClient(BaseSFTP, ClosingContextManager):
                 callback(size, file_size)
         return size
 
-    def putfo(self, fl, remotepath, file_size=0, callback=None, confirm=True):
+    def putfo(
+        self,
+        fl,
+        remotepath,
+        file_size=0,
+        callback=None,
+        confirm=True,
+        max_concurrent_requests=None,
+    ):
         """
         Copy the contents of an open file object (``fl``) to the SFTP server as
         ``remotepath``. Any exception raised by operations will be passed
@@ -704,6 +712,9 @@ class SFTPClient(BaseSFTP, ClosingContextManager):
         :param bool confirm:
             whether to do a stat() on the file afterwards to confirm the file
             size (since 1.7.7)
+        :param int max_concurrent_requests:
+            The maximum number of write requests in flight; see
+            `.SFTPFile.set_pipelined`.
 
         :return:
             an `.SFTPAttributes` object containing attributes about the given
@@ -712,7 +723,7 @@ class SFTPClient(BaseSFTP, ClosingContextManager):
         .. versionadded:: 1.10
         """
         with self.file(remotepath, "wb") as fr:
-            fr.set_pipelined(True)
+            fr.set_pipelined(True, max_concurrent_requests)
             size = self._transfer_with_callback(
                 reader=fl, writer=fr, file_size=file_size, callback=callback
             )
@@ -726,7 +737,14 @@ class SFTPClient(BaseSFTP, ClosingContextManager):
             s = SFTPAttributes()
         return s
 
-    def put(self, localpath, remotepath, callback=None, confirm=True):
+    def put(
+        self,
+        localpath,
+        remotepath,
+        callback=None,
+        confirm=True,
+        max_concurrent_requests=None,
+    ):
         """
         Copy a local file (``localpath``) to the SFTP server as ``remotepath``.
         Any exception raised by operations will be passed through.  This
@@ -744,6 +762,9 @@ class SFTPClient(BaseSFTP, ClosingContextManager):
         :param bool confirm:
             whether to do a stat() on the file afterwards to confirm the file
             size
+        :param int max_concurrent_requests:
+            The maximum number of write requests in flight; see
+            `.SFTPFile.set_pipelined`.
 
         :return: an `.SFTPAttributes` object containing attributes about the
             given file
@@ -756,7 +777,14 @@ class SFTPClient(BaseSFTP, ClosingContextManager):
         """
         file_size = os.stat(localpath).st_size
         with open(localpath, "rb") as fl:
-            return self.putfo(fl, remotepath, file_size, callback, confirm)
+            return self.putfo(
+                fl,
+                remotepath,
+                file_size,
+                callback,
+                confirm,
+                max_concurrent_requests,
+            )
 
     def getfo(
         self,
@@ -64,6 +64,7 @@ class SFTPFile(BufferedFile):
         self.handle = handle
         BufferedFile._set_mode(self, mode, bufsize)
         self.pipelined = False
+        self._max_pipelined_requests = None
         self._prefetching = False
         self._prefetch_done = False
         self._prefetch_data = {}
@@ -200,17 +201,24 @@ class SFTPFile(BufferedFile):
             data[:chunk],
         )
         self._reqs.append(sftp_async_request)
-        if not self.pipelined or (
+        if self.pipelined and self._max_pipelined_requests is not None:
+            # Sliding window: only wait for the oldest acknowledgements, so
+            # the pipe never drains while the file is being written.
+            while len(self._reqs) > self._max_pipelined_requests:
+                self._read_write_status(self._reqs.popleft())
+        elif not self.pipelined or (
             len(self._reqs) > 100 and self.sftp.sock.recv_ready()
         ):
             while len(self._reqs):
-                req = self._reqs.popleft()
-                t, msg = self.sftp._read_response(req)
-                if t != CMD_STATUS:
-                    raise SFTPError("Expected status")
-                # convert_status already called
+                self._read_write_status(self._reqs.popleft())
         return chunk
 
+    def _read_write_status(self, req):
+        t, msg = self.sftp._read_response(req)
+        if t != CMD_STATUS:
+            raise SFTPError("Expected status")
+        # convert_status already called
+
     def settimeout(self, timeout):
         """
         Set a timeout on read/write operations on the underlying socket or
@@ -415,7 +423,7 @@ class SFTPFile(BufferedFile):
         data = msg.get_remainder()
         return data
 
-    def set_pipelined(self, pipelined=True):
+    def set_pipelined(self, pipelined=True, max_concurrent_requests=None):
         """
         Turn on/off the pipelining of write operations to this file.  When
         pipelining is on, paramiko won't wait for the server response after
@@ -430,10 +438,17 @@ class SFTPFile(BufferedFile):
         :param bool pipelined:
             ``True`` if pipelining should be turned on for this file; ``False``
             otherwise
+        :param int max_concurrent_requests:
+            The maximum number of write requests waiting for a response. Once
+            reached, each new write waits only for the oldest response, which
+            keeps that many requests in flight all the time. By default,
+            responses are collected in bursts once more than 100 are
+            outstanding.
 
         .. versionadded:: 1.5
         """
         self.pipelined = pipelined
+        self._max_pipelined_requests = max_concurrent_requests
 
     def prefetch(self, file_size=None, max_concurrent_requests=None):
         """
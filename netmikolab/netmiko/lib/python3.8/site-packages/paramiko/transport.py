@@ -372,6 +372,8 @@ class Transport(threading.Thread, ClosingContextManager):
         server_sig_algs=True,
         strict_kex=True,
         packetizer_class=None,
+        reactor=None,
+        window_autotune=False,
     ):
         """
         Create a new SSH session over an existing socket, or socket-like
@@ -445,6 +447,20 @@ class Transport(threading.Thread, ClosingContextManager):
         :param packetizer_class:
             Which class to use for instantiating the internal packet handler.
             Default: ``None`` (i.e.: use `Packetizer` as normal).
+        :param reactor:
+            A `.TransportReactor` which should drive this session's inbound
+            packets, instead of a dedicated thread per `.Transport`. Useful
+            when holding many (hundreds to thousands of) sessions open at
+            once. Default: ``None`` (i.e.: run in our own thread as normal).
+        :param bool window_autotune:
+            Whether channels should grow their receive window beyond
+            ``default_window_size`` while data is being read from them, to
+            about twice the measured bandwidth-delay product (read rate times
+            the round trip time measured when opening channels), capped at
+            the ``window_autotune_max`` attribute (``MAX_WINDOW_SIZE`` by
+            default). Helps bulk downloads over high-latency links, whose
+            throughput is otherwise limited to window size / RTT. Default:
+            ``False``.
 
         .. versionchanged:: 1.15
             Added the ``default_window_size`` and ``default_max_packet_size``
@@ -509,6 +525,7 @@ class Transport(threading.Thread, ClosingContextManager):
 
         # negotiated crypto parameters
         self.packetizer = (packetizer_class or Packetizer)(sock)
+        self.reactor = reactor
         self.local_version = "SSH-" + self._PROTO_ID + "-" + self._CLIENT_ID
         self.remote_version = ""
         self.local_cipher = self.remote_cipher = ""
@@ -548,6 +565,10 @@ class Transport(threading.Thread, ClosingContextManager):
         self._channel_counter = 0
         self.default_max_packet_size = default_max_packet_size
         self.default_window_size = default_window_size
+        self.window_autotune = window_autotune
+        self.window_autotune_max = MAX_WINDOW_SIZE
+        # smallest round trip time seen so far (seconds), if any
+        self._rtt = None
         self._forward_agent_handler = None
         self._x11_handler = None
         self._tcp_handler = None
@@ -758,12 +779,12 @@ class Transport(threading.Thread, ClosingContextManager):
         if event is not None:
             # async, return immediately and let the app poll for completion
             self.completion_event = event
-            self.start()
+            self._start_protocol()
             return
 
         # synchronous, wait for a result
         self.completion_event = event = threading.Event()
-        self.start()
+        self._start_protocol()
         max_time = time.time() + timeout if timeout is not None else None
         while True:
             event.wait(0.1)
@@ -827,12 +848,12 @@ class Transport(threading.Thread, ClosingContextManager):
         if event is not None:
             # async, return immediately and let the app poll for completion
             self.completion_event = event
-            self.start()
+            self._start_protocol()
             return
 
         # synchronous, wait for a result
         self.completion_event = event = threading.Event()
-        self.start()
+        self._start_protocol()
         while True:
             event.wait(0.1)
             if not self.active:
@@ -1114,8 +1135,8 @@ class Transport(threading.Thread, ClosingContextManager):
             chan._set_window(window_size, max_packet_size)
         finally:
             self.lock.release()
+        start_ts = chan._open_started = time.time()
         self._send_user_message(m)
-        start_ts = time.time()
         while True:
             event.wait(0.1)
             if not self.active:
@@ -1884,8 +1905,9 @@ class Transport(threading.Thread, ClosingContextManager):
     def use_compression(self, compress=True):
         """
         Turn on/off compression.  This will only have an affect before starting
-        the transport (ie before calling `connect`, etc).  By default,
-        compression is off since it negatively affects interactive sessions.
+        the transport (ie before calling `connect`, etc), or on the next key
+        exchange (see `renegotiate_keys`).  By default, compression is off
+        since it negatively affects interactive sessions.
 
         :param bool compress:
             ``True`` to ask the remote client/server to compress traffic;
@@ -1898,6 +1920,22 @@ class Transport(threading.Thread, ClosingContextManager):
         else:
             self._preferred_compression = ("none",)
 
+    def is_compressing(self):
+        """
+        Return ``True`` if compression was negotiated in either direction.
+        """
+        off = (None, "none")
+        return not (
+            self.local_compression in off and self.remote_compression in off
+        )
+
+    def get_compression_stats(self):
+        """
+        Return payload byte counts before and after compression; see
+        `.Packetizer.get_compression_stats`.
+        """
+        return self.packetizer.get_compression_stats()
+
     def getpeername(self):
         """
         Return the address of the remote side of this Transport, if possible.
@@ -1917,6 +1955,9 @@ class Transport(threading.Thread, ClosingContextManager):
 
     def stop_thread(self):
         self.active = False
+        if self.reactor is not None:
+            # Stop the reactor servicing us before our socket goes away.
+            self.reactor.unregister(self)
         self.packetizer.close()
         # Keep trying to join() our main thread, quickly, until:
         # * We join()ed successfully (self.is_alive() == False)
@@ -2096,6 +2137,12 @@ class Transport(threading.Thread, ClosingContextManager):
         finally:
             self.lock.release()
 
+    def _sample_rtt(self, rtt):
+        # Keep the smallest sample: anything above it is remote-side
+        # processing time, not network latency.
+        if self._rtt is None or rtt < self._rtt:
+            self._rtt = rtt
+
     def _sanitize_window_size(self, window_size):
         if window_size is None:
             window_size = self.default_window_size
@@ -2177,151 +2224,13 @@ class Transport(threading.Thread, ClosingContextManager):
             self._log(DEBUG, "starting thread (client mode): {}".format(tid))
         try:
             try:
-                self.packetizer.write_all(b(self.local_version + "\r\n"))
-                self._log(
-                    DEBUG,
-                    "Local version/idstring: {}".format(self.local_version),
-                )  # noqa
-                self._check_banner()
-                # The above is actually very much part of the handshake, but
-                # sometimes the banner can be read but the machine is not
-                # responding, for example when the remote ssh daemon is loaded
-                # in to memory but we can not read from the disk/spawn a new
-                # shell.
-                # Make sure we can specify a timeout for the initial handshake.
-                # Re-use the banner timeout for now.
-                self.packetizer.start_handshake(self.handshake_timeout)
-                self._send_kex_init()
-                self._expect_packet(MSG_KEXINIT)
-
+                self._run_preamble()
                 while self.active:
-                    if self.packetizer.need_rekey() and not self.in_kex:
-                        self._send_kex_init()
-                    try:
-                        ptype, m = self.packetizer.read_message()
-                    except NeedRekeyException:
-                        continue
-                    if ptype == MSG_IGNORE:
-                        self._enforce_strict_kex(ptype)
-                        continue
-                    elif ptype == MSG_DISCONNECT:
-                        self._parse_disconnect(m)
+                    if not self._run_one_packet():
                         break
-                    elif ptype == MSG_DEBUG:
-                        self._enforce_strict_kex(ptype)
-                        self._parse_debug(m)
-                        continue
-                    if len(self._expected_packet) > 0:
-                        if ptype not in self._expected_packet:
-                            exc_class = SSHException
-                            if self.agreed_on_strict_kex:
-                                exc_class = MessageOrderError
-                            raise exc_class(
-                                "Expecting packet from {!r}, got {:d}".format(
-                                    self._expected_packet, ptype
-                                )
-                            )  # noqa
-                        self._expected_packet = tuple()
-                        # These message IDs indicate key exchange & will differ
-                        # depending on exact exchange algorithm
-                        if (ptype >= 30) and (ptype <= 41):
-                            self.kex_engine.parse_next(ptype, m)
-                            continue
-
-                    if ptype in self._handler_table:
-                        error_msg = self._ensure_authed(ptype, m)
-                        if error_msg:
-                            self._send_message(error_msg)
-                        else:
-                            self._handler_table[ptype](m)
-                    elif ptype in self._channel_handler_table:
-                        chanid = m.get_int()
-                        chan = self._channels.get(chanid)
-                        if chan is not None:
-                            self._channel_handler_table[ptype](chan, m)
-                        elif chanid in self.channels_seen:
-                            self._log(
-                                DEBUG,
-                                "Ignoring message for dead channel {:d}".format(  # noqa
-                                    chanid
-                                ),
-                            )
-                        else:
-                            self._log(
-                                ERROR,
-                                "Channel request for unknown channel {:d}".format(  # noqa
-                                    chanid
-                                ),
-                            )
-                            break
-                    elif (
-                        self.auth_handler is not None
-                        and ptype in self.auth_handler._handler_table
-                    ):
-                        handler = self.auth_handler._handler_table[ptype]
-                        handler(m)
-                        if len(self._expected_packet) > 0:
-                            continue
-                    else:
-                        # Respond with "I don't implement this particular
-                        # message type" message (unless the message type was
-                        # itself literally MSG_UNIMPLEMENTED, in which case, we
-                        # just shut up to avoid causing a useless loop).
-                        name = MSG_NAMES[ptype]
-                        warning = "Oops, unhandled type {} ({!r})".format(
-                            ptype, name
-                        )
-                        self._log(WARNING, warning)
-                        if ptype != MSG_UNIMPLEMENTED:
-                            msg = Message()
-                            msg.add_byte(cMSG_UNIMPLEMENTED)
-                            msg.add_int(m.seqno)
-                            self._send_message(msg)
-                    self.packetizer.complete_handshake()
-            except SSHException as e:
-                self._log(
-                    ERROR,
-                    "Exception ({}): {}".format(
-                        "server" if self.server_mode else "client", e
-                    ),
-                )
-                self._log(ERROR, util.tb_strings())
-                self.saved_exception = e
-            except EOFError as e:
-                self._log(DEBUG, "EOF in transport thread")
-                self.saved_exception = e
-            except socket.error as e:
-                if type(e.args) is tuple:
-                    if e.args:
-                        emsg = "{} ({:d})".format(e.args[1], e.args[0])
-                    else:  # empty tuple, e.g. socket.timeout
-                        emsg = str(e) or repr(e)
-                else:
-                    emsg = e.args
-                self._log(ERROR, "Socket exception: " + emsg)
-                self.saved_exception = e
             except Exception as e:
-                self._log(ERROR, "Unknown exception: " + str(e))
-                self._log(ERROR, util.tb_strings())
-                self.saved_exception = e
-            _active_threads.remove(self)
-            for chan in list(self._channels.values()):
-                chan._unlink()
-            if self.active:
-                self.active = False
-                self.packetizer.close()
-                if self.completion_event is not None:
-                    self.completion_event.set()
-                if self.auth_handler is not None:
-                    self.auth_handler.abort()
-                for event in self.channel_events.values():
-                    event.set()
-                try:
-                    self.lock.acquire()
-                    self.server_accept_cv.notify()
-                finally:
-                    self.lock.release()
-            self.sock.close()
+                self._run_failed(e)
+            self._run_cleanup()
         except:
             # Don't raise spurious 'NoneType has no attribute X' errors when we
             # wake up during interpreter shutdown. Or rather -- raise
@@ -2330,6 +2239,184 @@ class Transport(threading.Thread, ClosingContextManager):
             if self.sys.modules is not None:
                 raise
 
+    def _start_protocol(self):
+        # Run the protocol loop in our own thread as usual, or (see
+        # `.TransportReactor`) do the version exchange right here and hand
+        # everything after it to our reactor.
+        if self.reactor is None or not self.reactor.supports(self):
+            self.start()
+            return
+        _active_threads.append(self)
+        tid = hex(id(self) & xffffffff)
+        mode = "server" if self.server_mode else "client"
+        self._log(
+            DEBUG, "starting reactor session ({} mode): {}".format(mode, tid)
+        )
+        try:
+            self._run_preamble()
+            self.reactor.register(self)
+        except Exception as e:
+            self._run_failed(e)
+            self._run_cleanup()
+
+    def _run_preamble(self):
+        # Version exchange & initial KEXINIT; everything after this is driven
+        # one packet at a time by _run_one_packet().
+        self.packetizer.write_all(b(self.local_version + "\r\n"))
+        self._log(
+            DEBUG,
+            "Local version/idstring: {}".format(self.local_version),
+        )  # noqa
+        self._check_banner()
+        # The above is actually very much part of the handshake, but
+        # sometimes the banner can be read but the machine is not
+        # responding, for example when the remote ssh daemon is loaded
+        # in to memory but we can not read from the disk/spawn a new
+        # shell.
+        # Make sure we can specify a timeout for the initial handshake.
+        # Re-use the banner timeout for now.
+        self.packetizer.start_handshake(self.handshake_timeout)
+        self._send_kex_init()
+        self._expect_packet(MSG_KEXINIT)
+
+    def _run_one_packet(self):
+        """
+        Read and dispatch a single inbound packet.
+
+        :returns:
+            ``False`` if the session should end (disconnect, or a message for
+            an unknown channel), ``True`` otherwise.
+        """
+        if self.packetizer.need_rekey() and not self.in_kex:
+            self._send_kex_init()
+        try:
+            ptype, m = self.packetizer.read_message()
+        except NeedRekeyException:
+            return True
+        if ptype == MSG_IGNORE:
+            self._enforce_strict_kex(ptype)
+            return True
+        elif ptype == MSG_DISCONNECT:
+            self._parse_disconnect(m)
+            return False
+        elif ptype == MSG_DEBUG:
+            self._enforce_strict_kex(ptype)
+            self._parse_debug(m)
+            return True
+        if len(self._expected_packet) > 0:
+            if ptype not in self._expected_packet:
+                exc_class = SSHException
+                if self.agreed_on_strict_kex:
+                    exc_class = MessageOrderError
+                raise exc_class(
+                    "Expecting packet from {!r}, got {:d}".format(
+                        self._expected_packet, ptype
+                    )
+                )  # noqa
+            self._expected_packet = tuple()
+            # These message IDs indicate key exchange & will differ
+            # depending on exact exchange algorithm
+            if (ptype >= 30) and (ptype <= 41):
+                self.kex_engine.parse_next(ptype, m)
+                return True
+
+        if ptype in self._handler_table:
+            error_msg = self._ensure_authed(ptype, m)
+            if error_msg:
+                self._send_message(error_msg)
+            else:
+                self._handler_table[ptype](m)
+        elif ptype in self._channel_handler_table:
+            chanid = m.get_int()
+            chan = self._channels.get(chanid)
+            if chan is not None:
+                self._channel_handler_table[ptype](chan, m)
+            elif chanid in self.channels_seen:
+                self._log(
+                    DEBUG,
+                    "Ignoring message for dead channel {:d}".format(  # noqa
+                        chanid
+                    ),
+                )
+            else:
+                self._log(
+                    ERROR,
+                    "Channel request for unknown channel {:d}".format(  # noqa
+                        chanid
+                    ),
+                )
+                return False
+        elif (
+            self.auth_handler is not None
+            and ptype in self.auth_handler._handler_table
+        ):
+            handler = self.auth_handler._handler_table[ptype]
+            handler(m)
+            if len(self._expected_packet) > 0:
+                return True
+        else:
+            # Respond with "I don't implement this particular
+            # message type" message (unless the message type was
+            # itself literally MSG_UNIMPLEMENTED, in which case, we
+            # just shut up to avoid causing a useless loop).
+            name = MSG_NAMES[ptype]
+            warning = "Oops, unhandled type {} ({!r})".format(ptype, name)
+            self._log(WARNING, warning)
+            if ptype != MSG_UNIMPLEMENTED:
+                msg = Message()
+                msg.add_byte(cMSG_UNIMPLEMENTED)
+                msg.add_int(m.seqno)
+                self._send_message(msg)
+        self.packetizer.complete_handshake()
+        return True
+
+    def _run_failed(self, e):
+        # Log & save an exception which ended the protocol loop.
+        if isinstance(e, SSHException):
+            self._log(
+                ERROR,
+                "Exception ({}): {}".format(
+                    "server" if self.server_mode else "client", e
+                ),
+            )
+            self._log(ERROR, util.tb_strings())
+        elif isinstance(e, EOFError):
+            self._log(DEBUG, "EOF in transport thread")
+        elif isinstance(e, socket.error):
+            if type(e.args) is tuple:
+                if e.args:
+                    emsg = "{} ({:d})".format(e.args[1], e.args[0])
+                else:  # empty tuple, e.g. socket.timeout
+                    emsg = str(e) or repr(e)
+            else:
+                emsg = e.args
+            self._log(ERROR, "Socket exception: " + emsg)
+        else:
+            self._log(ERROR, "Unknown exception: " + str(e))
+            self._log(ERROR, util.tb_strings())
+        self.saved_exception = e
+
+    def _run_cleanup(self):
+        # Tear down after the protocol loop ended, for whatever reason.
+        _active_threads.remove(self)
+        for chan in list(self._channels.values()):
+            chan._unlink()
+        if self.active:
+            self.active = False
+            self.packetizer.close()
+            if self.completion_event is not None:
+                self.completion_event.set()
+            if self.auth_handler is not None:
+                self.auth_handler.abort()
+            for event in self.channel_events.values():
+                event.set()
+            try:
+                self.lock.acquire()
+                self.server_accept_cv.notify()
+            finally:
+                self.lock.release()
+        self.sock.close()
+
     def _log_agreement(self, which, local, remote):
         # Log useful, non-duplicative line re: an agreed-upon algorithm.
         # Old code implied algorithms could be asymmetrical (different for
@@ -2775,7 +2862,10 @@ class Transport(threading.Thread, ClosingContextManager):
         )
 
         compress_in = self._compression_info[self.remote_compression][1]
-        if compress_in is not None and (
+        if compress_in is None:
+            # May have been on before a rekey
+            self.packetizer.set_inbound_compressor(None)
+        elif (
             self.remote_compression != "zlib@openssh.com" or self.authenticated
         ):
             self._log(DEBUG, "Switching on inbound compression ...")
@@ -2845,7 +2935,10 @@ class Transport(threading.Thread, ClosingContextManager):
         )
 
         compress_out = self._compression_info[self.local_compression][0]
-        if compress_out is not None and (
+        if compress_out is None:
+            # May have been on before a rekey
+            self.packetizer.set_outbound_compressor(None)
+        elif (
             self.local_compression != "zlib@openssh.com" or self.authenticated
         ):
             self._log(DEBUG, "Switching on outbound compression ...")
@@ -2985,6 +3078,8 @@ class Transport(threading.Thread, ClosingContextManager):
         if chan is None:
             self._log(WARNING, "Success for unrequested channel! [??]")
             return
+        if chan._open_started is not None:
+            self._sample_rtt(time.time() - chan._open_started)
         self.lock.acquire()
         try:
             chan._set_remote_channel(
@@ -7,7 +7,9 @@ Utilities for sending files over ssh using the scp1 protocol.
 
 __version__ = '0.15.0'
 
+import io
 import locale
+import mmap
 import os
 import re
 from socket import timeout as SocketTimeout
@@ -338,14 +340,58 @@ class SCPClient(object):
                 self._progress(basename, size, 0, self.peername)
         buff_size = self.buff_size
         chan = self.channel
-        while file_pos < size:
-            chan.sendall(fl.read(buff_size))
-            file_pos = fl.tell()
-            if self._progress:
-                self._progress(basename, size, file_pos, self.peername)
+        data = self._map_file(fl, size)
+        if data is not None:
+            # Regular file: send slices of the page cache, no copies
+            start = fl.tell()
+            view = memoryview(data)[start:start + size]
+            try:
+                while file_pos < size:
+                    chunk = view[file_pos:file_pos + buff_size]
+                    chan.sendall(chunk)
+                    file_pos += len(chunk)
+                    if self._progress:
+                        self._progress(basename, size, file_pos, self.peername)
+            finally:
+                chunk = view = None
+                try:
+                    data.close()
+                except BufferError:
+                    # a traceback still holds a slice; unmapped once collected
+                    pass
+            fl.seek(start + size)
+        else:
+            buf = memoryview(bytearray(buff_size))
+            while file_pos < size:
+                read = fl.readinto(buf) if hasattr(fl, 'readinto') else None
+                if read is None:
+                    chunk = fl.read(buff_size)
+                    read = len(chunk)
+                else:
+                    chunk = buf[:read]
+                if not read:
+                    # The remote side waits for exactly size bytes
+                    raise SCPException(
+                        "File '%s' ended after %d of %d bytes" %
+                        (asunicode(basename), file_pos, size))
+                chan.sendall(chunk)
+                file_pos += read
+                if self._progress:
+                    self._progress(basename, size, file_pos, self.peername)
         chan.sendall('\x00')
         self._recv_confirm()
 
+    def _map_file(self, fl, size):
+        """mmap a regular file for reading, None if fl can't be mapped"""
+        if size == 0:
+            return None
+        try:
+            if fl.tell() + size > os.fstat(fl.fileno()).st_size:
+                return None
+            return mmap.mmap(fl.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return None
+
     def _chdir(self, from_dir, to_dir):
         # Pop until we're one level up from our next push.
         # Push *once* into to_dir.
@@ -25,9 +25,12 @@ Is the glue between an automated command scraping program (such as RANCID) and
 the TextFSM output parser.
 """
 
+import collections
 import copy
 import os
+import pickle
 import re
+import sys
 import threading
 import textfsm
 from textfsm import texttable
@@ -45,6 +48,18 @@ class CliTableError(Error):  # pylint: disable=g-bad-exception-name
   """General CliTable error."""
 
 
+# Format of bundles written by WriteBundle. Bump on incompatible changes.
+BUNDLE_VERSION = 3
+# Bundle file name is the index file name with this suffix.
+BUNDLE_SUFFIX = '.bundle'
+
+
+def _Stamp(path):
+  """Returns the (mtime, size) pair used to detect stale bundle entries."""
+  stat = os.stat(path)
+  return (stat.st_mtime_ns, stat.st_size)
+
+
 class IndexTable(object):
   """Class that reads and stores comma-separated values as a TextTable.
 
@@ -87,12 +102,19 @@ class IndexTable(object):
     if hasattr(self, '_index_file'):
       # pylint: disable=protected-access
       clone._index_file = self._index_file
+    if hasattr(self, '_index_handle'):
       clone._index_handle = self._index_handle
 
     clone.index = self.index
     clone.compiled = self.compiled
     return clone
 
+  def __getstate__(self):
+    """Returns picklable state, without the open index file handle."""
+    state = self.__dict__.copy()
+    state.pop('_index_handle', None)
+    return state
+
   def __deepcopy__(self, memodict=None):
     """Returns a deepcopy of an IndexTable object."""
     clone = IndexTable()
@@ -174,6 +196,8 @@ class CliTable(texttable.TextTable):
   # Without this, the regexes are parsed at every call to CliTable().
   _lock = threading.Lock()
   INDEX = {}
+  # Pickled templates from bundles, keyed by index file then template name.
+  BUNDLES = {}
 
   def synchronised(func):
     """Synchronisation decorator."""
@@ -199,6 +223,8 @@ class CliTable(texttable.TextTable):
     # pylint: disable=E1002
     super(CliTable, self).__init__()
     self._keys = set()
+    self._fsms = {}
+    self._bundle = None
     self.raw = None
     self.index_file = index_file
     self.template_dir = template_dir
@@ -218,15 +244,72 @@ class CliTable(texttable.TextTable):
     self.index_file = index_file or self.index_file
     fullpath = os.path.join(self.template_dir, self.index_file)
     if self.index_file and fullpath not in self.INDEX:
-      self.index = IndexTable(self._PreParse, self._PreCompile, fullpath)
+      self.index = self._LoadBundle(fullpath)
+      if self.index is None:
+        self.index = IndexTable(self._PreParse, self._PreCompile, fullpath)
       self.INDEX[fullpath] = self.index
     else:
       self.index = self.INDEX[fullpath]
+    self._bundle = self.BUNDLES.get(fullpath)
 
     # Does the IndexTable have the right columns.
     if 'Template' not in self.index.index.header:  # pylint: disable=E1103
       raise CliTableError("Index file does not have 'Template' column.")
 
+  def _LoadBundle(self, fullpath):
+    """Loads the bundle written by WriteBundle for an index file, if current.
+
+    Args:
+      fullpath: String, path of the index file.
+
+    Returns:
+      The bundled IndexTable, or None if there is no usable bundle.
+    """
+    try:
+      with open(fullpath + BUNDLE_SUFFIX, 'rb') as f:
+        bundle = pickle.load(f)
+      if (
+          bundle['version'] != BUNDLE_VERSION
+          or bundle['textfsm'] != textfsm.__version__
+      ):
+        return None
+      stamp, index = bundle['index']
+      if stamp != _Stamp(fullpath):
+        return None
+    except Exception:  # pylint: disable=broad-except
+      # Missing, corrupt or incompatible bundle, use the source files.
+      return None
+
+    self.BUNDLES[fullpath] = bundle['templates']
+    return index
+
+  def _BundledTemplate(self, tmplt):
+    """Returns a TextFSM for the template from the bundle, or None if stale."""
+    if not self._bundle or tmplt not in self._bundle:
+      return None
+    stamp, data = self._bundle[tmplt]
+    try:
+      if stamp != _Stamp(os.path.join(self.template_dir, tmplt)):
+        return None
+    except OSError:
+      return None
+    return pickle.loads(data)
+
+  def _GetTemplate(self, tmplt):
+    """Returns the compiled TextFSM for a template name.
+
+    FSMs are held per object, so each template is only compiled once. They
+    come from the bundle where possible, else from the template file.
+    """
+    fsm = self._fsms.get(tmplt)
+    if fsm is None:
+      fsm = self._BundledTemplate(tmplt)
+      if fsm is None:
+        with open(os.path.join(self.template_dir, tmplt), 'r') as f:
+          fsm = textfsm.TextFSM(f)
+      self._fsms[tmplt] = fsm
+    return fsm
+
   def _TemplateNamesToFiles(self, template_str):
     """Parses a string of templates into a list of file handles."""
 
@@ -242,6 +325,24 @@ class CliTable(texttable.TextTable):
 
     return template_files
 
+  def PreloadTemplates(self):
+    """Compiles every template referenced by the index up front.
+
+    Subsequent calls to ParseCmd on this object reuse the compiled FSMs rather
+    than re-reading and re-compiling the template files. Templates that fail
+    to load are skipped and will raise as usual if they are ever matched.
+
+    Returns:
+      Integer, the number of templates held by this object.
+    """
+    for row in self.index.index:
+      for tmplt in row['Template'].split(':'):
+        try:
+          self._GetTemplate(tmplt)
+        except (IOError, textfsm.TextFSMTemplateError):
+          continue
+    return len(self._fsms)
+
   def ParseCmd(self, cmd_input, attributes=None, templates=None):
     """Creates a TextTable table of values from cmd_input string.
 
@@ -259,39 +360,97 @@ class CliTable(texttable.TextTable):
     # Store raw command data within the object.
     self.raw = cmd_input
 
-    if not templates:
-      # Find template in template index.
-      row_idx = self.index.GetRowMatch(attributes)
-      if row_idx:
-        templates = self.index.index[row_idx]['Template']
-      else:
-        raise CliTableError(
-            'No template found for attributes: "%s"' % attributes
-        )
+    templates = self._FindTemplates(attributes, templates)
+    fsms = [self._GetTemplate(tmplt) for tmplt in templates.split(':')]
+
+    # Re-initialise the table.
+    self.Reset()
+    self._keys = set()
+    self.table = self._ParseCmdItem(self.raw, template_file=fsms[0])
 
-    template_files = self._TemplateNamesToFiles(templates)
+    # Add additional columns from any additional tables.
+    for fsm in fsms[1:]:
+      self.extend(
+          self._ParseCmdItem(self.raw, template_file=fsm), set(self._keys)
+      )
 
-    try:
-      # Re-initialise the table.
-      self.Reset()
-      self._keys = set()
-      self.table = self._ParseCmdItem(self.raw, template_file=template_files[0])
-
-      # Add additional columns from any additional tables.
-      for tmplt in template_files[1:]:
-        self.extend(
-            self._ParseCmdItem(self.raw, template_file=tmplt), set(self._keys)
-        )
-    finally:
-      for f in template_files:
-        f.close()
+  def ParseCmdRecords(
+      self, cmd_input, attributes=None, templates=None, output='dicts'
+  ):
+    """Parses cmd_input and returns the records without building a TextTable.
+
+    When a single template applies, records are built straight from the FSM
+    results. Several templates still need their tables merged, in which case
+    ParseCmd is used and the resulting table is converted.
+
+    Args:
+      cmd_input: String, Device/command response.
+      attributes: Dict, attribute that further refine matching template.
+      templates: String list of templates to parse with. If None, uses index
+      output: String, one of 'dicts' (list of dicts keyed by lowercase column
+        name), 'columns' (dict of lowercase column name to list of values) or
+        'namedtuples' (list of namedtuples with lowercase field names).
+
+    Returns:
+      The parsed records in the requested output format.
+
+    Raises:
+      CliTableError: A template was not found for the given command.
+      ValueError: Unknown output format.
+    """
+    if output not in ('dicts', 'columns', 'namedtuples'):
+      raise ValueError("Unknown output format '%s'." % output)
+
+    self.raw = cmd_input
+    templates = self._FindTemplates(attributes, templates)
+    if ':' in templates:
+      self.ParseCmd(cmd_input, templates=templates)
+      header = self.header
+      records = [row.values for row in self]
+    else:
+      fsm = self._GetTemplate(templates)
+      fsm.Reset()
+      header = fsm.header
+      # Match the string conversion that TextTable applies to row values.
+      records = [
+          [[str(v) for v in value] if isinstance(value, list) else value
+           for value in record]
+          for record in fsm.ParseText(cmd_input)
+      ]
+
+    header = [name.lower() for name in header]
+    if output == 'columns':
+      return {name: [record[idx] for record in records]
+              for idx, name in enumerate(header)}
+    if output == 'namedtuples':
+      record_cls = collections.namedtuple('Record', header, rename=True)
+      return [record_cls._make(record) for record in records]
+    return [dict(zip(header, record)) for record in records]
+
+  def _FindTemplates(self, attributes, templates):
+    """Returns templates, or else the templates the index matches attributes to.
+
+    Raises:
+      CliTableError: A template was not found for the given attributes.
+    """
+    if templates:
+      return templates
+
+    # Find template in template index.
+    row_idx = self.index.GetRowMatch(attributes)
+    if not row_idx:
+      raise CliTableError(
+          'No template found for attributes: "%s"' % attributes
+      )
+    return self.index.index[row_idx]['Template']
 
   def _ParseCmdItem(self, cmd_input, template_file=None):
     """Creates Texttable with output of command.
 
     Args:
       cmd_input: String, Device response.
-      template_file: File object, template to parse with.
+      template_file: File object, template to parse with. May also be an
+        already compiled TextFSM object, which is reset and reused.
 
     Returns:
       TextTable containing command output.
@@ -299,8 +458,12 @@ class CliTable(texttable.TextTable):
     Raises:
       CliTableError: A template was not found for the given command.
     """
-    # Build FSM machine from the template.
-    fsm = textfsm.TextFSM(template_file)
+    if isinstance(template_file, textfsm.TextFSM):
+      fsm = template_file
+      fsm.Reset()
+    else:
+      # Build FSM machine from the template.
+      fsm = textfsm.TextFSM(template_file)
     if not self._keys:
       self._keys = set(fsm.GetValuesByAttrib('Key'))
 
@@ -405,3 +568,73 @@ class CliTable(texttable.TextTable):
       if header in self.superkey:
         sorted_list.append(row[header])
     return sorted_list
+
+
+def WriteBundle(template_dir, index_file='index', bundle_file=None):
+  """Writes the index and its compiled templates to a single bundle file.
+
+  CliTable loads the bundle in place of parsing the index file and templates,
+  as long as the bundle matches the installed TextFSM and each source file is
+  unchanged since the bundle was written. Stale entries fall back to the
+  source files.
+
+  Args:
+    template_dir: String, directory where index file and templates reside.
+    index_file: String, name of the index file within template_dir.
+    bundle_file: String, path to write to. Defaults to the index file path
+      with BUNDLE_SUFFIX appended, where CliTable looks for it.
+
+  Returns:
+    String, the path of the bundle written.
+  """
+  cli_table = CliTable(template_dir=template_dir)
+  fullpath = os.path.join(template_dir, index_file)
+  # pylint: disable=protected-access
+  index = IndexTable(cli_table._PreParse, cli_table._PreCompile, fullpath)
+
+  templates = {}
+  for row in index.index:
+    for tmplt in row['Template'].split(':'):
+      if tmplt in templates:
+        continue
+      path = os.path.join(template_dir, tmplt)
+      try:
+        with open(path, 'r') as f:
+          fsm = textfsm.TextFSM(f)
+      except (IOError, textfsm.TextFSMTemplateError):
+        continue
+      templates[tmplt] = (
+          _Stamp(path),
+          pickle.dumps(fsm, pickle.HIGHEST_PROTOCOL),
+      )
+
+  bundle = {
+      'version': BUNDLE_VERSION,
+      'textfsm': textfsm.__version__,
+      'index': (_Stamp(fullpath), index),
+      'templates': templates,
+  }
+  bundle_file = bundle_file or fullpath + BUNDLE_SUFFIX
+  tmp_file = '%s.%d.tmp' % (bundle_file, os.getpid())
+  with open(tmp_file, 'wb') as f:
+    pickle.dump(bundle, f, pickle.HIGHEST_PROTOCOL)
+  os.replace(tmp_file, bundle_file)
+  return bundle_file
+
+
+def main(argv=None):
+  """Writes a template bundle for the index in the given directory."""
+
+  if argv is None:
+    argv = sys.argv
+
+  if len(argv) not in (2, 3):
+    print('%s template_dir [index_file]' % argv[0], file=sys.stderr)
+    return 2
+
+  print(WriteBundle(*argv[1:]))
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
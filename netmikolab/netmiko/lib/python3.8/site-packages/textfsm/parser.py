@@ -148,20 +148,40 @@ class TextFSMOptions(object):
   class Fillup(OptionBase):
     """Like Filldown, but upwards until it finds a non-empty entry."""
 
+    def OnCreateOptions(self):
+      # Index of this value's column in the results, found on first use.
+      self._column = None
+      # Results table last filled, and the row count at that point. Rows
+      # before that count have the column set, so are never revisited.
+      self._rows = None
+      self._filled = 0
+      # Last of those rows, to notice the results being emptied meanwhile.
+      self._last_filled = None
+
     def OnAssignVar(self):
       # If value is set, copy up the results table, until we
       # see a set item.
       if self.value.value:
-        # Get index of relevant result column.
-        value_idx = self.value.fsm.values.index(self.value)
-        # Go up the list from the end until we see a filled value.
+        if self._column is None:
+          self._column = self.value.fsm.values.index(self.value)
         # pylint: disable=protected-access
-        for result in reversed(self.value.fsm._result):
-          if result[value_idx]:
+        rows = self.value.fsm._result
+        stale = self._filled and (
+            len(rows) < self._filled
+            or rows[self._filled - 1] is not self._last_filled)
+        if rows is not self._rows or stale:
+          # The FSM was reset, or its results emptied, since the last fill.
+          self._rows = rows
+          self._filled = 0
+        # Go up the new rows from the end until we see a filled value.
+        for row_idx in range(len(rows) - 1, self._filled - 1, -1):
+          if rows[row_idx][self._column]:
             # Stop when a record has this column already.
             break
           # Otherwise set the column value.
-          result[value_idx] = self.value.value
+          rows[row_idx][self._column] = self.value.value
+        self._filled = len(rows)
+        self._last_filled = rows[-1] if rows else None
 
   class Key(OptionBase):
     """Value constitutes part of the Key of the record."""
@@ -369,14 +389,26 @@ class CopyableRegexObject(object):
     self.regex = re.compile(pattern)
 
   def match(self, *args, **kwargs):  # pylint: disable=invalid-name
+    if self.regex is None:
+      self.regex = re.compile(self.pattern)
     return self.regex.match(*args, **kwargs)
 
   def sub(self, *args, **kwargs):  # pylint: disable=invalid-name
+    if self.regex is None:
+      self.regex = re.compile(self.pattern)
     return self.regex.sub(*args, **kwargs)
 
   def __copy__(self):
     return CopyableRegexObject(self.pattern)
 
+  def __getstate__(self):
+    return self.pattern
+
+  def __setstate__(self, pattern):
+    # Unpickled objects compile on first use, keeping bundle loads cheap.
+    self.pattern = pattern
+    self.regex = None
+
   def __deepcopy__(self, unused_memo):
     return self.__copy__()
 
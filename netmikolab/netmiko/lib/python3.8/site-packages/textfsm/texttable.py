@@ -61,6 +61,10 @@ class Row(dict):
     self._color = None
     self._index = {}
 
+  def __reduce__(self):
+    """Pickle by attributes, the underlying dict is never populated."""
+    return (self.__class__, (), self.__dict__)
+
   def _BuildIndex(self):
     """Recreate the key index."""
     self._index = {}
@@ -0,0 +1,51 @@
+"""Tests of the netmikolab virtualenv packages, run against the fake IOS device of the
+benchmarks (netmikolab/benchmarks/fake_ios.py).
+
+Run them with the python of the netmiko virtualenv (with pytest installed):
+
+    cd netmikolab
+    netmiko/bin/python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+BENCHMARKS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"
+)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from fake_ios import FakeIOSServer  # noqa
+
+
+@pytest.fixture(scope="session")
+def fake_ios():
+    server = FakeIOSServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def device(fake_ios):
+    return {
+        "device_type": "cisco_ios",
+        "host": fake_ios.host,
+        "port": fake_ios.port,
+        "username": "test",
+        "password": "test",
+        "ssh_strict": False,
+        "system_host_keys": False,
+        "alt_host_keys": False,
+        "allow_agent": False,
+        "use_keys": False,
+    }
+
+
+@pytest.fixture
+def net_connect(device):
+    from netmiko import ConnectHandler
+
+    conn = ConnectHandler(**device)
+    yield conn
+    conn.disconnect()
@@ -0,0 +1,134 @@
+"""Grouped probing, and the AutodetectCache shared by autodetect_many."""
+import json
+import threading
+import time
+
+import pytest
+
+from netmiko.ssh_autodetect import (
+    SSH_MAPPER_BASE,
+    AutodetectCache,
+    SSHDetect,
+    autodetect_many,
+)
+
+SHOW_OUTPUTS = {
+    "cisco_ios": {"show version": "Cisco IOS Software, C3750E Software"},
+    "cisco_xe": {"show version": "Cisco IOS XE Software, Version 16.09.03"},
+    "cisco_nxos": {"show version": "Cisco Nexus Operating System (NX-OS) Software"},
+    "arista_eos": {"show version": "Arista DCS-7050T-64"},
+    "juniper_junos": {"show version": "JUNOS Software Release [12.1X46-D35.1]"},
+    "huawei": {"display version": "Huawei Versatile Routing Platform Software"},
+    "linux": {"uname -a": "Linux host 5.4.0-42-generic x86_64 GNU/Linux"},
+    "unknown": {},
+}
+
+
+class CannedDetect(SSHDetect):
+    """SSHDetect answering each command from a dict instead of a device."""
+
+    class Connection:
+        remote_conn = None
+
+        def disconnect(self):
+            pass
+
+    def __init__(self, outputs):
+        self.connection = self.Connection()
+        self.potential_matches = {}
+        self._results_cache = {}
+        self.detect_cache = None
+        self._detect_cache_key = None
+        self.cached_match = None
+        self.outputs = outputs
+        self.sent = []
+
+    def _send_command(self, cmd=""):
+        self.sent.append(cmd)
+        return self.outputs.get(cmd, "% Invalid input detected at '^' marker.")
+
+    def serial_autodetect(self):
+        """The walk over SSH_MAPPER_BASE, one device_type after the other."""
+        for device_type, autodetect_dict in SSH_MAPPER_BASE:
+            tmp_dict = autodetect_dict.copy()
+            autodetect_method = getattr(self, tmp_dict.pop("dispatch"))
+            accuracy = autodetect_method(**tmp_dict)
+            if accuracy:
+                self.potential_matches[device_type] = accuracy
+                if accuracy >= 99:
+                    break
+        if not self.potential_matches:
+            return None
+        best_match = sorted(
+            self.potential_matches.items(), key=lambda t: t[1], reverse=True
+        )
+        return {"cisco_wlc_85": "cisco_wlc", "cisco_xr_2": "cisco_xr"}.get(
+            best_match[0][0], best_match[0][0]
+        )
+
+
+@pytest.mark.parametrize("name", sorted(SHOW_OUTPUTS))
+def test_grouped_matches_serial(name):
+    serial = CannedDetect(SHOW_OUTPUTS[name])
+    grouped = CannedDetect(SHOW_OUTPUTS[name])
+    device_type = grouped.autodetect()
+    assert device_type == serial.serial_autodetect()
+    assert (device_type is None) == (name == "unknown")
+    # Each command is sent once
+    assert len(grouped.sent) == len(set(grouped.sent))
+
+
+def test_concurrent_saves(tmp_path):
+    cache_file = tmp_path / "autodetect.json"
+    cache = AutodetectCache(str(cache_file))
+    threads = [
+        threading.Thread(target=cache.set, args=(f"host{i}", "cisco_ios"))
+        for i in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(json.loads(cache_file.read_text())) == 16
+    assert [path.name for path in tmp_path.iterdir()] == ["autodetect.json"]
+
+
+def test_autodetect_many_saves_once(device, tmp_path, monkeypatch):
+    cache_file = tmp_path / "autodetect.json"
+    cache = AutodetectCache(str(cache_file))
+    saves = []
+    save = cache.save
+
+    def counting_save():
+        saves.append(threading.current_thread())
+        save()
+
+    monkeypatch.setattr(cache, "save", counting_save)
+
+    # Another user of the cache while the devices are being detected
+    other = threading.Timer(1.0, cache.set, args=("other", "linux"))
+    other.start()
+    start = time.monotonic()
+    assert autodetect_many([device] * 3, detect_cache=cache) == ["cisco_ios"] * 3
+    other.join()
+    assert time.monotonic() - start > 1.0
+    assert cache.autosave
+    # One save by the other thread's set(), one at the end of autodetect_many
+    assert saves == [other, threading.current_thread()]
+    entries = json.loads(cache_file.read_text())
+    assert entries.pop("other") == "linux"
+    assert list(entries.values()) == ["cisco_ios"]
+
+    # Known now, nothing new to save
+    start = time.monotonic()
+    assert autodetect_many([device], detect_cache=cache) == ["cisco_ios"]
+    assert time.monotonic() - start < 3
+
+
+def test_autodetect_many_no_autosave(device, tmp_path):
+    cache_file = tmp_path / "autodetect.json"
+    cache = AutodetectCache(str(cache_file), autosave=False)
+    assert autodetect_many([device], detect_cache=cache) == ["cisco_ios"]
+    assert not cache_file.exists()
+    cache.save()
+    assert list(json.loads(cache_file.read_text()).values()) == ["cisco_ios"]
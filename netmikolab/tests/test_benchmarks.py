@@ -0,0 +1,68 @@
+"""The benchmark harness: fake device outputs, results file and regression check."""
+import json
+import time
+
+import pytest
+
+import run_benchmarks
+from fake_ios import FakeIOSServer, bench_output
+from run_benchmarks import compare, format_size, parse_size
+
+
+@pytest.mark.parametrize(
+    "text, size, formatted",
+    [("1K", 1024, "1KB"), ("50m", 50 * 1024**2, "50MB"), ("1500", 1500, "1500B")],
+)
+def test_sizes(text, size, formatted):
+    assert parse_size(text) == size
+    assert format_size(size) == formatted
+
+
+@pytest.mark.parametrize("size", [80, 1000, 100000])
+def test_show_bench(net_connect, size):
+    assert len(bench_output(size)) == size
+    output = net_connect.send_command(f"show bench {size}")
+    assert output == bench_output(size).rstrip("\n")
+
+
+def test_rtt_and_chunks(device):
+    from netmiko import ConnectHandler
+
+    server = FakeIOSServer(rtt=0.3, chunk_size=1000, chunk_delay=0.02).start()
+    try:
+        conn = ConnectHandler(**dict(device, host=server.host, port=server.port))
+        try:
+            start = time.monotonic()
+            output = conn.send_command("show bench 20000")
+            # One rtt for the command, 19 chunk_delay between its 20 pieces
+            assert time.monotonic() - start > 0.3 + 19 * 0.02
+            assert output == bench_output(20000).rstrip("\n")
+        finally:
+            conn.disconnect()
+    finally:
+        server.stop()
+
+
+def test_compare(capsys):
+    baseline = {"a": {"median": 1.0}, "b": {"median": 2.0}, "gone": {"median": 1.0}}
+    results = {"a": {"median": 1.05}, "b": {"median": 2.5}, "new": {"median": 1.0}}
+    assert compare(results, baseline, 0.1) == ["b"]
+    assert "REGRESSION" in capsys.readouterr().out
+    assert compare(results, baseline, 0.3) == []
+
+
+def test_main_results_file(tmp_path):
+    output = tmp_path / "results.json"
+    args = ["--only", "send_command[", "--sizes", "1K,10K", "--repeat", "2"]
+    assert run_benchmarks.main(args + ["--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert set(report["results"]) == {"send_command[1KB]", "send_command[10KB]"}
+    result = report["results"]["send_command[10KB]"]
+    assert len(result["runs"]) == 2 and result["size"] == 10240
+    assert result["min"] <= result["median"] <= result["max"]
+
+    # Much faster baseline: reported as a regression
+    for result in report["results"].values():
+        result["median"] /= 100
+    output.write_text(json.dumps(report))
+    assert run_benchmarks.main(args + ["--compare", str(output)]) == 1
@@ -0,0 +1,62 @@
+"""Brokered sessions reuse one warm SSH connection and survive it going away."""
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from netmiko import ConnectHandler
+from netmiko.broker import ConnectionBroker
+
+
+@pytest.fixture
+def broker():
+    # Unix socket paths are limited to ~100 characters, tmp_path can be longer
+    with tempfile.TemporaryDirectory() as socket_dir:
+        broker = ConnectionBroker(socket_path=os.path.join(socket_dir, "broker.sock"))
+        thread = threading.Thread(target=broker.serve_forever, daemon=True)
+        thread.start()
+        while not os.path.exists(broker.socket_path):
+            time.sleep(0.01)
+        yield broker
+        broker.shutdown()
+        thread.join()
+
+
+def brokered_show_version(device, broker):
+    conn = ConnectHandler(**device, broker_socket=broker.socket_path)
+    try:
+        return conn.send_command("show version")
+    finally:
+        conn.disconnect()
+
+
+def test_sessions_reuse_connection(fake_ios, device, broker, net_connect):
+    expected = net_connect.send_command("show version")
+    connections = fake_ios.connections
+    for _ in range(3):
+        assert brokered_show_version(device, broker) == expected
+    assert fake_ios.connections == connections + 1
+    # The broker notices the last session ended on its own time
+    deadline = time.time() + 5
+    while broker.stats()["channels"] and time.time() < deadline:
+        time.sleep(0.05)
+    assert broker.stats() == {"transports": 1, "channels": 0}
+
+
+def test_reconnects_once_when_channel_open_fails(fake_ios, device, broker):
+    brokered_show_version(device, broker)
+    (pooled,) = broker._clients.values()
+    transport = pooled.client.get_transport()
+
+    def open_session(*args, **kwargs):
+        raise OSError("Connection reset by peer")
+
+    # Still looks active, but opening a channel on it fails
+    transport.open_session = open_session
+    assert pooled.is_active()
+    connections = fake_ios.connections
+    assert "R1 uptime" in brokered_show_version(device, broker)
+    assert fake_ios.connections == connections + 1
+    assert pooled.client.get_transport() is not transport
@@ -0,0 +1,71 @@
+"""The lazy CLASS_MAPPER resolves every device_type, without importing drivers up front."""
+import importlib
+import inspect
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+
+import netmiko
+from netmiko.base_connection import BaseConnection
+from netmiko.scp_handler import BaseFileTransfer
+from netmiko.ssh_dispatcher import CLASS_MAPPER, FILE_TRANSFER_MAP, _CLASS_MODULES
+
+# netmiko.ssh_dispatcher is also the name of a function of the package
+dispatcher = importlib.import_module("netmiko.ssh_dispatcher")
+
+VENDOR_PACKAGES = sorted(set(_CLASS_MODULES.values()))
+
+
+def test_import_netmiko_loads_no_driver():
+    code = (
+        "import sys, netmiko; "
+        "print(' '.join(name for name in sys.modules if name.startswith('netmiko.')))"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    loaded = set(output.split())
+    assert "netmiko.ssh_dispatcher" in loaded
+    assert loaded.isdisjoint(VENDOR_PACKAGES)
+
+
+@pytest.mark.parametrize("device_type", sorted(CLASS_MAPPER))
+def test_device_types_resolve(device_type):
+    platform_class = CLASS_MAPPER[device_type]
+    assert issubclass(platform_class, BaseConnection)
+    assert dispatcher.ssh_dispatcher(device_type) is platform_class
+
+
+@pytest.mark.parametrize("device_type", sorted(FILE_TRANSFER_MAP))
+def test_file_transfers_resolve(device_type):
+    assert issubclass(FILE_TRANSFER_MAP[device_type], BaseFileTransfer)
+
+
+def test_platforms():
+    assert netmiko.platforms == sorted(CLASS_MAPPER)
+    for device_type in dispatcher.platforms_base:
+        assert CLASS_MAPPER[f"{device_type}_ssh"] is CLASS_MAPPER[device_type]
+
+
+def driver_classes():
+    """The driver classes (not the base classes) the netmiko subpackages export."""
+    for module_info in pkgutil.iter_modules(netmiko.__path__):
+        if not module_info.ispkg:
+            continue
+        package = importlib.import_module(f"netmiko.{module_info.name}")
+        for name, value in vars(package).items():
+            if not name.endswith(("SSH", "Telnet", "Serial", "FileTransfer")):
+                continue
+            if inspect.isclass(value) and issubclass(
+                value, (BaseConnection, BaseFileTransfer)
+            ):
+                yield package.__name__, name
+
+
+def test_every_driver_class_listed():
+    missing = [
+        (package, name)
+        for package, name in driver_classes()
+        if _CLASS_MODULES.get(name) != package
+    ]
+    assert missing == []
@@ -0,0 +1,77 @@
+"""The CLI tools run devices concurrently, and only show outputs go to the output store."""
+import threading
+import time
+
+import pytest
+import yaml
+
+from netmiko.cli_tools import netmiko_cfg, netmiko_show
+from netmiko.cli_tools.helpers import ERROR_PATTERN, run_devices
+from netmiko.cli_tools.output_store import OutputStore
+
+
+def test_run_devices_abandons_hung_device():
+    release = threading.Event()
+    threads = {}
+
+    def task(device_name, a_device):
+        threads[device_name] = threading.current_thread()
+        if device_name == "hung":
+            release.wait()
+        return device_name.upper()
+
+    device_group = {name: {} for name in ("hung", "r1", "r2", "r3")}
+    start = time.monotonic()
+    results = dict(run_devices(device_group, task, max_workers=1, timeout=0.2))
+    try:
+        assert time.monotonic() - start < 5
+        assert results == {"hung": ERROR_PATTERN, "r1": "R1", "r2": "R2", "r3": "R3"}
+        # The stuck thread does not keep the process from exiting
+        assert threads["hung"].daemon and threads["hung"].is_alive()
+        assert threads["r1"] is not threads["hung"]
+    finally:
+        release.set()
+    threads["hung"].join(5)
+    assert not threads["hung"].is_alive()
+
+
+def test_run_devices_close_skips_remaining():
+    ran = []
+
+    def task(device_name, a_device):
+        ran.append(device_name)
+        time.sleep(0.05)
+        return device_name
+
+    device_group = {f"r{i}": {} for i in range(10)}
+    results = run_devices(device_group, task, max_workers=2)
+    next(results)
+    results.close()
+    time.sleep(0.3)
+    assert len(ran) < len(device_group)
+
+
+@pytest.fixture
+def inventory(device, tmp_path, monkeypatch):
+    devices_file = tmp_path / ".netmiko.yml"
+    devices_file.write_text(yaml.safe_dump({"r1": device}))
+    monkeypatch.setenv("NETMIKO_TOOLS_CFG", str(devices_file))
+    monkeypatch.setenv("NETMIKO_DIR", str(tmp_path / "netmiko"))
+    return tmp_path / "netmiko" / "output_store.sqlite"
+
+
+def stored(store_file, command):
+    with OutputStore(str(store_file)) as store:
+        return store.get("r1", command)
+
+
+def test_show_output_stored(inventory, capsys):
+    assert netmiko_show.main(["r1", "--cmd", "show version"]) == 0
+    assert "R1 uptime" in capsys.readouterr().out
+    assert "R1 uptime" in stored(inventory, "show version")
+
+
+def test_config_output_not_stored(inventory, capsys):
+    assert netmiko_cfg.main(["r1", "--cmd", "logging buffered 4096"]) == 0
+    assert "logging buffered 4096" in capsys.readouterr().out
+    assert stored(inventory, "logging buffered 4096") is None
@@ -0,0 +1,55 @@
+"""CliTable.ParseCmdRecords returns the same records as ParseCmd and its TextTable."""
+import os
+
+import pytest
+import textfsm
+from textfsm import clitable
+
+from fake_ios import ip_interface_brief
+
+TESTDATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(textfsm.__file__)), "testdata"
+)
+NTC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(textfsm.__file__)), "ntc_templates", "templates"
+)
+
+
+def table_records(cli_table):
+    header = [name.lower() for name in cli_table.header]
+    return [dict(zip(header, row.values)) for row in cli_table]
+
+
+def test_single_template_formats():
+    cli_table = clitable.CliTable("index", NTC_DIR)
+    attrs = {"Command": "show ip interface brief", "Platform": "cisco_ios"}
+    raw = ip_interface_brief(10)
+    cli_table.ParseCmd(raw, attrs)
+    expected = table_records(cli_table)
+    assert len(expected) == 10
+
+    assert cli_table.ParseCmdRecords(raw, attrs) == expected
+    columns = cli_table.ParseCmdRecords(raw, attrs, output="columns")
+    assert list(columns) == list(expected[0])
+    assert columns["interface"] == [record["interface"] for record in expected]
+    records = cli_table.ParseCmdRecords(raw, attrs, output="namedtuples")
+    assert [record._asdict() for record in records] == expected
+
+
+def test_merged_templates():
+    # clitable_templateA:clitable_templateB merge their tables on the Col1 key
+    cli_table = clitable.CliTable("default_index", TESTDATA_DIR)
+    attrs = {"Command": "sh vers", "Vendor": "VendorA"}
+    raw = "a b c\nd e f\n"
+    cli_table.ParseCmd(raw, attrs)
+    expected = table_records(cli_table)
+    assert cli_table.ParseCmdRecords(raw, attrs) == expected
+    assert expected[0]["col4"] == "b"
+
+
+def test_errors():
+    cli_table = clitable.CliTable("default_index", TESTDATA_DIR)
+    with pytest.raises(ValueError):
+        cli_table.ParseCmdRecords("", {"Command": "sh vers"}, output="rows")
+    with pytest.raises(clitable.CliTableError):
+        cli_table.ParseCmdRecords("", {"Command": "show nothing", "Vendor": "VendorA"})
@@ -0,0 +1,65 @@
+"""fast_prepare sets up the session like session_preparation, in one exchange."""
+import pytest
+
+from netmiko import ConnectHandler
+from netmiko.base_connection import BaseConnection
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Everything written to the channel, by every connection of the test."""
+    writes = []
+    write_channel = BaseConnection.write_channel
+
+    def recording_write_channel(self, out_data):
+        writes.append(out_data)
+        write_channel(self, out_data)
+
+    monkeypatch.setattr(BaseConnection, "write_channel", recording_write_channel)
+    return writes
+
+
+@pytest.fixture
+def no_slow_path(monkeypatch):
+    def _test_channel_read(self, *args, **kwargs):
+        raise AssertionError("usual session_preparation used")
+
+    monkeypatch.setattr(BaseConnection, "_test_channel_read", _test_channel_read)
+
+
+def test_matches_session_preparation(device, net_connect, no_slow_path):
+    expected = net_connect.send_command("show version")
+    conn = ConnectHandler(**device, fast_prepare=True)
+    try:
+        assert conn.base_prompt == net_connect.base_prompt == "R1"
+        assert conn.send_command("show version") == expected
+    finally:
+        conn.disconnect()
+
+
+def prepare_writes(device, writes, prompt_cache):
+    del writes[:]
+    conn = ConnectHandler(**device, fast_prepare=True, prompt_cache=prompt_cache)
+    try:
+        assert conn.base_prompt == "R1"
+        prepare = writes[:]
+        assert "uptime" in conn.send_command("show version")
+    finally:
+        conn.disconnect()
+    return prepare
+
+
+def test_prompt_cache(device, writes, no_slow_path):
+    key = f"{device['host']}:{device['port']}"
+    setup = "terminal width 511\nterminal length 0\n"
+    prompt_cache = {}
+    assert prepare_writes(device, writes, prompt_cache) == [setup, "\n"]
+    assert prompt_cache == {key: "R1#"}
+
+    # Known prompt: no probe
+    assert prepare_writes(device, writes, prompt_cache) == [setup]
+
+    # Stale prompt: probed again
+    prompt_cache[key] = "R2#"
+    assert prepare_writes(device, writes, prompt_cache) == [setup, "\n"]
+    assert prompt_cache == {key: "R1#"}
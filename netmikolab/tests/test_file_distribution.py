@@ -0,0 +1,110 @@
+"""distribute_file keeps to max_workers threads and per_site transfers per site."""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import netmiko.file_distribution
+from netmiko.file_distribution import distribute_file
+
+
+class Recorder:
+    """Stands in for the device operations, recording how many run at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = Counter()
+        self.peak = Counter()
+        self.pools = []
+
+    def precheck(self, target, transfer_args, overwrite_file):
+        target.needs_transfer = True
+
+    def transfer(self, target, source):
+        with self.lock:
+            self.running[target.site] += 1
+            self.running["all"] += 1
+            for key in (target.site, "all"):
+                self.peak[key] = max(self.peak[key], self.running[key])
+            self.peak["threads"] = max(self.peak["threads"], threading.active_count())
+        time.sleep(0.02)
+        with self.lock:
+            self.running[target.site] -= 1
+            self.running["all"] -= 1
+        target.result.update(
+            file_exists=True, file_transferred=True, file_verified=True, source=source
+        )
+
+    def upload(self, target, transfer_args):
+        self.transfer(target, None)
+
+    def peer_copy(self, target, seed, transfer_args, peer_copy):
+        self.transfer(target, seed.result["host"])
+        return True
+
+    def executor(self, max_workers):
+        self.pools.append(max_workers)
+        return ThreadPoolExecutor(max_workers=max_workers)
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = Recorder()
+    module = netmiko.file_distribution
+    monkeypatch.setattr(module, "_precheck", recorder.precheck)
+    monkeypatch.setattr(module, "_upload", recorder.upload)
+    monkeypatch.setattr(module, "_peer_copy", recorder.peer_copy)
+    monkeypatch.setattr(module, "ThreadPoolExecutor", recorder.executor)
+    return recorder
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.bin"
+    path.write_bytes(b"image")
+    return str(path)
+
+
+def devices(sites, per_site):
+    return [
+        {"device_type": "cisco_ios", "host": f"r{s}-{d}", "site": f"site{s}"}
+        for s in range(sites)
+        for d in range(per_site)
+    ]
+
+
+def test_many_sites_bounded_by_max_workers(recorder, image):
+    threads = threading.active_count()
+    results = distribute_file(
+        devices(50, 2), image, "image.bin", "flash:", max_workers=4, per_site=2
+    )
+    assert all(r["file_verified"] for r in results)
+    # Precheck pool, then one site pool, then one pool per site
+    assert recorder.pools[:2] == [4, 4]
+    assert set(recorder.pools[2:]) == {1}
+    assert recorder.peak["all"] <= 4
+    # The site threads plus at most one transfer thread for each
+    assert recorder.peak["threads"] <= threads + 2 * 4
+
+
+def test_per_site_limit(recorder, image):
+    results = distribute_file(
+        devices(3, 6), image, "image.bin", "flash:", max_workers=20, per_site=2
+    )
+    assert all(r["file_verified"] for r in results)
+    assert recorder.pools[1:] == [3, 2, 2, 2]
+    assert max(recorder.peak[f"site{s}"] for s in range(3)) <= 2
+
+
+def test_peer_copy_from_site_seed(recorder, image):
+    results = distribute_file(
+        devices(2, 3),
+        image,
+        "image.bin",
+        "flash:",
+        peer_copy=lambda transfer, seed: None,
+    )
+    sources = [r["source"] for r in results]
+    assert sources == [None, "r0-0", "r0-0", None, "r1-0", "r1-0"]
@@ -0,0 +1,79 @@
+"""SFTP options reach every FileTransfer class; SCP refuses to pad a short source."""
+import io
+from types import SimpleNamespace
+
+import pytest
+from scp import SCPClient, SCPException
+
+import netmiko.scp_handler
+from netmiko import file_transfer
+from netmiko.cisco.cisco_nxos_ssh import CiscoNxosFileTransfer
+from netmiko.extreme.extreme_exos import ExtremeExosFileTransfer
+from netmiko.mikrotik.mikrotik_ssh import MikrotikRouterOsFileTransfer
+from netmiko.nokia.nokia_sros import NokiaSrosFileTransfer
+
+
+@pytest.mark.parametrize(
+    "transfer_class",
+    [
+        CiscoNxosFileTransfer,
+        ExtremeExosFileTransfer,
+        MikrotikRouterOsFileTransfer,
+        NokiaSrosFileTransfer,
+    ],
+)
+def test_sftp_options_forwarded(transfer_class, tmp_path, monkeypatch):
+    source_file = tmp_path / "image.bin"
+    source_file.write_bytes(b"x" * 100)
+    conn = SimpleNamespace(device_type="generic")
+    transfer = transfer_class(
+        conn,
+        source_file=str(source_file),
+        dest_file="image.bin",
+        file_system="flash:",
+        use_sftp=True,
+        max_in_flight=16,
+    )
+
+    established = {}
+
+    def scp_conn(ssh_conn, **kwargs):
+        established.update(kwargs)
+
+    monkeypatch.setattr(netmiko.scp_handler, "SCPConn", scp_conn)
+    transfer.establish_scp_conn()
+    assert established["use_sftp"] is True
+    assert established["max_in_flight"] == 16
+
+
+def test_sftp_with_inline_transfer_rejected(tmp_path):
+    conn = SimpleNamespace(device_type="cisco_ios")
+    with pytest.raises(ValueError, match="use_sftp"):
+        file_transfer(
+            conn,
+            source_file=str(tmp_path / "config.txt"),
+            dest_file="config.txt",
+            inline_transfer=True,
+            use_sftp=True,
+        )
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent = b""
+
+    def sendall(self, data):
+        # paramiko channels take str as well
+        self.sent += data.encode() if isinstance(data, str) else bytes(data)
+
+    def recv(self, nbytes):
+        return b"\x00"
+
+
+def test_scp_short_source_raises():
+    transport = SimpleNamespace(getpeername=lambda: ("192.0.2.1", 22))
+    client = SCPClient(transport, buff_size=4)
+    client.channel = FakeChannel()
+    with pytest.raises(SCPException, match="ended after 10 of 20 bytes"):
+        client._send_file(io.BytesIO(b"0123456789"), b"short.txt", "0644", 20)
+    assert not client.channel.sent.endswith(b"\x00")
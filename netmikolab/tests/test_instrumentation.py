@@ -0,0 +1,174 @@
+"""Spans account the channel read loops as read_time, and the exporters aggregate them."""
+import gc
+import os
+import threading
+
+import pytest
+
+from fake_ios import FakeIOSServer
+from netmiko import ConnectHandler
+from netmiko.exceptions import ReadTimeout
+from netmiko.instrumentation import (
+    HistogramExporter,
+    Instrumentation,
+    PrometheusExporter,
+    Span,
+)
+
+RTT = 0.2
+
+
+class Collector:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def named(self, name):
+        return [span for span in self.spans if span.name == name]
+
+
+@pytest.fixture(scope="module")
+def slow_ios():
+    server = FakeIOSServer(rtt=RTT, chunk_size=1024, chunk_delay=0.01).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def spans(slow_ios, device):
+    collector = Collector()
+    device = dict(device, host=slow_ios.host, port=slow_ios.port)
+    conn = ConnectHandler(**device, instrumentation=Instrumentation([collector]))
+    collector.conn = conn
+    yield collector
+    conn.disconnect()
+
+
+def test_send_command_read_time(spans):
+    spans.conn.send_command("show interfaces")
+    (span,) = spans.named("send_command")
+    assert span.error is None
+    # Waiting on the device is most of the command
+    assert span.read_time > RTT
+    assert span.read_time <= span.duration
+    assert span.sleep_time <= span.read_time
+    assert span.other_time < span.duration / 2
+    # The command echo: counted in both spans, not twice in send_command
+    nested = [read for read in spans.named("read_until_pattern") if read.parent is span]
+    assert len(nested) == 1
+    assert 0 < nested[0].read_time <= span.read_time
+
+
+def test_stream_command_read_time(spans):
+    output = "".join(spans.conn.stream_command("show interfaces"))
+    assert output == spans.conn.send_command("show interfaces")
+    (span,) = spans.named("stream_command")
+    assert span.error is None and span.parent is None
+    assert RTT < span.read_time <= span.duration
+
+
+def test_abandoned_stream_command(spans):
+    chunks = spans.conn.stream_command("show interfaces")
+    assert next(chunks)
+    assert spans.named("stream_command") == []
+
+    # Not nested in the stream_command span while it is suspended
+    with spans.conn._span("caller"):
+        pass
+    (caller,) = spans.named("caller")
+    assert caller.parent is None
+
+    del chunks
+    gc.collect()
+    (span,) = spans.named("stream_command")
+    assert span.error == "GeneratorExit"
+    assert span.end is not None
+    assert span.read_time <= span.duration
+
+
+def test_read_timeout_read_time(spans):
+    with pytest.raises(ReadTimeout):
+        spans.conn.send_command("show interfaces", read_timeout=RTT / 2)
+    (span,) = spans.named("send_command")
+    assert span.error == "ReadTimeout"
+    # The read loop left by the exception is accounted when the span ends
+    assert RTT / 2 <= span.read_time <= span.duration
+    assert span._reading is None
+
+    spans.conn.send_command("show interfaces")
+    span = spans.named("send_command")[-1]
+    assert span.error is None and span.read_time > RTT
+
+
+def make_span(duration, name="send_command", device_type="cisco_ios", host="r1"):
+    span = Span(name, host, device_type)
+    span.end = span.start + duration
+    return span
+
+
+def test_quantile():
+    exporter = HistogramExporter(buckets=(1.0, 2.0, 4.0))
+    assert exporter.quantile(0.5, "send_command") == 0.0
+    for duration in (0.5, 1.5, 1.5, 3.0):
+        exporter.export(make_span(duration))
+    exporter.export(make_span(0.1, device_type="juniper_junos"))
+    exporter.export(make_span(0.1, name="disconnect"))
+
+    # 4 spans: 1 up to 1s, 3 up to 2s, all 4 up to 4s
+    assert exporter.quantile(0.25, "send_command", "cisco_ios") == 1.0
+    assert exporter.quantile(0.5, "send_command", "cisco_ios") == 1.5
+    assert exporter.quantile(1.0, "send_command", "cisco_ios") == 4.0
+    # With the juniper_junos span: 2 of 5 up to 1s
+    assert exporter.quantile(0.4, "send_command") == 1.0
+
+    exporter.export(make_span(10.0))
+    assert exporter.quantile(1.0, "send_command", "cisco_ios") == 4.0
+    exporter.reset()
+    assert exporter.quantile(0.5, "send_command") == 0.0
+
+
+def test_prometheus_render():
+    exporter = PrometheusExporter(buckets=(1.0, 2.0), per_host=True, prefix="lab")
+    span = make_span(1.5, host='r"1')
+    span.bytes_read = 100
+    span.loop_iterations = 3
+    span.read_time = 1.25
+    span.error = "ReadTimeout"
+    exporter.export(span)
+
+    labels = 'operation="send_command",device_type="cisco_ios",host="r\\"1"'
+    lines = exporter.render().splitlines()
+    assert lines[:7] == [
+        "# HELP lab_operation_duration_seconds Duration of Netmiko operations.",
+        "# TYPE lab_operation_duration_seconds histogram",
+        f'lab_operation_duration_seconds_bucket{{{labels},le="1"}} 0',
+        f'lab_operation_duration_seconds_bucket{{{labels},le="2"}} 1',
+        f'lab_operation_duration_seconds_bucket{{{labels},le="+Inf"}} 1',
+        f"lab_operation_duration_seconds_sum{{{labels}}} 1.500000",
+        f"lab_operation_duration_seconds_count{{{labels}}} 1",
+    ]
+    assert "# TYPE lab_operation_read_seconds_total counter" in lines
+    assert f"lab_operation_read_seconds_total{{{labels}}} 1.250000" in lines
+    assert f"lab_operation_bytes_read_total{{{labels}}} 100" in lines
+    assert f"lab_operation_loop_iterations_total{{{labels}}} 3" in lines
+    assert f"lab_operation_errors_total{{{labels}}} 1" in lines
+
+
+def test_prometheus_write(tmp_path):
+    exporter = PrometheusExporter()
+    exporter.export(make_span(0.3))
+    metrics_file = tmp_path / "netmiko.prom"
+    threads = [
+        threading.Thread(target=exporter.write, args=(str(metrics_file),))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics_file.read_text() == exporter.render()
+    assert os.listdir(tmp_path) == ["netmiko.prom"]
+    # Readable by the node_exporter
+    assert metrics_file.stat().st_mode & 0o777 == 0o644
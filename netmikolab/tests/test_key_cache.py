@@ -0,0 +1,101 @@
+"""PKeyCache reuses keys until their files change; indexed HostKeys lookups match a scan."""
+import os
+import random
+
+import paramiko
+import pytest
+from paramiko import HostKeys, PKeyCache, RSAKey, SSHException
+from paramiko.ed25519key import Ed25519Key
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return [RSAKey.generate(1024) for _ in range(3)]
+
+
+def write_key(path, key, password=None):
+    key.write_private_key_file(str(path), password=password)
+    # Make sure a rewrite is seen even on filesystems with coarse mtimes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + random.randint(1, 10**9)))
+
+
+def test_pkey_cache(tmp_path, keys):
+    path = tmp_path / "id_rsa"
+    write_key(path, keys[0])
+    cache = PKeyCache()
+    key = cache.get(str(path), RSAKey)
+    assert key == keys[0]
+    assert cache.get(str(path), RSAKey) is key
+
+    write_key(path, keys[1])
+    assert cache.get(str(path), RSAKey) == keys[1]
+
+    for _ in range(2):
+        with pytest.raises(SSHException):
+            cache.get(str(path), Ed25519Key)
+
+
+def test_pkey_cache_password(tmp_path, keys):
+    path = tmp_path / "id_rsa"
+    write_key(path, keys[2], password="secret")
+    cache = PKeyCache()
+    with pytest.raises(SSHException):
+        cache.get(str(path), RSAKey)
+    with pytest.raises(SSHException):
+        cache.get(str(path), RSAKey, password="wrong")
+    assert cache.get(str(path), RSAKey, password="secret") == keys[2]
+
+
+def test_ssh_client_uses_cache(tmp_path, keys):
+    path = tmp_path / "id_rsa"
+    write_key(path, keys[0])
+    client = paramiko.SSHClient()
+    # Not connected, nothing to log to
+    client._log = lambda level, msg: None
+    client.key_cache = PKeyCache()
+    assert client._key_from_filepath(str(path), RSAKey, None) is (
+        client._key_from_filepath(str(path), RSAKey, None)
+    )
+    client.key_cache = None
+    assert client._key_from_filepath(str(path), RSAKey, None) == keys[0]
+
+
+def test_hostkeys_lookups_match_scan(tmp_path, keys):
+    rand = random.Random(34)
+    hosts = [f"host{i}.example.com" for i in range(60)] + ["[10.0.0.1]:2222"]
+    lines = []
+    for i, host in enumerate(hosts):
+        key = keys[i % len(keys)]
+        names = HostKeys.hash_host(host) if rand.random() < 0.5 else host
+        if rand.random() < 0.2:
+            names += f",alias{i}"
+        lines.append(f"{names} {key.get_name()} {key.get_base64()}\n")
+    lines.append(
+        f"|1|bm90IGEgc2FsdA==|broken {keys[0].get_name()} {keys[0].get_base64()}\n"
+    )
+    known_hosts = tmp_path / "known_hosts"
+    known_hosts.write_text("".join(lines))
+
+    host_keys = HostKeys(str(known_hosts))
+
+    def scan(hostname):
+        # The malformed entry made every (linear) lookup raise; the index skips it
+        return [
+            e
+            for e in host_keys._entries
+            if not e.hostnames[0].endswith("|broken")
+            and host_keys._hostname_matches(hostname, e)
+        ]
+
+    names = hosts + ["alias3", "alias7", "unknown.example.com"]
+    for hostname in names + names:
+        assert host_keys._matching_entries(hostname) == scan(hostname)
+
+    # The index follows additions and removals
+    host_keys.add("new.example.com", "ssh-rsa", keys[1])
+    assert host_keys.lookup("new.example.com")["ssh-rsa"] == keys[1]
+    del host_keys[hosts[0]]
+    assert host_keys.lookup(hosts[0]) is None
+    for hostname in names:
+        assert host_keys._matching_entries(hostname) == scan(hostname)
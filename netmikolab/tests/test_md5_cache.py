@@ -0,0 +1,125 @@
+"""Local file MD5s are cached per (path, size, mtime) and computed while uploading."""
+import hashlib
+import os
+from types import SimpleNamespace
+
+import pytest
+from scp import SCPClient
+
+import netmiko.scp_handler
+from netmiko.scp_handler import BaseFileTransfer, SCPConn, cached_file_md5
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(netmiko.scp_handler, "_md5_cache", {})
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.bin"
+    path.write_bytes(os.urandom(3 * netmiko.scp_handler.MD5_READ_SIZE + 123))
+    return path
+
+
+def md5(path):
+    return hashlib.md5(path.read_bytes()).hexdigest()
+
+
+def test_cached_file_md5(image):
+    expected = md5(image)
+    assert cached_file_md5(str(image)) == expected
+
+    # Same size and mtime: the cached digest is returned without reading the file
+    stat = os.stat(image)
+    with open(image, "r+b") as f:
+        f.write(b"changed")
+    os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cached_file_md5(str(image)) == expected
+
+    os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cached_file_md5(str(image)) == md5(image) != expected
+
+
+def test_cache_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(netmiko.scp_handler, "MD5_CACHE_SIZE", 3)
+    for i in range(5):
+        path = tmp_path / f"file{i}"
+        path.write_bytes(b"%d" % i)
+        assert cached_file_md5(str(path)) == md5(path)
+    assert len(netmiko.scp_handler._md5_cache) == 3
+
+
+class FakeChannel:
+    closed = False
+
+    def __init__(self):
+        self.sent = bytearray()
+
+    def settimeout(self, timeout):
+        pass
+
+    def exec_command(self, command):
+        pass
+
+    def sendall(self, data):
+        self.sent += data.encode() if isinstance(data, str) else data
+
+    def recv(self, nbytes):
+        return b"\x00"
+
+    def close(self):
+        self.closed = True
+
+
+def transfer_with_fake_scp(image, buff_size=65536):
+    """A put BaseFileTransfer whose SCP client writes to a FakeChannel."""
+    ssh_conn = SimpleNamespace(device_type="generic")
+    transfer = BaseFileTransfer(
+        ssh_conn, source_file=str(image), dest_file="image.bin", file_system="flash:"
+    )
+    channel = FakeChannel()
+    transport = SimpleNamespace(
+        getpeername=lambda: ("192.0.2.1", 22), open_session=lambda: channel
+    )
+    scp_conn = SCPConn.__new__(SCPConn)
+    scp_conn.use_sftp = False
+    scp_conn.scp_conn = SimpleNamespace(close=lambda: None)
+    scp_conn.scp_client = SCPClient(transport, buff_size=buff_size)
+    transfer.scp_conn = scp_conn
+    return transfer, channel
+
+
+def test_put_file_hashes_sent_data(image, monkeypatch):
+    transfer, channel = transfer_with_fake_scp(image)
+
+    def no_rehash(file_name):
+        raise AssertionError("source file read a second time")
+
+    monkeypatch.setattr(netmiko.scp_handler, "cached_file_md5", no_rehash)
+    transfer.put_file()
+    assert image.read_bytes() in channel.sent
+    expected = md5(image)
+    assert transfer.source_md5 == expected
+
+    # Later transfers of the same file reuse the digest
+    monkeypatch.setattr(netmiko.scp_handler, "cached_file_md5", cached_file_md5)
+    monkeypatch.setattr(netmiko.scp_handler.hashlib, "md5", no_rehash)
+    transfer, _ = transfer_with_fake_scp(image)
+    assert transfer.source_md5 == expected
+
+
+def test_put_file_skips_hash_of_changed_file(image, monkeypatch):
+    transfer, _ = transfer_with_fake_scp(image)
+    putfo = SCPClient.putfo
+
+    def putfo_then_modify(self, fl, *args, **kwargs):
+        putfo(self, fl, *args, **kwargs)
+        stat = os.stat(image)
+        os.utime(image, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    monkeypatch.setattr(SCPClient, "putfo", putfo_then_modify)
+    transfer.put_file()
+    assert not netmiko.scp_handler._md5_cache
+    # Hashed from the file on disk when it is first needed
+    assert transfer.source_md5 == md5(image)
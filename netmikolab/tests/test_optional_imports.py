@@ -0,0 +1,33 @@
+"""Optional parsers count as installed only if they actually import."""
+import sys
+
+import pytest
+
+from netmiko import utilities
+
+
+@pytest.fixture
+def broken_genie(tmp_path, monkeypatch):
+    """genie and pyats packages that are found, but fail to import a dependency."""
+    for package in ("genie", "genie/conf", "genie/libs", "pyats"):
+        (tmp_path / package).mkdir()
+        (tmp_path / package / "__init__.py").write_text("")
+    (tmp_path / "genie/conf/base.py").write_text("import missing_genie_dependency\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in list(sys.modules):
+        if name.split(".")[0] in ("genie", "pyats"):
+            monkeypatch.delitem(sys.modules, name)
+    utilities._installed.cache_clear()
+    yield
+    utilities._installed.cache_clear()
+
+
+def test_broken_genie_not_installed(broken_genie):
+    assert utilities.GENIE_INSTALLED is False
+    with pytest.raises(ValueError, match="Genie and PyATS are not installed"):
+        utilities.get_structured_data_genie("", "cisco_ios", "show version")
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        utilities.NOT_INSTALLED
@@ -0,0 +1,123 @@
+"""OutputStore.grep finds the same lines as searching every stored output."""
+import re
+import time
+
+import pytest
+import yaml
+
+from fake_ios import ip_interface_brief, show_interfaces
+from netmiko.cli_tools import netmiko_grep
+from netmiko.cli_tools.output_store import OutputStore
+
+OUTPUTS = {
+    ("r1", "show interfaces"): show_interfaces(8),
+    ("r1", "show ip interface brief"): ip_interface_brief(8),
+    ("r2", "show ip interface brief"): ip_interface_brief(3),
+    ("r3", "show run"): (
+        "hostname r3\n"
+        "interface GigabitEthernet0/1\n"
+        " description WAN_link to 100%_isp\n"
+        " ip address 10.0.0.1 255.255.255.0\n"
+        " shutdown\n"
+        "interface Loopback0\n"
+        " ip address 10.255.0.3 255.255.255.255\n"
+    ),
+}
+
+PATTERNS = [
+    "GigabitEthernet0/1",
+    "face",
+    "^interface",
+    "Loopback0$",
+    r"\bip\b",
+    r"10\.0\.0\.",
+    "up|down",
+    "[0-9]+",
+    "description .*WAN",
+    "WAN_link",
+    "100%_isp",
+    "(?i)SHUTDOWN",
+    "Shutdown",
+    "address",
+    "missing",
+    "",
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = OutputStore(str(tmp_path / "store.sqlite"))
+    for (device, command), output in OUTPUTS.items():
+        store.save(device, command, output)
+    yield store
+    store.close()
+
+
+def scan(regex, outputs):
+    matches = {}
+    for device, command in sorted(outputs):
+        for line in OUTPUTS[device, command].splitlines():
+            if regex.search(line):
+                matches.setdefault(device, []).append(line)
+    return matches
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_grep_matches_scan(store, pattern):
+    regex = re.compile(pattern)
+    assert store.grep(regex, OUTPUTS) == scan(regex, OUTPUTS)
+    some = [("r1", "show interfaces"), ("r3", "show run")]
+    assert store.grep(regex, some) == scan(regex, some)
+    assert store.grep(regex, some + [("r4", "show run")]) == scan(regex, some)
+    assert store.grep(regex, []) == {}
+
+
+def test_save_replaces(store):
+    store.save("r3", "show run", "hostname r3-new\n")
+    assert store.get("r3", "show run") == "hostname r3-new\n"
+    assert store.grep(re.compile("GigabitEthernet0/1"), [("r3", "show run")]) == {}
+    assert store.grep(re.compile("r3-new"), OUTPUTS) == {"r3": ["hostname r3-new"]}
+
+
+def test_max_age(store, monkeypatch):
+    assert store.get("r1", "show interfaces", max_age=60) is not None
+    assert store.fresh(OUTPUTS, max_age=60) == set(OUTPUTS)
+    assert store.fresh([("r1", "show run"), ("r4", "show run")], max_age=60) == set()
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert store.get("r1", "show interfaces", max_age=60) is None
+    assert store.get("r1", "show interfaces") is not None
+    assert store.fresh(OUTPUTS, max_age=60) == set()
+
+
+def test_grep_max_age_uses_store(fake_ios, device, tmp_path, monkeypatch, capsys):
+    devices_file = tmp_path / ".netmiko.yml"
+    devices_file.write_text(yaml.safe_dump({"r1": device}))
+    monkeypatch.setenv("NETMIKO_TOOLS_CFG", str(devices_file))
+    monkeypatch.setenv("NETMIKO_DIR", str(tmp_path / "netmiko"))
+    args = [r"GigabitEthernet0/1\b", "r1", "--cmd", "show ip interface brief"]
+    searched = []
+    grep = OutputStore.grep
+
+    def spy_grep(self, regex, outputs):
+        searched.append(set(outputs))
+        return grep(self, regex, outputs)
+
+    monkeypatch.setattr(OutputStore, "grep", spy_grep)
+
+    connections = fake_ios.connections
+    assert netmiko_grep.main(args + ["--max-age", "3600"]) == 0
+    retrieved = capsys.readouterr().out
+    assert "GigabitEthernet0/1 " in retrieved
+    assert fake_ios.connections == connections + 1
+    # Nothing stored yet
+    assert searched == []
+
+    assert netmiko_grep.main(args + ["--max-age", "3600"]) == 0
+    assert capsys.readouterr().out == retrieved
+    assert fake_ios.connections == connections + 1
+    assert searched == [{("r1", "show ip interface brief")}]
+
+    assert netmiko_grep.main(args) == 0
+    assert capsys.readouterr().out == retrieved
+    assert fake_ios.connections == connections + 2
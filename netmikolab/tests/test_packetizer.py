@@ -0,0 +1,175 @@
+"""Packetizer round trips: what one side sends, the other reads back, with every framing."""
+import os
+import random
+import socket
+import threading
+
+import pytest
+from cryptography.hazmat.primitives.ciphers import Cipher
+
+from paramiko import Message, Transport
+from paramiko.common import MSG_IGNORE
+from paramiko.packet import Packetizer
+
+SIZES = [0, 1, 7, 15, 16, 17, 255, 1000, 4095, 4096, 4097, 32768, 34000]
+
+FRAMINGS = [
+    (None, None),
+    ("aes128-ctr", "hmac-sha2-256"),
+    ("aes256-ctr", "hmac-sha1-96"),
+    ("aes128-cbc", "hmac-md5"),
+    ("3des-cbc", "hmac-sha2-512"),
+    ("aes128-ctr", "hmac-sha2-256-etm@openssh.com"),
+    ("aes256-cbc", "hmac-sha2-512-etm@openssh.com"),
+    ("aes128-gcm@openssh.com", None),
+    ("aes256-gcm@openssh.com", None),
+]
+
+
+def framing(cipher, mac):
+    """Functions setting up a sending and a receiving Packetizer with the same keys."""
+    if cipher is None:
+        return (lambda packetizer: None), (lambda packetizer: None)
+
+    info = Transport._cipher_info[cipher]
+    aead = info.get("is_aead", False)
+    block_size = info["block-size"]
+    key = os.urandom(info["key-size"])
+    iv = os.urandom(info.get("iv-size", block_size))
+    if aead:
+        mac_engine, mac_size, mac_key = None, 16, None
+    else:
+        mac_engine = Transport._mac_info[mac]["class"]
+        mac_size = Transport._mac_info[mac]["size"]
+        mac_key = os.urandom(mac_engine().digest_size)
+    etm = mac is not None and "etm@openssh.com" in mac
+
+    def engine(encrypt):
+        if aead:
+            return info["class"](key)
+        cipher_obj = Cipher(info["class"](key), info["mode"](iv))
+        return cipher_obj.encryptor() if encrypt else cipher_obj.decryptor()
+
+    def outbound(packetizer):
+        packetizer.set_outbound_cipher(
+            engine(True),
+            block_size,
+            mac_engine,
+            mac_size,
+            mac_key,
+            sdctr=cipher.endswith("-ctr"),
+            etm=etm,
+            aead=aead,
+            iv_out=iv if aead else None,
+        )
+
+    def inbound(packetizer):
+        packetizer.set_inbound_cipher(
+            engine(False),
+            block_size,
+            mac_engine,
+            mac_size,
+            mac_key,
+            etm=etm,
+            aead=aead,
+            iv_in=iv if aead else None,
+        )
+
+    return outbound, inbound
+
+
+def send_all(sender, payloads):
+    def run():
+        for payload in payloads:
+            msg = Message()
+            msg.add_byte(bytes([MSG_IGNORE]))
+            msg.add_string(payload)
+            sender.send_message(msg)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def payloads():
+    rand = random.Random(32)
+    return [bytes(rand.getrandbits(8) for _ in range(size)) for size in SIZES]
+
+
+@pytest.mark.parametrize("cipher, mac", FRAMINGS)
+def test_read_message(cipher, mac):
+    outbound, inbound = framing(cipher, mac)
+    sock_out, sock_in = socket.socketpair()
+    sock_in.settimeout(5)
+    sender, receiver = Packetizer(sock_out), Packetizer(sock_in)
+    outbound(sender)
+    inbound(receiver)
+    expected = payloads()
+    thread = send_all(sender, expected)
+    for payload in expected:
+        ptype, msg = receiver.read_message()
+        assert ptype == MSG_IGNORE
+        assert msg.get_string() == payload
+    thread.join()
+    sock_out.close()
+    sock_in.close()
+
+
+@pytest.mark.parametrize("cipher, mac", FRAMINGS)
+def test_buffered_input_in_small_pieces(cipher, mac):
+    """The reactor's path: packets are only read once they are fully buffered."""
+    outbound, inbound = framing(cipher, mac)
+    sock_out, sock_wire = socket.socketpair()
+    sender = Packetizer(sock_out)
+    outbound(sender)
+    expected = payloads()
+    thread = send_all(sender, expected)
+    wire = b""
+    sock_wire.settimeout(0.5)
+    while True:
+        try:
+            wire += sock_wire.recv(65536)
+        except socket.timeout:
+            if not thread.is_alive():
+                break
+    thread.join()
+
+    sock_feed, sock_in = socket.socketpair()
+    sock_in.settimeout(5)
+    receiver = Packetizer(sock_in)
+    inbound(receiver)
+    received = []
+    for i in range(0, len(wire), 1000):
+        sock_feed.sendall(wire[i : i + 1000])
+        receiver.buffer_input()
+        while receiver.has_buffered_packet():
+            ptype, msg = receiver.read_message()
+            received.append(msg.get_string())
+    assert received == expected
+    assert not receiver.has_pending_input()
+    for sock in (sock_out, sock_wire, sock_feed, sock_in):
+        sock.close()
+
+
+@pytest.mark.parametrize("cipher, mac", FRAMINGS[:2])
+def test_burst_of_small_packets(cipher, mac):
+    """Many packets per recv: each is taken from the buffer without copying the rest."""
+    outbound, inbound = framing(cipher, mac)
+    sock_out, sock_in = socket.socketpair()
+    sock_in.settimeout(5)
+    sender, receiver = Packetizer(sock_out), Packetizer(sock_in)
+    outbound(sender)
+    inbound(receiver)
+    expected = [b"%05d" % i for i in range(5000)]
+    thread = send_all(sender, expected)
+    received = []
+    while len(received) < len(expected):
+        receiver.buffer_input()
+        while receiver.has_buffered_packet():
+            ptype, msg = receiver.read_message()
+            received.append(msg.get_string())
+    thread.join()
+    assert received == expected
+    assert not receiver.has_pending_input()
+    sock_out.close()
+    sock_in.close()
@@ -0,0 +1,91 @@
+"""TransportReactor drives many sessions from one thread, without head-of-line blocking."""
+import functools
+import socket
+import threading
+import time
+
+import paramiko
+import pytest
+
+NON_ETM_MACS = ["hmac-sha2-256", "hmac-sha2-512", "hmac-sha1", "hmac-md5"]
+NON_GCM_CIPHERS = ["aes128-ctr", "aes192-ctr", "aes256-ctr", "aes128-cbc"]
+NON_GCM_CIPHERS += ["aes192-cbc", "aes256-cbc", "3des-cbc"]
+
+
+def open_shell(fake_ios, reactor, disabled_algorithms=None):
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        fake_ios.host,
+        port=fake_ios.port,
+        username="test",
+        password="test",
+        look_for_keys=False,
+        allow_agent=False,
+        disabled_algorithms=disabled_algorithms,
+        transport_factory=functools.partial(paramiko.Transport, reactor=reactor),
+    )
+    return client, client.invoke_shell()
+
+
+def run_command(shell, command, prompt=b"R1#"):
+    shell.settimeout(10)
+    shell.send(command + "\n")
+    output = b""
+    while not output.rstrip().endswith(prompt) or command.encode() not in output:
+        output += shell.recv(65536)
+    return output.decode()
+
+
+@pytest.mark.parametrize(
+    "disabled_algorithms",
+    [
+        None,
+        # forces encrypt-then-mac
+        {"macs": NON_ETM_MACS},
+        # forces AES-GCM
+        {"ciphers": NON_GCM_CIPHERS},
+    ],
+)
+def test_sessions(fake_ios, disabled_algorithms):
+    with paramiko.TransportReactor(loops=1) as reactor:
+        sessions = [
+            open_shell(fake_ios, reactor, disabled_algorithms) for _ in range(3)
+        ]
+        assert len(reactor) == 3
+        for _ in range(2):
+            for client, shell in sessions:
+                output = run_command(shell, "show interfaces")
+                assert output.count("GigabitEthernet0/47 is up") == 1
+        for client, shell in sessions:
+            client.close()
+
+
+def test_partial_packet_does_not_stall(fake_ios):
+    """A peer stopping halfway through a packet doesn't hold up other transports."""
+    stalled = socket.socket()
+    stalled.bind(("127.0.0.1", 0))
+    stalled.listen(1)
+    stop = threading.Event()
+
+    def stalled_peer():
+        conn, _ = stalled.accept()
+        conn.sendall(b"SSH-2.0-Stalled\r\n")
+        # Start of a packet of 256 bytes, which never arrives
+        conn.sendall(b"\x00\x00\x01\x00\x0c")
+        stop.wait(30)
+        conn.close()
+
+    threading.Thread(target=stalled_peer, daemon=True).start()
+    with paramiko.TransportReactor(loops=1) as reactor:
+        transport = paramiko.Transport(stalled.getsockname(), reactor=reactor)
+        transport.start_client(event=threading.Event())
+        time.sleep(0.5)
+        start = time.time()
+        client, shell = open_shell(fake_ios, reactor)
+        assert "R1 uptime" in run_command(shell, "show version")
+        assert time.time() - start < 5
+        client.close()
+        transport.close()
+    stop.set()
+    stalled.close()
@@ -0,0 +1,73 @@
+"""send_commands returns what send_command returns for each command, in one round trip."""
+import pytest
+
+from fake_ios import FakeIOSServer
+from netmiko import ConnectHandler
+from netmiko.exceptions import ReadTimeout
+from netmiko.transport_profile import TransportProfile
+
+COMMANDS = ["show version", "show ip interface brief", "show interfaces", "show run"]
+
+
+def sequential(conn, commands, **kwargs):
+    return {cmd.strip(): conn.send_command(cmd, **kwargs) for cmd in commands}
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"strip_prompt": False, "strip_command": False},
+        {"use_textfsm": True},
+        {"cmd_verify": False},
+    ],
+)
+def test_matches_send_command(net_connect, kwargs):
+    expected = sequential(net_connect, COMMANDS, **kwargs)
+    assert net_connect.send_commands(COMMANDS, **kwargs) == expected
+    if kwargs.get("use_textfsm"):
+        assert isinstance(expected["show ip interface brief"], list)
+
+
+def test_not_normalized(net_connect):
+    commands = [cmd + "\n" for cmd in COMMANDS]
+    expected = sequential(net_connect, commands, normalize=False)
+    assert net_connect.send_commands(commands, normalize=False) == expected
+
+
+def test_base_prompt(net_connect):
+    # send_command() stops at 'hostname R1' in show run when searching for base_prompt
+    expected = net_connect.send_commands(COMMANDS)
+    assert net_connect.send_commands(COMMANDS, auto_find_prompt=False) == expected
+
+
+def test_global_cmd_verify(device, net_connect):
+    expected = net_connect.send_commands(COMMANDS)
+    conn = ConnectHandler(**device, global_cmd_verify=False)
+    try:
+        assert conn.send_commands(COMMANDS) == expected
+    finally:
+        conn.disconnect()
+
+
+def test_read_timeout_override(device):
+    server = FakeIOSServer(rtt=0.5).start()
+    conn = ConnectHandler(**dict(device, host=server.host, port=server.port))
+    try:
+        conn.read_timeout_override = 0.2
+        with pytest.raises(ReadTimeout):
+            conn.send_commands(COMMANDS, read_timeout=60)
+    finally:
+        conn.disconnect()
+        server.stop()
+
+
+def test_transport_stats(device):
+    conn = ConnectHandler(**device, transport_profile=TransportProfile())
+    try:
+        outputs = conn.send_commands(COMMANDS)
+        (burst,) = conn.transport_stats.summary()["commands"]
+    finally:
+        conn.disconnect()
+    assert burst["command"] == "\n".join(COMMANDS)
+    assert burst["raw_bytes"] >= sum(len(output) for output in outputs.values())
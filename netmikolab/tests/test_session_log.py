@@ -0,0 +1,54 @@
+"""AsyncSessionLog rotates at max_bytes even when a whole batch is written at once."""
+import os
+
+import pytest
+
+from netmiko.session_log import AsyncSessionLog
+
+
+def read_rotated(file_name, backup_count):
+    """Contents of every file, oldest first, and their sizes."""
+    names = [f"{file_name}.{i}" for i in range(backup_count, 0, -1)] + [file_name]
+    names = [name for name in names if os.path.exists(name)]
+    contents = b"".join(open(name, "rb").read() for name in names)
+    return contents.decode("utf-8"), [os.path.getsize(name) for name in names]
+
+
+@pytest.mark.parametrize("text", ["router#show version\n", "intf é–ü\n"])
+def test_rotates_within_batch(tmp_path, text):
+    file_name = str(tmp_path / "session.log")
+    session_log = AsyncSessionLog(
+        file_name=file_name, max_bytes=1000, backup_count=50, compress=False
+    )
+    session_log.open()
+    data = text * 300
+    # Queued faster than the writer thread runs: written in a few large batches
+    for i in range(0, len(data), 450):
+        session_log.write(data[i : i + 450])
+    session_log.close()
+
+    contents, sizes = read_rotated(file_name, 50)
+    assert contents == data
+    assert len(sizes) > 1
+    assert max(sizes) <= 1000
+    assert all(size > 1000 - 4 for size in sizes[:-1])
+
+
+def test_no_log_filter_with_rotation(tmp_path):
+    file_name = str(tmp_path / "session.log")
+    session_log = AsyncSessionLog(
+        file_name=file_name,
+        max_bytes=100,
+        backup_count=50,
+        compress=False,
+        no_log={"password": "s3cret-pass"},
+    )
+    session_log.open()
+    for _ in range(20):
+        session_log.write("username admin password s3cret-pass\n")
+    session_log.close()
+
+    contents, sizes = read_rotated(file_name, 50)
+    assert "s3cret" not in contents
+    assert contents == "username admin password ********\n" * 20
+    assert max(sizes) <= 100
@@ -0,0 +1,82 @@
+"""Indexed, memoized SSHConfig lookups give the same results as evaluating every stanza."""
+import os
+
+from paramiko import SSHConfig
+
+from netmiko.base_connection import _load_ssh_config
+
+CONFIG = """\
+Host *
+    ServerAliveInterval 30
+
+Host r1 r2
+    User admin
+    IdentityFile ~/.ssh/r1
+
+Host r2
+    Port 2222
+
+Host core-*
+    User core
+    ProxyJump jump1
+
+Host !r1 edge?
+    Compression yes
+
+Match host r3 user admin
+    Port 2022
+
+Host R4
+    User upper
+
+Host jump1
+    HostName 10.0.0.1
+
+Match all
+    ConnectTimeout 10
+"""
+
+HOSTS = ["r1", "r2", "r3", "R4", "r4", "core-1", "edge1", "edge12", "jump1", "other"]
+
+
+def unindexed(text):
+    config = SSHConfig.from_text(text)
+    config._candidates = lambda hostname: config._config
+    return config
+
+
+def test_lookups_match_unindexed():
+    config = SSHConfig.from_text(CONFIG)
+    reference = unindexed(CONFIG)
+    for hostname in HOSTS + HOSTS:
+        assert config.lookup(hostname) == reference.lookup(hostname)
+
+
+def test_memoized_results_are_copies():
+    config = SSHConfig.from_text(CONFIG)
+    options = config.lookup("r1")
+    options["user"] = "changed"
+    options["identityfile"].append("~/.ssh/other")
+    assert config.lookup("r1") == unindexed(CONFIG).lookup("r1")
+
+
+def test_parse_drops_memo(tmp_path):
+    config = SSHConfig.from_text(CONFIG)
+    assert "user" not in config.lookup("new")
+    config_file = tmp_path / "config"
+    config_file.write_text("Host new\n    User newuser\n")
+    with open(config_file) as f:
+        config.parse(f)
+    assert config.lookup("new")["user"] == "newuser"
+
+
+def test_netmiko_reuses_parsed_file(tmp_path):
+    config_file = tmp_path / "config"
+    config_file.write_text(CONFIG)
+    config = _load_ssh_config(str(config_file))
+    assert _load_ssh_config(str(config_file)) is config
+
+    config_file.write_text(CONFIG.replace("User admin", "User operator"))
+    stat = os.stat(config_file)
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert _load_ssh_config(str(config_file)).lookup("r1")["user"] == "operator"
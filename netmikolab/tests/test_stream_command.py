@@ -0,0 +1,100 @@
+"""stream_command yields what send_command returns, and streamed TextFSM parses the same."""
+import pytest
+
+from fake_ios import ip_interface_brief
+from netmiko.utilities import get_structured_data_textfsm, iter_structured_data_textfsm
+
+FILLUP_TEMPLATE = """\
+Value Fillup GROUP (\\S+)
+Value NAME (\\S+)
+
+Start
+  ^name ${NAME} -> Record
+  ^group ${GROUP}
+"""
+
+FILLUP_OUTPUT = """\
+name a
+name b
+group G1
+name c
+name d
+group G2
+name e
+"""
+
+
+def chunked(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 20, 1000])
+def test_fillup_stream_matches_parse(tmp_path, size):
+    template = tmp_path / "fillup.textfsm"
+    template.write_text(FILLUP_TEMPLATE)
+    expected = get_structured_data_textfsm(FILLUP_OUTPUT, template=str(template))
+    assert {"group": "G2", "name": "d"} in expected
+    chunks = chunked(FILLUP_OUTPUT, size)
+    streamed = iter_structured_data_textfsm(chunks, template=str(template))
+    assert list(streamed) == expected
+
+
+@pytest.mark.parametrize(
+    "state, chunks",
+    [
+        ("EOF", ["name a\nSTOP\n", "name b\n", "name c\n"]),
+        ("EOF", ["name a\nST", "OP\nname b\n", "name c"]),
+        ("End", ["name a\nSTOP\n", "name b\n", "name c\n"]),
+        ("End", ["name a\nname b"]),
+    ],
+)
+def test_stop_state_stream_matches_parse(tmp_path, state, chunks):
+    template = tmp_path / "stop.textfsm"
+    template.write_text(
+        "Value NAME (\\S+)\n\nStart\n  ^name ${NAME} -> Record\n"
+        f"  ^STOP -> {state}\n"
+    )
+    expected = get_structured_data_textfsm("".join(chunks), template=str(template))
+    streamed = iter_structured_data_textfsm(chunks, template=str(template))
+    assert list(streamed) == expected
+
+
+@pytest.mark.parametrize("size", [1, 50, 4096])
+def test_index_stream_matches_parse(size):
+    output = ip_interface_brief(30)
+    attrs = {"platform": "cisco_xe", "command": "show ip interface brief"}
+    expected = get_structured_data_textfsm(output, **attrs)
+    assert len(expected) == 30
+    streamed = iter_structured_data_textfsm(chunked(output, size), **attrs)
+    assert list(streamed) == expected
+
+
+COMMANDS = [
+    "show version",
+    "show interfaces",
+    "show run",
+    "show bench 300000",
+    "show no such command",
+]
+
+
+@pytest.mark.parametrize("command", COMMANDS)
+def test_matches_send_command(net_connect, command):
+    expected = net_connect.send_command(command)
+    assert "".join(net_connect.stream_command(command)) == expected
+    lines = list(net_connect.stream_command(command, lines=True))
+    assert lines == expected.split("\n")
+
+
+@pytest.mark.parametrize("kwargs", [{"strip_prompt": False}, {"cmd_verify": False}])
+def test_options_match_send_command(net_connect, kwargs):
+    expected = net_connect.send_command("show interfaces", **kwargs)
+    output = "".join(net_connect.stream_command("show interfaces", **kwargs))
+    assert output == expected
+
+
+def test_textfsm_matches_send_command(net_connect):
+    command = "show ip interface brief"
+    expected = net_connect.send_command(command, use_textfsm=True)
+    assert isinstance(expected, list)
+    assert list(net_connect.stream_command(command, use_textfsm=True)) == expected
@@ -0,0 +1,80 @@
+"""StructuredDataCache returns exactly what parsing returns and invalidates on change."""
+import os
+
+from fake_ios import SHOW_VERSION, ip_interface_brief
+from netmiko.structured_data_cache import StructuredDataCache
+from netmiko.utilities import structured_data_converter
+
+INDEX = """\
+Template, Hostname, Platform, Command
+
+show_thing.textfsm, .*, fake_os, sh[[ow]] thing
+"""
+
+TEMPLATE = """\
+Value {name} (\\S+)
+
+Start
+  ^thing ${{{name}}} -> Record
+"""
+
+
+def convert(raw_data, command, cache, platform="cisco_ios"):
+    return structured_data_converter(
+        raw_data, command=command, platform=platform, use_textfsm=True, cache=cache
+    )
+
+
+def test_hit_equals_miss():
+    cache = StructuredDataCache()
+    for command, raw_data in [
+        ("show version", SHOW_VERSION.format(hostname="R1")),
+        ("show ip interface brief", ip_interface_brief(10)),
+        ("show no such command", "some output"),
+    ]:
+        miss = convert(raw_data, command, cache)
+        assert convert(raw_data, command, cache) == miss
+        assert miss == convert(raw_data, command, None)
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 3
+
+
+def test_types_preserved(tmp_path):
+    value = {1: ("a", 2), "b": [(3, 4)], None: {5.0}}
+    for cache in (StructuredDataCache(), StructuredDataCache(cache_dir=str(tmp_path))):
+        cache.set("key", value)
+        assert cache.get("key") == value
+        # Modifying a returned value does not change the cached one
+        cache.get("key")[1] = None
+        assert cache.get("key") == value
+    disk_only = StructuredDataCache(cache_dir=str(tmp_path))
+    assert disk_only.get("key") == value
+    assert disk_only.stats()["disk_hits"] == 1
+
+
+def test_template_edit_invalidates(tmp_path, monkeypatch):
+    (tmp_path / "index").write_text(INDEX)
+    template = tmp_path / "show_thing.textfsm"
+    template.write_text(TEMPLATE.format(name="NAME"))
+    monkeypatch.setenv("NET_TEXTFSM", str(tmp_path))
+    cache = StructuredDataCache()
+
+    assert convert("thing one\n", "show thing", cache, "fake_os") == [{"name": "one"}]
+    template.write_text(TEMPLATE.format(name="THING_NAME"))
+    stat = os.stat(template)
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert convert("thing one\n", "show thing", cache, "fake_os") == [
+        {"thing_name": "one"}
+    ]
+    assert cache.stats()["misses"] == 2
+
+
+def test_disk_eviction(tmp_path):
+    cache = StructuredDataCache(cache_dir=str(tmp_path), max_disk_entries=10)
+    for i in range(25):
+        cache.set(f"key{i}", i)
+        assert len(os.listdir(tmp_path)) <= 10
+    # The most recently written entries survive
+    assert StructuredDataCache(cache_dir=str(tmp_path)).get("key24") == 24
+    cache.clear()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,89 @@
+"""The precompiled template bundle parses like the source files, and stale parts of it
+are ignored."""
+
+import os
+import pickle
+import shutil
+
+import pytest
+import textfsm
+from textfsm import clitable
+from ntc_templates.parse import build_template_bundle
+
+TESTDATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(textfsm.__file__)), "testdata"
+)
+ATTRS = {"Command": "sh vers", "Vendor": "VendorB"}
+RAW = "a b c\nd e f\n"
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    for name in ("default_index", "clitable_templateA", "clitable_templateB"):
+        shutil.copy(os.path.join(TESTDATA_DIR, name), str(tmp_path))
+    shutil.copy(os.path.join(TESTDATA_DIR, "default_index"), str(tmp_path / "index"))
+    (tmp_path / "clitable_templateC").write_text(
+        "Value Col1 (.)\nValue Col2 (.)\n\nStart\n  ^${Col1} ${Col2} -> Record\n"
+    )
+    return str(tmp_path)
+
+
+def parse(template_dir, attrs=ATTRS, index_file="default_index"):
+    return clitable.CliTable(index_file, template_dir).ParseCmdRecords(RAW, attrs)
+
+
+def test_bundle_matches_sources(template_dir):
+    expected = parse(template_dir)
+    bundle_file = clitable.WriteBundle(template_dir, "default_index")
+    assert bundle_file == os.path.join(template_dir, "default_index.bundle")
+    # A new index path, so the bundle is read instead of the cached index
+    shutil.copytree(template_dir, template_dir + "_copy", copy_function=shutil.copy2)
+    bundled_dir = template_dir + "_copy"
+    cli_table = clitable.CliTable("default_index", bundled_dir)
+    assert clitable.CliTable.BUNDLES.get(os.path.join(bundled_dir, "default_index"))
+    assert cli_table.ParseCmdRecords(RAW, ATTRS) == expected
+    assert cli_table.ParseCmdRecords(
+        RAW, {"Command": "show version", "Vendor": "VendorA"}
+    ) == parse(template_dir, {"Command": "show version", "Vendor": "VendorA"})
+
+
+def test_changed_template_uses_source(template_dir):
+    clitable.WriteBundle(template_dir, "default_index")
+    path = os.path.join(template_dir, "clitable_templateC")
+    with open(path, "w") as f:
+        f.write(
+            "Value Col1 (.)\nValue Col99 (.)\n\nStart\n  ^${Col1} ${Col99} -> Record\n"
+        )
+    records = parse(template_dir)
+    assert records == [{"col1": "a", "col99": "b"}, {"col1": "d", "col99": "e"}]
+
+
+def test_stale_bundle_ignored(template_dir):
+    bundle_file = clitable.WriteBundle(template_dir, "default_index")
+    with open(bundle_file, "rb") as f:
+        bundle = pickle.load(f)
+    bundle["version"] = -1
+    with open(bundle_file, "wb") as f:
+        pickle.dump(bundle, f)
+    parse(template_dir)
+    assert os.path.join(template_dir, "default_index") not in clitable.CliTable.BUNDLES
+
+    with open(bundle_file, "wb") as f:
+        f.write(b"not a bundle")
+    assert parse(template_dir) == [
+        {"col1": "a", "col2": "b"},
+        {"col1": "d", "col2": "e"},
+    ]
+
+
+def test_unpickled_fsm_parses(template_dir):
+    with open(os.path.join(template_dir, "clitable_templateA")) as f:
+        fsm = textfsm.TextFSM(f)
+    clone = pickle.loads(pickle.dumps(fsm))
+    assert clone.ParseText(RAW) == fsm.ParseText(RAW)
+
+
+def test_ntc_build_template_bundle(template_dir):
+    assert build_template_bundle(template_dir) == os.path.join(
+        template_dir, "index.bundle"
+    )
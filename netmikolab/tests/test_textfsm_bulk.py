@@ -0,0 +1,58 @@
+"""Bulk TextFSM parsing (process pool) returns the same data as parsing one by one."""
+import pytest
+
+from fake_ios import SHOW_VERSION, ip_interface_brief, show_interfaces
+from netmiko.utilities import (
+    get_structured_data_textfsm,
+    get_structured_data_textfsm_bulk,
+    iter_structured_data_textfsm_bulk,
+)
+from ntc_templates.parse import (
+    ParsingException,
+    iter_parse_output_bulk,
+    parse_output,
+    parse_output_bulk,
+)
+
+ITEMS = [
+    ("cisco_ios", "show version", SHOW_VERSION.format(hostname="R1")),
+    ("cisco_ios", "show ip interface brief", ip_interface_brief(20)),
+    ("cisco_ios", "show interfaces", show_interfaces(5)),
+    ("cisco_xe", "show ip interface brief", ip_interface_brief(3)),
+    ("cisco_ios", "show no such command", "some output"),
+] * 3
+
+
+def test_netmiko_bulk_matches_sequential():
+    expected = [
+        get_structured_data_textfsm(raw, platform=platform, command=command)
+        for platform, command, raw in ITEMS
+    ]
+    assert get_structured_data_textfsm_bulk(ITEMS, processes=2) == expected
+
+
+def test_netmiko_bulk_unordered_positions():
+    results = dict(iter_structured_data_textfsm_bulk(ITEMS, processes=2, ordered=False))
+    assert sorted(results) == list(range(len(ITEMS)))
+    assert results[1] == get_structured_data_textfsm(
+        ITEMS[1][2], platform="cisco_ios", command="show ip interface brief"
+    )
+
+
+def test_ntc_bulk_matches_parse_output():
+    items = [item for item in ITEMS if item[0] == "cisco_ios"][:3]
+    expected = [
+        parse_output(platform=platform, command=command, data=raw)
+        for platform, command, raw in items
+    ]
+    assert parse_output_bulk(items, processes=2) == expected
+
+
+def test_ntc_bulk_errors():
+    items = [("cisco_ios", "show no such command", "output")]
+    with pytest.raises(ParsingException):
+        parse_output_bulk(items, processes=1)
+    [result] = parse_output_bulk(items, processes=1, raise_on_error=False)
+    assert isinstance(result, ParsingException)
+    [(position, _)] = list(iter_parse_output_bulk(items, processes=1))
+    assert position == 0
@@ -0,0 +1,78 @@
+"""Fillup values, whose fills only walk the rows added since the last fill."""
+import io
+import random
+
+import textfsm
+
+TEMPLATE = """\
+Value Fillup GROUP (\\S+)
+Value NAME (\\S+)
+
+Start
+  ^name ${NAME} -> Record
+  ^group ${GROUP}
+"""
+
+
+def new_fsm():
+    return textfsm.TextFSM(io.StringIO(TEMPLATE))
+
+
+def expected_records(lines):
+    """The records of TEMPLATE, by the plain reverse walk of Fillup."""
+    records = []
+    group = ""
+    for line in lines:
+        kind, value = line.split()
+        if kind == "name":
+            records.append([group, value])
+            group = ""
+        else:
+            group = value
+            for record in reversed(records):
+                if record[0]:
+                    break
+                record[0] = value
+    if group:
+        records.append([group, ""])
+    return records
+
+
+def random_lines(count, seed):
+    rand = random.Random(seed)
+    return [
+        "{} {}".format(rand.choice(["name", "name", "group"]), i) for i in range(count)
+    ]
+
+
+def test_fillup_matches_reverse_walk():
+    for seed in range(20):
+        lines = random_lines(200, seed)
+        assert new_fsm().ParseText("\n".join(lines)) == expected_records(lines)
+
+
+def test_fillup_after_reset():
+    fsm = new_fsm()
+    first = random_lines(100, 1)
+    fsm.ParseText("\n".join(first))
+    fsm.Reset()
+    lines = random_lines(100, 2)
+    assert fsm.ParseText("\n".join(lines)) == expected_records(lines)
+
+
+def test_fillup_across_partial_parses():
+    lines = random_lines(300, 3)
+    fsm = new_fsm()
+    for i in range(0, len(lines), 7):
+        fsm.ParseText("\n".join(lines[i : i + 7]), eof=False)
+    assert fsm.ParseText("") == expected_records(lines)
+
+
+def test_fillup_after_results_emptied():
+    # Rows recorded after the results list was emptied are still filled
+    fsm = new_fsm()
+    rows = fsm.ParseText("name a\nname b\ngroup G1\n", eof=False)
+    assert rows == [["G1", "a"], ["G1", "b"]]
+    del rows[:]
+    rows = fsm.ParseText("name c\nname d\nname e\ngroup G2\n")
+    assert rows == [["G1", "c"], ["G2", "d"], ["G2", "e"], ["G2", ""]]
@@ -0,0 +1,75 @@
+"""TransportProfile turns on compression when asked to, without changing any output."""
+import pytest
+
+from fake_ios import FakeIOSServer
+from netmiko import ConnectHandler
+from netmiko.transport_profile import TransportProfile
+
+
+@pytest.fixture(scope="module")
+def compressing_ios():
+    server = FakeIOSServer(compression=True).start()
+    yield server
+    server.stop()
+
+
+def connect(device, server, profile):
+    return ConnectHandler(
+        **dict(device, host=server.host, port=server.port), transport_profile=profile
+    )
+
+
+def test_compression_for_verbose_command(device, compressing_ios, net_connect):
+    expected = net_connect.send_command("show running-config")
+    profile = TransportProfile(commands=[r"^show running-config"])
+    conn = connect(device, compressing_ios, profile)
+    try:
+        conn.send_command("show version")
+        assert not conn.transport_stats.transport.is_compressing()
+        assert conn.send_command("show running-config") == expected
+        assert conn.transport_stats.transport.is_compressing()
+        summary = conn.transport_stats.summary()
+    finally:
+        conn.disconnect()
+
+    version, running_config = summary["commands"]
+    assert not version["compression"] and version["saved_bytes"] == 0
+    assert running_config["compression"]
+    assert running_config["raw_bytes"] >= len(expected)
+    assert 0 < running_config["compressed_bytes"] < running_config["raw_bytes"]
+    assert summary["saved_bytes"] > 0
+
+
+def test_compression_on_connect_and_by_size(device, compressing_ios):
+    profile = TransportProfile(device_types=["cisco_*"])
+    conn = connect(device, compressing_ios, profile)
+    try:
+        assert conn.transport_stats.transport.is_compressing()
+    finally:
+        conn.disconnect()
+
+    profile = TransportProfile(commands=[], min_output_size=10000)
+    conn = connect(device, compressing_ios, profile)
+    try:
+        conn.send_command("show interfaces")
+        assert not conn.transport_stats.transport.is_compressing()
+        # Its output was more than min_output_size bytes last time
+        conn.send_command("show interfaces")
+        assert conn.transport_stats.transport.is_compressing()
+    finally:
+        conn.disconnect()
+
+
+def test_unsupported_host_remembered(device, fake_ios, net_connect):
+    expected = net_connect.send_command("show running-config")
+    profile = TransportProfile(commands=[r"^show running-config"])
+    for _ in range(2):
+        conn = connect(device, fake_ios, profile)
+        try:
+            assert conn.send_command("show running-config") == expected
+            assert not conn.transport_stats.transport.is_compressing()
+        finally:
+            conn.disconnect()
+    assert not profile.compress_for_command(
+        "cisco_ios", fake_ios.host, "show running-config"
+    )
@@ -0,0 +1,64 @@
+"""Channels of a window_autotune Transport grow their receive window during bulk reads."""
+import paramiko
+import pytest
+
+SIZE = 4 * 1024**2
+WINDOW = 64 * 1024
+
+
+@pytest.fixture(autouse=True)
+def wan_rtt(monkeypatch):
+    """Make transports measure a 50 ms round trip, as over a WAN link."""
+    sample_rtt = paramiko.Transport._sample_rtt
+    monkeypatch.setattr(
+        paramiko.Transport,
+        "_sample_rtt",
+        lambda self, rtt: sample_rtt(self, rtt + 0.05),
+    )
+
+
+def bulk_read(fake_ios, window_autotune, window_autotune_max=None):
+    def transport_factory(*args, **kwargs):
+        transport = paramiko.Transport(
+            *args, default_window_size=WINDOW, window_autotune=window_autotune, **kwargs
+        )
+        if window_autotune_max is not None:
+            transport.window_autotune_max = window_autotune_max
+        return transport
+
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        fake_ios.host,
+        port=fake_ios.port,
+        username="test",
+        password="test",
+        look_for_keys=False,
+        allow_agent=False,
+        transport_factory=transport_factory,
+    )
+    shell = client.invoke_shell()
+    shell.settimeout(10)
+    shell.send(f"show bench {SIZE}\n")
+    output = b""
+    while not output.rstrip().endswith(b"R1#") or len(output) < SIZE:
+        output += shell.recv(65536)
+    window = shell.in_window_size
+    client.close()
+    return output, window
+
+
+@pytest.mark.parametrize("window_autotune", [False, True])
+def test_bulk_read(fake_ios, window_autotune):
+    output, window = bulk_read(fake_ios, window_autotune)
+    assert fake_ios.bench_output(SIZE) in output
+    if window_autotune:
+        assert window > WINDOW
+    else:
+        assert window == WINDOW
+
+
+def test_window_capped(fake_ios):
+    output, window = bulk_read(fake_ios, True, window_autotune_max=96 * 1024)
+    assert fake_ios.bench_output(SIZE) in output
+    assert WINDOW < window <= 96 * 1024